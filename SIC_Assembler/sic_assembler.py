@@ -8,7 +8,7 @@ from SIC_Utilities.sic_constants import MAXIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_NUMB
     TO_INDEXED_ADDRESSING_DICT, OBJECT_CODE_TEXT_RECORD_BODY_LENGTH, SIC_ASSEMBLY_CODE_FILE_EXTENSION
 from SIC_Utilities.sic_converter import hex_string_to_dec, dec_to_memory_address_hex_string, dec_to_hex_string
 from SIC_Utilities.sic_messaging import print_status, print_error
-from sic_assembly_parser import parse_assembly_code_file, SICAssemblyParserError
+from SIC_Assembler.sic_assembly_parser import parse_assembly_code_file, SICAssemblyParserError
 
 # GLOBALS
 label_dict = {}
@@ -424,38 +424,45 @@ ASSEMBLE_MENU = "(a)ssemble, (q)uit"
 QUIT_CONFIRM = "Are you sure you want to quit? (y)es, (n)o"
 UNRECOGNIZED_COMMAND = "Unrecognized command"
 
-print("SIC ASSEMBLER")
+# The assembler is run as a program (SIC_Assembler > sic_assembler.py). Importing it only defines the passes,
+# so other code (for example the benchmarks) can assemble programs without the menu.
+def MAIN():
+    print("SIC ASSEMBLER")
 
-while True:
-    print(ASSEMBLE_MENU)
-    command = input(SICASM_PROMPT)
+    while True:
+        print(ASSEMBLE_MENU)
+        command = input(SICASM_PROMPT)
 
-    program_file_path = ""
+        program_file_path = ""
 
-    match command.strip().upper():
-        case "A":
-            try:
-                print("Enter program file name")
-                program_file_name = input(SICASM_PROMPT)
+        match command.strip().upper():
+            case "A":
+                try:
+                    print("Enter program file name")
+                    program_file_name = input(SICASM_PROMPT)
+
+                    # Verify program file path
+                    program_file_path = verify_program_file_path(program_file_name)
+                    # Parse assembly code
+                    parsed_code_dict_list = parse_assembly_code_file(program_file_path)
+                    # Execute pass one and pass two assembly
+                    assembler_pass_one(parsed_code_dict_list)
+                    assembler_pass_two(parsed_code_dict_list, program_file_path)
+                except (SICAssemblyParserError, SICAssemblerError) as ex:
+                    # ERROR
+                    print_error(str(ex))
+            case "Q":
+                print(QUIT_CONFIRM)
+                command = input(SICASM_PROMPT)
 
-                # Verify program file path
-                program_file_path = verify_program_file_path(program_file_name)
-                # Parse assembly code
-                parsed_code_dict_list = parse_assembly_code_file(program_file_path)
-                # Execute pass one and pass two assembly
-                assembler_pass_one(parsed_code_dict_list)
-                assembler_pass_two(parsed_code_dict_list, program_file_path)
-            except (SICAssemblyParserError, SICAssemblerError) as ex:
-                # ERROR
-                print_error(str(ex))
-        case "Q":
-            print(QUIT_CONFIRM)
-            command = input(SICASM_PROMPT)
-
-            if command.strip().upper() == "Y":
-                sys.exit()
-        case _:
-            print(UNRECOGNIZED_COMMAND)
+                if command.strip().upper() == "Y":
+                    sys.exit()
+            case _:
+                print(UNRECOGNIZED_COMMAND)
+
+
+if __name__ == "__main__":
+    MAIN()
 
 # TEST BED
 # Create path to assembly code file
@@ -0,0 +1,158 @@
+import random
+
+from SIC_Utilities.sic_constants import SW_EQUAL, SW_LESS_THAN
+
+# A readiness model answers the device tests (TD) of one device: READY(SW_LESS_THAN) or NOT READY(SW_EQUAL).
+# A readiness model is any object with get_description(), test(), test_until_ready(maximum_number_of_tests),
+# record_transfer(), reset(), get_state() and set_state(state) methods:
+# SICAlwaysReadyModel is always READY,
+# SICRandomReadinessModel is READY with a configurable probability, from a seeded random number generator,
+# SICLatencyReadinessModel is NOT READY for a fixed number of tests after every byte transferred (RD, WD).
+# Each model starts over when its device is initialized, so a run can be repeated exactly.
+#
+# test_until_ready tests the device up to maximum_number_of_tests times and stops after the first READY.
+# It returns the number of tests and whether the device was READY, and leaves the model as the same tests would.
+# get_state returns the state of the model as plain values (for machine snapshots), set_state restores it.
+READINESS_MODEL_ALWAYS_READY = "always"
+READINESS_MODEL_RANDOM = "random"
+READINESS_MODEL_LATENCY = "latency"
+READINESS_MODEL_LIST = [READINESS_MODEL_ALWAYS_READY, READINESS_MODEL_RANDOM, READINESS_MODEL_LATENCY]
+
+# The simulator has always favored NOT READY: one test in three is READY
+DEFAULT_READY_PROBABILITY = 1 / 3
+DEFAULT_LATENCY = 2
+MAXIMUM_SEED = 2 ** 32 - 1
+
+
+class SICDeviceReadinessError(Exception):
+    pass
+
+
+class SICAlwaysReadyModel:
+    def get_description(self):
+        return READINESS_MODEL_ALWAYS_READY
+
+    def test(self):
+        return SW_LESS_THAN
+
+    def test_until_ready(self, maximum_number_of_tests):
+        if maximum_number_of_tests < 1:
+            return 0, False
+        return 1, True
+
+    def record_transfer(self):
+        pass
+
+    def reset(self):
+        pass
+
+    def get_state(self):
+        return None
+
+    def set_state(self, state):
+        pass
+
+
+# This function draws a new seed from the operating system.
+def draw_seed():
+    return random.SystemRandom().randint(0, MAXIMUM_SEED)
+
+
+# A seed of None draws a new seed, which is kept in self.seed so the run can be reported and repeated.
+class SICRandomReadinessModel:
+    def __init__(self, seed=None, ready_probability=DEFAULT_READY_PROBABILITY):
+        if not 0 < ready_probability <= 1:
+            raise SICDeviceReadinessError("The ready probability must be greater than 0 and at most 1")
+
+        if seed is None:
+            seed = draw_seed()
+
+        self.seed = seed
+        self.ready_probability = ready_probability
+        self.random_number_generator = random.Random(seed)
+
+    def get_description(self):
+        return (READINESS_MODEL_RANDOM + " (seed " + str(self.seed) +
+                ", ready probability " + format(self.ready_probability, "g") + ")")
+
+    def test(self):
+        if self.random_number_generator.random() < self.ready_probability:
+            return SW_LESS_THAN
+        return SW_EQUAL
+
+    def test_until_ready(self, maximum_number_of_tests):
+        random_number_generator_random = self.random_number_generator.random
+        ready_probability = self.ready_probability
+
+        for number_of_tests in range(1, maximum_number_of_tests + 1):
+            if random_number_generator_random() < ready_probability:
+                return number_of_tests, True
+        return maximum_number_of_tests, False
+
+    def record_transfer(self):
+        pass
+
+    def reset(self):
+        self.random_number_generator.seed(self.seed)
+
+    # The generator state is (version, 625 integers, gauss), kept as a list
+    def get_state(self):
+        version, internal_state, gauss_next = self.random_number_generator.getstate()
+        return [version, list(internal_state), gauss_next]
+
+    def set_state(self, state):
+        version, internal_state, gauss_next = state
+        self.random_number_generator.setstate((version, tuple(internal_state), gauss_next))
+
+
+# The latency is counted in device tests. A TD/JEQ polling loop spends two steps on every test.
+class SICLatencyReadinessModel:
+    def __init__(self, latency=DEFAULT_LATENCY):
+        if latency < 0:
+            raise SICDeviceReadinessError("The latency must not be negative")
+
+        self.latency = latency
+        self.number_of_tests_until_ready = latency
+
+    def get_description(self):
+        return READINESS_MODEL_LATENCY + " (" + str(self.latency) + " tests)"
+
+    def test(self):
+        if self.number_of_tests_until_ready > 0:
+            self.number_of_tests_until_ready -= 1
+            return SW_EQUAL
+        return SW_LESS_THAN
+
+    def test_until_ready(self, maximum_number_of_tests):
+        if self.number_of_tests_until_ready >= maximum_number_of_tests:
+            self.number_of_tests_until_ready -= maximum_number_of_tests
+            return maximum_number_of_tests, False
+
+        number_of_tests = self.number_of_tests_until_ready + 1
+        self.number_of_tests_until_ready = 0
+        return number_of_tests, True
+
+    def record_transfer(self):
+        self.number_of_tests_until_ready = self.latency
+
+    def reset(self):
+        self.number_of_tests_until_ready = self.latency
+
+    def get_state(self):
+        return self.number_of_tests_until_ready
+
+    def set_state(self, state):
+        self.number_of_tests_until_ready = state
+
+
+# This function builds a readiness model by name.
+def create_readiness_model(readiness_model_name, seed=None, ready_probability=DEFAULT_READY_PROBABILITY,
+                           latency=DEFAULT_LATENCY):
+    if readiness_model_name == READINESS_MODEL_ALWAYS_READY:
+        return SICAlwaysReadyModel()
+    elif readiness_model_name == READINESS_MODEL_RANDOM:
+        return SICRandomReadinessModel(seed, ready_probability)
+    elif readiness_model_name == READINESS_MODEL_LATENCY:
+        return SICLatencyReadinessModel(latency)
+    else:
+        raise SICDeviceReadinessError("Invalid readiness model: " + str(readiness_model_name))
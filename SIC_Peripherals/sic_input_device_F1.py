@@ -1,9 +1,37 @@
-import random
+import io
+import sys
 
-from SIC_Utilities.sic_constants import SW_EQUAL, SW_LESS_THAN
-from SIC_Utilities.sic_converter import dec_to_hex_string
+from SIC_Peripherals.sic_device_readiness import SICRandomReadinessModel
+from SIC_Utilities.sic_converter import dec_to_hex_string, hex_string_to_dec
 from SIC_Utilities.sic_messaging import print_error
 
+# Input device F1 reads every byte (RD) from a source.
+# A source is any object with read_byte(is_in_EOF_state), reset(), close(), get_state() and set_state(state) methods:
+# SICTerminalSource prompts for one character at a time,
+# SICStreamSource reads a binary stream (a file or a pipe) through a buffer,
+# SICFileSource reads a file and SICBufferSource reads an in-memory buffer.
+#
+# END OF RECORD AND END OF FILE
+# Programs read X'00' as the end of a record, and as the end of file at the start of a record.
+# At the terminal these are entered as 'EOR' and 'EOF'.
+# A stream source reads the record separator byte (a line feed by default) as X'00' (end of record),
+# and reads X'00' for every read once the stream is exhausted (end of file).
+# With a record separator of None every byte of the stream is passed through unchanged.
+#
+# STATE
+# get_state returns the state of the device as plain values (for machine snapshots), set_state restores it.
+# The state of a stream source is its position in the stream, which can only be restored in a seekable stream.
+END_OF_RECORD_BYTE_VALUE = 0x00
+END_OF_FILE_BYTE_VALUE = 0x00
+DEFAULT_RECORD_SEPARATOR_BYTE_VALUE = 0x0A
+DEFAULT_READ_SIZE = 65536
+
+INPUT_DEVICE_F1_CODE = 0xF1
+
+
+class SICInputDeviceF1Error(Exception):
+    pass
+
 
 def read_byte_input_device_F1(is_in_EOF_state: bool):
     TEXT_COLOR_CYAN = "\033[96m"
@@ -38,10 +66,162 @@ def read_byte_input_device_F1(is_in_EOF_state: bool):
             print_error("INPUT PERIPHERAL DEVICE FAULT")
 
 
-def test_input_device_F1():
-    # Simulate testing a device by randomly selecting READY(SW_LESS_THAN) or NOT READY(SW_EQUAL)
-    # The "randomization" will be weighted to favor NOT READY
-    test_device_response_list = [SW_EQUAL, SW_EQUAL, SW_LESS_THAN]
-    test_device_response_hex_string = random.choice(test_device_response_list)
+# This source prompts at the terminal for each byte.
+class SICTerminalSource:
+    def read_byte(self, is_in_EOF_state: bool):
+        return hex_string_to_dec(read_byte_input_device_F1(is_in_EOF_state))
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+    def get_state(self):
+        return None
+
+    def set_state(self, state):
+        pass
+
+
+# This source reads a binary stream in large chunks, so a byte is read without a call into the stream.
+# A seekable stream starts over from the beginning when the device is initialized.
+class SICStreamSource:
+    def __init__(self, stream, record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE,
+                 read_size=DEFAULT_READ_SIZE):
+        if record_separator_byte_value is not None and not 0 <= record_separator_byte_value <= 0xFF:
+            raise SICInputDeviceF1Error("Invalid record separator byte value")
+
+        self.stream = stream
+        # read1 returns the bytes available in a pipe without waiting for a whole chunk
+        self.read_chunk = getattr(stream, "read1", stream.read)
+        self.record_separator_byte_value = record_separator_byte_value
+        self.read_size = read_size
+        self.chunk = b""
+        self.chunk_index = 0
+        self.is_at_end_of_file = False
+
+    def read_byte(self, is_in_EOF_state: bool):
+        if self.chunk_index >= len(self.chunk):
+            if self.is_at_end_of_file:
+                return END_OF_FILE_BYTE_VALUE
+
+            self.chunk = self.read_chunk(self.read_size)
+            self.chunk_index = 0
+            if not self.chunk:
+                self.is_at_end_of_file = True
+                return END_OF_FILE_BYTE_VALUE
+
+        byte_value = self.chunk[self.chunk_index]
+        self.chunk_index += 1
+
+        if byte_value == self.record_separator_byte_value:
+            return END_OF_RECORD_BYTE_VALUE
+        return byte_value
+
+    def reset(self):
+        if self.stream.seekable():
+            self.stream.seek(0)
+            self.chunk = b""
+            self.chunk_index = 0
+            self.is_at_end_of_file = False
+
+    def close(self):
+        self.stream.close()
+
+    # The position of the next byte to read, and whether the end of the stream has been read
+    def get_state(self):
+        if not self.stream.seekable():
+            return None
+        return [self.stream.tell() - (len(self.chunk) - self.chunk_index), self.is_at_end_of_file]
+
+    def set_state(self, state):
+        if state is None or not self.stream.seekable():
+            raise SICInputDeviceF1Error("The position in the input stream can not be restored")
+
+        self.stream.seek(state[0])
+        self.chunk = b""
+        self.chunk_index = 0
+        self.is_at_end_of_file = state[1]
+
+
+# This source reads a file opened in binary mode.
+class SICFileSource(SICStreamSource):
+    def __init__(self, input_file_path, record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE):
+        super().__init__(open(input_file_path, "rb"), record_separator_byte_value)
 
-    return test_device_response_hex_string
+
+# This source reads an in-memory buffer (bytes, bytearray or an ASCII str).
+class SICBufferSource(SICStreamSource):
+    def __init__(self, input_data, record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE):
+        if isinstance(input_data, str):
+            input_data = input_data.encode("ascii")
+
+        super().__init__(io.BytesIO(bytes(input_data)), record_separator_byte_value)
+
+
+# This function returns the source for the standard input pipe.
+def get_standard_input_source(record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE):
+    return SICStreamSource(sys.stdin.buffer, record_separator_byte_value)
+
+
+class SICInputDeviceF1:
+    def __init__(self, source=None, readiness_model=None):
+        self.source = source if source is not None else SICTerminalSource()
+        self.readiness_model = readiness_model if readiness_model is not None else SICRandomReadinessModel()
+        self.bytes_read = 0
+
+    def initialize(self):
+        self.bytes_read = 0
+        self.source.reset()
+        self.readiness_model.reset()
+
+    def set_source(self, source):
+        self.source = source
+
+    def set_readiness_model(self, readiness_model):
+        self.readiness_model = readiness_model
+
+    # Test the device: READY(SW_LESS_THAN) or NOT READY(SW_EQUAL), as answered by the readiness model
+    def test(self):
+        return self.readiness_model.test()
+
+    # Test the device until it is READY, at most maximum_number_of_tests times (see sic_device_readiness)
+    def test_until_ready(self, maximum_number_of_tests):
+        return self.readiness_model.test_until_ready(maximum_number_of_tests)
+
+    def read_byte(self, is_in_EOF_state: bool):
+        byte_value = self.source.read_byte(is_in_EOF_state)
+        self.bytes_read += 1
+        self.readiness_model.record_transfer()
+        return byte_value
+
+    def get_state(self):
+        return {"bytes_read": self.bytes_read,
+                "source": self.source.get_state(),
+                "readiness": self.readiness_model.get_state()}
+
+    def set_state(self, state):
+        self.source.set_state(state["source"])
+        self.readiness_model.set_state(state["readiness"])
+        self.bytes_read = state["bytes_read"]
+
+    # The transfer state is the state without the readiness model: the byte count and the source state.
+    # Time travel (see sic_time_travel) restores the transfer state only, it does not rewind the readiness model.
+    def get_transfer_state(self):
+        return self.bytes_read, self.source.get_state()
+
+    def set_transfer_state(self, transfer_state):
+        self.source.set_state(transfer_state[1])
+        self.bytes_read = transfer_state[0]
+
+
+INPUT_DEVICE_F1 = SICInputDeviceF1()
+
+
+def initialize_input_device_F1():
+    INPUT_DEVICE_F1.initialize()
+
+
+def test_input_device_F1():
+    return INPUT_DEVICE_F1.test()
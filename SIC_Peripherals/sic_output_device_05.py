@@ -1,30 +1,193 @@
-import random
+import sys
 
-from SIC_Utilities.sic_constants import SW_EQUAL, SW_LESS_THAN
+from SIC_Peripherals.sic_device_readiness import SICRandomReadinessModel
 from SIC_Utilities.sic_converter import hex_string_to_dec
 
-OUTPUT_DEVICE_05_INTERFACE = ""
+# Output device 05 passes every byte written to it (WD) on to a sink.
+# A sink is any object with write_byte(byte_value), flush(), reset(), get_state(), set_state(state),
+# get_transfer_state() and set_transfer_state(transfer_state) methods:
+# SICTerminalSink echoes each new byte to the terminal,
+# SICBytearraySink collects the output in memory,
+# SICFileSink writes the output to a file.
+# get_state returns the state of the device as plain values (for machine snapshots), set_state restores it.
+# The transfer state is only the length of the output, so time travel can save it before every WD at no cost
+# and take back a write by truncating the output to its earlier length.
+# Output already written to the terminal can not be taken back.
+LINE_FEED_BYTE_VALUE = 0x0A
 
+OUTPUT_DEVICE_05_CODE = 0x05
 
-def initialize_output_device_05():
-    global OUTPUT_DEVICE_05_INTERFACE
-    OUTPUT_DEVICE_05_INTERFACE = ""
+# File sink flush policies
+FLUSH_POLICY_EVERY_BYTE = "byte"
+FLUSH_POLICY_EVERY_LINE = "line"
+FLUSH_POLICY_ON_CLOSE = "close"
+FLUSH_POLICY_LIST = [FLUSH_POLICY_EVERY_BYTE, FLUSH_POLICY_EVERY_LINE, FLUSH_POLICY_ON_CLOSE]
 
 
-def test_output_device_05():
-    # Simulate testing a device by randomly selecting READY(SW_LESS_THAN) or NOT READY(SW_EQUAL)
-    # The "randomization" will be weighted to favor NOT READY
-    test_device_response_list = [SW_EQUAL, SW_EQUAL, SW_LESS_THAN]
-    test_device_response_hex_string = random.choice(test_device_response_list)
+class SICOutputDevice05Error(Exception):
+    pass
 
-    return test_device_response_hex_string
 
+# This sink writes each byte to the terminal as a character.
+# The stream is looked up on every write, so a run that redirects sys.stdout also captures the device output.
+class SICTerminalSink:
+    def write_byte(self, byte_value: int):
+        sys.stdout.write(chr(byte_value))
 
-def write_byte_to_output_device_05(byte_string: str):
-    global OUTPUT_DEVICE_05_INTERFACE
-    TEXT_COLOR_CYAN = "\033[96m"
-    TEXT_COLOR_DEFAULT = "\033[0m"
+    def flush(self):
+        sys.stdout.flush()
+
+    def reset(self):
+        pass
+
+    def get_state(self):
+        return None
+
+    def set_state(self, state):
+        pass
+
+    def get_transfer_state(self):
+        return None
+
+    def set_transfer_state(self, transfer_state):
+        pass
+
+
+# This sink collects the output in a bytearray.
+class SICBytearraySink:
+    def __init__(self):
+        self.output_bytearray = bytearray()
+
+    def write_byte(self, byte_value: int):
+        self.output_bytearray.append(byte_value)
+
+    def flush(self):
+        pass
+
+    def reset(self):
+        self.output_bytearray.clear()
+
+    # The output collected so far, as text (Latin-1)
+    def get_state(self):
+        return self.output_bytearray.decode("latin-1")
+
+    def set_state(self, state):
+        self.output_bytearray[:] = state.encode("latin-1")
+
+    # The length of the output collected so far
+    def get_transfer_state(self):
+        return len(self.output_bytearray)
+
+    def set_transfer_state(self, transfer_state):
+        del self.output_bytearray[transfer_state:]
+
+
+# This sink writes the output to a file opened in binary mode.
+# The flush policy decides when the file is flushed: after every byte, after every line feed, or only on close.
+class SICFileSink:
+    def __init__(self, output_file_path, flush_policy=FLUSH_POLICY_EVERY_LINE):
+        if flush_policy not in FLUSH_POLICY_LIST:
+            raise SICOutputDevice05Error("Invalid flush policy: " + str(flush_policy))
+
+        self.output_file = open(output_file_path, "wb")
+        self.flush_policy = flush_policy
+
+    def write_byte(self, byte_value: int):
+        self.output_file.write(bytes((byte_value,)))
+
+        if (self.flush_policy == FLUSH_POLICY_EVERY_BYTE or
+                (self.flush_policy == FLUSH_POLICY_EVERY_LINE and byte_value == LINE_FEED_BYTE_VALUE)):
+            self.output_file.flush()
+
+    def flush(self):
+        self.output_file.flush()
+
+    def reset(self):
+        pass
+
+    def close(self):
+        self.output_file.close()
+
+    # The length of the output file
+    def get_state(self):
+        return self.output_file.tell()
 
-    OUTPUT_DEVICE_05_INTERFACE += chr(hex_string_to_dec(byte_string))
+    def set_state(self, state):
+        self.output_file.flush()
+        self.output_file.seek(state)
+        self.output_file.truncate()
 
-    print(TEXT_COLOR_CYAN + "OUTPUT DEVICE>\n" + OUTPUT_DEVICE_05_INTERFACE + "\n" + TEXT_COLOR_DEFAULT)
+    def get_transfer_state(self):
+        return self.get_state()
+
+    def set_transfer_state(self, transfer_state):
+        self.set_state(transfer_state)
+
+
+class SICOutputDevice05:
+    def __init__(self, sink=None, readiness_model=None):
+        self.sink = sink if sink is not None else SICTerminalSink()
+        self.readiness_model = readiness_model if readiness_model is not None else SICRandomReadinessModel()
+        self.bytes_written = 0
+
+    def initialize(self):
+        self.bytes_written = 0
+        self.sink.reset()
+        self.readiness_model.reset()
+
+    def set_sink(self, sink):
+        self.sink.flush()
+        self.sink = sink
+
+    def set_readiness_model(self, readiness_model):
+        self.readiness_model = readiness_model
+
+    # Test the device: READY(SW_LESS_THAN) or NOT READY(SW_EQUAL), as answered by the readiness model
+    def test(self):
+        return self.readiness_model.test()
+
+    # Test the device until it is READY, at most maximum_number_of_tests times (see sic_device_readiness)
+    def test_until_ready(self, maximum_number_of_tests):
+        return self.readiness_model.test_until_ready(maximum_number_of_tests)
+
+    def write_byte(self, byte_value: int):
+        self.sink.write_byte(byte_value)
+        self.bytes_written += 1
+        self.readiness_model.record_transfer()
+
+    def flush(self):
+        self.sink.flush()
+
+    def get_state(self):
+        return {"bytes_written": self.bytes_written,
+                "sink": self.sink.get_state(),
+                "readiness": self.readiness_model.get_state()}
+
+    def set_state(self, state):
+        self.sink.set_state(state["sink"])
+        self.readiness_model.set_state(state["readiness"])
+        self.bytes_written = state["bytes_written"]
+
+    # The byte count and the sink transfer state, used by sic_time_travel to take back a write.
+    # A file or bytearray sink is truncated, output already shown at the terminal stays there.
+    def get_transfer_state(self):
+        return self.bytes_written, self.sink.get_transfer_state()
+
+    def set_transfer_state(self, transfer_state):
+        self.sink.set_transfer_state(transfer_state[1])
+        self.bytes_written = transfer_state[0]
+
+
+OUTPUT_DEVICE_05 = SICOutputDevice05()
+
+
+def initialize_output_device_05():
+    OUTPUT_DEVICE_05.initialize()
+
+
+def test_output_device_05():
+    return OUTPUT_DEVICE_05.test()
+
+
+def write_byte_to_output_device_05(byte_string: str):
+    OUTPUT_DEVICE_05.write_byte(hex_string_to_dec(byte_string))
@@ -0,0 +1,246 @@
+import argparse
+import os
+import sys
+
+from SIC_Peripherals.sic_device_readiness import READINESS_MODEL_LIST, READINESS_MODEL_RANDOM, \
+    DEFAULT_READY_PROBABILITY, DEFAULT_LATENCY
+from SIC_Peripherals.sic_input_device_F1 import DEFAULT_RECORD_SEPARATOR_BYTE_VALUE
+from SIC_Peripherals.sic_output_device_05 import FLUSH_POLICY_LIST, FLUSH_POLICY_EVERY_LINE
+from SIC_Simulator.sic_batch_runner import get_batch_program_file_paths, run_batch, SICBatchRunnerError
+from SIC_Simulator.sic_profiler import DEFAULT_NUMBER_OF_HOT_SPOTS
+from SIC_Simulator.sic_runner import run_program_file, EXIT_STATUS_NORMAL, EXIT_STATUS_LOAD_ERROR, RUN_MODE_LIST, \
+    RUN_MODE_SILENT, RUN_MODE_FULL, DEFAULT_REPORT_INTERVAL
+from SIC_Simulator.sic_trace_recorder import write_trace_text, write_trace_csv, SICTraceRecorderError
+from SIC_Utilities.sic_messaging import print_error
+
+# HEADLESS SIMULATOR COMMAND LINE
+# python -m SIC_Simulator run <program>.obj [--max-steps N] [--run-mode MODE] [--report-interval N] [--trace]
+#                                           [--dump-registers] [--dump-memory] [--no-compile]
+#                                           [--output-file PATH] [--output-flush byte|line|close]
+#                                           [--input-file PATH|-] [--record-separator HEX|none]
+#                                           [--readiness always|random|latency] [--seed N] [--ready-probability P]
+#                                           [--latency N] [--stats] [--no-fast-forward]
+#                                           [--profile] [--profile-file PATH] [--profile-hot-spots N]
+#                                           [--trace-file PATH] [--trace-ring N]
+#                                           [--break LOCATION[ if CONDITION]]... [--watch RANGE[:r|w|rw]]...
+# python -m SIC_Simulator trace <trace file> [--csv] [--output-file PATH]
+# python -m SIC_Simulator batch <program>.obj|<directory> ... [--recursive] [--workers N] [--max-steps N]
+#                                           [--time-limit SECONDS] [--results-file PATH] [--no-compile]
+#                                           [--input-file PATH] [--record-separator HEX|none]
+#                                           [--readiness always|random|latency] [--seed N] [--ready-probability P]
+#                                           [--latency N] [--no-fast-forward]
+#
+# EXIT STATUS
+# 0 program terminated normally (XOS), every program in a batch
+# 1 program fault, any other outcome of a program in a batch
+# 2 step budget exhausted
+# 3 program could not be loaded, no programs to run in a batch, trace file could not be read
+# 4 stopped at a breakpoint or watchpoint
+
+
+# The record separator is a hex byte (0A) or "none" to pass every input byte through unchanged.
+def parse_record_separator(record_separator_string):
+    if record_separator_string.strip().lower() == "none":
+        return None
+
+    try:
+        record_separator_byte_value = int(record_separator_string, 16)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid hex byte: " + record_separator_string)
+
+    if not 0 <= record_separator_byte_value <= 0xFF:
+        raise argparse.ArgumentTypeError("invalid hex byte: " + record_separator_string)
+
+    return record_separator_byte_value
+
+
+# This function adds the input file record separator and readiness model options to a command.
+def add_device_arguments(command_parser):
+    command_parser.add_argument("--record-separator", type=parse_record_separator,
+                                default=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE,
+                                help="hex byte read as end of record from the input file (default: 0A), or none")
+    command_parser.add_argument("--readiness", choices=READINESS_MODEL_LIST, default=READINESS_MODEL_RANDOM,
+                                help="how the devices answer TD (default: random)")
+    command_parser.add_argument("--seed", type=int, default=None,
+                                help="seed of the random readiness model (default: a new seed, see --stats)")
+    command_parser.add_argument("--ready-probability", type=float, default=DEFAULT_READY_PROBABILITY,
+                                help="probability that a device test answers READY in the random readiness model")
+    command_parser.add_argument("--latency", type=int, default=DEFAULT_LATENCY,
+                                help="number of device tests answered NOT READY after each transfer "
+                                     "in the latency readiness model")
+
+
+# This function adds the options that select how instructions are executed to a command.
+def add_execution_arguments(command_parser):
+    command_parser.add_argument("--no-fast-forward", action="store_true",
+                                help="execute device polling loops (TD, JEQ) one instruction at a time")
+    command_parser.add_argument("--no-compile", action="store_true",
+                                help="execute one instruction at a time instead of compiled blocks")
+
+
+def build_argument_parser():
+    argument_parser = argparse.ArgumentParser(prog="python -m SIC_Simulator",
+                                              description="Run SIC programs without the interactive simulator.")
+    subparsers = argument_parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="load and run a program object code file")
+    run_parser.add_argument("program_file_path", help="program object code file (*.obj)")
+    run_parser.add_argument("--max-steps", type=int, default=None,
+                            help="stop after this many instructions (default: run until the program stops)")
+    run_parser.add_argument("--run-mode", choices=RUN_MODE_LIST, default=RUN_MODE_SILENT,
+                            help="how much to print while the program runs (default: silent)")
+    run_parser.add_argument("--report-interval", type=int, default=DEFAULT_REPORT_INTERVAL,
+                            help="number of steps between register dumps in the every-n run mode")
+    run_parser.add_argument("--trace", action="store_true", help="same as --run-mode full")
+    run_parser.add_argument("--dump-registers", action="store_true", help="dump the registers at the end of the run")
+    run_parser.add_argument("--dump-memory", action="store_true", help="dump memory at the end of the run")
+    run_parser.add_argument("--output-file", default=None,
+                            help="write the output of device 05 to this file instead of the terminal")
+    run_parser.add_argument("--output-flush", choices=FLUSH_POLICY_LIST, default=FLUSH_POLICY_EVERY_LINE,
+                            help="when the output file is flushed (default: line)")
+    run_parser.add_argument("--input-file", default=None,
+                            help="read input device F1 from this file, or from the standard input pipe with -")
+    add_device_arguments(run_parser)
+    run_parser.add_argument("--stats", action="store_true",
+                            help="print the run statistics, including the readiness seed")
+    run_parser.add_argument("--profile", action="store_true",
+                            help="count the executions of every address and opcode and print the hot spots")
+    run_parser.add_argument("--profile-file", default=None,
+                            help="write the profile as JSON to this file")
+    run_parser.add_argument("--profile-hot-spots", type=int, default=DEFAULT_NUMBER_OF_HOT_SPOTS,
+                            help="number of addresses in the printed profile (default: 20)")
+    run_parser.add_argument("--trace-file", default=None,
+                            help="write a binary trace record of every instruction to this file")
+    run_parser.add_argument("--trace-ring", type=int, default=None,
+                            help="only keep the last N trace records and write them when the run ends")
+    run_parser.add_argument("--break", dest="breakpoint_list", action="append", default=None,
+                            metavar="LOCATION[ if CONDITION]",
+                            help="stop before the instruction at a label or hex address, "
+                                 "if the condition holds (for example \"RLOOP if X >= 1E\")")
+    run_parser.add_argument("--watch", dest="watchpoint_list", action="append", default=None,
+                            metavar="RANGE[:r|w|rw]",
+                            help="stop before an instruction that reads or writes (default: w) the word at a location, "
+                                 "or a range of locations (for example BUFFER-103F:rw)")
+    add_execution_arguments(run_parser)
+
+    trace_parser = subparsers.add_parser("trace", help="decode a binary trace file to text or CSV")
+    trace_parser.add_argument("trace_file_path", help="trace file written by run --trace-file")
+    trace_parser.add_argument("--csv", action="store_true", help="write CSV instead of text")
+    trace_parser.add_argument("--output-file", default=None,
+                              help="write to this file instead of the terminal")
+
+    batch_parser = subparsers.add_parser("batch", help="run many program object code files in worker processes")
+    batch_parser.add_argument("path_list", nargs="+", metavar="path",
+                              help="program object code file (*.obj), or a directory of them")
+    batch_parser.add_argument("--recursive", action="store_true",
+                              help="also run the object code files in the subdirectories of a directory")
+    batch_parser.add_argument("--workers", type=int, default=None,
+                              help="number of worker processes (default: one per processor)")
+    batch_parser.add_argument("--max-steps", type=int, default=None,
+                              help="stop each program after this many instructions")
+    batch_parser.add_argument("--time-limit", type=float, default=None,
+                              help="stop each program after running this many seconds")
+    batch_parser.add_argument("--results-file", default=None,
+                              help="write the JSON lines results to this file instead of the terminal")
+    batch_parser.add_argument("--input-file", default=None,
+                              help="every program reads input device F1 from this file (default: no input)")
+    add_device_arguments(batch_parser)
+    add_execution_arguments(batch_parser)
+
+    return argument_parser
+
+
+# This function writes the records of a trace file as text or CSV, to the terminal or to output_file_path.
+# Decoding stops quietly when the reader of a pipe (for example head) goes away.
+def decode_trace_file(trace_file_path, is_writing_csv, output_file_path):
+    write_trace = write_trace_csv if is_writing_csv else write_trace_text
+
+    try:
+        if output_file_path is None:
+            write_trace(trace_file_path, sys.stdout)
+            sys.stdout.flush()
+        else:
+            with open(output_file_path, "wt", newline="") as output_file:
+                write_trace(trace_file_path, output_file)
+    except BrokenPipeError:
+        # The standard output is pointed at the null device, so flushing it at exit does not fail again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except (SICTraceRecorderError, OSError) as ex:
+        print_error(str(ex))
+        return EXIT_STATUS_LOAD_ERROR
+
+    return EXIT_STATUS_NORMAL
+
+
+def MAIN(argument_list=None):
+    arguments = build_argument_parser().parse_args(argument_list)
+
+    if arguments.command == "trace":
+        return decode_trace_file(arguments.trace_file_path, arguments.csv, arguments.output_file)
+
+    if arguments.max_steps is not None and arguments.max_steps < 0:
+        print_error("--max-steps must not be negative")
+        return EXIT_STATUS_LOAD_ERROR
+
+    if arguments.command == "batch":
+        program_file_path_list = get_batch_program_file_paths(arguments.path_list, arguments.recursive)
+        if not program_file_path_list:
+            print_error("No object code files to run")
+            return EXIT_STATUS_LOAD_ERROR
+
+        try:
+            return run_batch(program_file_path_list,
+                             number_of_workers=arguments.workers,
+                             maximum_number_of_steps=arguments.max_steps,
+                             time_limit_seconds=arguments.time_limit,
+                             results_file_path=arguments.results_file,
+                             input_file_path=arguments.input_file,
+                             record_separator_byte_value=arguments.record_separator,
+                             readiness_model_name=arguments.readiness,
+                             seed=arguments.seed,
+                             ready_probability=arguments.ready_probability,
+                             latency=arguments.latency,
+                             use_block_compiler=not arguments.no_compile,
+                             is_fast_forwarding_polling_loops=not arguments.no_fast_forward)
+        except (SICBatchRunnerError, OSError) as ex:
+            print_error(str(ex))
+            return EXIT_STATUS_LOAD_ERROR
+
+    if arguments.report_interval < 1:
+        print_error("--report-interval must be at least 1")
+        return EXIT_STATUS_LOAD_ERROR
+
+    if arguments.trace_ring is not None and arguments.trace_ring < 1:
+        print_error("--trace-ring must be at least 1")
+        return EXIT_STATUS_LOAD_ERROR
+
+    if arguments.command == "run":
+        return run_program_file(arguments.program_file_path,
+                                maximum_number_of_steps=arguments.max_steps,
+                                run_mode=RUN_MODE_FULL if arguments.trace else arguments.run_mode,
+                                report_interval=arguments.report_interval,
+                                is_dumping_registers=arguments.dump_registers,
+                                is_dumping_memory=arguments.dump_memory,
+                                use_block_compiler=not arguments.no_compile,
+                                output_file_path=arguments.output_file,
+                                output_flush_policy=arguments.output_flush,
+                                input_file_path=arguments.input_file,
+                                record_separator_byte_value=arguments.record_separator,
+                                readiness_model_name=arguments.readiness,
+                                seed=arguments.seed,
+                                ready_probability=arguments.ready_probability,
+                                latency=arguments.latency,
+                                is_reporting_statistics=arguments.stats,
+                                is_fast_forwarding_polling_loops=not arguments.no_fast_forward,
+                                is_profiling=arguments.profile,
+                                profile_file_path=arguments.profile_file,
+                                number_of_profile_hot_spots=arguments.profile_hot_spots,
+                                trace_file_path=arguments.trace_file,
+                                trace_ring_size=arguments.trace_ring,
+                                breakpoint_string_list=arguments.breakpoint_list,
+                                watchpoint_string_list=arguments.watchpoint_list)
+
+
+# Worker processes that are started fresh (not forked) import this module again, without running MAIN
+if __name__ == "__main__":
+    sys.exit(MAIN())
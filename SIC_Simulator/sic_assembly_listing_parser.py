@@ -1,8 +1,10 @@
+import mmap
 import os.path
+import re
 import sys
 
 from SIC_Simulator.sic_configuration import SIC_DEFAULT_WORKING_DIRECTORY
-from SIC_Utilities.sic_constants import SIC_ASSEMBLY_LISTING_FILE_EXTENSION
+from SIC_Utilities.sic_constants import SIC_ASSEMBLY_LISTING_FILE_EXTENSION, LOC_COLUMN_WIDTH, LABEL_COLUMN_WIDTH
 from SIC_Utilities.sic_messaging import print_error, print_status
 
 
@@ -54,11 +56,135 @@ def sic_assembly_listing_parser(assembly_listing_file):
         raise SICAssemblyListingParserError("END was not found in the assembly listing file")
 
 
+# LISTING INDEX
+# An assembly listing index finds the lines of an assembly listing by integer memory address.
+# The index is built by a single scan of the memory-mapped file that records where each line starts and ends,
+# and only when a line is first asked for (or build_index is called), so a run that prints no listing
+# lines never reads the file. A line is decoded when it is first read and kept for the steps that follow.
+# The index holds the same lines as sic_assembly_listing_parser and checks the file by the same rules.
+# The same scan collects the label table (label -> memory address) from the label column.
+LISTING_ADDRESS_PATTERN = re.compile(rb"[0-9A-F]{4}")
+LINE_END_PATTERN = re.compile(rb"\r\n|\r|\n|\Z")
+
+
+class SICAssemblyListingIndex:
+    def __init__(self, assembly_listing_file_path):
+        self.assembly_listing_file_path = assembly_listing_file_path
+        self.listing_bytes = None
+        self.line_offset_dict = None
+        self.label_address_dict = None
+        self.line_dict = {}
+
+    # This function maps the assembly listing file and records the start and end offset of every line
+    # between START and END by memory address.
+    def build_index(self):
+        if self.line_offset_dict is not None:
+            return
+
+        with open(self.assembly_listing_file_path, "rb") as assembly_listing_file:
+            try:
+                listing_bytes = mmap.mmap(assembly_listing_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # An empty file can not be mapped
+                listing_bytes = b""
+
+        try:
+            self.scan_listing_bytes(listing_bytes)
+        except SICAssemblyListingParserError:
+            # The index of a listing that breaks the rules is not kept, so its mapping is closed here
+            if isinstance(listing_bytes, mmap.mmap):
+                listing_bytes.close()
+            raise
+
+    # This function scans the lines of the mapped assembly listing file and keeps the index once END is found.
+    def scan_listing_bytes(self, listing_bytes):
+        line_offset_dict = {}
+        label_address_dict = {}
+        start_found = False
+        line_start_offset = 0
+
+        # Lines end as in a file read in text mode (universal newlines), the end of the file ends the last line
+        for line_end_match in LINE_END_PATTERN.finditer(listing_bytes):
+            if line_start_offset == len(listing_bytes):
+                break
+
+            line_end_offset = line_end_match.start()
+            line_of_listing = listing_bytes[line_start_offset:line_end_offset]
+
+            if not line_of_listing or line_of_listing.isspace():
+                # ERROR
+                raise SICAssemblyListingParserError("Can not have a blank line in the assembly listing file")
+
+            if not start_found:
+                if line_of_listing[19:28].rstrip() == b"START":
+                    start_found = True
+                else:
+                    # ERROR
+                    raise SICAssemblyListingParserError("START must be the first opcode in the assembly listing file.")
+            else:
+                if line_of_listing[19:28].rstrip() == b"END":
+                    self.listing_bytes = listing_bytes
+                    self.line_offset_dict = line_offset_dict
+                    self.label_address_dict = label_address_dict
+                    return
+
+                # Lines that do not start with a four digit address can never be looked up
+                if LISTING_ADDRESS_PATTERN.match(line_of_listing):
+                    memory_address_dec = int(line_of_listing[:4], 16)
+                    line_offset_dict[memory_address_dec] = (line_start_offset, line_end_offset)
+
+                    label = line_of_listing[LOC_COLUMN_WIDTH:LOC_COLUMN_WIDTH + LABEL_COLUMN_WIDTH].strip()
+                    if label:
+                        label_address_dict[label.decode("utf-8", errors="replace")] = memory_address_dec
+
+            line_start_offset = line_end_match.end()
+
+        # ERROR
+        raise SICAssemblyListingParserError("END was not found in the assembly listing file")
+
+    # This function returns the line of the assembly listing at a memory address.
+    # It raises KeyError if no line of the listing is at the address.
+    def get_line(self, memory_address_dec):
+        line_of_listing = self.line_dict.get(memory_address_dec)
+
+        if line_of_listing is None:
+            if self.line_offset_dict is None:
+                self.build_index()
+
+            line_start_offset, line_end_offset = self.line_offset_dict[memory_address_dec]
+            line_of_listing = self.listing_bytes[line_start_offset:line_end_offset].decode("utf-8",
+                                                                                           errors="replace")
+            self.line_dict[memory_address_dec] = line_of_listing
+
+        return line_of_listing
+
+    # This function returns the label table of the assembly listing: the memory address of every label.
+    def get_label_address_dict(self):
+        if self.label_address_dict is None:
+            self.build_index()
+
+        return self.label_address_dict
+
+    def close(self):
+        if isinstance(self.listing_bytes, mmap.mmap):
+            self.listing_bytes.close()
+        self.listing_bytes = None
+        self.line_offset_dict = None
+        self.label_address_dict = None
+        self.line_dict = {}
+
+
 # This function prints a line of the assembly listing
 # referenced by the passed memory address
 # NOTE: The memory address should always come from the program counter register[PC].
-def print_assembly_listing_line(parsed_listing_dict, register_pc):
-    print(parsed_listing_dict[register_pc.get_hex_string()] + "\n")
+def print_assembly_listing_line(assembly_listing_index, register_pc):
+    print(get_assembly_listing_line(assembly_listing_index, register_pc) + "\n")
+
+
+# This function returns the line of the assembly listing (see SICAssemblyListingIndex)
+# referenced by the passed memory address.
+def get_assembly_listing_line(assembly_listing_index, register_pc):
+    return assembly_listing_index.get_line(register_pc.value)
 
 # TEST BED
 
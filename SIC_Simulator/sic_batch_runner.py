@@ -0,0 +1,221 @@
+import concurrent.futures
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+from SIC_Peripherals.sic_device_readiness import create_readiness_model, draw_seed, SICDeviceReadinessError, \
+    READINESS_MODEL_RANDOM, DEFAULT_READY_PROBABILITY, DEFAULT_LATENCY
+from SIC_Peripherals.sic_input_device_F1 import SICInputDeviceF1, SICFileSource, SICBufferSource, \
+    SICInputDeviceF1Error, DEFAULT_RECORD_SEPARATOR_BYTE_VALUE
+from SIC_Peripherals.sic_output_device_05 import SICOutputDevice05, SICBytearraySink
+from SIC_Simulator.sic_machine import SICMachine
+from SIC_Simulator.sic_memory_model import SICMemoryModelError
+from SIC_Simulator.sic_object_code_parser import SICObjectCodeParserError
+from SIC_Simulator.sic_program_image import load_program_image, SICProgramImageError
+from SIC_Simulator.sic_register_model import SICRegisterContentsError
+from SIC_Simulator.sic_runner import EXIT_STATUS_NORMAL, EXIT_STATUS_FAULT
+from SIC_Utilities.sic_constants import SIC_OBJECT_CODE_FILE_EXTENSION
+from SIC_Utilities.sic_messaging import print_error, TEXT_COLOR_RED, TEXT_COLOR_GREEN, TEXT_COLOR_DEFAULT
+
+# The batch runner runs many object code files, each on its own machine, in a pool of worker processes.
+# Every job writes one result as a line of JSON as soon as it is done, so results arrive in order of completion.
+# A job reads input device F1 from the input file (every job reads the whole file), or reads end of file at once.
+# The output of device 05 is collected in memory and reported with the result.
+#
+# RESULT
+# {"program": object code file path, "exit_reason": see below, "steps": instructions executed,
+#  "elapsed_seconds": run time, "input_bytes": bytes read, "output_bytes": bytes written,
+#  "output": the output as text (Latin-1), "registers": {"A": "000046", ... } (null if uninitialized),
+#  "readiness": readiness model and seed, "messages": the status and fault messages of the run}
+EXIT_REASON_NORMAL = "normal"
+EXIT_REASON_FAULT = "fault"
+EXIT_REASON_STEP_BUDGET_EXHAUSTED = "step-budget-exhausted"
+EXIT_REASON_TIME_LIMIT_EXCEEDED = "time-limit-exceeded"
+EXIT_REASON_LOAD_ERROR = "load-error"
+
+# A job runs this many steps between checks of its time limit
+STEPS_PER_TIME_LIMIT_CHECK = 100000
+
+
+class SICBatchRunnerError(Exception):
+    pass
+
+
+# This function lists the object code files to run: every file path as given,
+# and every object code file in a directory (in its subdirectories too if is_recursive is True), sorted by name.
+def get_batch_program_file_paths(path_list, is_recursive=False):
+    program_file_path_list = []
+
+    for path in path_list:
+        if not os.path.isdir(path):
+            program_file_path_list.append(path)
+            continue
+
+        if is_recursive:
+            directory_program_file_path_list = []
+            for directory_path, directory_name_list, file_name_list in os.walk(path):
+                for file_name in file_name_list:
+                    if file_name.endswith("." + SIC_OBJECT_CODE_FILE_EXTENSION):
+                        directory_program_file_path_list.append(os.path.join(directory_path, file_name))
+            program_file_path_list.extend(sorted(directory_program_file_path_list))
+        else:
+            program_file_path_list.extend(sorted(os.path.join(path, file_name) for file_name in os.listdir(path)
+                                                 if file_name.endswith("." + SIC_OBJECT_CODE_FILE_EXTENSION)))
+
+    return program_file_path_list
+
+
+# This function removes the text colors from printed status and fault messages.
+def remove_text_colors(text):
+    for text_color in (TEXT_COLOR_RED, TEXT_COLOR_GREEN, TEXT_COLOR_DEFAULT):
+        text = text.replace(text_color, "")
+    return text
+
+
+# This function returns the final contents of the registers: a hex string per register, None if uninitialized.
+def get_register_result_dict(machine):
+    return {register_name: format(register.value, "06X") if register.is_initialized else None
+            for register_name, register in machine.register_dict.items()}
+
+
+# This function returns the result of a job that did not run (see RESULT).
+def create_empty_result_dict(program_file_path, exit_reason, messages=""):
+    return {"program": program_file_path, "exit_reason": exit_reason, "steps": 0, "elapsed_seconds": 0.0,
+            "input_bytes": 0, "output_bytes": 0, "output": "", "registers": None, "readiness": None,
+            "messages": messages}
+
+
+# This function returns the fault message of an error the simulator did not expect.
+def get_unexpected_fault_message(ex):
+    return "UNEXPECTED FAULT: Halting program execution\n" + type(ex).__name__ + ": " + str(ex) + "\n"
+
+
+# This function runs one object code file on a new machine and returns its result (see RESULT).
+# It runs in a worker process, so it takes and returns only plain values.
+def run_batch_job(program_file_path, maximum_number_of_steps=None, time_limit_seconds=None, input_file_path=None,
+                  record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE,
+                  readiness_model_name=READINESS_MODEL_RANDOM, seed=None,
+                  ready_probability=DEFAULT_READY_PROBABILITY, latency=DEFAULT_LATENCY,
+                  use_block_compiler=True, is_fast_forwarding_polling_loops=True):
+    result_dict = create_empty_result_dict(program_file_path, EXIT_REASON_LOAD_ERROR)
+    message_writer = io.StringIO()
+    input_source = None
+
+    with contextlib.redirect_stdout(message_writer):
+        try:
+            if input_file_path is None:
+                input_source = SICBufferSource(b"", record_separator_byte_value)
+            else:
+                input_source = SICFileSource(input_file_path, record_separator_byte_value)
+
+            machine = SICMachine(SICInputDeviceF1(input_source,
+                                                  create_readiness_model(readiness_model_name, seed,
+                                                                         ready_probability, latency)),
+                                 SICOutputDevice05(SICBytearraySink(),
+                                                   create_readiness_model(readiness_model_name, seed,
+                                                                          ready_probability, latency)))
+
+            machine.load_program_image(load_program_image(program_file_path))
+        except (SICObjectCodeParserError, SICProgramImageError, SICMemoryModelError, SICRegisterContentsError,
+                SICDeviceReadinessError, SICInputDeviceF1Error, OSError) as ex:
+            if input_source is not None:
+                input_source.close()
+            print_error(str(ex))
+            result_dict["messages"] = remove_text_colors(message_writer.getvalue())
+            return result_dict
+
+        number_of_steps = 0
+        continue_execution = True
+        exit_reason = EXIT_REASON_STEP_BUDGET_EXHAUSTED
+        is_unexpected_fault = False
+        start_time = time.perf_counter()
+
+        try:
+            while continue_execution:
+                if maximum_number_of_steps is not None and number_of_steps >= maximum_number_of_steps:
+                    exit_reason = EXIT_REASON_STEP_BUDGET_EXHAUSTED
+                    break
+                if time_limit_seconds is not None and time.perf_counter() - start_time >= time_limit_seconds:
+                    exit_reason = EXIT_REASON_TIME_LIMIT_EXCEEDED
+                    break
+
+                slice_number_of_steps = STEPS_PER_TIME_LIMIT_CHECK
+                if maximum_number_of_steps is not None:
+                    slice_number_of_steps = min(slice_number_of_steps, maximum_number_of_steps - number_of_steps)
+
+                continue_execution, slice_number_of_steps = machine.run_steps(slice_number_of_steps,
+                                                                              use_block_compiler,
+                                                                              is_fast_forwarding_polling_loops)
+                number_of_steps += slice_number_of_steps
+        except Exception as ex:
+            # An error the simulator did not expect faults this job only, the rest of the batch runs on
+            print_error(get_unexpected_fault_message(ex))
+            is_unexpected_fault = True
+        finally:
+            input_source.close()
+
+        if is_unexpected_fault:
+            exit_reason = EXIT_REASON_FAULT
+        elif not continue_execution:
+            exit_reason = EXIT_REASON_NORMAL if machine.test_for_normal_termination() else EXIT_REASON_FAULT
+
+    output_bytearray = machine.output_device_05.sink.output_bytearray
+    result_dict.update({"exit_reason": exit_reason,
+                        "steps": number_of_steps,
+                        "elapsed_seconds": round(time.perf_counter() - start_time, 6),
+                        "input_bytes": machine.input_device_F1.bytes_read,
+                        "output_bytes": len(output_bytearray),
+                        "output": output_bytearray.decode("latin-1"),
+                        "registers": get_register_result_dict(machine),
+                        "readiness": machine.input_device_F1.readiness_model.get_description(),
+                        "messages": remove_text_colors(message_writer.getvalue())})
+    return result_dict
+
+
+# This function runs every program in program_file_path_list across number_of_workers worker processes
+# and writes each result as a line of JSON to results_file_path (or the terminal) as soon as it is done.
+# Every job gets the same readiness settings. A random readiness model without a seed draws one seed for the batch.
+# It returns the exit status: EXIT_STATUS_NORMAL if every program terminated normally, EXIT_STATUS_FAULT otherwise.
+def run_batch(program_file_path_list, number_of_workers=None, maximum_number_of_steps=None, time_limit_seconds=None,
+              results_file_path=None, input_file_path=None,
+              record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE,
+              readiness_model_name=READINESS_MODEL_RANDOM, seed=None, ready_probability=DEFAULT_READY_PROBABILITY,
+              latency=DEFAULT_LATENCY, use_block_compiler=True, is_fast_forwarding_polling_loops=True):
+    if number_of_workers is not None and number_of_workers < 1:
+        raise SICBatchRunnerError("The number of workers must be at least 1")
+
+    if readiness_model_name == READINESS_MODEL_RANDOM and seed is None:
+        seed = draw_seed()
+
+    exit_status = EXIT_STATUS_NORMAL
+
+    with contextlib.ExitStack() as exit_stack:
+        if results_file_path is None:
+            results_stream = sys.stdout
+        else:
+            results_stream = exit_stack.enter_context(open(results_file_path, "wt"))
+
+        executor = exit_stack.enter_context(concurrent.futures.ProcessPoolExecutor(number_of_workers))
+        future_dict = {executor.submit(run_batch_job, program_file_path, maximum_number_of_steps,
+                                       time_limit_seconds, input_file_path, record_separator_byte_value,
+                                       readiness_model_name, seed, ready_probability, latency,
+                                       use_block_compiler, is_fast_forwarding_polling_loops): program_file_path
+                       for program_file_path in program_file_path_list}
+
+        for future in concurrent.futures.as_completed(future_dict):
+            # A job that failed outside of its run (or whose worker process died) still gets its result line
+            try:
+                result_dict = future.result()
+            except Exception as ex:
+                result_dict = create_empty_result_dict(future_dict[future], EXIT_REASON_FAULT,
+                                                       get_unexpected_fault_message(ex))
+            if result_dict["exit_reason"] != EXIT_REASON_NORMAL:
+                exit_status = EXIT_STATUS_FAULT
+
+            results_stream.write(json.dumps(result_dict) + "\n")
+            results_stream.flush()
+
+    return exit_status
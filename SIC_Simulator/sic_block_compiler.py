@@ -0,0 +1,480 @@
+from SIC_Simulator.sic_memory_model import SICMemoryModelError, SICMemoryModel
+from SIC_Simulator.sic_operation_executor import execute_operation, decode_instruction, fast_forward_polling_loop, \
+    execute_add, execute_and, execute_comp, execute_div, execute_j, execute_jeq, execute_jgt, execute_jlt, \
+    execute_jsub, execute_lda, execute_ldch, execute_ldl, execute_ldx, execute_mul, execute_or, execute_rsub, \
+    execute_sta, execute_stch, execute_stl, execute_stsw, execute_stx, execute_sub, execute_tix, execute_tixw
+from SIC_Simulator.sic_register_model import REGISTER_A, REGISTER_X, REGISTER_L, REGISTER_PC, REGISTER_SW
+from SIC_Utilities.sic_constants import BYTES_IN_WORD, MAXIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_INTEGER, \
+    MINIMUM_INTEGER, MAXIMUM_WORD_DEC, SW_LESS_THAN_DEC, SW_EQUAL_DEC, SW_GREATER_THAN_DEC
+
+# A basic block is a run of instructions that ends at a branch (J, JEQ, JGT, JLT, JSUB, RSUB).
+# A block also ends in front of an instruction that is left to the interpreter:
+# device instructions (RD, WD, TD), XOS, unsupported opcodes and instructions that would fault.
+# Each block is compiled into a single Python function from generated source and cached by start address.
+# Registers are kept in locals while the block runs and are written back when the block exits.
+# A block that branches back to its own start loops inside the compiled function.
+# Compiling an instruction costs about as much as interpreting it a hundred times, so code that runs only a few
+# times is never compiled: the interpreter executes the first visits of a block and it is compiled on the next one.
+MAXIMUM_INSTRUCTIONS_PER_BLOCK = 64
+NUMBER_OF_INTERPRETED_BLOCK_VISITS = 100
+DEFAULT_MAXIMUM_NUMBER_OF_STEPS = 1000000
+
+DECODED_INSTRUCTION_OVERLAP = SICMemoryModel.DECODED_INSTRUCTION_OVERLAP
+
+# Local variable names used for the registers inside a compiled block
+REGISTER_LOCAL_DICT = {REGISTER_A: "a", REGISTER_X: "x", REGISTER_L: "l", REGISTER_SW: "sw"}
+
+# Registers read and written by each operation: (read registers, written registers)
+# Indexed addressing also reads register X.
+REGISTER_USAGE_DICT = {execute_add: ("A", "A"), execute_and: ("A", "A"), execute_comp: ("A", "SW"),
+                       execute_div: ("A", "A"), execute_j: ("", ""), execute_jeq: ("SW", ""),
+                       execute_jgt: ("SW", ""), execute_jlt: ("SW", ""), execute_jsub: ("", "L"),
+                       execute_lda: ("", "A"), execute_ldch: ("A", "A"), execute_ldl: ("", "L"),
+                       execute_ldx: ("", "X"), execute_mul: ("A", "A"), execute_or: ("A", "A"),
+                       execute_rsub: ("L", ""), execute_sta: ("A", ""), execute_stch: ("A", ""),
+                       execute_stl: ("L", ""), execute_stsw: ("SW", ""), execute_stx: ("X", ""),
+                       execute_sub: ("A", "A"), execute_tix: ("X", "X SW"), execute_tixw: ("X", "X SW")}
+
+BRANCH_HANDLER_SET = {execute_j, execute_jeq, execute_jgt, execute_jlt, execute_jsub, execute_rsub}
+
+# Status word value tested by each conditional jump
+JUMP_CONDITION_DICT = {execute_jeq: SW_EQUAL_DEC, execute_jgt: SW_GREATER_THAN_DEC, execute_jlt: SW_LESS_THAN_DEC}
+
+# The operator and operand register used by the arithmetic and logic operations
+ARITHMETIC_OPERATOR_DICT = {execute_add: "+", execute_sub: "-", execute_mul: "*", execute_div: "//"}
+LOGIC_OPERATOR_DICT = {execute_and: "&", execute_or: "|"}
+LOAD_REGISTER_DICT = {execute_lda: "a", execute_ldl: "l", execute_ldx: "x"}
+STORE_REGISTER_DICT = {execute_sta: "a", execute_stl: "l", execute_stsw: "sw", execute_stx: "x"}
+
+
+class SICCompiledBlock:
+    def __init__(self, start_address_dec, end_address_dec, number_of_instructions, block_function, block_source):
+        # Memory covered by the block: start_address_dec up to (not including) end_address_dec
+        self.start_address_dec = start_address_dec
+        self.end_address_dec = end_address_dec
+        self.number_of_instructions = number_of_instructions
+        # block_function(step_budget) returns (number_of_steps, is_complete)
+        self.block_function = block_function
+        self.block_source = block_source
+        self.is_valid = True
+
+
+# This function reads instructions from a start address up to the end of the basic block.
+# It returns a list of decoded instruction tuples: (instruction address, operation handler, base address, indexed flag)
+# and the end address of the memory that was examined.
+def find_basic_block(MEMORY_MODEL, start_address_dec):
+    instruction_list = []
+    instruction_address_dec = start_address_dec
+    end_address_dec = start_address_dec
+
+    while len(instruction_list) < MAXIMUM_INSTRUCTIONS_PER_BLOCK:
+        try:
+            operation_handler, base_address_dec, is_indexed_addressing = decode_instruction(MEMORY_MODEL,
+                                                                                            instruction_address_dec)
+        except SICMemoryModelError:
+            break
+
+        end_address_dec = instruction_address_dec + BYTES_IN_WORD
+
+        # Leave device instructions, XOS, unsupported opcodes and program counter faults to the interpreter
+        if operation_handler not in REGISTER_USAGE_DICT or end_address_dec > MAXIMUM_MEMORY_ADDRESS_DEC:
+            break
+
+        # Leave memory faults on direct addresses to the interpreter
+        if not is_indexed_addressing and operation_handler not in BRANCH_HANDLER_SET:
+            if operation_handler in (execute_ldch, execute_stch):
+                last_byte_address_dec = base_address_dec
+            else:
+                last_byte_address_dec = base_address_dec + BYTES_IN_WORD - 1
+            if last_byte_address_dec > MAXIMUM_MEMORY_ADDRESS_DEC:
+                break
+
+        instruction_list.append((instruction_address_dec, operation_handler, base_address_dec, is_indexed_addressing))
+
+        if operation_handler in BRANCH_HANDLER_SET:
+            break
+
+        instruction_address_dec = end_address_dec
+
+    return instruction_list, end_address_dec
+
+
+# This class builds the Python source of a compiled block, one line at a time.
+class SICBlockSourceBuilder:
+    def __init__(self, instruction_list, is_loop):
+        self.instruction_list = instruction_list
+        self.is_loop = is_loop
+        self.line_list = []
+        self.indent = 1
+
+        # Registers touched (read or written) before each instruction, and by the whole block
+        self.touched_register_list = []
+        touched_register_set = set()
+        modified_register_set = set()
+        for instruction_address_dec, operation_handler, base_address_dec, is_indexed_addressing in instruction_list:
+            self.touched_register_list.append(set(touched_register_set))
+            read_registers, written_registers = REGISTER_USAGE_DICT[operation_handler]
+            touched_register_set.update(read_registers.split())
+            touched_register_set.update(written_registers.split())
+            modified_register_set.update(written_registers.split())
+            if is_indexed_addressing:
+                touched_register_set.add(REGISTER_X)
+        self.touched_register_list.append(set(touched_register_set))
+        self.all_touched_register_set = touched_register_set
+        self.modified_register_set = modified_register_set
+
+    def add_line(self, line):
+        self.line_list.append("    " * self.indent + line)
+
+    # This function writes back the registers and returns from the block.
+    # number_of_completed_instructions counts the instructions of the current pass that have been executed.
+    def add_exit(self, pc_expression, number_of_completed_instructions, is_complete):
+        for register_name in sorted(self.modified_register_set):
+            self.add_line(register_name + ".value = " + REGISTER_LOCAL_DICT[register_name])
+
+        # A register counts as initialized once an executed instruction has touched it
+        touched_register_set = self.touched_register_list[number_of_completed_instructions]
+        for register_name in sorted(touched_register_set):
+            self.add_line(register_name + ".is_initialized = True")
+        if self.is_loop and self.all_touched_register_set - touched_register_set:
+            self.add_line("if steps:")
+            for register_name in sorted(self.all_touched_register_set - touched_register_set):
+                self.add_line("    " + register_name + ".is_initialized = True")
+
+        self.add_line("PC.value = " + pc_expression)
+        self.add_line("return steps + " + str(number_of_completed_instructions) + ", " + str(is_complete))
+
+    # This function exits in front of an instruction, so the interpreter can execute it (and report any fault).
+    def add_exit_before(self, condition, instruction_index):
+        self.add_line("if " + condition + ":")
+        self.indent += 1
+        self.add_exit(str(self.instruction_list[instruction_index][0]), instruction_index, False)
+        self.indent -= 1
+
+    # This function adds the memory address of an instruction as the expression m.
+    # Indexed addresses are range checked at run time, direct addresses were checked by find_basic_block.
+    def add_memory_address(self, instruction_index, number_of_bytes):
+        instruction_address_dec, operation_handler, base_address_dec, is_indexed_addressing = \
+            self.instruction_list[instruction_index]
+        if is_indexed_addressing:
+            self.add_line("m = " + str(base_address_dec) + " + x")
+            self.add_exit_before("m > " + str(MAXIMUM_MEMORY_ADDRESS_DEC - number_of_bytes + 1), instruction_index)
+            return "m"
+        else:
+            return str(base_address_dec)
+
+    def add_word_read(self, instruction_index, target):
+        m = self.add_memory_address(instruction_index, BYTES_IN_WORD)
+        if m == "m":
+            self.add_line(target + " = (mem[m] << 16) | (mem[m + 1] << 8) | mem[m + 2]")
+        else:
+            m_dec = int(m)
+            self.add_line(target + " = (mem[" + str(m_dec) + "] << 16) | (mem[" + str(m_dec + 1) + "] << 8) | mem["
+                          + str(m_dec + 2) + "]")
+
+    # Words with the sign-bit set are read as 2's complement negative values
+    def add_signed(self, target, word_expression):
+        self.add_line(target + " = " + word_expression + " - " + str(MAXIMUM_WORD_DEC + 1) + " if " + word_expression
+                      + " > " + str(MAXIMUM_INTEGER) + " else " + word_expression)
+
+    def add_compare(self, left_expression, right_expression):
+        self.add_line("sw = " + str(SW_LESS_THAN_DEC) + " if " + left_expression + " < " + right_expression + " else ("
+                      + str(SW_EQUAL_DEC) + " if " + left_expression + " == " + right_expression + " else "
+                      + str(SW_GREATER_THAN_DEC) + ")")
+
+    def add_instruction(self, instruction_index):
+        instruction_address_dec, operation_handler, base_address_dec, is_indexed_addressing = \
+            self.instruction_list[instruction_index]
+        next_address_dec = instruction_address_dec + BYTES_IN_WORD
+
+        if operation_handler in ARITHMETIC_OPERATOR_DICT:
+            # A <- (A) op (m..m+2)
+            self.add_word_read(instruction_index, "w")
+            self.add_signed("w", "w")
+            self.add_signed("r", "a")
+            if operation_handler is execute_div:
+                self.add_exit_before("w == 0", instruction_index)
+            self.add_line("r = r " + ARITHMETIC_OPERATOR_DICT[operation_handler] + " w")
+            self.add_exit_before("not " + str(MINIMUM_INTEGER) + " <= r <= " + str(MAXIMUM_INTEGER), instruction_index)
+            self.add_line("a = r & " + str(MAXIMUM_WORD_DEC))
+        elif operation_handler in LOGIC_OPERATOR_DICT:
+            # A <- (A) op (m..m+2)
+            self.add_word_read(instruction_index, "w")
+            self.add_line("a = a " + LOGIC_OPERATOR_DICT[operation_handler] + " w")
+        elif operation_handler is execute_comp:
+            # (A) : (m..m+2)
+            self.add_word_read(instruction_index, "w")
+            self.add_signed("w", "w")
+            self.add_compare("a", "w")
+        elif operation_handler in LOAD_REGISTER_DICT:
+            # r <- (m..m+2)
+            self.add_word_read(instruction_index, LOAD_REGISTER_DICT[operation_handler])
+        elif operation_handler is execute_ldch:
+            # A[rightmost byte] <- (m)
+            m = self.add_memory_address(instruction_index, 1)
+            self.add_line("a = (a & 16776960) | mem[" + m + "]")
+        elif operation_handler in STORE_REGISTER_DICT:
+            # m..m+2 <- (r)
+            m = self.add_memory_address(instruction_index, BYTES_IN_WORD)
+            register_local = STORE_REGISTER_DICT[operation_handler]
+            if m == "m":
+                self.add_line("mem[m] = " + register_local + " >> 16")
+                self.add_line("mem[m + 1] = (" + register_local + " >> 8) & 255")
+                self.add_line("mem[m + 2] = " + register_local + " & 255")
+            else:
+                m_dec = int(m)
+                self.add_line("mem[" + str(m_dec) + "] = " + register_local + " >> 16")
+                self.add_line("mem[" + str(m_dec + 1) + "] = (" + register_local + " >> 8) & 255")
+                self.add_line("mem[" + str(m_dec + 2) + "] = " + register_local + " & 255")
+            self.add_store_bookkeeping(instruction_index, m, BYTES_IN_WORD)
+        elif operation_handler is execute_stch:
+            # m <- (A)[rightmost byte]
+            m = self.add_memory_address(instruction_index, 1)
+            self.add_line("mem[" + m + "] = a & 255")
+            self.add_store_bookkeeping(instruction_index, m, 1)
+        elif operation_handler in (execute_tix, execute_tixw):
+            # X <- (X) + 1; (X):(m..m+2)
+            # X <- (X) + 3; (X):((m..m+2) * 3)
+            if operation_handler is execute_tix:
+                self.add_line("r = x + 1")
+            else:
+                self.add_line("r = x + 3")
+            self.add_exit_before("r > " + str(MAXIMUM_WORD_DEC), instruction_index)
+            # The memory address is built from X before it is incremented
+            self.add_word_read(instruction_index, "w")
+            self.add_signed("w", "w")
+            if operation_handler is execute_tixw:
+                self.add_line("w = w * 3")
+            self.add_line("x = r")
+            self.add_compare("x", "w")
+        elif operation_handler is execute_jsub:
+            # L <- (PC); PC <- m
+            self.add_jump_target(instruction_index)
+            self.add_line("l = " + str(next_address_dec))
+            self.add_branch_exit(instruction_index, "t")
+        elif operation_handler is execute_j:
+            # PC <- m
+            self.add_jump_target(instruction_index)
+            self.add_branch_exit(instruction_index, "t")
+        elif operation_handler in JUMP_CONDITION_DICT:
+            # PC <- m if CC set to condition
+            self.add_line("if sw == " + str(JUMP_CONDITION_DICT[operation_handler]) + ":")
+            self.indent += 1
+            self.add_jump_target(instruction_index)
+            self.add_branch_exit(instruction_index, "t")
+            self.indent -= 1
+            self.add_branch_exit(instruction_index, str(next_address_dec))
+        elif operation_handler is execute_rsub:
+            # PC <- (L)
+            self.add_exit_before("l > " + str(MAXIMUM_MEMORY_ADDRESS_DEC), instruction_index)
+            self.add_branch_exit(instruction_index, "l")
+
+    # This function adds the jump target of a branch as the local t.
+    def add_jump_target(self, instruction_index):
+        instruction_address_dec, operation_handler, base_address_dec, is_indexed_addressing = \
+            self.instruction_list[instruction_index]
+        if is_indexed_addressing:
+            self.add_line("t = " + str(base_address_dec) + " + x")
+            self.add_exit_before("t > " + str(MAXIMUM_WORD_DEC), instruction_index)
+        else:
+            self.add_line("t = " + str(base_address_dec))
+
+    # This function leaves the block at the branch that ends it.
+    # A branch back to the start of a looping block runs the next pass if the step budget allows.
+    def add_branch_exit(self, instruction_index, pc_expression):
+        number_of_instructions = len(self.instruction_list)
+        if self.is_loop:
+            self.add_line("steps += " + str(number_of_instructions))
+            if pc_expression == "t":
+                self.add_line("if t == " + str(self.instruction_list[0][0]) + " and steps + "
+                              + str(number_of_instructions) + " <= step_budget:")
+                self.add_line("    continue")
+            self.add_exit(pc_expression, 0, True)
+        else:
+            self.add_exit(pc_expression, number_of_instructions, True)
+
+    # This function does the bookkeeping of MEMORY_MODEL.write_word/write_byte for a store at the expression m:
+    # the initialized bitmap, the decoded instruction cache and the compiled block map.
+    # A store that writes over a compiled block invalidates it. If the running block was invalidated,
+    # it leaves after the store so the rest of the code is decoded again.
+    def add_store_bookkeeping(self, instruction_index, m, number_of_bytes):
+        instruction_address_dec, operation_handler, base_address_dec, is_indexed_addressing = \
+            self.instruction_list[instruction_index]
+
+        if m == "m":
+            self.add_line("b = " + str((1 << number_of_bytes) - 1) + " << (m & 7)")
+            self.add_line("bitmap[m >> 3] |= b & 255")
+            if number_of_bytes > 1:
+                self.add_line("if b > 255:")
+                self.add_line("    bitmap[(m >> 3) + 1] |= b >> 8")
+        else:
+            m_dec = int(m)
+            initialized_bits = ((1 << number_of_bytes) - 1) << (m_dec & 7)
+            self.add_line("bitmap[" + str(m_dec >> 3) + "] |= " + str(initialized_bits & 255))
+            if initialized_bits > 255:
+                self.add_line("bitmap[" + str((m_dec >> 3) + 1) + "] |= " + str(initialized_bits >> 8))
+
+        # Decoded instructions that start up to two bytes before the store overlap it
+        if base_address_dec >= DECODED_INSTRUCTION_OVERLAP:
+            number_of_cache_entries = DECODED_INSTRUCTION_OVERLAP + number_of_bytes
+            if m == "m":
+                self.add_line("decoded_instruction_cache[m - " + str(DECODED_INSTRUCTION_OVERLAP) + ":m + "
+                              + str(number_of_bytes) + "] = EMPTY_CACHE_ENTRIES_" + str(number_of_cache_entries))
+            else:
+                self.add_line("decoded_instruction_cache[" + str(int(m) - DECODED_INSTRUCTION_OVERLAP) + ":"
+                              + str(int(m) + number_of_bytes) + "] = EMPTY_CACHE_ENTRIES_"
+                              + str(number_of_cache_entries))
+        else:
+            self.add_line("invalidate_decoded_instructions(" + m + ", " + str(number_of_bytes) + ")")
+
+        # Compiled blocks are never shorter than a word, so checking the first and last byte is enough
+        if m == "m":
+            last_byte_expression = "m + " + str(number_of_bytes - 1)
+        else:
+            last_byte_expression = str(int(m) + number_of_bytes - 1)
+        if number_of_bytes > 1:
+            self.add_line("if code_map[" + m + "] or code_map[" + last_byte_expression + "]:")
+        else:
+            self.add_line("if code_map[" + m + "]:")
+        self.indent += 1
+        self.add_line("invalidate_compiled_blocks(" + m + ", " + str(number_of_bytes) + ")")
+        self.add_line("if not block.is_valid:")
+        self.indent += 1
+        self.add_exit(str(instruction_address_dec + BYTES_IN_WORD), instruction_index + 1, False)
+        self.indent -= 2
+
+    def build_source(self, function_name):
+        if self.is_loop:
+            self.add_line("while True:")
+            self.indent += 1
+
+        for instruction_index in range(len(self.instruction_list)):
+            self.add_line("# " + format(self.instruction_list[instruction_index][0], "04X") + " "
+                          + self.instruction_list[instruction_index][1].__name__[len("execute_"):].upper())
+            self.add_instruction(instruction_index)
+
+        # A block that does not end at a branch falls through to the next instruction
+        if self.instruction_list[-1][1] not in BRANCH_HANDLER_SET:
+            self.add_exit(str(self.instruction_list[-1][0] + BYTES_IN_WORD), len(self.instruction_list), True)
+
+        header_line_list = ["def " + function_name + "(step_budget):", "    steps = 0"]
+        for register_name in sorted(self.all_touched_register_set):
+            header_line_list.append("    " + REGISTER_LOCAL_DICT[register_name] + " = " + register_name + ".value")
+
+        return "\n".join(header_line_list + self.line_list) + "\n"
+
+
+# This function compiles the basic block that starts at an address.
+# It returns None if the address is outside of memory.
+def compile_block(REGISTER_DICT, MEMORY_MODEL, start_address_dec):
+    if not 0 <= start_address_dec <= MAXIMUM_MEMORY_ADDRESS_DEC:
+        return None
+
+    instruction_list, end_address_dec = find_basic_block(MEMORY_MODEL, start_address_dec)
+
+    if not instruction_list:
+        # Nothing to compile, the interpreter executes the first instruction
+        compiled_block = SICCompiledBlock(start_address_dec, end_address_dec, 0, None, "")
+        MEMORY_MODEL.add_compiled_block(compiled_block)
+        return compiled_block
+
+    # The block loops inside the compiled function when its branch can jump back to the start
+    last_instruction = instruction_list[-1]
+    is_loop = (last_instruction[1] in (execute_j, execute_jeq, execute_jgt, execute_jlt) and
+               not last_instruction[3] and last_instruction[2] == start_address_dec)
+
+    function_name = "compiled_block_" + format(start_address_dec, "04X")
+    block_source = SICBlockSourceBuilder(instruction_list, is_loop).build_source(function_name)
+
+    block_namespace = {"mem": MEMORY_MODEL.memory_bytearray,
+                       "bitmap": MEMORY_MODEL.initialized_bitmap,
+                       "decoded_instruction_cache": MEMORY_MODEL.decoded_instruction_cache,
+                       "code_map": MEMORY_MODEL.compiled_code_map,
+                       "invalidate_decoded_instructions": MEMORY_MODEL.invalidate_decoded_instructions,
+                       "invalidate_compiled_blocks": MEMORY_MODEL.invalidate_compiled_blocks,
+                       "EMPTY_CACHE_ENTRIES_3": [None] * (DECODED_INSTRUCTION_OVERLAP + 1),
+                       "EMPTY_CACHE_ENTRIES_5": [None] * (DECODED_INSTRUCTION_OVERLAP + BYTES_IN_WORD),
+                       "A": REGISTER_DICT[REGISTER_A],
+                       "X": REGISTER_DICT[REGISTER_X],
+                       "L": REGISTER_DICT[REGISTER_L],
+                       "SW": REGISTER_DICT[REGISTER_SW],
+                       "PC": REGISTER_DICT[REGISTER_PC]}
+    exec(compile(block_source, "<" + function_name + ">", "exec"), block_namespace)
+
+    compiled_block = SICCompiledBlock(start_address_dec, end_address_dec, len(instruction_list),
+                                      block_namespace[function_name], block_source)
+    block_namespace["block"] = compiled_block
+    MEMORY_MODEL.add_compiled_block(compiled_block)
+
+    return compiled_block
+
+
+# This function executes the instructions from the program counter up to the next branch or jump with
+# execute_operation, for a block that has not been visited often enough to be compiled.
+# Like a compiled block it stops after MAXIMUM_INSTRUCTIONS_PER_BLOCK instructions, so the next block of a long run
+# of straight code is visited (and counted) too. It also stops at the start of a compiled block
+# or when maximum_number_of_steps have been executed.
+# It returns continue_execution and the number of instructions (steps) executed.
+def interpret_block(REGISTER_DICT, MEMORY_MODEL, maximum_number_of_steps):
+    register_pc = REGISTER_DICT[REGISTER_PC]
+    compiled_block_dict = MEMORY_MODEL.compiled_block_dict
+    pc_register_dec_value = register_pc.value
+    number_of_steps = 0
+    maximum_number_of_steps = min(maximum_number_of_steps, MAXIMUM_INSTRUCTIONS_PER_BLOCK)
+
+    while number_of_steps < maximum_number_of_steps:
+        continue_execution = execute_operation(REGISTER_DICT, MEMORY_MODEL)
+        number_of_steps += 1
+        if not continue_execution:
+            return False, number_of_steps
+
+        # A taken branch or jump ends the block
+        if register_pc.value != pc_register_dec_value + BYTES_IN_WORD:
+            break
+        pc_register_dec_value = register_pc.value
+        if pc_register_dec_value in compiled_block_dict:
+            break
+
+    return True, number_of_steps
+
+
+# This function executes the compiled block at the program counter, compiling it first if necessary.
+# A block is interpreted on its first NUMBER_OF_INTERPRETED_BLOCK_VISITS visits and compiled on the next one.
+# Anything the block cannot execute is left to execute_operation, one instruction at a time.
+# A device polling loop (TD, JEQ) is fast-forwarded unless is_fast_forwarding_polling_loops is False.
+# It returns continue_execution and the number of instructions (steps) executed.
+def execute_block(REGISTER_DICT, MEMORY_MODEL, maximum_number_of_steps=DEFAULT_MAXIMUM_NUMBER_OF_STEPS,
+                  is_fast_forwarding_polling_loops=True):
+    pc_register_dec_value = REGISTER_DICT[REGISTER_PC].get_value()
+
+    compiled_block = MEMORY_MODEL.compiled_block_dict.get(pc_register_dec_value)
+    if compiled_block is None:
+        number_of_visits = MEMORY_MODEL.block_visit_count_dict.get(pc_register_dec_value, 0)
+        if number_of_visits < NUMBER_OF_INTERPRETED_BLOCK_VISITS:
+            MEMORY_MODEL.block_visit_count_dict[pc_register_dec_value] = number_of_visits + 1
+            if is_fast_forwarding_polling_loops:
+                number_of_steps = fast_forward_polling_loop(REGISTER_DICT, MEMORY_MODEL, maximum_number_of_steps)
+                if number_of_steps:
+                    return True, number_of_steps
+
+            return interpret_block(REGISTER_DICT, MEMORY_MODEL, maximum_number_of_steps)
+
+        compiled_block = compile_block(REGISTER_DICT, MEMORY_MODEL, pc_register_dec_value)
+
+    if (compiled_block is None or compiled_block.number_of_instructions == 0 or
+            compiled_block.number_of_instructions > maximum_number_of_steps):
+        # Device instructions are never compiled, so a polling loop starts at an empty block
+        if is_fast_forwarding_polling_loops:
+            number_of_steps = fast_forward_polling_loop(REGISTER_DICT, MEMORY_MODEL, maximum_number_of_steps)
+            if number_of_steps:
+                return True, number_of_steps
+
+        return execute_operation(REGISTER_DICT, MEMORY_MODEL), 1
+
+    number_of_steps, is_complete = compiled_block.block_function(maximum_number_of_steps)
+
+    # The block stopped in front of an instruction it could not finish, let the interpreter execute it
+    if not is_complete and number_of_steps < maximum_number_of_steps:
+        return execute_operation(REGISTER_DICT, MEMORY_MODEL), number_of_steps + 1
+
+    return True, number_of_steps
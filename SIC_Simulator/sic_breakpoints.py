@@ -0,0 +1,258 @@
+import operator
+import re
+
+from SIC_Simulator.sic_memory_model import SICMemoryModelError
+from SIC_Simulator.sic_operation_executor import ADDRESS_MASK, INDEXED_ADDRESSING_FLAG
+from SIC_Simulator.sic_register_model import REGISTER_X, REGISTER_PC
+from SIC_Utilities.sic_constants import BYTES_IN_MEMORY, BYTES_IN_WORD, OPCODE_TO_HEX_DICT, MAXIMUM_WORD_DEC
+from SIC_Utilities.sic_converter import hex_string_to_dec
+
+# A breakpoint table holds the breakpoints and watchpoints of a run, and a run loop calls test_for_break before
+# every instruction. The cost of the test does not depend on how many breakpoints and watchpoints are set:
+# one byte map over the 32K address space marks the breakpoint addresses, two more mark the bytes watched for
+# reads and for writes, and the memory an instruction reads or writes is found from its opcode and effective address.
+# A run without breakpoints or watchpoints does not test anything (see run_program of sic_runner).
+#
+# A breakpoint stops a run before the instruction at its address, when its condition holds (if it has one).
+# A condition compares a register with a hex value, for example "A = 0", "X >= 1E" or "SW != 3D".
+# A register that was never set does not satisfy any condition.
+# A watchpoint stops a run before an instruction that reads, or writes, any byte of its memory range.
+# RD, WD and TD read the device code byte at their memory address.
+#
+# Locations are given as labels of the assembly listing (see SICAssemblyListingIndex.get_label_address_dict)
+# or as hex memory addresses. A watchpoint on a single location watches the word there.
+BREAK_FLAG = 1
+WATCH_ACCESS_READ = "r"
+WATCH_ACCESS_WRITE = "w"
+WATCH_ACCESS_READ_WRITE = "rw"
+WATCH_ACCESS_LIST = [WATCH_ACCESS_READ, WATCH_ACCESS_WRITE, WATCH_ACCESS_READ_WRITE]
+
+# The memory read or written by each opcode: opcode -> (is_write, number_of_bytes)
+MEMORY_ACCESS_DICT = {}
+for opcode_mnemonic in ["ADD", "AND", "COMP", "DIV", "LDA", "LDL", "LDX", "MUL", "OR", "SUB", "TIX", "TIXB", "TIXW"]:
+    MEMORY_ACCESS_DICT[hex_string_to_dec(OPCODE_TO_HEX_DICT[opcode_mnemonic])] = (False, BYTES_IN_WORD)
+for opcode_mnemonic in ["LDCH", "RD", "TD", "WD"]:
+    MEMORY_ACCESS_DICT[hex_string_to_dec(OPCODE_TO_HEX_DICT[opcode_mnemonic])] = (False, 1)
+for opcode_mnemonic in ["STA", "STL", "STSW", "STX"]:
+    MEMORY_ACCESS_DICT[hex_string_to_dec(OPCODE_TO_HEX_DICT[opcode_mnemonic])] = (True, BYTES_IN_WORD)
+MEMORY_ACCESS_DICT[hex_string_to_dec(OPCODE_TO_HEX_DICT["STCH"])] = (True, 1)
+
+BREAK_CONDITION_OPERATOR_DICT = {"=": operator.eq, "==": operator.eq, "!=": operator.ne, "<": operator.lt,
+                                 "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+BREAK_CONDITION_PATTERN = re.compile(r"\s*(A|X|L|PC|SW)\s*(==|=|!=|<=|>=|<|>)\s*([0-9A-F]{1,6})\s*$", re.IGNORECASE)
+BREAK_CONDITION_KEYWORD = "IF"
+HEX_MEMORY_ADDRESS_PATTERN = re.compile(r"[0-9A-F]{1,4}$", re.IGNORECASE)
+
+
+class SICBreakpointError(Exception):
+    pass
+
+
+class SICBreakpointTable:
+    def __init__(self):
+        self.breakpoint_map = bytearray(BYTES_IN_MEMORY)
+        # address -> condition (register name, operator, value), or None for a breakpoint without condition
+        self.breakpoint_dict = {}
+        self.read_watch_map = bytearray(BYTES_IN_MEMORY)
+        self.write_watch_map = bytearray(BYTES_IN_MEMORY)
+        # (start address, end address (inclusive), access) in the order they were set
+        self.watchpoint_list = []
+        # Why the last run stopped, or None if it did not stop at a breakpoint or watchpoint
+        self.break_message = None
+
+    def is_empty(self):
+        return not self.breakpoint_dict and not self.watchpoint_list
+
+    # A breakpoint set again at the same address replaces the one before.
+    def set_breakpoint(self, memory_address_dec, break_condition=None):
+        if not 0 <= memory_address_dec < BYTES_IN_MEMORY:
+            raise SICBreakpointError("Breakpoint address out of range: " + format(memory_address_dec, "X"))
+
+        self.breakpoint_dict[memory_address_dec] = break_condition
+        self.breakpoint_map[memory_address_dec] = BREAK_FLAG
+
+    def set_watchpoint(self, start_address_dec, end_address_dec, watch_access=WATCH_ACCESS_WRITE):
+        if not 0 <= start_address_dec <= end_address_dec < BYTES_IN_MEMORY:
+            raise SICBreakpointError("Invalid watchpoint range: " + format(start_address_dec, "04X") + "-" +
+                                     format(end_address_dec, "04X"))
+
+        if watch_access not in WATCH_ACCESS_LIST:
+            raise SICBreakpointError("Invalid watchpoint access: " + str(watch_access))
+
+        self.watchpoint_list.append((start_address_dec, end_address_dec, watch_access))
+        self.mark_watchpoint(start_address_dec, end_address_dec, watch_access)
+
+    def mark_watchpoint(self, start_address_dec, end_address_dec, watch_access):
+        range_length = end_address_dec - start_address_dec + 1
+        if WATCH_ACCESS_READ in watch_access:
+            self.read_watch_map[start_address_dec:end_address_dec + 1] = bytes([BREAK_FLAG]) * range_length
+        if WATCH_ACCESS_WRITE in watch_access:
+            self.write_watch_map[start_address_dec:end_address_dec + 1] = bytes([BREAK_FLAG]) * range_length
+
+    # BREAKPOINT LIST
+    # The breakpoints (by address) and then the watchpoints (in the order they were set) are numbered from 1.
+    def get_description_list(self):
+        description_list = []
+
+        for memory_address_dec in sorted(self.breakpoint_dict):
+            description = "BREAK " + format(memory_address_dec, "04X")
+            break_condition = self.breakpoint_dict[memory_address_dec]
+            if break_condition is not None:
+                description += " IF " + get_break_condition_string(break_condition)
+            description_list.append(description)
+
+        for start_address_dec, end_address_dec, watch_access in self.watchpoint_list:
+            description_list.append("WATCH " + format(start_address_dec, "04X") + "-" +
+                                    format(end_address_dec, "04X") + " " + watch_access.upper())
+
+        return description_list
+
+    # This function deletes a breakpoint or watchpoint by its number in get_description_list.
+    def delete(self, number):
+        breakpoint_address_list = sorted(self.breakpoint_dict)
+
+        if 1 <= number <= len(breakpoint_address_list):
+            memory_address_dec = breakpoint_address_list[number - 1]
+            del self.breakpoint_dict[memory_address_dec]
+            self.breakpoint_map[memory_address_dec] = 0
+        elif 1 <= number - len(breakpoint_address_list) <= len(self.watchpoint_list):
+            del self.watchpoint_list[number - len(breakpoint_address_list) - 1]
+
+            # Watched ranges can overlap, so the watch maps are marked again from the watchpoints left
+            self.read_watch_map[:] = bytes(BYTES_IN_MEMORY)
+            self.write_watch_map[:] = bytes(BYTES_IN_MEMORY)
+            for start_address_dec, end_address_dec, watch_access in self.watchpoint_list:
+                self.mark_watchpoint(start_address_dec, end_address_dec, watch_access)
+        else:
+            raise SICBreakpointError("There is no breakpoint or watchpoint " + str(number))
+
+    def clear(self):
+        self.breakpoint_map[:] = bytes(BYTES_IN_MEMORY)
+        self.breakpoint_dict = {}
+        self.read_watch_map[:] = bytes(BYTES_IN_MEMORY)
+        self.write_watch_map[:] = bytes(BYTES_IN_MEMORY)
+        self.watchpoint_list = []
+        self.break_message = None
+
+    # This function returns True, and sets break_message, if the instruction at PC hits a breakpoint or watchpoint.
+    # An instruction that can not be read hits no watchpoint, executing it faults.
+    def test_for_break(self, REGISTER_DICT, MEMORY_MODEL):
+        pc_register_dec_value = REGISTER_DICT[REGISTER_PC].value
+        if pc_register_dec_value >= BYTES_IN_MEMORY:
+            return False
+
+        if self.breakpoint_map[pc_register_dec_value]:
+            break_condition = self.breakpoint_dict[pc_register_dec_value]
+            if break_condition is None:
+                self.break_message = "BREAKPOINT AT " + format(pc_register_dec_value, "04X")
+                return True
+            if test_break_condition(break_condition, REGISTER_DICT):
+                self.break_message = ("BREAKPOINT AT " + format(pc_register_dec_value, "04X") + " IF " +
+                                      get_break_condition_string(break_condition))
+                return True
+
+        if not self.watchpoint_list:
+            return False
+
+        try:
+            instruction_word_value = MEMORY_MODEL.read_word(pc_register_dec_value)
+        except SICMemoryModelError:
+            return False
+
+        memory_access = MEMORY_ACCESS_DICT.get(instruction_word_value >> 16)
+        if memory_access is None:
+            return False
+
+        is_write, number_of_bytes = memory_access
+        effective_address_dec_value = instruction_word_value & ADDRESS_MASK
+        if instruction_word_value & INDEXED_ADDRESSING_FLAG:
+            effective_address_dec_value += REGISTER_DICT[REGISTER_X].value
+
+        watch_map = self.write_watch_map if is_write else self.read_watch_map
+        if watch_map.find(BREAK_FLAG, effective_address_dec_value,
+                          effective_address_dec_value + number_of_bytes) == -1:
+            return False
+
+        self.break_message = ("WATCHPOINT AT " + format(pc_register_dec_value, "04X") + ": " +
+                              ("WRITE " if is_write else "READ ") + format(effective_address_dec_value, "04X"))
+        return True
+
+
+# BREAK CONDITIONS
+def test_break_condition(break_condition, REGISTER_DICT):
+    register_name, condition_operator, value = break_condition
+    register = REGISTER_DICT[register_name]
+    return register.is_initialized and BREAK_CONDITION_OPERATOR_DICT[condition_operator](register.value, value)
+
+
+def get_break_condition_string(break_condition):
+    register_name, condition_operator, value = break_condition
+    return register_name + " " + condition_operator + " " + format(value, "X")
+
+
+# This function parses a break condition, a register compared with a hex value: "X >= 1E".
+def parse_break_condition(break_condition_string):
+    break_condition_match = BREAK_CONDITION_PATTERN.match(break_condition_string)
+    if break_condition_match is None:
+        raise SICBreakpointError("Invalid break condition: " + break_condition_string.strip())
+
+    register_name, condition_operator, value_hex_string = break_condition_match.groups()
+    value = hex_string_to_dec(value_hex_string.upper())
+    if value > MAXIMUM_WORD_DEC:
+        raise SICBreakpointError("Invalid break condition: " + break_condition_string.strip())
+
+    return register_name.upper(), condition_operator, value
+
+
+# LOCATIONS
+# This function returns the memory address of a label of the label table, or of a hex memory address.
+# A label is looked up first, so a label that reads as hex (for example ADD) still finds its line.
+def parse_memory_location(location_string, label_address_dict=None):
+    location_string = location_string.strip()
+
+    if label_address_dict is not None and location_string in label_address_dict:
+        return label_address_dict[location_string]
+
+    if HEX_MEMORY_ADDRESS_PATTERN.match(location_string):
+        memory_address_dec = hex_string_to_dec(location_string.upper())
+        if memory_address_dec < BYTES_IN_MEMORY:
+            return memory_address_dec
+
+    raise SICBreakpointError("Unknown label or memory address: " + location_string)
+
+
+# This function parses a breakpoint: LOCATION [IF CONDITION], for example "RLOOP if X >= 1E".
+# It returns the memory address and the break condition (None without a condition).
+def parse_breakpoint(breakpoint_string, label_address_dict=None):
+    token_list = breakpoint_string.split(None, 2)
+
+    if len(token_list) == 1:
+        return parse_memory_location(token_list[0], label_address_dict), None
+
+    if len(token_list) == 3 and token_list[1].upper() == BREAK_CONDITION_KEYWORD:
+        return parse_memory_location(token_list[0], label_address_dict), parse_break_condition(token_list[2])
+
+    raise SICBreakpointError("Invalid breakpoint: " + breakpoint_string.strip())
+
+
+# This function parses a watchpoint: LOCATION[-LOCATION][:r|w|rw], for example "BUFFER-BUFEND:w".
+# A single location watches the word there, and a watchpoint without access watches writes.
+# It returns the start address, the end address (inclusive) and the access.
+def parse_watchpoint(watchpoint_string, label_address_dict=None):
+    watch_range_string, separator, watch_access = watchpoint_string.strip().partition(":")
+    watch_access = watch_access.strip().lower() if separator else WATCH_ACCESS_WRITE
+
+    if watch_access not in WATCH_ACCESS_LIST:
+        raise SICBreakpointError("Invalid watchpoint access: " + watch_access)
+
+    start_location_string, separator, end_location_string = watch_range_string.partition("-")
+    start_address_dec = parse_memory_location(start_location_string, label_address_dict)
+    if separator:
+        end_address_dec = parse_memory_location(end_location_string, label_address_dict)
+    else:
+        end_address_dec = min(start_address_dec + BYTES_IN_WORD, BYTES_IN_MEMORY) - 1
+
+    if end_address_dec < start_address_dec:
+        raise SICBreakpointError("Invalid watchpoint range: " + watch_range_string.strip())
+
+    return start_address_dec, end_address_dec, watch_access
@@ -1,10 +1,11 @@
 from SIC_Simulator.sic_memory_model import MEMORY_MODEL
+from SIC_Simulator.sic_object_code_parser import SICHeaderRecord, SICTextRecord
 from SIC_Utilities.sic_converter import hex_string_to_dec
 
 
 # This function will initialize the memory model and
 # then load program object code into the memory model
-def load_program_object_code(parsed_object_code_dict_list):
+def load_program_object_code(parsed_object_code_dict_list, MEMORY_MODEL=MEMORY_MODEL):
     MEMORY_MODEL.initialize_memory()
     for parsed_object_code_dict in parsed_object_code_dict_list:
         if parsed_object_code_dict["record_type"] == "text":
@@ -12,9 +13,23 @@ def load_program_object_code(parsed_object_code_dict_list):
             address_dec = hex_string_to_dec(address_hex_string)
             byte_list = parsed_object_code_dict["byte_list"]
 
-            for byte in byte_list:
-                MEMORY_MODEL.set_byte(address_dec, byte)
-                address_dec += 1
+            # Copy the whole text record into memory with a single slice assignment
+            MEMORY_MODEL.write_bytes(address_dec, bytes.fromhex("".join(byte_list)))
+
+
+# This function will initialize the memory model and then load object code records
+# (see iterate_object_code_records) into the memory model as they are read.
+# It returns the header record.
+def load_program_object_code_records(object_code_record_iterable, MEMORY_MODEL=MEMORY_MODEL):
+    MEMORY_MODEL.initialize_memory()
+    header_record = None
+    for object_code_record in object_code_record_iterable:
+        if isinstance(object_code_record, SICTextRecord):
+            MEMORY_MODEL.write_bytes(object_code_record.start_address_dec, object_code_record.byte_data)
+        elif header_record is None and isinstance(object_code_record, SICHeaderRecord):
+            header_record = object_code_record
+
+    return header_record
 
 # TEST BED
 #
@@ -0,0 +1,608 @@
+from SIC_Peripherals.sic_input_device_F1 import DEFAULT_RECORD_SEPARATOR_BYTE_VALUE, END_OF_RECORD_BYTE_VALUE, \
+    INPUT_DEVICE_F1_CODE
+from SIC_Peripherals.sic_output_device_05 import OUTPUT_DEVICE_05_CODE
+from SIC_Simulator.sic_batch_runner import EXIT_REASON_NORMAL, EXIT_REASON_FAULT, EXIT_REASON_STEP_BUDGET_EXHAUSTED
+from SIC_Simulator.sic_loader import load_program_object_code
+from SIC_Simulator.sic_memory_model import SICMemoryModel
+from SIC_Simulator.sic_operation_executor import OPCODE_HANDLER_TABLE, INDEXED_ADDRESSING_FLAG, ADDRESS_MASK, \
+    REGISTER_CONTENTS_FAULT_MESSAGE, \
+    execute_add, execute_and, execute_comp, execute_div, execute_j, execute_jeq, execute_jgt, execute_jlt, \
+    execute_jsub, execute_lda, execute_ldch, execute_ldl, execute_ldx, execute_mul, execute_or, execute_rd, \
+    execute_rsub, execute_sta, execute_stch, execute_stl, execute_stsw, execute_stx, execute_sub, execute_td, \
+    execute_tix, execute_wd, execute_xos, execute_tixw
+from SIC_Simulator.sic_register_model import REGISTER_A, REGISTER_X, REGISTER_L, REGISTER_PC, REGISTER_SW
+from SIC_Utilities.sic_constants import BYTES_IN_MEMORY, BYTES_IN_WORD, MAXIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_INTEGER, \
+    MINIMUM_INTEGER, MAXIMUM_WORD_DEC, SW_LESS_THAN_DEC, SW_EQUAL_DEC, SW_GREATER_THAN_DEC
+from SIC_Utilities.sic_converter import hex_string_to_dec
+
+# NumPy is only needed by the lockstep engine, the rest of the simulator runs without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The lockstep engine runs one program on many machines (lanes) at once, for example against many input streams
+# or many initial memory images. The registers of all lanes are held in NumPy int32 arrays and memory in an
+# N x 32768 uint8 array. Every step fetches the instruction at the PC of each running lane and executes each
+# opcode once for all the lanes that hold it, so lanes whose PC (or code) has diverged still run in lockstep.
+# The semantics are those of the operation handlers of sic_operation_executor, faults included.
+#
+# A lane stops at XOS or at a fault, the other lanes run on.
+# Input device F1 of each lane reads its own input data: the record separator byte reads as X'00' (end of record)
+# and every read past the end of the data reads X'00' (end of file), as with a stream source.
+# Output device 05 of each lane is collected in memory. Both devices are always ready (see SICAlwaysReadyModel),
+# so a lane runs as a machine with the "always" readiness model would.
+# Memory is held without the initialized bitmap, uninitialized memory simply reads as FF.
+LANE_RUNNING = 0
+LANE_TERMINATED_NORMALLY = 1
+LANE_FAULTED = 2
+
+DEFAULT_OUTPUT_CAPACITY = 256
+
+MEMORY_FAULT_MESSAGE = "MEMORY FAULT: Halting program execution\n"
+INTEGER_OUT_OF_RANGE_MESSAGE = "INTEGER OUT OF RANGE: Halting program execution\n"
+
+
+class SICLockstepEngineError(Exception):
+    pass
+
+
+# This function returns a message as print_status and print_error print it, without the text colors.
+def get_message_text(text_line_1, text_line_2=None):
+    message_text = text_line_1
+
+    if text_line_2 is not None:
+        message_text += "\n" + text_line_2
+
+    return message_text + "\n"
+
+
+# This function converts 24-bit words to signed integers (see word_to_dec).
+def words_to_dec(word_array):
+    return numpy.where(word_array > MAXIMUM_INTEGER, word_array - (MAXIMUM_WORD_DEC + 1), word_array)
+
+
+class SICLockstepEngine:
+    REGISTER_NAME_LIST = [REGISTER_A, REGISTER_X, REGISTER_L, REGISTER_PC, REGISTER_SW]
+
+    def __init__(self, number_of_lanes):
+        if numpy is None:
+            raise SICLockstepEngineError("The lockstep engine needs NumPy")
+
+        if number_of_lanes < 1:
+            raise SICLockstepEngineError("The number of lanes must be at least 1")
+
+        self.number_of_lanes = number_of_lanes
+        self.memory_array = numpy.full((number_of_lanes, BYTES_IN_MEMORY), SICMemoryModel.UNINITIALIZED_BYTE_VALUE,
+                                       dtype=numpy.uint8)
+        self.memory_flat_array = self.memory_array.reshape(-1)
+        self.register_array_dict = {register_name: numpy.full(number_of_lanes, MAXIMUM_WORD_DEC, dtype=numpy.int32)
+                                    for register_name in self.REGISTER_NAME_LIST}
+        self.register_initialized_array_dict = {register_name: numpy.zeros(number_of_lanes, dtype=bool)
+                                                for register_name in self.REGISTER_NAME_LIST}
+
+        self.lane_state_array = numpy.full(number_of_lanes, LANE_RUNNING, dtype=numpy.int8)
+        self.steps_array = numpy.zeros(number_of_lanes, dtype=numpy.int64)
+        self.message_list = [""] * number_of_lanes
+
+        self.input_array = numpy.zeros(0, dtype=numpy.uint8)
+        self.input_start_array = numpy.zeros(number_of_lanes, dtype=numpy.int64)
+        self.input_length_array = numpy.zeros(number_of_lanes, dtype=numpy.int64)
+        self.input_position_array = numpy.zeros(number_of_lanes, dtype=numpy.int64)
+        self.bytes_read_array = numpy.zeros(number_of_lanes, dtype=numpy.int64)
+
+        self.output_array = numpy.zeros((number_of_lanes, DEFAULT_OUTPUT_CAPACITY), dtype=numpy.uint8)
+        self.output_length_array = numpy.zeros(number_of_lanes, dtype=numpy.int64)
+
+        # Set when a program is loaded
+        self.is_supported_opcode_array = None
+
+        self.lockstep_handler_dict = {execute_add: self.execute_add, execute_and: self.execute_and,
+                                      execute_comp: self.execute_comp, execute_div: self.execute_div,
+                                      execute_j: self.execute_j, execute_jeq: self.execute_jeq,
+                                      execute_jgt: self.execute_jgt, execute_jlt: self.execute_jlt,
+                                      execute_jsub: self.execute_jsub, execute_lda: self.execute_lda,
+                                      execute_ldch: self.execute_ldch, execute_ldl: self.execute_ldl,
+                                      execute_ldx: self.execute_ldx, execute_mul: self.execute_mul,
+                                      execute_or: self.execute_or, execute_rd: self.execute_rd,
+                                      execute_rsub: self.execute_rsub, execute_sta: self.execute_sta,
+                                      execute_stch: self.execute_stch, execute_stl: self.execute_stl,
+                                      execute_stsw: self.execute_stsw, execute_stx: self.execute_stx,
+                                      execute_sub: self.execute_sub, execute_td: self.execute_td,
+                                      execute_tix: self.execute_tix, execute_wd: self.execute_wd,
+                                      execute_xos: self.execute_xos, execute_tixw: self.execute_tixw}
+
+    ###########
+    # LOADING
+    ###########
+    # This function loads parsed program object code into every lane and initializes the registers and devices.
+    def load_program_object_code(self, parsed_object_code_dict_list):
+        memory_model = SICMemoryModel()
+        load_program_object_code(parsed_object_code_dict_list, memory_model)
+        self.memory_array[:] = numpy.frombuffer(memory_model.memory_bytearray, dtype=numpy.uint8)
+
+        # The opcodes supported by the simulator, as the dispatch table holds them now
+        self.is_supported_opcode_array = numpy.array([operation_handler is not None
+                                                      for operation_handler in OPCODE_HANDLER_TABLE])
+
+        for register_name in self.REGISTER_NAME_LIST:
+            self.register_array_dict[register_name].fill(MAXIMUM_WORD_DEC)
+            self.register_initialized_array_dict[register_name].fill(False)
+
+        header_record_dict = parsed_object_code_dict_list[0]
+        self.register_array_dict[REGISTER_PC].fill(hex_string_to_dec(header_record_dict["program_start_address"]))
+        self.register_initialized_array_dict[REGISTER_PC].fill(True)
+
+        self.lane_state_array.fill(LANE_RUNNING)
+        self.steps_array.fill(0)
+        self.message_list = [""] * self.number_of_lanes
+
+        self.input_position_array.fill(0)
+        self.bytes_read_array.fill(0)
+        self.output_length_array.fill(0)
+
+    # This function writes bytes into the memory of one lane, to give the lanes different initial memory images.
+    def write_lane_bytes(self, lane_index, memory_address_dec_value, byte_data):
+        if not 0 <= memory_address_dec_value <= memory_address_dec_value + len(byte_data) <= BYTES_IN_MEMORY:
+            raise SICLockstepEngineError("Memory address out of range.")
+
+        self.memory_array[lane_index, memory_address_dec_value:memory_address_dec_value + len(byte_data)] = \
+            numpy.frombuffer(bytes(byte_data), dtype=numpy.uint8)
+
+    # This function gives every lane its input data for input device F1: one bytes object per lane.
+    def set_input_data_list(self, input_data_list, record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE):
+        if len(input_data_list) != self.number_of_lanes:
+            raise SICLockstepEngineError("There must be input data for every lane")
+
+        input_data_list = [bytes(input_data) for input_data in input_data_list]
+        self.input_array = numpy.frombuffer(b"".join(input_data_list), dtype=numpy.uint8).copy()
+        if record_separator_byte_value is not None:
+            self.input_array[self.input_array == record_separator_byte_value] = END_OF_RECORD_BYTE_VALUE
+
+        self.input_length_array = numpy.array([len(input_data) for input_data in input_data_list], dtype=numpy.int64)
+        self.input_start_array = numpy.cumsum(self.input_length_array) - self.input_length_array
+        self.input_position_array.fill(0)
+
+    ###########
+    # RUNNING
+    ###########
+    # This function runs every lane for up to maximum_number_of_steps instructions, or until every lane has stopped.
+    # It returns the number of lanes that are still running.
+    def run(self, maximum_number_of_steps=None):
+        if self.is_supported_opcode_array is None:
+            raise SICLockstepEngineError("No program is loaded")
+
+        number_of_steps = 0
+
+        while maximum_number_of_steps is None or number_of_steps < maximum_number_of_steps:
+            lane_index_array = numpy.flatnonzero(self.lane_state_array == LANE_RUNNING)
+            if lane_index_array.size == 0:
+                break
+
+            self.steps_array[lane_index_array] += 1
+            self.execute_step(lane_index_array)
+            number_of_steps += 1
+
+        return int(numpy.count_nonzero(self.lane_state_array == LANE_RUNNING))
+
+    # This function stops lanes with a status or fault message.
+    def stop_lanes(self, lane_index_array, lane_state, text_line_1, text_line_2=None):
+        self.lane_state_array[lane_index_array] = lane_state
+        message_text = get_message_text(text_line_1, text_line_2)
+        for lane_index in lane_index_array.tolist():
+            self.message_list[lane_index] += message_text
+
+    # This function faults the lanes that fail a test (is_faulting_array).
+    # It returns an index that selects the lanes that pass: a slice of every lane when none fail, to save a copy.
+    def fault_lanes(self, lane_index_array, is_faulting_array, text_line_1):
+        if not is_faulting_array.any():
+            return slice(None)
+
+        self.stop_lanes(lane_index_array[is_faulting_array], LANE_FAULTED, text_line_1)
+        return ~is_faulting_array
+
+    # This function executes one instruction on every lane in lane_index_array, as execute_operation does.
+    def execute_step(self, lane_index_array):
+        memory_flat_array = self.memory_flat_array
+        pc_array = self.register_array_dict[REGISTER_PC][lane_index_array].astype(numpy.int64)
+
+        # INSTRUCTION
+        # Fetch the whole instruction word: [OPCODE 8 bits][X 1 bit][ADDRESS 15 bits]
+        is_fetched_index = self.fault_lanes(lane_index_array, pc_array > MAXIMUM_MEMORY_ADDRESS_DEC - 2,
+                                            MEMORY_FAULT_MESSAGE)
+        lane_index_array = lane_index_array[is_fetched_index]
+        pc_array = pc_array[is_fetched_index]
+
+        instruction_address_array = lane_index_array * BYTES_IN_MEMORY + pc_array
+        opcode_array = memory_flat_array[instruction_address_array]
+        address_field_array = ((memory_flat_array[instruction_address_array + 1].astype(numpy.int64) << 8) |
+                               memory_flat_array[instruction_address_array + 2])
+
+        # Verify that the opcode is supported by the simulator.
+        is_unrecognized_array = ~self.is_supported_opcode_array[opcode_array]
+        if is_unrecognized_array.any():
+            for lane_index, opcode in zip(lane_index_array[is_unrecognized_array].tolist(),
+                                          opcode_array[is_unrecognized_array].tolist()):
+                self.stop_lanes(numpy.array([lane_index]), LANE_FAULTED,
+                                "UNRECOGNIZED OPCODE FAULT: Halting program execution",
+                                "OPCODE: " + format(opcode, "02X") + "\n")
+            lane_index_array = lane_index_array[~is_unrecognized_array]
+            pc_array = pc_array[~is_unrecognized_array]
+            opcode_array = opcode_array[~is_unrecognized_array]
+            address_field_array = address_field_array[~is_unrecognized_array]
+
+        # MEMORY ADDRESS
+        # Add register X to the base address for indexed addressing
+        memory_address_array = address_field_array & ADDRESS_MASK
+        is_indexed_array = (address_field_array & INDEXED_ADDRESSING_FLAG) != 0
+        if is_indexed_array.any():
+            memory_address_array[is_indexed_array] += self.get_registers(REGISTER_X,
+                                                                         lane_index_array[is_indexed_array])
+
+        # Increment PC Register
+        pc_array += BYTES_IN_WORD
+        self.register_array_dict[REGISTER_PC][lane_index_array] = pc_array
+
+        # Verify that the PC register holds an in-range memory address
+        is_in_range_array = pc_array <= MAXIMUM_MEMORY_ADDRESS_DEC
+        if not is_in_range_array.all():
+            for lane_index, pc_value in zip(lane_index_array[~is_in_range_array].tolist(),
+                                            pc_array[~is_in_range_array].tolist()):
+                self.stop_lanes(numpy.array([lane_index]), LANE_FAULTED,
+                                "PROGRAM COUNTER FAULT: Halting program execution",
+                                "PC REGISTER: " + format(pc_value, "06X") + "\n")
+            lane_index_array = lane_index_array[is_in_range_array]
+            opcode_array = opcode_array[is_in_range_array]
+            memory_address_array = memory_address_array[is_in_range_array]
+
+        if lane_index_array.size == 0:
+            return
+
+        # EXECUTE INSTRUCTION, once per opcode
+        # Lanes that have not diverged all hold the same opcode and run without a mask
+        if opcode_array.min() == opcode_array.max():
+            self.get_lockstep_handler(int(opcode_array[0]))(lane_index_array, memory_address_array)
+            return
+
+        for opcode in numpy.unique(opcode_array).tolist():
+            is_opcode_array = opcode_array == opcode
+            self.get_lockstep_handler(opcode)(lane_index_array[is_opcode_array], memory_address_array[is_opcode_array])
+
+    # This function returns the lockstep version of the operation handler of an opcode.
+    def get_lockstep_handler(self, opcode):
+        operation_handler = OPCODE_HANDLER_TABLE[opcode]
+        lockstep_handler = self.lockstep_handler_dict.get(operation_handler)
+        if lockstep_handler is None:
+            raise SICLockstepEngineError("The lockstep engine can not execute " + operation_handler.__name__)
+
+        return lockstep_handler
+
+    ############
+    # REGISTERS
+    ############
+    # This function reads a register of some lanes as unsigned integers.
+    # Reading an uninitialized register yields FFFFFF, and the register is considered set from then on.
+    def get_registers(self, register_name, lane_index_array):
+        self.register_initialized_array_dict[register_name][lane_index_array] = True
+        return self.register_array_dict[register_name][lane_index_array].astype(numpy.int64)
+
+    def set_registers(self, register_name, lane_index_array, value_array):
+        self.register_array_dict[register_name][lane_index_array] = value_array
+        self.register_initialized_array_dict[register_name][lane_index_array] = True
+
+    # This function sets the status word register of some lanes based on a comparison.
+    def compare_and_set_status_words(self, lane_index_array, left_dec_array, right_dec_array):
+        self.set_registers(REGISTER_SW, lane_index_array,
+                           numpy.where(left_dec_array < right_dec_array, SW_LESS_THAN_DEC,
+                                       numpy.where(left_dec_array == right_dec_array, SW_EQUAL_DEC,
+                                                   SW_GREATER_THAN_DEC)))
+
+    #########
+    # MEMORY
+    #########
+    # Memory is addressed through a flat view: the byte at memory address m of a lane is at lane * 32768 + m.
+    # These functions fault the lanes whose memory address is out of range and return the lanes (and addresses)
+    # that are left, with the bytes or words read from memory.
+    def read_bytes(self, lane_index_array, memory_address_array):
+        is_in_range_index = self.fault_lanes(lane_index_array, memory_address_array > MAXIMUM_MEMORY_ADDRESS_DEC,
+                                             MEMORY_FAULT_MESSAGE)
+        lane_index_array = lane_index_array[is_in_range_index]
+        memory_address_array = memory_address_array[is_in_range_index]
+
+        return (lane_index_array, memory_address_array,
+                self.memory_flat_array[lane_index_array * BYTES_IN_MEMORY + memory_address_array].astype(numpy.int64))
+
+    def read_words(self, lane_index_array, memory_address_array):
+        is_in_range_index = self.fault_lanes(lane_index_array,
+                                             memory_address_array > MAXIMUM_MEMORY_ADDRESS_DEC - 2,
+                                             MEMORY_FAULT_MESSAGE)
+        lane_index_array = lane_index_array[is_in_range_index]
+        memory_address_array = memory_address_array[is_in_range_index]
+
+        memory_flat_array = self.memory_flat_array
+        flat_address_array = lane_index_array * BYTES_IN_MEMORY + memory_address_array
+        word_array = ((memory_flat_array[flat_address_array].astype(numpy.int64) << 16) |
+                      (memory_flat_array[flat_address_array + 1].astype(numpy.int64) << 8) |
+                      memory_flat_array[flat_address_array + 2])
+        return lane_index_array, memory_address_array, word_array
+
+    # This function faults the lanes whose memory address is out of range and writes the words of the others.
+    def write_words(self, lane_index_array, memory_address_array, word_array):
+        is_in_range_index = self.fault_lanes(lane_index_array,
+                                             memory_address_array > MAXIMUM_MEMORY_ADDRESS_DEC - 2,
+                                             MEMORY_FAULT_MESSAGE)
+        flat_address_array = (lane_index_array[is_in_range_index] * BYTES_IN_MEMORY +
+                              memory_address_array[is_in_range_index])
+        word_array = word_array[is_in_range_index]
+
+        self.memory_flat_array[flat_address_array] = word_array >> 16
+        self.memory_flat_array[flat_address_array + 1] = (word_array >> 8) & 0xFF
+        self.memory_flat_array[flat_address_array + 2] = word_array & 0xFF
+
+    ####################
+    # OPERATION HANDLERS
+    ####################
+    # Every handler takes the lanes that execute the operation and their memory addresses.
+
+    # This function stores a result in register A, or faults the lanes where it is out of the integer range.
+    def set_integer_results(self, lane_index_array, dec_array, fault_message=INTEGER_OUT_OF_RANGE_MESSAGE):
+        is_in_range_index = self.fault_lanes(lane_index_array,
+                                             (dec_array < MINIMUM_INTEGER) | (dec_array > MAXIMUM_INTEGER),
+                                             fault_message)
+        self.set_registers(REGISTER_A, lane_index_array[is_in_range_index],
+                           dec_array[is_in_range_index] & MAXIMUM_WORD_DEC)
+
+    def execute_add(self, lane_index_array, memory_address_array):
+        # A <- (A) + (m..m+2)
+        register_a_array = self.get_registers(REGISTER_A, lane_index_array)
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        register_a_array = self.register_array_dict[REGISTER_A][lane_index_array].astype(numpy.int64)
+        self.set_integer_results(lane_index_array, words_to_dec(register_a_array) + words_to_dec(word_array))
+
+    def execute_and(self, lane_index_array, memory_address_array):
+        # A <- (A) & (m..m+2)
+        self.get_registers(REGISTER_A, lane_index_array)
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        self.set_registers(REGISTER_A, lane_index_array,
+                           self.register_array_dict[REGISTER_A][lane_index_array] & word_array)
+
+    def execute_comp(self, lane_index_array, memory_address_array):
+        # (A) : (m..m+2)
+        # NOTE: register A is compared unsigned, as in execute_comp
+        self.get_registers(REGISTER_A, lane_index_array)
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        self.compare_and_set_status_words(lane_index_array,
+                                          self.register_array_dict[REGISTER_A][lane_index_array].astype(numpy.int64),
+                                          words_to_dec(word_array))
+
+    def execute_div(self, lane_index_array, memory_address_array):
+        # A <- (A) / (m..m+2)
+        self.get_registers(REGISTER_A, lane_index_array)
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        word_dec_array = words_to_dec(word_array)
+
+        is_divisible_index = self.fault_lanes(lane_index_array, word_dec_array == 0,
+                                              "DIVISION BY ZERO FAULT: Halting program execution\n")
+        lane_index_array = lane_index_array[is_divisible_index]
+        word_dec_array = word_dec_array[is_divisible_index]
+
+        register_a_dec_array = words_to_dec(self.register_array_dict[REGISTER_A][lane_index_array].astype(numpy.int64))
+        self.set_integer_results(lane_index_array, register_a_dec_array // word_dec_array,
+                                 "INTEGER OUT OF RANGE FAULT: Halting program execution\n")
+
+    # This function jumps: PC <- m. A target that does not fit in the PC register faults the lane.
+    def jump(self, lane_index_array, memory_address_array):
+        is_in_range_index = self.fault_lanes(lane_index_array, memory_address_array > MAXIMUM_WORD_DEC,
+                                             REGISTER_CONTENTS_FAULT_MESSAGE)
+        self.set_registers(REGISTER_PC, lane_index_array[is_in_range_index], memory_address_array[is_in_range_index])
+
+    def execute_j(self, lane_index_array, memory_address_array):
+        # PC <- m
+        self.jump(lane_index_array, memory_address_array)
+
+    # This function jumps on the lanes whose status word holds a condition code.
+    def jump_on_condition(self, lane_index_array, memory_address_array, status_word_dec_value):
+        is_jumping_array = self.get_registers(REGISTER_SW, lane_index_array) == status_word_dec_value
+        self.jump(lane_index_array[is_jumping_array], memory_address_array[is_jumping_array])
+
+    def execute_jeq(self, lane_index_array, memory_address_array):
+        # PC <- m if CC set to =
+        self.jump_on_condition(lane_index_array, memory_address_array, SW_EQUAL_DEC)
+
+    def execute_jgt(self, lane_index_array, memory_address_array):
+        # PC <- m if CC set to >
+        self.jump_on_condition(lane_index_array, memory_address_array, SW_GREATER_THAN_DEC)
+
+    def execute_jlt(self, lane_index_array, memory_address_array):
+        # PC <- m if CC set to <
+        self.jump_on_condition(lane_index_array, memory_address_array, SW_LESS_THAN_DEC)
+
+    def execute_jsub(self, lane_index_array, memory_address_array):
+        # L <- (PC); PC <- m
+        self.set_registers(REGISTER_L, lane_index_array, self.get_registers(REGISTER_PC, lane_index_array))
+        self.jump(lane_index_array, memory_address_array)
+
+    # This function loads a register from memory: r <- (m..m+2)
+    def load_registers(self, register_name, lane_index_array, memory_address_array):
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        self.set_registers(register_name, lane_index_array, word_array)
+
+    def execute_lda(self, lane_index_array, memory_address_array):
+        # A <- (m..m+2)
+        self.load_registers(REGISTER_A, lane_index_array, memory_address_array)
+
+    def execute_ldch(self, lane_index_array, memory_address_array):
+        # A[rightmost byte] <- (m)
+        # All other bytes in register A are unaffected
+        lane_index_array, memory_address_array, byte_array = self.read_bytes(lane_index_array, memory_address_array)
+        register_a_array = self.get_registers(REGISTER_A, lane_index_array)
+        self.set_registers(REGISTER_A, lane_index_array, (register_a_array & 0xFFFF00) | byte_array)
+
+    def execute_ldl(self, lane_index_array, memory_address_array):
+        # L <- (m..m+2)
+        self.load_registers(REGISTER_L, lane_index_array, memory_address_array)
+
+    def execute_ldx(self, lane_index_array, memory_address_array):
+        # X <- (m..m+2)
+        self.load_registers(REGISTER_X, lane_index_array, memory_address_array)
+
+    def execute_mul(self, lane_index_array, memory_address_array):
+        # A <- (A) * (m..m+2)
+        self.get_registers(REGISTER_A, lane_index_array)
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        register_a_array = self.register_array_dict[REGISTER_A][lane_index_array].astype(numpy.int64)
+        self.set_integer_results(lane_index_array, words_to_dec(register_a_array) * words_to_dec(word_array))
+
+    def execute_or(self, lane_index_array, memory_address_array):
+        # A <- (A) | (m..m+2)
+        self.get_registers(REGISTER_A, lane_index_array)
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        self.set_registers(REGISTER_A, lane_index_array,
+                           self.register_array_dict[REGISTER_A][lane_index_array] | word_array)
+
+    def execute_rd(self, lane_index_array, memory_address_array):
+        # A[rightmost byte] <- data from device F1
+        register_a_array = self.get_registers(REGISTER_A, lane_index_array)
+        self.get_registers(REGISTER_X, lane_index_array)
+
+        input_position_array = self.input_position_array[lane_index_array]
+        is_in_data_array = input_position_array < self.input_length_array[lane_index_array]
+        byte_array = numpy.zeros(lane_index_array.size, dtype=numpy.int64)
+        byte_array[is_in_data_array] = self.input_array[self.input_start_array[lane_index_array[is_in_data_array]] +
+                                                        input_position_array[is_in_data_array]]
+        self.input_position_array[lane_index_array] = input_position_array + is_in_data_array
+        self.bytes_read_array[lane_index_array] += 1
+
+        self.set_registers(REGISTER_A, lane_index_array, (register_a_array & 0xFFFF00) | byte_array)
+
+    def execute_rsub(self, lane_index_array, memory_address_array):
+        # PC <- (L)
+        register_l_array = self.get_registers(REGISTER_L, lane_index_array)
+        self.set_registers(REGISTER_PC, lane_index_array, register_l_array)
+
+        is_in_range_array = register_l_array <= MAXIMUM_MEMORY_ADDRESS_DEC
+        for lane_index, pc_value in zip(lane_index_array[~is_in_range_array].tolist(),
+                                        register_l_array[~is_in_range_array].tolist()):
+            self.stop_lanes(numpy.array([lane_index]), LANE_FAULTED,
+                            "PROGRAM COUNTER FAULT: Halting program execution",
+                            "PC REGISTER: " + format(pc_value, "06X") + "\n")
+
+    # This function stores a register in memory: m..m+2 <- (r)
+    def store_registers(self, register_name, lane_index_array, memory_address_array):
+        self.write_words(lane_index_array, memory_address_array, self.get_registers(register_name, lane_index_array))
+
+    def execute_sta(self, lane_index_array, memory_address_array):
+        # m..m+2 <- (A)
+        self.store_registers(REGISTER_A, lane_index_array, memory_address_array)
+
+    def execute_stch(self, lane_index_array, memory_address_array):
+        # m <- (A)[rightmost byte]
+        register_a_array = self.get_registers(REGISTER_A, lane_index_array)
+        is_in_range_index = self.fault_lanes(lane_index_array, memory_address_array > MAXIMUM_MEMORY_ADDRESS_DEC,
+                                             MEMORY_FAULT_MESSAGE)
+        self.memory_flat_array[lane_index_array[is_in_range_index] * BYTES_IN_MEMORY +
+                               memory_address_array[is_in_range_index]] = register_a_array[is_in_range_index] & 0xFF
+
+    def execute_stl(self, lane_index_array, memory_address_array):
+        # m..m+2 <- (L)
+        self.store_registers(REGISTER_L, lane_index_array, memory_address_array)
+
+    def execute_stsw(self, lane_index_array, memory_address_array):
+        # m..m+2 <- (SW)
+        self.store_registers(REGISTER_SW, lane_index_array, memory_address_array)
+
+    def execute_stx(self, lane_index_array, memory_address_array):
+        # m..m+2 <- (X)
+        self.store_registers(REGISTER_X, lane_index_array, memory_address_array)
+
+    def execute_sub(self, lane_index_array, memory_address_array):
+        # A <- (A) - (m..m+2)
+        self.get_registers(REGISTER_A, lane_index_array)
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        register_a_array = self.register_array_dict[REGISTER_A][lane_index_array].astype(numpy.int64)
+        self.set_integer_results(lane_index_array, words_to_dec(register_a_array) - words_to_dec(word_array))
+
+    def execute_td(self, lane_index_array, memory_address_array):
+        # Test device specified by (m): the devices are always ready
+        lane_index_array, memory_address_array, device_code_array = self.read_bytes(lane_index_array,
+                                                                                    memory_address_array)
+        is_device_index = self.fault_lanes(lane_index_array,
+                                           (device_code_array != OUTPUT_DEVICE_05_CODE) &
+                                           (device_code_array != INPUT_DEVICE_F1_CODE),
+                                           "PERIPHERAL DEVICE FAULT: Halting program execution\n")
+        self.set_registers(REGISTER_SW, lane_index_array[is_device_index], SW_LESS_THAN_DEC)
+
+    # This function increments register X and compares it with memory: X <- (X) + increment; (X):((m..m+2) * scale)
+    def increment_and_compare_registers(self, lane_index_array, memory_address_array, increment):
+        register_x_array = self.get_registers(REGISTER_X, lane_index_array) + increment
+        is_in_range_index = self.fault_lanes(lane_index_array, register_x_array > MAXIMUM_WORD_DEC,
+                                             REGISTER_CONTENTS_FAULT_MESSAGE)
+        lane_index_array = lane_index_array[is_in_range_index]
+        memory_address_array = memory_address_array[is_in_range_index]
+        self.set_registers(REGISTER_X, lane_index_array, register_x_array[is_in_range_index])
+
+        lane_index_array, memory_address_array, word_array = self.read_words(lane_index_array, memory_address_array)
+        self.compare_and_set_status_words(lane_index_array,
+                                          self.register_array_dict[REGISTER_X][lane_index_array].astype(numpy.int64),
+                                          words_to_dec(word_array) * increment)
+
+    def execute_tix(self, lane_index_array, memory_address_array):
+        # X <- (X) + 1; (X):(m..m+2)
+        self.increment_and_compare_registers(lane_index_array, memory_address_array, 1)
+
+    def execute_wd(self, lane_index_array, memory_address_array):
+        # Device 05 <- (A)[rightmost byte]
+        register_a_array = self.get_registers(REGISTER_A, lane_index_array)
+
+        output_length_array = self.output_length_array[lane_index_array]
+        output_capacity = self.output_array.shape[1]
+        if output_length_array.max() >= output_capacity:
+            self.output_array = numpy.concatenate((self.output_array, numpy.zeros_like(self.output_array)), axis=1)
+
+        self.output_array[lane_index_array, output_length_array] = register_a_array & 0xFF
+        self.output_length_array[lane_index_array] = output_length_array + 1
+
+    # CUSTOM OPERATION HANDLERS
+
+    def execute_xos(self, lane_index_array, memory_address_array):
+        # End processing and exit to the operating system
+        self.stop_lanes(lane_index_array, LANE_TERMINATED_NORMALLY, "Program execution terminated normally\n")
+
+    def execute_tixw(self, lane_index_array, memory_address_array):
+        # X <- (X) + 3; (X):((m..m+2) * 3)
+        self.increment_and_compare_registers(lane_index_array, memory_address_array, 3)
+
+    ##########
+    # RESULTS
+    ##########
+    # This function returns the result of one lane, in the form of a batch runner result (see sic_batch_runner).
+    def get_lane_result_dict(self, lane_index):
+        lane_state = int(self.lane_state_array[lane_index])
+        if lane_state == LANE_TERMINATED_NORMALLY:
+            exit_reason = EXIT_REASON_NORMAL
+        elif lane_state == LANE_FAULTED:
+            exit_reason = EXIT_REASON_FAULT
+        else:
+            exit_reason = EXIT_REASON_STEP_BUDGET_EXHAUSTED
+
+        output_length = int(self.output_length_array[lane_index])
+        register_result_dict = {}
+        for register_name in self.REGISTER_NAME_LIST:
+            if self.register_initialized_array_dict[register_name][lane_index]:
+                register_result_dict[register_name] = format(int(self.register_array_dict[register_name][lane_index]),
+                                                             "06X")
+            else:
+                register_result_dict[register_name] = None
+
+        return {"lane": lane_index,
+                "exit_reason": exit_reason,
+                "steps": int(self.steps_array[lane_index]),
+                "input_bytes": int(self.bytes_read_array[lane_index]),
+                "output_bytes": output_length,
+                "output": self.output_array[lane_index, :output_length].tobytes().decode("latin-1"),
+                "registers": register_result_dict,
+                "messages": self.message_list[lane_index]}
+
+    # This function returns a copy of the memory of one lane.
+    def get_lane_memory_bytes(self, lane_index):
+        return self.memory_array[lane_index].tobytes()
@@ -0,0 +1,196 @@
+from SIC_Peripherals.sic_input_device_F1 import SICInputDeviceF1, INPUT_DEVICE_F1_CODE
+from SIC_Peripherals.sic_output_device_05 import SICOutputDevice05, OUTPUT_DEVICE_05_CODE
+from SIC_Simulator.sic_block_compiler import execute_block, DEFAULT_MAXIMUM_NUMBER_OF_STEPS
+from SIC_Simulator.sic_loader import load_program_object_code, load_program_object_code_records
+from SIC_Simulator.sic_memory_model import SICMemoryModel, MEMORY_MODEL
+from SIC_Simulator.sic_object_code_parser import iterate_object_code_records
+from SIC_Simulator.sic_operation_executor import execute_operation, fast_forward_polling_loop, \
+    initialize_program_termination, test_for_normal_termination
+from SIC_Simulator.sic_profiler import run_profiled_steps
+from SIC_Simulator.sic_register_model import create_register_dict, get_register_dump_string, initialize_registers, \
+    REGISTER_DICT, REGISTER_PC
+from SIC_Simulator.sic_snapshot import SICMachineSnapshot
+from SIC_Simulator.sic_trace_recorder import run_traced_steps
+from SIC_Utilities.sic_converter import hex_string_to_dec
+
+
+class SICMachineError(Exception):
+    pass
+
+
+# A machine owns its memory, registers and devices, so one process can hold any number of independent machines.
+# Machines share nothing but the dispatch table of the operation executor, so separate machines can run
+# on separate threads. The status and fault messages of every machine are printed to the same sys.stdout.
+#
+# A new machine gets its own input device F1 (terminal source) and output device 05 (terminal sink).
+# Pass devices in to connect the machine to other sources and sinks, for example:
+#     SICMachine(SICInputDeviceF1(SICBufferSource(b"DATA")), SICOutputDevice05(SICBytearraySink()))
+# MACHINE is the machine of the interactive simulator and the headless runner.
+#
+# snapshot() takes a snapshot of the whole machine state and restore(snapshot) returns the machine to it,
+# for example to branch many runs from the state a program reaches after its setup (see sic_snapshot).
+# fork() builds a new machine that starts from the state of this one. With paged memory
+# (SICMachine(memory_model=SICPagedMemoryModel())) the machines share memory pages until they write them.
+class SICMachine:
+    def __init__(self, input_device_F1=None, output_device_05=None, memory_model=None, register_dict=None):
+        if memory_model is None:
+            memory_model = SICMemoryModel()
+        self.memory_model = memory_model
+        self.register_dict = register_dict if register_dict is not None else create_register_dict()
+
+        # The devices the memory model already holds are kept unless others are passed in
+        if input_device_F1 is None:
+            input_device_F1 = memory_model.device_dict.get(INPUT_DEVICE_F1_CODE) or SICInputDeviceF1()
+        if output_device_05 is None:
+            output_device_05 = memory_model.device_dict.get(OUTPUT_DEVICE_05_CODE) or SICOutputDevice05()
+        self.input_device_F1 = input_device_F1
+        self.output_device_05 = output_device_05
+        memory_model.device_dict[INPUT_DEVICE_F1_CODE] = input_device_F1
+        memory_model.device_dict[OUTPUT_DEVICE_05_CODE] = output_device_05
+
+    # This function loads parsed program object code (see sic_object_code_parser), ready to run.
+    def load_program_object_code(self, parsed_object_code_dict_list):
+        # Initialize memory and load program
+        load_program_object_code(parsed_object_code_dict_list, self.memory_model)
+
+        header_record_dict = parsed_object_code_dict_list[0]
+        self.initialize_program(hex_string_to_dec(header_record_dict["program_start_address"]))
+
+    # This function loads the program of an object code file (*.obj) as its records are read, ready to run.
+    def load_program_object_code_file(self, object_code_file):
+        header_record = load_program_object_code_records(iterate_object_code_records(object_code_file),
+                                                         self.memory_model)
+
+        self.initialize_program(header_record.program_start_address_dec)
+
+    # This function loads a program image (see sic_program_image), ready to run.
+    def load_program_image(self, program_image):
+        # Initialize memory and load program
+        program_image.load(self.memory_model)
+
+        self.initialize_program(program_image.program_start_address_dec)
+
+    # This function initializes the registers, the devices and the termination flag for a newly loaded program.
+    def initialize_program(self, program_start_address_dec):
+        # Initialize registers
+        initialize_registers(self.register_dict)
+
+        # Initialize the program counter register
+        self.register_dict[REGISTER_PC].set_value(program_start_address_dec)
+
+        # Initialize peripherals
+        self.input_device_F1.initialize()
+        self.output_device_05.initialize()
+
+        initialize_program_termination(self.memory_model)
+
+    def execute_operation(self):
+        return execute_operation(self.register_dict, self.memory_model)
+
+    def execute_block(self, maximum_number_of_steps=DEFAULT_MAXIMUM_NUMBER_OF_STEPS,
+                      is_fast_forwarding_polling_loops=True):
+        return execute_block(self.register_dict, self.memory_model, maximum_number_of_steps,
+                             is_fast_forwarding_polling_loops)
+
+    # This function runs the loaded program for up to maximum_number_of_steps instructions.
+    # A maximum_number_of_steps of None runs the program until it stops.
+    # Device polling loops are fast-forwarded unless is_fast_forwarding_polling_loops is False.
+    # Blocks are only compiled if the memory model supports them.
+    # It returns continue_execution and the number of instructions (steps) executed.
+    def run_steps(self, maximum_number_of_steps=None, use_block_compiler=True, is_fast_forwarding_polling_loops=True):
+        if maximum_number_of_steps is not None and maximum_number_of_steps < 0:
+            raise SICMachineError("The maximum number of steps must not be negative")
+
+        register_dict = self.register_dict
+        memory_model = self.memory_model
+        use_block_compiler = use_block_compiler and memory_model.SUPPORTS_COMPILED_BLOCKS
+        number_of_steps = 0
+        continue_execution = True
+
+        while continue_execution and (maximum_number_of_steps is None or number_of_steps < maximum_number_of_steps):
+            if maximum_number_of_steps is None:
+                step_budget = DEFAULT_MAXIMUM_NUMBER_OF_STEPS
+            else:
+                step_budget = maximum_number_of_steps - number_of_steps
+
+            if use_block_compiler:
+                continue_execution, block_number_of_steps = execute_block(register_dict, memory_model, step_budget,
+                                                                          is_fast_forwarding_polling_loops)
+                number_of_steps += block_number_of_steps
+                continue
+
+            if is_fast_forwarding_polling_loops:
+                polling_number_of_steps = fast_forward_polling_loop(register_dict, memory_model, step_budget)
+                if polling_number_of_steps:
+                    number_of_steps += polling_number_of_steps
+                    continue
+
+            continue_execution = execute_operation(register_dict, memory_model)
+            number_of_steps += 1
+
+        return continue_execution, number_of_steps
+
+    # This function runs the loaded program like run_steps, one instruction at a time,
+    # and counts every instruction executed in the profile (see sic_profiler).
+    def run_profiled_steps(self, profile, maximum_number_of_steps=None, is_fast_forwarding_polling_loops=True):
+        if maximum_number_of_steps is not None and maximum_number_of_steps < 0:
+            raise SICMachineError("The maximum number of steps must not be negative")
+
+        return run_profiled_steps(self.register_dict, self.memory_model, profile, maximum_number_of_steps,
+                                  is_fast_forwarding_polling_loops)
+
+    # This function runs the loaded program like run_steps, one instruction at a time without fast-forwarding,
+    # and records every instruction executed with the trace recorder (see sic_trace_recorder).
+    def run_traced_steps(self, trace_recorder, maximum_number_of_steps=None):
+        if maximum_number_of_steps is not None and maximum_number_of_steps < 0:
+            raise SICMachineError("The maximum number of steps must not be negative")
+
+        return run_traced_steps(self.register_dict, self.memory_model, trace_recorder, maximum_number_of_steps)
+
+    # This function returns True if the program was ended by XOS.
+    def test_for_normal_termination(self):
+        return test_for_normal_termination(self.memory_model)
+
+    def get_register_dump_string(self):
+        return get_register_dump_string(self.register_dict)
+
+    def snapshot(self):
+        return SICMachineSnapshot(self.memory_model.get_memory_image(),
+                                  self.memory_model.get_initialized_bitmap_image(),
+                                  {register_name: [register.value, register.is_initialized]
+                                   for register_name, register in self.register_dict.items()},
+                                  self.memory_model.is_program_terminated_normally,
+                                  self.input_device_F1.get_state(),
+                                  self.output_device_05.get_state())
+
+    # This function returns a new machine with a fork of this machine's memory (see SICMemoryModel.fork)
+    # and a copy of its registers and termination flag.
+    # The new machine gets the devices passed in, or new devices as SICMachine() would create them.
+    def fork(self, input_device_F1=None, output_device_05=None):
+        machine = SICMachine(input_device_F1, output_device_05, self.memory_model.fork())
+
+        for register_name, register in self.register_dict.items():
+            machine.register_dict[register_name].value = register.value
+            machine.register_dict[register_name].is_initialized = register.is_initialized
+
+        return machine
+
+    # Only the memory pages that differ from the snapshot are written, so unchanged code stays compiled.
+    def restore(self, snapshot):
+        if snapshot.register_state_dict.keys() != self.register_dict.keys():
+            raise SICMachineError("The snapshot does not hold the registers of this machine")
+
+        self.memory_model.restore_memory_image(snapshot.memory_image, snapshot.initialized_bitmap_image)
+
+        for register_name, register in self.register_dict.items():
+            register.value, register.is_initialized = snapshot.register_state_dict[register_name]
+
+        self.memory_model.is_program_terminated_normally = snapshot.is_program_terminated_normally
+        self.input_device_F1.set_state(snapshot.input_device_F1_state)
+        self.output_device_05.set_state(snapshot.output_device_05_state)
+
+    def get_memory_dump_string(self):
+        return self.memory_model.get_memory_dump_string()
+
+
+MACHINE = SICMachine(memory_model=MEMORY_MODEL, register_dict=REGISTER_DICT)
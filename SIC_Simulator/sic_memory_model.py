@@ -1,6 +1,7 @@
+from SIC_Peripherals.sic_input_device_F1 import INPUT_DEVICE_F1, INPUT_DEVICE_F1_CODE
+from SIC_Peripherals.sic_output_device_05 import OUTPUT_DEVICE_05, OUTPUT_DEVICE_05_CODE
 from SIC_Utilities.sic_constants import BYTES_IN_MEMORY, INITIALIZATION_CHARACTER, MINIMUM_MEMORY_ADDRESS_DEC, \
-    MAXIMUM_MEMORY_ADDRESS_DEC
-from SIC_Utilities.sic_converter import dec_to_memory_address_hex_string
+    MAXIMUM_MEMORY_ADDRESS_DEC, BYTES_IN_WORD
 
 
 class SICMemoryModelError(Exception):
@@ -14,8 +15,47 @@ class SICMemoryModel:
     BYTES_PER_GROUP = 4
     ROWS_IN_MEMORY_DUMP = BYTES_IN_MEMORY // BYTES_PER_ROW
 
-    def __init__(self):
-        self.memory_model_dict = self.initialize_memory()
+    # Uninitialized memory reads as FF.
+    # One bit per byte of memory records whether that byte has been written since initialization,
+    # so dump_memory can still show uninitialized bytes as "--".
+    UNINITIALIZED_BYTE_VALUE = 0xFF
+    BYTES_IN_BITMAP = BYTES_IN_MEMORY // 8
+    UNINITIALIZED_MEMORY_IMAGE = bytes([UNINITIALIZED_BYTE_VALUE]) * BYTES_IN_MEMORY
+    UNINITIALIZED_BITMAP_IMAGE = bytes(BYTES_IN_BITMAP)
+
+    # Decoded instructions are cached by the executor, one slot per memory address.
+    # An instruction starting up to 2 bytes before a written byte overlaps it.
+    EMPTY_DECODED_INSTRUCTION_CACHE = [None] * BYTES_IN_MEMORY
+    DECODED_INSTRUCTION_OVERLAP = BYTES_IN_WORD - 1
+
+    # A memory image is restored one page at a time, only the pages that differ are written (restore_memory_image)
+    BYTES_PER_RESTORE_PAGE = 256
+
+    # Compiled blocks (see sic_block_compiler) are cached by start address.
+    # The compiled code map flags every byte of memory that is covered by a compiled block.
+    EMPTY_COMPILED_CODE_MAP = bytes(BYTES_IN_MEMORY)
+    COMPILED_CODE_FLAG = 1
+    # Compiled blocks read and write memory_bytearray directly, memory models without it do not support them
+    SUPPORTS_COMPILED_BLOCKS = True
+
+    # While the write log is a list, every write through the integer API first appends the old contents of the
+    # memory it writes: (address, old bytes, initialization bits of the old bytes), see log_write.
+    # The time travel log (see sic_time_travel) collects the writes of each step this way.
+
+    # The memory model also holds the device table (devices by device code) and the termination flag
+    # of the machine it belongs to, because the operation handlers only see REGISTER_DICT and MEMORY_MODEL.
+    def __init__(self, device_dict=None):
+        self.device_dict = device_dict if device_dict is not None else {}
+        self.is_program_terminated_normally = False
+        self.memory_bytearray = bytearray(self.UNINITIALIZED_MEMORY_IMAGE)
+        self.memory_view = memoryview(self.memory_bytearray)
+        self.initialized_bitmap = bytearray(self.UNINITIALIZED_BITMAP_IMAGE)
+        self.decoded_instruction_cache = list(self.EMPTY_DECODED_INSTRUCTION_CACHE)
+        self.compiled_block_dict = {}
+        self.compiled_code_map = bytearray(self.EMPTY_COMPILED_CODE_MAP)
+        # Visits to the start of each block that is not compiled yet (see sic_block_compiler)
+        self.block_visit_count_dict = {}
+        self.write_log = None
 
     def test_for_dec_memory_address_in_range(self, memory_address_dec_value: int):
         is_in_memory_address_range = False
@@ -27,71 +67,270 @@ class SICMemoryModel:
             pass
         return is_in_memory_address_range
 
-    def get_byte(self, memory_address_dec_value: int):
-        if not self.test_for_dec_memory_address_in_range(memory_address_dec_value):
+    def test_for_initialized_byte(self, memory_address_dec_value: int):
+        return self.initialized_bitmap[memory_address_dec_value >> 3] & (1 << (memory_address_dec_value & 7)) != 0
+
+    def clear_initialized_byte(self, memory_address_dec_value: int):
+        self.initialized_bitmap[memory_address_dec_value >> 3] &= ~(1 << (memory_address_dec_value & 7))
+
+    # This function sets the initialization bits for a range of memory addresses.
+    # Whole bitmap bytes are filled with a single slice assignment.
+    def mark_initialized(self, memory_address_dec_value: int, number_of_bytes: int):
+        address_dec = memory_address_dec_value
+        end_address_dec = memory_address_dec_value + number_of_bytes
+
+        # Leading bits up to the first whole bitmap byte
+        while address_dec < end_address_dec and address_dec & 7:
+            self.initialized_bitmap[address_dec >> 3] |= 1 << (address_dec & 7)
+            address_dec += 1
+
+        # Whole bitmap bytes
+        whole_end_address_dec = end_address_dec & ~7
+        if address_dec < whole_end_address_dec:
+            self.initialized_bitmap[address_dec >> 3:whole_end_address_dec >> 3] = \
+                b"\xFF" * ((whole_end_address_dec - address_dec) >> 3)
+            address_dec = whole_end_address_dec
+
+        # Trailing bits
+        while address_dec < end_address_dec:
+            self.initialized_bitmap[address_dec >> 3] |= 1 << (address_dec & 7)
+            address_dec += 1
+
+    # This function drops any cached decoded instruction or compiled block that overlaps a range of written memory.
+    def invalidate_decoded_instructions(self, memory_address_dec_value: int, number_of_bytes: int):
+        start_address_dec = memory_address_dec_value - self.DECODED_INSTRUCTION_OVERLAP
+        if start_address_dec < 0:
+            start_address_dec = 0
+        end_address_dec = memory_address_dec_value + number_of_bytes
+        self.decoded_instruction_cache[start_address_dec:end_address_dec] = \
+            self.EMPTY_DECODED_INSTRUCTION_CACHE[start_address_dec:end_address_dec]
+
+        if self.compiled_code_map.find(self.COMPILED_CODE_FLAG, memory_address_dec_value, end_address_dec) != -1:
+            self.invalidate_compiled_blocks(memory_address_dec_value, number_of_bytes)
+
+    # This function caches a compiled block and flags the memory it covers.
+    def add_compiled_block(self, compiled_block):
+        self.compiled_block_dict[compiled_block.start_address_dec] = compiled_block
+        self.compiled_code_map[compiled_block.start_address_dec:compiled_block.end_address_dec] = \
+            bytes([self.COMPILED_CODE_FLAG]) * (compiled_block.end_address_dec - compiled_block.start_address_dec)
+
+    # This function drops every compiled block that overlaps a range of written memory.
+    # A dropped block is flagged as invalid, so a block that writes over its own code can stop running.
+    def invalidate_compiled_blocks(self, memory_address_dec_value: int, number_of_bytes: int):
+        end_address_dec = memory_address_dec_value + number_of_bytes
+
+        for compiled_block in list(self.compiled_block_dict.values()):
+            if (compiled_block.start_address_dec < end_address_dec and
+                    memory_address_dec_value < compiled_block.end_address_dec):
+                compiled_block.is_valid = False
+                del self.compiled_block_dict[compiled_block.start_address_dec]
+                self.compiled_code_map[compiled_block.start_address_dec:compiled_block.end_address_dec] = \
+                    self.EMPTY_COMPILED_CODE_MAP[compiled_block.start_address_dec:compiled_block.end_address_dec]
+
+        # Compiled blocks can overlap each other, so flag the code of the remaining blocks again
+        for compiled_block in self.compiled_block_dict.values():
+            self.compiled_code_map[compiled_block.start_address_dec:compiled_block.end_address_dec] = \
+                bytes([self.COMPILED_CODE_FLAG]) * (compiled_block.end_address_dec - compiled_block.start_address_dec)
+
+    # INTEGER API
+    def read_byte(self, memory_address_dec_value: int):
+        if not MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC:
             raise SICMemoryModelError("Memory address out of range.")
 
-        byte_string = self.memory_model_dict[memory_address_dec_value]
-        # Replace the initialization characters("-") encountered with "F".
-        byte_string = byte_string.replace(INITIALIZATION_CHARACTER, "F")
+        return self.memory_bytearray[memory_address_dec_value]
 
-        return byte_string
+    def write_byte(self, memory_address_dec_value: int, byte_value: int):
+        if not MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC:
+            raise SICMemoryModelError("Memory address out of range.")
 
-    def get_bytes(self, memory_address_dec_value: int, number_of_bytes: int):
-        byte_string = ""
-        index = 0
+        if self.write_log is not None:
+            self.log_write(memory_address_dec_value, 1)
 
-        # Concatenate requested byte string
-        while index < number_of_bytes:
-            if not self.test_for_dec_memory_address_in_range(memory_address_dec_value + index):
-                raise SICMemoryModelError("Memory address out of range.")
-            byte_string += self.memory_model_dict[memory_address_dec_value + index]
-            index += 1
-        # Replace the initialization characters("-") encountered with "F".
-        byte_string = byte_string.replace(INITIALIZATION_CHARACTER, "F")
+        self.memory_bytearray[memory_address_dec_value] = byte_value
+        self.initialized_bitmap[memory_address_dec_value >> 3] |= 1 << (memory_address_dec_value & 7)
+        self.invalidate_decoded_instructions(memory_address_dec_value, 1)
 
-        return byte_string
+    def read_word(self, memory_address_dec_value: int):
+        if not MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC - 2:
+            raise SICMemoryModelError("Memory address out of range.")
 
-    def set_byte(self, memory_address_dec_value: int, byte_string: str):
-        if not self.test_for_dec_memory_address_in_range(memory_address_dec_value):
+        memory_bytearray = self.memory_bytearray
+        return ((memory_bytearray[memory_address_dec_value] << 16) |
+                (memory_bytearray[memory_address_dec_value + 1] << 8) |
+                memory_bytearray[memory_address_dec_value + 2])
+
+    # The whole word is range checked before any byte is written.
+    def write_word(self, memory_address_dec_value: int, word_value: int):
+        if not MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC - 2:
+            raise SICMemoryModelError("Memory address out of range.")
+
+        if self.write_log is not None:
+            self.log_write(memory_address_dec_value, BYTES_IN_WORD)
+
+        memory_bytearray = self.memory_bytearray
+        memory_bytearray[memory_address_dec_value] = word_value >> 16
+        memory_bytearray[memory_address_dec_value + 1] = (word_value >> 8) & 0xFF
+        memory_bytearray[memory_address_dec_value + 2] = word_value & 0xFF
+
+        # The three initialized bits can straddle two bitmap bytes
+        initialized_bits = 7 << (memory_address_dec_value & 7)
+        self.initialized_bitmap[memory_address_dec_value >> 3] |= initialized_bits & 0xFF
+        if initialized_bits > 0xFF:
+            self.initialized_bitmap[(memory_address_dec_value >> 3) + 1] |= initialized_bits >> 8
+
+        self.invalidate_decoded_instructions(memory_address_dec_value, BYTES_IN_WORD)
+
+    def read_bytes(self, memory_address_dec_value: int, number_of_bytes: int):
+        end_address_dec = memory_address_dec_value + number_of_bytes
+        if not (MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value and
+                end_address_dec - 1 <= MAXIMUM_MEMORY_ADDRESS_DEC):
             raise SICMemoryModelError("Memory address out of range.")
 
-        self.memory_model_dict[memory_address_dec_value] = byte_string
+        return bytes(self.memory_view[memory_address_dec_value:end_address_dec])
+
+    def write_bytes(self, memory_address_dec_value: int, byte_data):
+        end_address_dec = memory_address_dec_value + len(byte_data)
+        if not (MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value and
+                end_address_dec - 1 <= MAXIMUM_MEMORY_ADDRESS_DEC):
+            raise SICMemoryModelError("Memory address out of range.")
+
+        if self.write_log is not None:
+            self.log_write(memory_address_dec_value, len(byte_data))
+
+        self.memory_view[memory_address_dec_value:end_address_dec] = byte_data
+        self.mark_initialized(memory_address_dec_value, len(byte_data))
+        self.invalidate_decoded_instructions(memory_address_dec_value, len(byte_data))
+
+    # WRITE LOG
+    # This function appends the old contents of a range of memory that is about to be written to the write log.
+    # Bit n of the initialization bits is set if byte n of the range was initialized.
+    def log_write(self, memory_address_dec_value: int, number_of_bytes: int):
+        initialized_bits = 0
+        for byte_index in range(number_of_bytes):
+            if self.test_for_initialized_byte(memory_address_dec_value + byte_index):
+                initialized_bits |= 1 << byte_index
+
+        self.write_log.append((memory_address_dec_value,
+                               self.read_bytes(memory_address_dec_value, number_of_bytes),
+                               initialized_bits))
+
+    # This function writes back the old contents of memory from a write log entry, initialization bits included.
+    def undo_write(self, memory_address_dec_value: int, byte_data, initialized_bits: int):
+        self.write_bytes(memory_address_dec_value, byte_data)
+        for byte_index in range(len(byte_data)):
+            if not initialized_bits & (1 << byte_index):
+                self.clear_initialized_byte(memory_address_dec_value + byte_index)
+
+    # HEX STRING API
+    # Thin compatibility layer over the integer API.
+    def get_byte(self, memory_address_dec_value: int):
+        return format(self.read_byte(memory_address_dec_value), "02X")
+
+    def get_bytes(self, memory_address_dec_value: int, number_of_bytes: int):
+        return self.read_bytes(memory_address_dec_value, number_of_bytes).hex().upper()
+
+    def set_byte(self, memory_address_dec_value: int, byte_string: str):
+        try:
+            byte_value = int(byte_string, 16)
+        except ValueError:
+            raise SICMemoryModelError("Invalid byte string.")
+
+        if not 0 <= byte_value <= 0xFF:
+            raise SICMemoryModelError("Invalid byte string.")
+
+        self.write_byte(memory_address_dec_value, byte_value)
 
     def initialize_memory(self):
-        # Create an empty dictionary to model memory
-        # Load dictionary with empty bytes
-        self.memory_model_dict = {}
-        for byte_address_dec in range(BYTES_IN_MEMORY):
-            self.memory_model_dict[byte_address_dec] = INITIALIZATION_CHARACTER * 2
+        # Reset every byte to its uninitialized value and clear the initialization bitmap
+        self.memory_view[:] = self.UNINITIALIZED_MEMORY_IMAGE
+        self.initialized_bitmap[:] = self.UNINITIALIZED_BITMAP_IMAGE
+        self.decoded_instruction_cache[:] = self.EMPTY_DECODED_INSTRUCTION_CACHE
+        for compiled_block in self.compiled_block_dict.values():
+            compiled_block.is_valid = False
+        self.compiled_block_dict.clear()
+        self.compiled_code_map[:] = self.EMPTY_COMPILED_CODE_MAP
+        self.block_visit_count_dict.clear()
 
-        return self.memory_model_dict
+    # These functions return copies of memory and of its initialization bitmap (bytes).
+    def get_memory_image(self):
+        return bytes(self.memory_bytearray)
+
+    def get_initialized_bitmap_image(self):
+        return bytes(self.initialized_bitmap)
+
+    # This function returns a copy of the memory model for a forked machine, with its own device table.
+    # The copy starts with empty caches, so every instruction is decoded (and compiled) again as it runs.
+    def fork(self, device_dict=None):
+        memory_model = SICMemoryModel(device_dict)
+        memory_model.memory_view[:] = self.memory_bytearray
+        memory_model.initialized_bitmap[:] = self.initialized_bitmap
+        memory_model.is_program_terminated_normally = self.is_program_terminated_normally
+        return memory_model
+
+    # This function restores memory and its initialization bitmap from images (bytes, as in a machine snapshot).
+    # Only the pages that differ from the image are written, so the decoded instructions and compiled blocks
+    # of unchanged code stay cached.
+    def restore_memory_image(self, memory_image, initialized_bitmap_image):
+        if len(memory_image) != BYTES_IN_MEMORY or len(initialized_bitmap_image) != self.BYTES_IN_BITMAP:
+            raise SICMemoryModelError("Invalid memory image.")
+
+        if self.memory_bytearray != memory_image:
+            for page_address_dec in range(0, BYTES_IN_MEMORY, self.BYTES_PER_RESTORE_PAGE):
+                page_end_address_dec = page_address_dec + self.BYTES_PER_RESTORE_PAGE
+                page_image = memory_image[page_address_dec:page_end_address_dec]
+                if self.memory_bytearray[page_address_dec:page_end_address_dec] != page_image:
+                    self.memory_view[page_address_dec:page_end_address_dec] = page_image
+                    self.invalidate_decoded_instructions(page_address_dec, self.BYTES_PER_RESTORE_PAGE)
+
+        self.initialized_bitmap[:] = initialized_bitmap_image
+
+    # This function formats the whole memory dump as a single string, one row per line.
+    # Rows that are all initialized or all uninitialized are formatted without testing each byte.
+    def get_memory_dump_string(self):
+        memory_row_string_list = []
+        uninitialized_byte_string = INITIALIZATION_CHARACTER * 2
+        bitmap_bytes_per_row = self.BYTES_PER_ROW // 8
+        memory_image = self.get_memory_image()
+        initialized_bitmap_image = self.get_initialized_bitmap_image()
 
-    def dump_memory(self):
         # rows 0 through 2048 (32767 / 16)
         for row in range(self.ROWS_IN_MEMORY_DUMP):
             # Row Format:
             # ADDR   Memory Contents
             # XXXX   -- -- -- --   -- -- -- --   -- -- -- --   -- -- -- --
+            row_address_dec = row * self.BYTES_PER_ROW
+            row_bitmap = initialized_bitmap_image[row_address_dec >> 3:(row_address_dec >> 3) + bitmap_bytes_per_row]
 
-            # Create memory_row_string and initialize it with a byte address as a 4 digit hex value
-            memory_row_string = dec_to_memory_address_hex_string(row * self.BYTES_PER_ROW)
-            # 0 through 15
-            for byte_column in range(self.BYTES_PER_ROW):
-                # calculate byte address
-                byte_address_dec = row * self.BYTES_PER_ROW + byte_column
+            if not any(row_bitmap):
+                byte_string_list = [uninitialized_byte_string] * self.BYTES_PER_ROW
+            else:
+                row_bytes = memory_image[row_address_dec:row_address_dec + self.BYTES_PER_ROW]
+                row_hex_string = row_bytes.hex().upper()
+                byte_string_list = [row_hex_string[index:index + 2] for index in range(0, len(row_hex_string), 2)]
+                if row_bitmap.count(0xFF) != bitmap_bytes_per_row:
+                    # 0 through 15
+                    for byte_column in range(self.BYTES_PER_ROW):
+                        if not self.test_for_initialized_byte(row_address_dec + byte_column):
+                            byte_string_list[byte_column] = uninitialized_byte_string
 
-                if byte_address_dec % self.BYTES_PER_GROUP == 0:
-                    memory_row_string += self.LARGE_SEPARATOR + self.memory_model_dict[byte_address_dec]
-                else:
-                    memory_row_string += self.SMALL_SEPARATOR + self.memory_model_dict[byte_address_dec]
+            # Start memory_row_string with the row byte address as a 4 digit hex value
+            memory_row_string = format(row_address_dec, "04X")
+            for group_index in range(0, self.BYTES_PER_ROW, self.BYTES_PER_GROUP):
+                memory_row_string += (self.LARGE_SEPARATOR +
+                                      self.SMALL_SEPARATOR.join(byte_string_list[group_index:
+                                                                                 group_index + self.BYTES_PER_GROUP]))
 
-            print(memory_row_string)
+            memory_row_string_list.append(memory_row_string)
+
+        return "\n".join(memory_row_string_list)
+
+    def dump_memory(self):
+        print(self.get_memory_dump_string())
 
 
-MEMORY_MODEL = SICMemoryModel()
+MEMORY_MODEL = SICMemoryModel({OUTPUT_DEVICE_05_CODE: OUTPUT_DEVICE_05, INPUT_DEVICE_F1_CODE: INPUT_DEVICE_F1})
 
 # test bed
-# memory_model_dict = initialize_memory()
+# MEMORY_MODEL.initialize_memory()
 #
-# dump_memory(memory_model_dict)
+# MEMORY_MODEL.dump_memory()
@@ -1,4 +1,6 @@
 import os.path
+import re
+from typing import NamedTuple
 
 from SIC_Simulator.sic_configuration import SIC_DEFAULT_WORKING_DIRECTORY
 from SIC_Utilities.sic_constants import SIC_OBJECT_CODE_FILE_EXTENSION
@@ -126,6 +128,83 @@ def sic_object_code_parser(object_code_file):
     return parsed_object_code_dict_list
 
 
+# STREAMING PARSER
+# iterate_object_code_records reads object code one line at a time and yields one typed record per line,
+# with addresses as integers and the object code of a text record already decoded to bytes,
+# so a loader can load each record as it is read without holding the whole file.
+# Each line is validated by a single precompiled pattern that holds the rules of the record parsers above.
+class SICHeaderRecord(NamedTuple):
+    program_name: str
+    program_start_address_dec: int
+    program_length_dec: int
+
+
+class SICTextRecord(NamedTuple):
+    start_address_dec: int
+    byte_data: bytes
+
+
+class SICEndRecord(NamedTuple):
+    program_start_address_dec: int
+
+
+# Addresses and lengths are six hex digits of which only the last four are used, as in the record parsers above.
+OBJECT_CODE_RECORD_PATTERN = re.compile(r"H(?P<program_name>.{6})[0-9A-F]{2}(?P<program_start_address>[0-9A-F]{4})"
+                                        r"[0-9A-F]{2}(?P<program_length>[0-9A-F]{4})|"
+                                        r"T[0-9A-F]{2}(?P<start_address>[0-9A-F]{4})(?P<byte_count>[0-9A-F]{2})"
+                                        r"(?P<object_code>(?:[0-9A-F]{2}){1,30})|"
+                                        r"E[0-9A-F]{2}(?P<end_program_start_address>[0-9A-F]{4})")
+INVALID_RECORD_MESSAGE_DICT = {"H": "Invalid header record", "T": "Invalid text record", "E": "Invalid End Record"}
+
+
+# This function parses one line of object code (trailing whitespace removed) into a typed record.
+def parse_object_code_record(unparsed_line_of_object_code):
+    record_match = OBJECT_CODE_RECORD_PATTERN.fullmatch(unparsed_line_of_object_code)
+    if record_match is None:
+        # ERROR
+        raise SICObjectCodeParserError(INVALID_RECORD_MESSAGE_DICT.get(unparsed_line_of_object_code[:1],
+                                                                       "Invalid record type"))
+
+    match unparsed_line_of_object_code[0]:
+        case "H":
+            return SICHeaderRecord(record_match["program_name"].rstrip(),
+                                   int(record_match["program_start_address"], 16),
+                                   int(record_match["program_length"], 16))
+        case "T":
+            byte_data = bytes.fromhex(record_match["object_code"])
+            # Verify that byte count is correct
+            if int(record_match["byte_count"], 16) != len(byte_data):
+                # ERROR
+                raise SICObjectCodeParserError("Invalid text record")
+            return SICTextRecord(int(record_match["start_address"], 16), byte_data)
+        case _:
+            return SICEndRecord(int(record_match["end_program_start_address"], 16))
+
+
+# This function reads an object code file (*.obj) one line at a time and yields its records.
+# The object code must start with a header record. The caller closes the file.
+def iterate_object_code_records(object_code_file):
+    is_first_record = True
+
+    for line_of_object_code in object_code_file:
+        try:
+            object_code_record = parse_object_code_record(line_of_object_code.rstrip())
+
+            if is_first_record and not isinstance(object_code_record, SICHeaderRecord):
+                # ERROR
+                raise SICObjectCodeParserError("Object code does not start with a header record")
+        except SICObjectCodeParserError as ex:
+            # ERROR
+            raise SICObjectCodeParserError("Could not parse object code - " + str(ex))
+
+        is_first_record = False
+        yield object_code_record
+
+    if is_first_record:
+        # ERROR
+        raise SICObjectCodeParserError("Could not parse object code - Object code does not start with a header record")
+
+
 # TEST BED
 # object_code_file_name = "ReadWrite"
 #
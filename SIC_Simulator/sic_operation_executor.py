@@ -1,644 +1,476 @@
-import random
-
-from SIC_Peripherals.sic_input_device_F1 import read_byte_input_device_F1, test_input_device_F1
-from SIC_Peripherals.sic_output_device_05 import test_output_device_05, write_byte_to_output_device_05
+from SIC_Peripherals.sic_input_device_F1 import INPUT_DEVICE_F1_CODE
+from SIC_Peripherals.sic_output_device_05 import OUTPUT_DEVICE_05_CODE
 from SIC_Simulator.sic_memory_model import SICMemoryModelError
-from SIC_Simulator.sic_register_model import REGISTER_DICT, REGISTER_A, REGISTER_PC, REGISTER_X, REGISTER_SW, REGISTER_L
-from SIC_Utilities import sic_integer
-from SIC_Utilities.sic_constants import HEX_TO_OPCODE_DICT, BYTES_IN_WORD, \
-    FROM_INDEXED_ADDRESSING_DICT, MINIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_INTEGER, \
-    MINIMUM_INTEGER, SW_LESS_THAN, SW_EQUAL, SW_GREATER_THAN, BITS_IN_WORD
-from SIC_Utilities.sic_converter import hex_string_to_dec, dec_to_hex_string, hex_word_to_bin_word
+from SIC_Simulator.sic_register_model import REGISTER_DICT, REGISTER_A, REGISTER_PC, REGISTER_X, REGISTER_SW, REGISTER_L, \
+    SICRegisterContentsError
+from SIC_Utilities.sic_constants import OPCODE_TO_HEX_DICT, BYTES_IN_WORD, \
+    MINIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_INTEGER, MINIMUM_INTEGER, SW_LESS_THAN_DEC, \
+    SW_EQUAL_DEC, SW_GREATER_THAN_DEC, MAXIMUM_WORD_DEC, SW_LESS_THAN, SW_EQUAL
+from SIC_Utilities.sic_converter import hex_string_to_dec
+from SIC_Utilities.sic_integer import word_to_dec
 from SIC_Utilities.sic_messaging import print_error, print_status
 
+# INSTRUCTION FORMAT: [OPCODE 8 bits][X 1 bit][ADDRESS 15 bits]
+INDEXED_ADDRESSING_FLAG = 0x8000
+ADDRESS_MASK = 0x7FFF
+
+# Register X or a jump target that does not fit in a register (above FFFFFF) halts the program
+REGISTER_CONTENTS_FAULT_MESSAGE = "REGISTER CONTENTS FAULT: Halting program execution\n"
+
+NUMBER_OF_OPCODES = 256
+
+# A device polling loop spends two steps (TD, JEQ) on every device test
+POLLING_LOOP_STEPS_PER_TEST = 2
+
+# Operation handlers raise this error to halt program execution.
+# The error arguments are the lines of the fault message.
+class SICOperationExecutorError(Exception):
+    pass
+
 
 # This function will test to see if a memory address is in the range of memory provided in the simulator(0000-7FFF).
-def test_for_hex_memory_address_in_range(memory_address_hex_string):
-    is_in_memory_address_range = False
-    memory_address_dec_value = hex_string_to_dec(memory_address_hex_string)
+def test_for_dec_memory_address_in_range(memory_address_dec_value):
+    return MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC
+
+
+# This function checks to see if the address field of an instruction has indexed addressing called.
+# It checks for the indexed addressing flag (the high bit) in the [X] position of the instruction format.
+# INSTRUCTION FORMAT: [OPCODE 8 bits][X 1 bit][ADDRESS 15 bits]
+def test_for_indexed_addressing(address_field_dec_value):
+    return address_field_dec_value & INDEXED_ADDRESSING_FLAG != 0
 
-    if MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC:
-        is_in_memory_address_range = True
+
+# This function sets the status word register based on a comparison.
+def compare_and_set_status_word(REGISTER_DICT, left_dec_value, right_dec_value):
+    if left_dec_value < right_dec_value:
+        REGISTER_DICT[REGISTER_SW].set_value(SW_LESS_THAN_DEC)
+    elif left_dec_value == right_dec_value:
+        REGISTER_DICT[REGISTER_SW].set_value(SW_EQUAL_DEC)
     else:
-        # NOTE: Raise exception?
-        pass
-    return is_in_memory_address_range
+        REGISTER_DICT[REGISTER_SW].set_value(SW_GREATER_THAN_DEC)
 
 
-# This function checks to see if a memory address hex string has indexed addressing called.
-# It checks for an indexed addressing flag (8, 9, A, B, C, D, E, F) in the [X] position of the instruction format.
-# INSTRUCTION FORMAT: [OPCODE 8 bits][X][ADDRESS 15 bits]
-def test_for_indexed_addressing(memory_address_hex_string):
-    is_indexed_addressing = False
+# This function raises an integer out of range fault if a result does not fit in a SIC integer.
+def test_for_integer_in_range(dec_value, fault_message="INTEGER OUT OF RANGE: Halting program execution\n"):
+    if not MINIMUM_INTEGER <= dec_value <= MAXIMUM_INTEGER:
+        raise SICOperationExecutorError(fault_message)
 
-    indexed_addressing_flag_character = memory_address_hex_string[0]
 
-    if indexed_addressing_flag_character > "7":
-        is_indexed_addressing = True
+# This function raises a program counter fault if the PC register does not hold an in-range memory address.
+def test_for_program_counter_in_range(REGISTER_DICT):
+    if not test_for_dec_memory_address_in_range(REGISTER_DICT[REGISTER_PC].get_value()):
+        raise SICOperationExecutorError("PROGRAM COUNTER FAULT: Halting program execution",
+                                        "PC REGISTER: " + REGISTER_DICT[REGISTER_PC].get_hex_string() + "\n")
 
-    return is_indexed_addressing
 
+####################
+# OPERATION HANDLERS
+####################
+# Every handler takes (REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value) and returns continue_execution.
+# Memory faults (SICMemoryModelError) and other faults (SICOperationExecutorError) are handled by execute_operation.
+# The devices of the machine are found in the device table of its memory model.
 
-# This function
-def create_indexed_address(memory_address_hex_string, REGISTER_DICT):
-    indexed_addressing_flag_character = memory_address_hex_string[0]
+def execute_add(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A <- (A) + (m..m+2)
+    sum_dec_value = (word_to_dec(REGISTER_DICT[REGISTER_A].get_value()) +
+                     word_to_dec(MEMORY_MODEL.read_word(memory_address_dec_value)))
+    test_for_integer_in_range(sum_dec_value)
 
-    # Remove the indexed addressing flag from the indexed addressing flag character
-    unflagged_character = FROM_INDEXED_ADDRESSING_DICT[indexed_addressing_flag_character]
+    REGISTER_DICT[REGISTER_A].set_value(sum_dec_value & MAXIMUM_WORD_DEC)
+    return True
 
-    memory_address_hex_string = unflagged_character + memory_address_hex_string[1:]
-    memory_address_dec_value = hex_string_to_dec(memory_address_hex_string)
 
-    x_register_hex_string = REGISTER_DICT[REGISTER_X].get_hex_string()
-    x_register_dec_value = hex_string_to_dec(x_register_hex_string)
+def execute_and(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A <- (A) & (m..m+2)
+    register_a_word_value = REGISTER_DICT[REGISTER_A].get_value()
+    REGISTER_DICT[REGISTER_A].set_value(register_a_word_value & MEMORY_MODEL.read_word(memory_address_dec_value))
+    return True
 
-    memory_address_hex_string = dec_to_hex_string(memory_address_dec_value + x_register_dec_value)
 
-    return memory_address_hex_string
+def execute_comp(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # (A) : (m..m+2)
+    register_a_dec_value = REGISTER_DICT[REGISTER_A].get_value()
+    memory_value_dec_value = word_to_dec(MEMORY_MODEL.read_word(memory_address_dec_value))
 
+    compare_and_set_status_word(REGISTER_DICT, register_a_dec_value, memory_value_dec_value)
+    return True
 
-def execute_operation(REGISTER_DICT, MEMORY_MODEL):
-    # PROGRAM COUNTER
-    pc_register_dec_value = hex_string_to_dec(REGISTER_DICT[REGISTER_PC].get_hex_string())
 
-    # OPCODE
-    # Look up operation code in memory and validate
-    try:
-        opcode_hex_string = MEMORY_MODEL.get_byte(pc_register_dec_value)
-    except SICMemoryModelError:
-        print_error("MEMORY FAULT: Halting program execution\n")
-        continue_execution = False
-        return continue_execution
+def execute_div(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A <- (A) / (m..m+2)
+    register_a_dec_value = word_to_dec(REGISTER_DICT[REGISTER_A].get_value())
+    word_dec_value = word_to_dec(MEMORY_MODEL.read_word(memory_address_dec_value))
 
-    opcode_mnemonic = HEX_TO_OPCODE_DICT.get(opcode_hex_string)
+    if word_dec_value == 0:
+        raise SICOperationExecutorError("DIVISION BY ZERO FAULT: Halting program execution\n")
 
-    # Verify that the opcode is supported by the simulator.
-    if opcode_mnemonic is None:
-        print_error("UNRECOGNIZED OPCODE FAULT: Halting program execution",
-                    "OPCODE: " + opcode_hex_string + "\n")
-        continue_execution = False
-        return continue_execution
+    quotient_dec_value = register_a_dec_value // word_dec_value
+    test_for_integer_in_range(quotient_dec_value, "INTEGER OUT OF RANGE FAULT: Halting program execution\n")
 
-    # MEMORY ADDRESS
-    # Build the memory address
-    try:
-        memory_address_hex_string = MEMORY_MODEL.get_bytes(pc_register_dec_value + 1, 2)
-    except SICMemoryModelError:
-        print_error("MEMORY FAULT: Halting program execution\n")
-        continue_execution = False
-        return continue_execution
+    REGISTER_DICT[REGISTER_A].set_value(quotient_dec_value & MAXIMUM_WORD_DEC)
+    return True
 
-    # Test for indexed addressing
-    is_indexed_addressing = test_for_indexed_addressing(memory_address_hex_string)
 
-    if is_indexed_addressing:
-        memory_address_hex_string = create_indexed_address(memory_address_hex_string, REGISTER_DICT)
+def execute_j(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # PC <- m
+    REGISTER_DICT[REGISTER_PC].set_value(memory_address_dec_value)
+    return True
 
-    memory_address_dec_value = hex_string_to_dec(memory_address_hex_string)
 
-    # Increment PC Register
-    REGISTER_DICT[REGISTER_PC].set_hex_string(dec_to_hex_string(pc_register_dec_value + BYTES_IN_WORD))
+def execute_jeq(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # PC <- m if CC set to =
+    if REGISTER_DICT[REGISTER_SW].get_value() == SW_EQUAL_DEC:
+        REGISTER_DICT[REGISTER_PC].set_value(memory_address_dec_value)
+    return True
 
-    # Verify that the PC register holds an in-range memory address
-    if not test_for_hex_memory_address_in_range(REGISTER_DICT[REGISTER_PC].get_hex_string()):
-        print_error("PROGRAM COUNTER FAULT: Halting program execution",
-                    "PC REGISTER: " + REGISTER_DICT[REGISTER_PC].get_hex_string() + "\n")
-        continue_execution = False
-        return continue_execution
 
-    # EXECUTE INSTRUCTION
-    match opcode_mnemonic:
-        case "ADD":
-            # A <- (A) + (m..m+2)
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            register_a_dec_value = sic_integer.hex_string_to_dec(register_a_hex_string)
+def execute_jgt(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # PC <- m if CC set to >
+    if REGISTER_DICT[REGISTER_SW].get_value() == SW_GREATER_THAN_DEC:
+        REGISTER_DICT[REGISTER_PC].set_value(memory_address_dec_value)
+    return True
 
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
 
-            # Convert to decimal value and do the arithmetic.
-            word_dec_value = sic_integer.hex_string_to_dec(word_hex_string)
+def execute_jlt(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # PC <- m if CC set to <
+    if REGISTER_DICT[REGISTER_SW].get_value() == SW_LESS_THAN_DEC:
+        REGISTER_DICT[REGISTER_PC].set_value(memory_address_dec_value)
+    return True
 
-            sum_dec_value = register_a_dec_value + word_dec_value
 
-            if not MINIMUM_INTEGER <= sum_dec_value <= MAXIMUM_INTEGER:
-                print_error("INTEGER OUT OF RANGE: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
+def execute_jsub(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # L <- (PC); PC <- m
+    REGISTER_DICT[REGISTER_L].set_value(REGISTER_DICT[REGISTER_PC].get_value())
+    REGISTER_DICT[REGISTER_PC].set_value(memory_address_dec_value)
+    return True
 
-            REGISTER_DICT[REGISTER_A].set_hex_string(sic_integer.dec_to_hex_string(sum_dec_value))
 
-            continue_execution = True
-            return continue_execution
-        case "AND":
-            # A <- (A) & (m..m+2)
-            # Get the contents of register A as a binary string
-            register_a_bin_string = REGISTER_DICT[REGISTER_A].get_bin_string()
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-            # Convert hex string to bin string
-            word_bin_string = hex_word_to_bin_word(word_hex_string)
-
-            # Do the logical AND comparison
-            and_bin_string = ""
-            for index in range(BITS_IN_WORD):
-                if register_a_bin_string[index] == "1" and word_bin_string[index] == "1":
-                    and_bin_string += "1"
-                else:
-                    and_bin_string += "0"
-
-            # Store the comparison result in register A
-            REGISTER_DICT[REGISTER_A].set_bin_string(and_bin_string)
-
-            continue_execution = True
-            return continue_execution
-        case "COMP":
-            # (A) : (m..m+2)
-            # Get value held in register A
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            register_a_dec_value = hex_string_to_dec(register_a_hex_string)
-            # Compare the register A value with the value stored at the memory address
-            try:
-                memory_value_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, 3)
-                memory_value_dec_value = sic_integer.hex_string_to_dec(memory_value_hex_string)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-            # Set status word register based on the comparison
-            if register_a_dec_value < memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_LESS_THAN)
-            elif register_a_dec_value == memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_EQUAL)
-            elif register_a_dec_value > memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_GREATER_THAN)
-
-            continue_execution = True
-            return continue_execution
-        case "DIV":
-            # A <- (A) / (m + m..2)
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            register_a_dec_value = sic_integer.hex_string_to_dec(register_a_hex_string)
+def execute_lda(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A <- (m..m+2)
+    REGISTER_DICT[REGISTER_A].set_value(MEMORY_MODEL.read_word(memory_address_dec_value))
+    return True
 
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
 
-            # Convert to decimal value and do the arithmetic.
-            word_dec_value = sic_integer.hex_string_to_dec(word_hex_string)
+def execute_ldch(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A[rightmost byte] <- (m)
+    # All other bytes in register A are unaffected
+    byte_value = MEMORY_MODEL.read_byte(memory_address_dec_value)
+    register_a_word_value = REGISTER_DICT[REGISTER_A].get_value()
+    REGISTER_DICT[REGISTER_A].set_value((register_a_word_value & 0xFFFF00) | byte_value)
+    return True
 
-            if word_dec_value == 0:
-                print_error("DIVISION BY ZERO FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
 
-            quotient_dec_value = register_a_dec_value // word_dec_value
+def execute_ldl(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # L <- (m..m+2)
+    REGISTER_DICT[REGISTER_L].set_value(MEMORY_MODEL.read_word(memory_address_dec_value))
+    return True
 
-            if not MINIMUM_INTEGER <= quotient_dec_value <= MAXIMUM_INTEGER:
-                print_error("INTEGER OUT OF RANGE FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
 
-            REGISTER_DICT[REGISTER_A].set_hex_string(sic_integer.dec_to_hex_string(quotient_dec_value))
+def execute_ldx(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # X <- (m..m+2)
+    REGISTER_DICT[REGISTER_X].set_value(MEMORY_MODEL.read_word(memory_address_dec_value))
+    return True
 
-            continue_execution = True
-            return continue_execution
-        case "J":
-            # PC <- m
-            memory_address_hex_string = memory_address_hex_string.rjust(6, "0")
-            REGISTER_DICT[REGISTER_PC].set_hex_string(memory_address_hex_string)
 
-            continue_execution = True
-            return continue_execution
-        case "JEQ":
-            # PC <- m if CC set to =
-            status_word = REGISTER_DICT[REGISTER_SW].get_hex_string()
-            if status_word == SW_EQUAL:
-                REGISTER_DICT[REGISTER_PC].set_hex_string(memory_address_hex_string)
+def execute_mul(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A <- (A) * (m..m+2)
+    product_dec_value = (word_to_dec(REGISTER_DICT[REGISTER_A].get_value()) *
+                         word_to_dec(MEMORY_MODEL.read_word(memory_address_dec_value)))
+    test_for_integer_in_range(product_dec_value)
 
-            continue_execution = True
-            return continue_execution
-        case "JGT":
-            # PC <- m if CC set to >
-            status_word = REGISTER_DICT[REGISTER_SW].get_hex_string()
-            if status_word == SW_GREATER_THAN:
-                REGISTER_DICT[REGISTER_PC].set_hex_string(memory_address_hex_string)
+    REGISTER_DICT[REGISTER_A].set_value(product_dec_value & MAXIMUM_WORD_DEC)
+    return True
 
-            continue_execution = True
-            return continue_execution
-        case "JLT":
-            # PC <- m if CC set to <
-            status_word = REGISTER_DICT[REGISTER_SW].get_hex_string()
-            if status_word == SW_LESS_THAN:
-                REGISTER_DICT[REGISTER_PC].set_hex_string(memory_address_hex_string)
 
-            continue_execution = True
-            return continue_execution
-        case "JSUB":
-            # L <- (PC); PC <- m
-            # Store program counter in register L
-            pc_register_hex_string = REGISTER_DICT[REGISTER_PC].get_hex_string()
-            REGISTER_DICT[REGISTER_L].set_hex_string(pc_register_hex_string)
+def execute_or(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A <- (A) | (m..m+2)
+    register_a_word_value = REGISTER_DICT[REGISTER_A].get_value()
+    REGISTER_DICT[REGISTER_A].set_value(register_a_word_value | MEMORY_MODEL.read_word(memory_address_dec_value))
+    return True
 
-            # Take the memory address and store it in register PC
-            memory_address_hex_string = memory_address_hex_string.rjust(6, "0")
-            REGISTER_DICT[REGISTER_PC].set_hex_string(memory_address_hex_string)
 
-            continue_execution = True
-            return continue_execution
-        case "LDA":
-            # A <- (m..m+2)
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-
-            REGISTER_DICT[REGISTER_A].set_hex_string(word_hex_string)
-
-            continue_execution = True
-            return continue_execution
-        case "LDCH":
-            # A[rightmost byte] <- (m)
-            # All other bytes in register A are unaffected
-            # Build the byte value held at memory location.
-            try:
-                byte_string = MEMORY_MODEL.get_byte(memory_address_dec_value)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-
-            # Set the rightmost bit in register A
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            register_a_hex_string = register_a_hex_string[:4] + byte_string
-            REGISTER_DICT[REGISTER_A].set_hex_string(register_a_hex_string)
-
-            continue_execution = True
-            return continue_execution
-        case "LDL":
-            # L <- (m..m+2)
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-
-            REGISTER_DICT[REGISTER_L].set_hex_string(word_hex_string)
-
-            continue_execution = True
-            return continue_execution
-        case "LDX":
-            # X <- (m..m+2)
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-
-            REGISTER_DICT[REGISTER_X].set_hex_string(word_hex_string)
-
-            continue_execution = True
-            return continue_execution
-        case "MUL":
-            # A <- (A) * (m..m+2)
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            register_a_dec_value = sic_integer.hex_string_to_dec(register_a_hex_string)
+def execute_rd(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A[rightmost byte] <- data from device specified by (m)
+    register_a_word_value = REGISTER_DICT[REGISTER_A].get_value()
+    register_x_word_value = REGISTER_DICT[REGISTER_X].get_value()
 
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
+    is_in_EOF_state = False
+    if register_a_word_value == 0 and register_x_word_value == 0:
+        is_in_EOF_state = True
 
-            # Convert to decimal value and do the arithmetic.
-            word_dec_value = sic_integer.hex_string_to_dec(word_hex_string)
+    byte_value = MEMORY_MODEL.device_dict[INPUT_DEVICE_F1_CODE].read_byte(is_in_EOF_state)
 
-            product_dec_value = register_a_dec_value * word_dec_value
+    REGISTER_DICT[REGISTER_A].set_value((register_a_word_value & 0xFFFF00) | byte_value)
+    return True
 
-            if not MINIMUM_INTEGER <= product_dec_value <= MAXIMUM_INTEGER:
-                print_error("INTEGER OUT OF RANGE: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
 
-            REGISTER_DICT[REGISTER_A].set_hex_string(sic_integer.dec_to_hex_string(product_dec_value))
+def execute_rsub(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # PC <- (L)
+    REGISTER_DICT[REGISTER_PC].set_value(REGISTER_DICT[REGISTER_L].get_value())
+    test_for_program_counter_in_range(REGISTER_DICT)
+    return True
 
-            continue_execution = True
-            return continue_execution
-        case "OR":
-            # A <- (A) | (m..m+2)
-            # Get the contents of register A as a binary string
-            register_a_bin_string = REGISTER_DICT[REGISTER_A].get_bin_string()
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-            # Convert hex string to bin string
-            word_bin_string = hex_word_to_bin_word(word_hex_string)
-
-            # Do the logical OR comparison
-            and_bin_string = ""
-            for index in range(BITS_IN_WORD):
-                if register_a_bin_string[index] == "0" and word_bin_string[index] == "0":
-                    and_bin_string += "0"
-                else:
-                    and_bin_string += "1"
-
-            # Store the comparison result in register A
-            REGISTER_DICT[REGISTER_A].set_bin_string(and_bin_string)
-
-            continue_execution = True
-            return continue_execution
-        case "RD":
-            # A[rightmost byte] <- data from device specified by (m)
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            register_x_hex_string = REGISTER_DICT[REGISTER_X].get_hex_string()
 
-            is_in_EOF_state = False
-            if register_a_hex_string == "000000" and register_x_hex_string == "000000":
-                is_in_EOF_state = True
+def execute_sta(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # m..m+2 <- (A)
+    MEMORY_MODEL.write_word(memory_address_dec_value, REGISTER_DICT[REGISTER_A].get_value())
+    return True
 
-            byte_string = read_byte_input_device_F1(is_in_EOF_state)
 
-            register_a_hex_string = register_a_hex_string[:4] + byte_string
+def execute_stch(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # m <- (A)[rightmost byte]
+    MEMORY_MODEL.write_byte(memory_address_dec_value, REGISTER_DICT[REGISTER_A].get_value() & 0xFF)
+    return True
 
-            REGISTER_DICT[REGISTER_A].set_hex_string(register_a_hex_string)
 
-            continue_execution = True
-            return continue_execution
-        case "RSUB":
-            # PC <- L
-            register_l_hex_string = REGISTER_DICT[REGISTER_L].get_hex_string()
-            REGISTER_DICT[REGISTER_PC].set_hex_string(register_l_hex_string)
-
-            if not test_for_hex_memory_address_in_range(REGISTER_DICT[REGISTER_PC].get_hex_string()):
-                print_error("PROGRAM COUNTER FAULT: Halting program execution",
-                            "PC REGISTER: " + REGISTER_DICT[REGISTER_PC].get_hex_string() + "\n")
-                continue_execution = False
-                return continue_execution
-
-            continue_execution = True
-            return continue_execution
-        case "STA":
-            # m..m+2 <- (A)
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            index = 0
-            start_index = 0
-            end_index = 2
-
-            while index < BYTES_IN_WORD:
-                try:
-                    MEMORY_MODEL.set_byte(memory_address_dec_value + index,
-                                          register_a_hex_string[start_index:end_index])
-                except SICMemoryModelError:
-                    print_error("MEMORY FAULT: Halting program execution\n")
-                    continue_execution = False
-                    return continue_execution
-                index += 1
-                start_index += 2
-                end_index += 2
-
-            continue_execution = True
-            return continue_execution
-        case "STCH":
-            # m <- (A)[rightmost byte]
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            byte_string = register_a_hex_string[4:]
-
-            try:
-                MEMORY_MODEL.set_byte(memory_address_dec_value, byte_string)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-
-            continue_execution = True
-            return continue_execution
+def execute_stl(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # m..m+2 <- (L)
+    MEMORY_MODEL.write_word(memory_address_dec_value, REGISTER_DICT[REGISTER_L].get_value())
+    return True
 
-        case "STL":
-            # m..m+2 <- (L)
-            register_l_hex_string = REGISTER_DICT[REGISTER_L].get_hex_string()
-            index = 0
-            start_index = 0
-            end_index = 2
-
-            while index < BYTES_IN_WORD:
-                try:
-                    MEMORY_MODEL.set_byte(memory_address_dec_value + index,
-                                          register_l_hex_string[start_index:end_index])
-                except SICMemoryModelError:
-                    print_error("MEMORY FAULT: Halting program execution\n")
-                    continue_execution = False
-                    return continue_execution
-                index += 1
-                start_index += 2
-                end_index += 2
-
-            continue_execution = True
-            return continue_execution
-        case "STSW":
-            # m..m+2 <- (SW)
-            register_sw_hex_string = REGISTER_DICT[REGISTER_SW].get_hex_string()
-            index = 0
-            start_index = 0
-            end_index = 2
-
-            while index < BYTES_IN_WORD:
-                try:
-                    MEMORY_MODEL.set_byte(memory_address_dec_value + index,
-                                          register_sw_hex_string[start_index:end_index])
-                except SICMemoryModelError:
-                    print_error("MEMORY FAULT: Halting program execution\n")
-                    continue_execution = False
-                    return continue_execution
-                index += 1
-                start_index += 2
-                end_index += 2
-
-            continue_execution = True
-            return continue_execution
-        case "STX":
-            # m..m+2 <- (X)
-            register_x_hex_string = REGISTER_DICT[REGISTER_X].get_hex_string()
-            index = 0
-            start_index = 0
-            end_index = 2
-
-            while index < BYTES_IN_WORD:
-                try:
-                    MEMORY_MODEL.set_byte(memory_address_dec_value + index,
-                                          register_x_hex_string[start_index:end_index])
-                except SICMemoryModelError:
-                    print_error("MEMORY FAULT: Halting program execution\n")
-                    continue_execution = False
-                    return continue_execution
-                index += 1
-                start_index += 2
-                end_index += 2
-
-            continue_execution = True
-            return continue_execution
-        case "SUB":
-            # A <- (A) - (m..m+2)
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            register_a_dec_value = sic_integer.hex_string_to_dec(register_a_hex_string)
 
-            # Build the value held at memory location.
-            try:
-                word_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, BYTES_IN_WORD)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
+def execute_stsw(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # m..m+2 <- (SW)
+    MEMORY_MODEL.write_word(memory_address_dec_value, REGISTER_DICT[REGISTER_SW].get_value())
+    return True
 
-            # Convert to decimal value and do the arithmetic.
-            word_dec_value = sic_integer.hex_string_to_dec(word_hex_string)
 
-            difference_dec_value = register_a_dec_value - word_dec_value
+def execute_stx(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # m..m+2 <- (X)
+    MEMORY_MODEL.write_word(memory_address_dec_value, REGISTER_DICT[REGISTER_X].get_value())
+    return True
 
-            if not MINIMUM_INTEGER <= difference_dec_value <= MAXIMUM_INTEGER:
-                print_error("INTEGER OUT OF RANGE: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
 
-            REGISTER_DICT[REGISTER_A].set_hex_string(sic_integer.dec_to_hex_string(difference_dec_value))
+def execute_sub(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # A <- (A) - (m..m+2)
+    difference_dec_value = (word_to_dec(REGISTER_DICT[REGISTER_A].get_value()) -
+                            word_to_dec(MEMORY_MODEL.read_word(memory_address_dec_value)))
+    test_for_integer_in_range(difference_dec_value)
 
-            continue_execution = True
-            return continue_execution
-        case "TD":
-            # Test device specified by (m)
-            # Determine which device is being tested
-            try:
-                byte_string = MEMORY_MODEL.get_byte(memory_address_dec_value)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-
-            match byte_string:
-                case "05":
-                    test_device_response_hex_string = test_output_device_05()
-                case "F1":
-                    test_device_response_hex_string = test_input_device_F1()
-                case _:
-                    print_error("PERIPHERAL DEVICE FAULT: Halting program execution\n")
-                    continue_execution = False
-                    return continue_execution
-
-            # Set register SW to the response from the randomization
-            REGISTER_DICT[REGISTER_SW].set_hex_string(test_device_response_hex_string)
-
-            continue_execution = True
-            return continue_execution
-        case "TIX":
-            # X <- (X) + 1; (X):(m..m+2)
-            # Increment the value in the X register by 1
-            register_x_dec_value = hex_string_to_dec(REGISTER_DICT[REGISTER_X].get_hex_string()) + 1
-            register_x_hex_string = dec_to_hex_string(register_x_dec_value)
-            REGISTER_DICT[REGISTER_X].set_hex_string(register_x_hex_string)
-            # Compare the incremented value in register X with the value stored at the memory address
-            try:
-                memory_value_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, 3)
-                memory_value_dec_value = sic_integer.hex_string_to_dec(memory_value_hex_string)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-            # Set status word register based on the comparison
-            if register_x_dec_value < memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_LESS_THAN)
-            elif register_x_dec_value == memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_EQUAL)
-            elif register_x_dec_value > memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_GREATER_THAN)
-
-            continue_execution = True
-            return continue_execution
-        case "TIXB":
-            # X <- (X) + 1; (X):(m..m+2)
-            # Increment the value in the X register by 1
-            # NOTE: This function is identical to TIX
-            register_x_dec_value = hex_string_to_dec(REGISTER_DICT[REGISTER_X].get_hex_string()) + 1
-            register_x_hex_string = dec_to_hex_string(register_x_dec_value)
-            REGISTER_DICT[REGISTER_X].set_hex_string(register_x_hex_string)
-            # Compare the incremented value in register X with the value stored at the memory address
-            try:
-                memory_value_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, 3)
-                memory_value_dec_value = sic_integer.hex_string_to_dec(memory_value_hex_string)
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-            # Set status word register based on the comparison
-            if register_x_dec_value < memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_LESS_THAN)
-            elif register_x_dec_value == memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_EQUAL)
-            elif register_x_dec_value > memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_GREATER_THAN)
-
-            continue_execution = True
-            return continue_execution
+    REGISTER_DICT[REGISTER_A].set_value(difference_dec_value & MAXIMUM_WORD_DEC)
+    return True
+
+
+def execute_td(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # Test device specified by (m)
+    # Determine which device is being tested
+    device = MEMORY_MODEL.device_dict.get(MEMORY_MODEL.read_byte(memory_address_dec_value))
+    if device is None:
+        raise SICOperationExecutorError("PERIPHERAL DEVICE FAULT: Halting program execution\n")
+    test_device_response_hex_string = device.test()
+
+    # Set register SW to the response from the device
+    REGISTER_DICT[REGISTER_SW].set_hex_string(test_device_response_hex_string)
+    return True
+
+
+def execute_tix(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # X <- (X) + 1; (X):(m..m+2)
+    register_x_dec_value = REGISTER_DICT[REGISTER_X].get_value() + 1
+    REGISTER_DICT[REGISTER_X].set_value(register_x_dec_value)
+
+    memory_value_dec_value = word_to_dec(MEMORY_MODEL.read_word(memory_address_dec_value))
+
+    compare_and_set_status_word(REGISTER_DICT, register_x_dec_value, memory_value_dec_value)
+    return True
 
-        case "TIXW":
-            # X <- (X) + 3; (X):((m..m+2) * 3)
-            # Increment the value in the X register by 3
-            register_x_dec_value = hex_string_to_dec(REGISTER_DICT[REGISTER_X].get_hex_string()) + 3
-            register_x_hex_string = dec_to_hex_string(register_x_dec_value)
-            REGISTER_DICT[REGISTER_X].set_hex_string(register_x_hex_string)
-            # Compare the incremented value in register X with the value stored at the memory address * 3 bytes (1 word)
-            try:
-                memory_value_hex_string = MEMORY_MODEL.get_bytes(memory_address_dec_value, 3)
-                memory_value_dec_value = sic_integer.hex_string_to_dec(memory_value_hex_string) * 3
-            except SICMemoryModelError:
-                print_error("MEMORY FAULT: Halting program execution\n")
-                continue_execution = False
-                return continue_execution
-            # Set status word register based on the comparison
-            if register_x_dec_value < memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_LESS_THAN)
-            elif register_x_dec_value == memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_EQUAL)
-            elif register_x_dec_value > memory_value_dec_value:
-                REGISTER_DICT[REGISTER_SW].set_hex_string(SW_GREATER_THAN)
-
-            continue_execution = True
-            return continue_execution
-        case "WD":
-            # Device specified by (m) <- (A)[rightmost byte]
-            register_a_hex_string = REGISTER_DICT[REGISTER_A].get_hex_string()
-            byte_string = register_a_hex_string[4:]
-            write_byte_to_output_device_05(byte_string)
 
-            continue_execution = True
+def execute_wd(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # Device specified by (m) <- (A)[rightmost byte]
+    MEMORY_MODEL.device_dict[OUTPUT_DEVICE_05_CODE].write_byte(REGISTER_DICT[REGISTER_A].get_value() & 0xFF)
+    return True
+
+
+# CUSTOM OPERATION HANDLERS
+
+def execute_xos(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # End processing and exit to the operating system
+    MEMORY_MODEL.is_program_terminated_normally = True
+    print_status("Program execution terminated normally\n")
+    return False
+
+
+def execute_tixw(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value):
+    # X <- (X) + 3; (X):((m..m+2) * 3)
+    register_x_dec_value = REGISTER_DICT[REGISTER_X].get_value() + 3
+    REGISTER_DICT[REGISTER_X].set_value(register_x_dec_value)
+
+    # Compare with the value stored at the memory address * 3 bytes (1 word)
+    memory_value_dec_value = word_to_dec(MEMORY_MODEL.read_word(memory_address_dec_value)) * 3
+
+    compare_and_set_status_word(REGISTER_DICT, register_x_dec_value, memory_value_dec_value)
+    return True
+
+
+################
+# DISPATCH TABLE
+################
+# The dispatch table holds one operation handler per opcode byte (00-FF).
+# Unsupported opcodes hold None.
+OPCODE_HANDLER_TABLE = [None] * NUMBER_OF_OPCODES
+
+
+# This function adds an operation handler to the dispatch table.
+# It is the extension point for custom opcodes.
+# NOTE: Register handlers before a program is loaded. Instructions that are already decoded keep their old handler.
+def register_operation_handler(opcode_hex_string, operation_handler):
+    OPCODE_HANDLER_TABLE[hex_string_to_dec(opcode_hex_string)] = operation_handler
+
+
+OPERATION_HANDLER_DICT = {"ADD": execute_add, "AND": execute_and, "COMP": execute_comp, "DIV": execute_div,
+                          "J": execute_j, "JEQ": execute_jeq, "JGT": execute_jgt, "JLT": execute_jlt,
+                          "JSUB": execute_jsub, "LDA": execute_lda, "LDCH": execute_ldch, "LDL": execute_ldl,
+                          "LDX": execute_ldx, "MUL": execute_mul, "OR": execute_or, "RD": execute_rd,
+                          "RSUB": execute_rsub, "STA": execute_sta, "STCH": execute_stch, "STL": execute_stl,
+                          "STSW": execute_stsw, "STX": execute_stx, "SUB": execute_sub, "TD": execute_td,
+                          "TIX": execute_tix, "WD": execute_wd}
+# NOTE: TIXB is identical to TIX
+CUSTOM_OPERATION_HANDLER_DICT = {"XOS": execute_xos, "TIXB": execute_tix, "TIXW": execute_tixw}
+OPERATION_HANDLER_DICT.update(CUSTOM_OPERATION_HANDLER_DICT)
+
+for opcode_mnemonic, operation_handler in OPERATION_HANDLER_DICT.items():
+    register_operation_handler(OPCODE_TO_HEX_DICT[opcode_mnemonic], operation_handler)
+
+
+def initialize_program_termination(MEMORY_MODEL):
+    MEMORY_MODEL.is_program_terminated_normally = False
+
+
+# This function returns True if the program was ended by XOS.
+def test_for_normal_termination(MEMORY_MODEL):
+    return MEMORY_MODEL.is_program_terminated_normally
+
+
+# This function fetches and decodes the instruction held at a memory address.
+# It returns a decoded instruction tuple: (operation handler, base address, indexed addressing flag)
+# The operation handler is None if the opcode is not supported by the simulator.
+def decode_instruction(MEMORY_MODEL, instruction_address_dec_value):
+    # Fetch the whole instruction word: [OPCODE 8 bits][X 1 bit][ADDRESS 15 bits]
+    instruction_word_value = MEMORY_MODEL.read_word(instruction_address_dec_value)
+
+    address_field_dec_value = instruction_word_value & 0xFFFF
+
+    return (OPCODE_HANDLER_TABLE[instruction_word_value >> 16],
+            address_field_dec_value & ADDRESS_MASK,
+            test_for_indexed_addressing(address_field_dec_value))
+
+
+def execute_operation(REGISTER_DICT, MEMORY_MODEL):
+    # PROGRAM COUNTER
+    pc_register_dec_value = REGISTER_DICT[REGISTER_PC].get_value()
+
+    # INSTRUCTION
+    # Instructions are decoded once per address and cached in the memory model.
+    # Any write to memory invalidates the cached instructions that overlap it.
+    try:
+        decoded_instruction = MEMORY_MODEL.decoded_instruction_cache[pc_register_dec_value]
+    except IndexError:
+        decoded_instruction = None
+
+    if decoded_instruction is None:
+        try:
+            decoded_instruction = decode_instruction(MEMORY_MODEL, pc_register_dec_value)
+        except SICMemoryModelError:
+            print_error("MEMORY FAULT: Halting program execution\n")
+            continue_execution = False
             return continue_execution
-        case "XOS":
-            # End processing and exit to the operating system
-            print_status("Program execution terminated normally\n")
+
+        # Verify that the opcode is supported by the simulator.
+        if decoded_instruction[0] is None:
+            print_error("UNRECOGNIZED OPCODE FAULT: Halting program execution",
+                        "OPCODE: " + MEMORY_MODEL.get_byte(pc_register_dec_value) + "\n")
             continue_execution = False
             return continue_execution
+
+        MEMORY_MODEL.decoded_instruction_cache[pc_register_dec_value] = decoded_instruction
+
+    operation_handler, memory_address_dec_value, is_indexed_addressing = decoded_instruction
+
+    # MEMORY ADDRESS
+    # Add register X to the base address for indexed addressing
+    if is_indexed_addressing:
+        memory_address_dec_value += REGISTER_DICT[REGISTER_X].get_value()
+
+    # Increment PC Register
+    REGISTER_DICT[REGISTER_PC].set_value(pc_register_dec_value + BYTES_IN_WORD)
+
+    # EXECUTE INSTRUCTION
+    try:
+        # Verify that the PC register holds an in-range memory address
+        test_for_program_counter_in_range(REGISTER_DICT)
+
+        continue_execution = operation_handler(REGISTER_DICT, MEMORY_MODEL, memory_address_dec_value)
+    except SICMemoryModelError:
+        print_error("MEMORY FAULT: Halting program execution\n")
+        continue_execution = False
+    except SICRegisterContentsError:
+        print_error(REGISTER_CONTENTS_FAULT_MESSAGE)
+        continue_execution = False
+    except SICOperationExecutorError as ex:
+        print_error(*ex.args)
+        continue_execution = False
+
+    return continue_execution
+
+
+# POLLING LOOP FAST-FORWARD
+# A device polling loop is a TD followed by a JEQ back to the TD:
+#     WAIT    TD      DEVICE
+#             JEQ     WAIT
+# Instead of executing the loop one instruction at a time, the device is tested until it is READY
+# and SW and PC are left as the last pass through the loop would have left them.
+# Every skipped pass counts as two steps, so the step count matches a run that is not fast-forwarded.
+def find_polling_loop_device(MEMORY_MODEL, instruction_address_dec_value):
+    # The loop must not run into the end of memory, so its faults are left to execute_operation
+    if not 0 <= instruction_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC - 2 * BYTES_IN_WORD:
+        return None
+
+    try:
+        operation_handler, device_address_dec_value, is_indexed_addressing = \
+            decode_instruction(MEMORY_MODEL, instruction_address_dec_value)
+        if operation_handler is not execute_td or is_indexed_addressing:
+            return None
+
+        operation_handler, jump_address_dec_value, is_indexed_addressing = \
+            decode_instruction(MEMORY_MODEL, instruction_address_dec_value + BYTES_IN_WORD)
+        if (operation_handler is not execute_jeq or is_indexed_addressing or
+                jump_address_dec_value != instruction_address_dec_value):
+            return None
+
+        return MEMORY_MODEL.device_dict.get(MEMORY_MODEL.read_byte(device_address_dec_value))
+    except SICMemoryModelError:
+        return None
+
+
+# This function fast-forwards the polling loop at the program counter, within a budget of maximum_number_of_steps.
+# It returns the number of steps skipped, 0 if there is no polling loop at the program counter.
+def fast_forward_polling_loop(REGISTER_DICT, MEMORY_MODEL, maximum_number_of_steps):
+    pc_register_dec_value = REGISTER_DICT[REGISTER_PC].get_value()
+
+    # Only a TD can start a polling loop, which the decoded instruction cache can tell without decoding
+    try:
+        decoded_instruction = MEMORY_MODEL.decoded_instruction_cache[pc_register_dec_value]
+    except IndexError:
+        return 0
+    if decoded_instruction is not None and decoded_instruction[0] is not execute_td:
+        return 0
+
+    maximum_number_of_tests = maximum_number_of_steps // POLLING_LOOP_STEPS_PER_TEST
+    if maximum_number_of_tests < 1:
+        return 0
+
+    device = find_polling_loop_device(MEMORY_MODEL, pc_register_dec_value)
+    if device is None:
+        return 0
+
+    number_of_tests, is_ready = device.test_until_ready(maximum_number_of_tests)
+
+    if is_ready:
+        # TD answered READY and JEQ fell through
+        REGISTER_DICT[REGISTER_SW].set_hex_string(SW_LESS_THAN)
+        REGISTER_DICT[REGISTER_PC].set_value(pc_register_dec_value + 2 * BYTES_IN_WORD)
+    else:
+        # TD answered NOT READY and JEQ jumped back to the TD
+        REGISTER_DICT[REGISTER_SW].set_hex_string(SW_EQUAL)
+
+    return number_of_tests * POLLING_LOOP_STEPS_PER_TEST
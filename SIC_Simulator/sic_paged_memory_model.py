@@ -0,0 +1,246 @@
+from SIC_Simulator.sic_memory_model import SICMemoryModel, SICMemoryModelError
+from SIC_Utilities.sic_constants import BYTES_IN_MEMORY, MINIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_MEMORY_ADDRESS_DEC, \
+    BYTES_IN_WORD
+
+# The paged memory model splits memory into 128 pages of 256 bytes, each with its own piece of the
+# initialization bitmap. Pages are shared between memory models and copied on write: forking a memory model
+# copies its page table, and a page is only copied when one of the models that share it writes to it.
+# So a fork costs a page table, and every run from it costs the pages it writes.
+#
+# A page records how many page tables hold it. A page held by more than one is never written in place.
+# Every new memory model starts with the blank page (uninitialized memory) in every slot.
+# Initializing memory gives the pages back, a forked machine that is done can initialize memory to let
+# the machines that share its pages write them in place again.
+#
+# The paged memory model has the interface of SICMemoryModel, so the loader and the operation executor
+# use it unchanged. Compiled blocks need a flat memory_bytearray, so a machine with paged memory interprets
+# one instruction at a time (see SICMachine.run_steps).
+BYTES_PER_PAGE = 256
+PAGE_ADDRESS_SHIFT = 8
+PAGE_OFFSET_MASK = BYTES_PER_PAGE - 1
+NUMBER_OF_PAGES = BYTES_IN_MEMORY // BYTES_PER_PAGE
+BITMAP_BYTES_PER_PAGE = BYTES_PER_PAGE // 8
+
+
+class SICMemoryPage:
+    def __init__(self, page_bytearray, initialized_bitmap, reference_count=0):
+        self.page_bytearray = page_bytearray
+        self.initialized_bitmap = initialized_bitmap
+        self.reference_count = reference_count
+
+
+# The blank page is held by this module too, so it is never written in place
+BLANK_PAGE = SICMemoryPage(bytearray([SICMemoryModel.UNINITIALIZED_BYTE_VALUE]) * BYTES_PER_PAGE,
+                           bytearray(BITMAP_BYTES_PER_PAGE), 1)
+
+
+# The decoded instructions of paged memory are cached in a dict, so forking copies only the entries in use.
+# A missing entry reads as None, like an empty slot of the list SICMemoryModel uses.
+class SICDecodedInstructionCache(dict):
+    def __missing__(self, memory_address_dec_value):
+        return None
+
+
+class SICPagedMemoryModel(SICMemoryModel):
+    SUPPORTS_COMPILED_BLOCKS = False
+
+    # The flat memory, bitmap and caches of SICMemoryModel are replaced by the page table
+    def __init__(self, device_dict=None):
+        self.device_dict = device_dict if device_dict is not None else {}
+        self.is_program_terminated_normally = False
+        self.page_list = [BLANK_PAGE] * NUMBER_OF_PAGES
+        BLANK_PAGE.reference_count += NUMBER_OF_PAGES
+        self.decoded_instruction_cache = SICDecodedInstructionCache()
+        self.compiled_block_dict = {}
+        self.write_log = None
+
+    # This function returns the page at a page index, copied first if it is shared.
+    def get_writable_page(self, page_index):
+        page = self.page_list[page_index]
+
+        if page.reference_count > 1:
+            page.reference_count -= 1
+            page = SICMemoryPage(bytearray(page.page_bytearray), bytearray(page.initialized_bitmap), 1)
+            self.page_list[page_index] = page
+
+        return page
+
+    # This function sets the page table, taking a reference to every new page and giving back the old ones.
+    def set_page_list(self, page_list):
+        for page in page_list:
+            page.reference_count += 1
+        for page in self.page_list:
+            page.reference_count -= 1
+        self.page_list = page_list
+
+    def test_for_initialized_byte(self, memory_address_dec_value: int):
+        page_offset = memory_address_dec_value & PAGE_OFFSET_MASK
+        return (self.page_list[memory_address_dec_value >> PAGE_ADDRESS_SHIFT].initialized_bitmap[page_offset >> 3] &
+                (1 << (page_offset & 7)) != 0)
+
+    def clear_initialized_byte(self, memory_address_dec_value: int):
+        page_offset = memory_address_dec_value & PAGE_OFFSET_MASK
+        self.get_writable_page(memory_address_dec_value >> PAGE_ADDRESS_SHIFT).initialized_bitmap[page_offset >> 3] &= \
+            ~(1 << (page_offset & 7))
+
+    def mark_initialized(self, memory_address_dec_value: int, number_of_bytes: int):
+        for address_dec in range(memory_address_dec_value, memory_address_dec_value + number_of_bytes):
+            page_offset = address_dec & PAGE_OFFSET_MASK
+            self.get_writable_page(address_dec >> PAGE_ADDRESS_SHIFT).initialized_bitmap[page_offset >> 3] |= \
+                1 << (page_offset & 7)
+
+    def invalidate_decoded_instructions(self, memory_address_dec_value: int, number_of_bytes: int):
+        decoded_instruction_cache = self.decoded_instruction_cache
+        if not decoded_instruction_cache:
+            return
+
+        start_address_dec = max(memory_address_dec_value - self.DECODED_INSTRUCTION_OVERLAP, 0)
+        for address_dec in range(start_address_dec, memory_address_dec_value + number_of_bytes):
+            decoded_instruction_cache.pop(address_dec, None)
+
+    def add_compiled_block(self, compiled_block):
+        raise SICMemoryModelError("Paged memory does not support compiled blocks.")
+
+    def invalidate_compiled_blocks(self, memory_address_dec_value: int, number_of_bytes: int):
+        pass
+
+    # INTEGER API
+    def read_byte(self, memory_address_dec_value: int):
+        if not MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC:
+            raise SICMemoryModelError("Memory address out of range.")
+
+        return (self.page_list[memory_address_dec_value >> PAGE_ADDRESS_SHIFT]
+                .page_bytearray[memory_address_dec_value & PAGE_OFFSET_MASK])
+
+    def write_byte(self, memory_address_dec_value: int, byte_value: int):
+        if not MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC:
+            raise SICMemoryModelError("Memory address out of range.")
+
+        if self.write_log is not None:
+            self.log_write(memory_address_dec_value, 1)
+
+        page = self.get_writable_page(memory_address_dec_value >> PAGE_ADDRESS_SHIFT)
+        page_offset = memory_address_dec_value & PAGE_OFFSET_MASK
+        page.page_bytearray[page_offset] = byte_value
+        page.initialized_bitmap[page_offset >> 3] |= 1 << (page_offset & 7)
+        self.invalidate_decoded_instructions(memory_address_dec_value, 1)
+
+    # A word that straddles two pages is read and written one byte at a time
+    def read_word(self, memory_address_dec_value: int):
+        if not MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC - 2:
+            raise SICMemoryModelError("Memory address out of range.")
+
+        page_offset = memory_address_dec_value & PAGE_OFFSET_MASK
+        if page_offset > BYTES_PER_PAGE - BYTES_IN_WORD:
+            return ((self.read_byte(memory_address_dec_value) << 16) |
+                    (self.read_byte(memory_address_dec_value + 1) << 8) |
+                    self.read_byte(memory_address_dec_value + 2))
+
+        page_bytearray = self.page_list[memory_address_dec_value >> PAGE_ADDRESS_SHIFT].page_bytearray
+        return ((page_bytearray[page_offset] << 16) |
+                (page_bytearray[page_offset + 1] << 8) |
+                page_bytearray[page_offset + 2])
+
+    def write_word(self, memory_address_dec_value: int, word_value: int):
+        if not MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value <= MAXIMUM_MEMORY_ADDRESS_DEC - 2:
+            raise SICMemoryModelError("Memory address out of range.")
+
+        page_offset = memory_address_dec_value & PAGE_OFFSET_MASK
+        if page_offset > BYTES_PER_PAGE - BYTES_IN_WORD:
+            self.write_byte(memory_address_dec_value, word_value >> 16)
+            self.write_byte(memory_address_dec_value + 1, (word_value >> 8) & 0xFF)
+            self.write_byte(memory_address_dec_value + 2, word_value & 0xFF)
+            return
+
+        if self.write_log is not None:
+            self.log_write(memory_address_dec_value, BYTES_IN_WORD)
+
+        page = self.get_writable_page(memory_address_dec_value >> PAGE_ADDRESS_SHIFT)
+        page_bytearray = page.page_bytearray
+        page_bytearray[page_offset] = word_value >> 16
+        page_bytearray[page_offset + 1] = (word_value >> 8) & 0xFF
+        page_bytearray[page_offset + 2] = word_value & 0xFF
+
+        # The three initialized bits can straddle two bitmap bytes
+        initialized_bits = 7 << (page_offset & 7)
+        page.initialized_bitmap[page_offset >> 3] |= initialized_bits & 0xFF
+        if initialized_bits > 0xFF:
+            page.initialized_bitmap[(page_offset >> 3) + 1] |= initialized_bits >> 8
+
+        self.invalidate_decoded_instructions(memory_address_dec_value, BYTES_IN_WORD)
+
+    def read_bytes(self, memory_address_dec_value: int, number_of_bytes: int):
+        end_address_dec = memory_address_dec_value + number_of_bytes
+        if not (MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value and
+                end_address_dec - 1 <= MAXIMUM_MEMORY_ADDRESS_DEC):
+            raise SICMemoryModelError("Memory address out of range.")
+
+        byte_data_list = []
+        address_dec = memory_address_dec_value
+        while address_dec < end_address_dec:
+            page_offset = address_dec & PAGE_OFFSET_MASK
+            page_end_offset = min(BYTES_PER_PAGE, page_offset + end_address_dec - address_dec)
+            byte_data_list.append(self.page_list[address_dec >> PAGE_ADDRESS_SHIFT]
+                                  .page_bytearray[page_offset:page_end_offset])
+            address_dec += page_end_offset - page_offset
+
+        return b"".join(byte_data_list)
+
+    def write_bytes(self, memory_address_dec_value: int, byte_data):
+        end_address_dec = memory_address_dec_value + len(byte_data)
+        if not (MINIMUM_MEMORY_ADDRESS_DEC <= memory_address_dec_value and
+                end_address_dec - 1 <= MAXIMUM_MEMORY_ADDRESS_DEC):
+            raise SICMemoryModelError("Memory address out of range.")
+
+        if self.write_log is not None:
+            self.log_write(memory_address_dec_value, len(byte_data))
+
+        address_dec = memory_address_dec_value
+        while address_dec < end_address_dec:
+            page_offset = address_dec & PAGE_OFFSET_MASK
+            page_end_offset = min(BYTES_PER_PAGE, page_offset + end_address_dec - address_dec)
+            data_index = address_dec - memory_address_dec_value
+            self.get_writable_page(address_dec >> PAGE_ADDRESS_SHIFT).page_bytearray[page_offset:page_end_offset] = \
+                byte_data[data_index:data_index + page_end_offset - page_offset]
+            address_dec += page_end_offset - page_offset
+
+        self.mark_initialized(memory_address_dec_value, len(byte_data))
+        self.invalidate_decoded_instructions(memory_address_dec_value, len(byte_data))
+
+    def initialize_memory(self):
+        # Give back every page and start over from the blank page
+        self.set_page_list([BLANK_PAGE] * NUMBER_OF_PAGES)
+        self.decoded_instruction_cache.clear()
+
+    def get_memory_image(self):
+        return b"".join(page.page_bytearray for page in self.page_list)
+
+    def get_initialized_bitmap_image(self):
+        return b"".join(page.initialized_bitmap for page in self.page_list)
+
+    # This function returns a memory model that shares every page with this one, with its own device table.
+    # The decoded instructions are still valid for the shared pages, so they are copied too.
+    def fork(self, device_dict=None):
+        memory_model = SICPagedMemoryModel(device_dict)
+        memory_model.set_page_list(list(self.page_list))
+        memory_model.decoded_instruction_cache.update(self.decoded_instruction_cache)
+        memory_model.is_program_terminated_normally = self.is_program_terminated_normally
+        return memory_model
+
+    # Only the pages that differ from the images are replaced, by new pages of their own.
+    def restore_memory_image(self, memory_image, initialized_bitmap_image):
+        if len(memory_image) != BYTES_IN_MEMORY or len(initialized_bitmap_image) != self.BYTES_IN_BITMAP:
+            raise SICMemoryModelError("Invalid memory image.")
+
+        for page_index, page in enumerate(self.page_list):
+            page_address_dec = page_index << PAGE_ADDRESS_SHIFT
+            page_image = memory_image[page_address_dec:page_address_dec + BYTES_PER_PAGE]
+            page_bitmap_image = initialized_bitmap_image[page_index * BITMAP_BYTES_PER_PAGE:
+                                                         (page_index + 1) * BITMAP_BYTES_PER_PAGE]
+            if page.page_bytearray != page_image:
+                self.invalidate_decoded_instructions(page_address_dec, BYTES_PER_PAGE)
+            elif page.initialized_bitmap == page_bitmap_image:
+                continue
+
+            page.reference_count -= 1
+            self.page_list[page_index] = SICMemoryPage(bytearray(page_image), bytearray(page_bitmap_image), 1)
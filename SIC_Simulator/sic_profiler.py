@@ -0,0 +1,143 @@
+import json
+
+from SIC_Simulator.sic_assembly_listing_parser import SICAssemblyListingParserError
+from SIC_Simulator.sic_block_compiler import DEFAULT_MAXIMUM_NUMBER_OF_STEPS
+from SIC_Simulator.sic_memory_model import SICMemoryModelError
+from SIC_Simulator.sic_operation_executor import execute_operation, fast_forward_polling_loop
+from SIC_Simulator.sic_register_model import REGISTER_PC
+from SIC_Utilities.sic_constants import BYTES_IN_MEMORY, BYTES_IN_WORD, HEX_TO_OPCODE_DICT
+
+# The profiler counts how many times the instruction at every address is executed, and how many times
+# every opcode is executed. A profiled run executes one instruction at a time through run_profiled_steps,
+# so a run that is not profiled does not pay for the counting.
+# The steps of a fast-forwarded device polling loop are counted as executions of its TD and its JEQ.
+#
+# The report ranks the addresses by executions (hot spots) next to their assembly listing lines,
+# and lists the opcodes by executions. The same results are available as JSON:
+# {"steps": instructions executed,
+#  "addresses": [{"address": "1003", "count": executions, "percent": share of the steps, "line": listing line}, ...],
+#  "opcodes": [{"opcode": "E0", "mnemonic": "TD", "count": executions, "percent": share of the steps}, ...]}
+# Addresses and opcodes are ranked by count, the addresses that never ran are left out.
+DEFAULT_NUMBER_OF_HOT_SPOTS = 20
+NUMBER_OF_OPCODES = 256
+
+
+class SICProfile:
+    def __init__(self):
+        self.execution_count_list = [0] * BYTES_IN_MEMORY
+        self.opcode_execution_count_list = [0] * NUMBER_OF_OPCODES
+        self.number_of_steps = 0
+
+    # This function returns (address, count) of every executed address, the most executed first.
+    def get_address_count_list(self):
+        address_count_list = [(address_dec, count) for address_dec, count in enumerate(self.execution_count_list)
+                              if count]
+        address_count_list.sort(key=lambda address_count: (-address_count[1], address_count[0]))
+        return address_count_list
+
+    # This function returns (opcode, count) of every executed opcode, the most executed first.
+    def get_opcode_count_list(self):
+        opcode_count_list = [(opcode_dec, count) for opcode_dec, count in enumerate(self.opcode_execution_count_list)
+                             if count]
+        opcode_count_list.sort(key=lambda opcode_count: (-opcode_count[1], opcode_count[0]))
+        return opcode_count_list
+
+    def get_percent(self, count):
+        return 100 * count / self.number_of_steps if self.number_of_steps else 0.0
+
+    def get_result_dict(self, assembly_listing_index=None):
+        return {"steps": self.number_of_steps,
+                "addresses": [{"address": format(address_dec, "04X"),
+                               "count": count,
+                               "percent": round(self.get_percent(count), 4),
+                               "line": get_profile_listing_line(assembly_listing_index, address_dec)}
+                              for address_dec, count in self.get_address_count_list()],
+                "opcodes": [{"opcode": format(opcode_dec, "02X"),
+                             "mnemonic": HEX_TO_OPCODE_DICT.get(format(opcode_dec, "02X"), ""),
+                             "count": count,
+                             "percent": round(self.get_percent(count), 4)}
+                            for opcode_dec, count in self.get_opcode_count_list()]}
+
+    def save(self, profile_file_path, assembly_listing_index=None):
+        with open(profile_file_path, "wt") as profile_file:
+            json.dump(self.get_result_dict(assembly_listing_index), profile_file, indent=1)
+            profile_file.write("\n")
+
+    # This function returns the report of the number_of_hot_spots most executed addresses and of the opcodes.
+    def get_report_string(self, assembly_listing_index=None, number_of_hot_spots=DEFAULT_NUMBER_OF_HOT_SPOTS):
+        report_line_list = ["PROFILE: " + str(self.number_of_steps) + " steps",
+                            "",
+                            "RANK  ADDR       COUNT  PERCENT  LISTING LINE"]
+        for rank, (address_dec, count) in enumerate(self.get_address_count_list()[:number_of_hot_spots], 1):
+            report_line_list.append(str(rank).ljust(6) + format(address_dec, "04X") + " " +
+                                    str(count).rjust(11) + format(self.get_percent(count), "8.2f") + "%  " +
+                                    get_profile_listing_line(assembly_listing_index, address_dec))
+
+        report_line_list += ["", "OPCODE         COUNT  PERCENT"]
+        for opcode_dec, count in self.get_opcode_count_list():
+            opcode_hex_string = format(opcode_dec, "02X")
+            report_line_list.append(opcode_hex_string + " " + HEX_TO_OPCODE_DICT.get(opcode_hex_string, "").ljust(5) +
+                                    str(count).rjust(11) + format(self.get_percent(count), "8.2f") + "%")
+
+        return "\n".join(report_line_list)
+
+
+# This function returns the assembly listing line at an address without its trailing spaces,
+# or "" if there is no listing or no line there.
+# A listing that can not be indexed is left out of the profile.
+def get_profile_listing_line(assembly_listing_index, address_dec):
+    if assembly_listing_index is None:
+        return ""
+
+    try:
+        return assembly_listing_index.get_line(address_dec).rstrip()
+    except (KeyError, SICAssemblyListingParserError, OSError):
+        return ""
+
+
+# This function runs the loaded program one instruction at a time for up to maximum_number_of_steps instructions
+# and counts every instruction executed in the profile.
+# A maximum_number_of_steps of None runs the program until it stops.
+# Device polling loops are fast-forwarded unless is_fast_forwarding_polling_loops is False.
+# It returns continue_execution and the number of instructions (steps) executed.
+def run_profiled_steps(REGISTER_DICT, MEMORY_MODEL, profile, maximum_number_of_steps=None,
+                       is_fast_forwarding_polling_loops=True):
+    execution_count_list = profile.execution_count_list
+    opcode_execution_count_list = profile.opcode_execution_count_list
+    pc_register = REGISTER_DICT[REGISTER_PC]
+    number_of_steps = 0
+    continue_execution = True
+
+    while continue_execution and (maximum_number_of_steps is None or number_of_steps < maximum_number_of_steps):
+        pc_register_dec_value = pc_register.get_value()
+
+        if is_fast_forwarding_polling_loops:
+            if maximum_number_of_steps is None:
+                step_budget = DEFAULT_MAXIMUM_NUMBER_OF_STEPS
+            else:
+                step_budget = maximum_number_of_steps - number_of_steps
+            polling_number_of_steps = fast_forward_polling_loop(REGISTER_DICT, MEMORY_MODEL, step_budget)
+            if polling_number_of_steps:
+                # Every pass through the loop executes its TD and its JEQ once
+                number_of_tests = polling_number_of_steps // 2
+                jeq_address_dec_value = pc_register_dec_value + BYTES_IN_WORD
+                execution_count_list[pc_register_dec_value] += number_of_tests
+                execution_count_list[jeq_address_dec_value] += number_of_tests
+                opcode_execution_count_list[MEMORY_MODEL.read_byte(pc_register_dec_value)] += number_of_tests
+                opcode_execution_count_list[MEMORY_MODEL.read_byte(jeq_address_dec_value)] += number_of_tests
+                number_of_steps += polling_number_of_steps
+                continue
+
+        # An instruction that faults is counted too, it is the last step of the run
+        try:
+            opcode_dec_value = MEMORY_MODEL.read_byte(pc_register_dec_value)
+            execution_count_list[pc_register_dec_value] += 1
+            opcode_execution_count_list[opcode_dec_value] += 1
+        except SICMemoryModelError:
+            pass
+
+        continue_execution = execute_operation(REGISTER_DICT, MEMORY_MODEL)
+        number_of_steps += 1
+
+    profile.number_of_steps += number_of_steps
+    return continue_execution, number_of_steps
@@ -0,0 +1,217 @@
+import hashlib
+import io
+import os
+import struct
+
+from SIC_Simulator.sic_object_code_parser import iterate_object_code_records, SICHeaderRecord, SICTextRecord, \
+    SICEndRecord
+from SIC_Utilities.sic_constants import SIC_OBJECT_CODE_FILE_EXTENSION, SIC_PROGRAM_IMAGE_FILE_EXTENSION, \
+    MINIMUM_MEMORY_ADDRESS_DEC, MAXIMUM_MEMORY_ADDRESS_DEC
+
+# A program image holds a loaded program in binary: the header of the object code (program name, start address,
+# length), the entry address of the end record, and the text records as segments of contiguous bytes.
+# Loading an image is one write_bytes (a slice assignment) per segment, so the object code is not parsed again.
+#
+# The image of an object code file is cached next to it (<program>.obj -> <program>.sicimg) the first time it
+# is loaded (see load_program_image). The image records the modification time, size and SHA-256 hash of the
+# object code file it was built from. The cached image is used while the time and size are unchanged,
+# or while the hash is unchanged after the file was touched, and is built again otherwise.
+#
+# PROGRAM IMAGE FILE FORMAT (integers big-endian)
+# [SIGNATURE 8 bytes][HEADER][SEGMENT]...
+# HEADER: program name (6 bytes, ASCII padded with spaces), start address (2), program length (2),
+#         entry address (2), object code modification time in nanoseconds (8), object code size (8),
+#         object code SHA-256 hash (32), number of segments (2)
+# SEGMENT: address (2), length (2), the bytes of the segment
+PROGRAM_IMAGE_FILE_SIGNATURE = b"SICIMG01"
+PROGRAM_IMAGE_HEADER_STRUCT = struct.Struct(">6sHHHQQ32sH")
+PROGRAM_IMAGE_SEGMENT_STRUCT = struct.Struct(">HH")
+
+
+class SICProgramImageError(Exception):
+    pass
+
+
+class SICProgramImage:
+    # segment_list holds (address, bytes) in load order
+    def __init__(self, program_name, program_start_address_dec, program_length_dec, entry_address_dec,
+                 segment_list, source_modification_time_ns=0, source_size=0, source_hash=bytes(32)):
+        self.program_name = program_name
+        self.program_start_address_dec = program_start_address_dec
+        self.program_length_dec = program_length_dec
+        self.entry_address_dec = entry_address_dec
+        self.segment_list = segment_list
+        self.source_modification_time_ns = source_modification_time_ns
+        self.source_size = source_size
+        self.source_hash = source_hash
+
+    # This function will initialize the memory model and then load the segments into it.
+    def load(self, MEMORY_MODEL):
+        MEMORY_MODEL.initialize_memory()
+        for segment_address_dec, segment_bytes in self.segment_list:
+            MEMORY_MODEL.write_bytes(segment_address_dec, segment_bytes)
+
+    def to_bytes(self):
+        byte_data_list = [PROGRAM_IMAGE_FILE_SIGNATURE,
+                          PROGRAM_IMAGE_HEADER_STRUCT.pack(self.program_name.ljust(6).encode("ascii", errors="replace"),
+                                                           self.program_start_address_dec, self.program_length_dec,
+                                                           self.entry_address_dec, self.source_modification_time_ns,
+                                                           self.source_size, self.source_hash,
+                                                           len(self.segment_list))]
+        for segment_address_dec, segment_bytes in self.segment_list:
+            byte_data_list.append(PROGRAM_IMAGE_SEGMENT_STRUCT.pack(segment_address_dec, len(segment_bytes)))
+            byte_data_list.append(segment_bytes)
+
+        return b"".join(byte_data_list)
+
+    def save(self, program_image_file_path):
+        with open(program_image_file_path, "wb") as program_image_file:
+            program_image_file.write(self.to_bytes())
+
+
+# This function raises an SICProgramImageError if a segment does not fit in memory.
+def check_segment_memory_range(segment_address_dec, segment_length):
+    if not (MINIMUM_MEMORY_ADDRESS_DEC <= segment_address_dec and
+            segment_address_dec + segment_length - 1 <= MAXIMUM_MEMORY_ADDRESS_DEC):
+        raise SICProgramImageError("Text record out of memory range")
+
+
+# This function builds a program image from object code records (see iterate_object_code_records),
+# which start with the header record.
+# Text records that continue where the one before ends are joined into one segment.
+# Every text record is checked against the memory range, so a bad object file fails here and not partway through a load.
+def program_image_from_object_code_records(object_code_record_iterable):
+    header_record = None
+    entry_address_dec = None
+    segment_list = []
+    segment_address_dec = None
+    segment_bytearray = None
+
+    for object_code_record in object_code_record_iterable:
+        if isinstance(object_code_record, SICTextRecord):
+            address_dec = object_code_record.start_address_dec
+            check_segment_memory_range(address_dec, len(object_code_record.byte_data))
+
+            if segment_bytearray is not None and address_dec == segment_address_dec + len(segment_bytearray):
+                segment_bytearray += object_code_record.byte_data
+            else:
+                if segment_bytearray is not None:
+                    segment_list.append((segment_address_dec, bytes(segment_bytearray)))
+                segment_address_dec = address_dec
+                segment_bytearray = bytearray(object_code_record.byte_data)
+
+        elif isinstance(object_code_record, SICHeaderRecord):
+            if header_record is None:
+                header_record = object_code_record
+
+        elif isinstance(object_code_record, SICEndRecord):
+            entry_address_dec = object_code_record.program_start_address_dec
+
+    if header_record is None:
+        raise SICProgramImageError("Object code does not start with a header record")
+
+    if segment_bytearray is not None:
+        segment_list.append((segment_address_dec, bytes(segment_bytearray)))
+
+    if entry_address_dec is None:
+        entry_address_dec = header_record.program_start_address_dec
+
+    return SICProgramImage(header_record.program_name, header_record.program_start_address_dec,
+                           header_record.program_length_dec, entry_address_dec, segment_list)
+
+
+# This function rebuilds a program image from the bytes of a program image file.
+def program_image_from_bytes(image_bytes):
+    if not image_bytes.startswith(PROGRAM_IMAGE_FILE_SIGNATURE):
+        raise SICProgramImageError("Not a program image file")
+
+    try:
+        offset = len(PROGRAM_IMAGE_FILE_SIGNATURE)
+        (program_name_bytes, program_start_address_dec, program_length_dec, entry_address_dec,
+         source_modification_time_ns, source_size, source_hash,
+         number_of_segments) = PROGRAM_IMAGE_HEADER_STRUCT.unpack_from(image_bytes, offset)
+        offset += PROGRAM_IMAGE_HEADER_STRUCT.size
+
+        segment_list = []
+        for segment_index in range(number_of_segments):
+            segment_address_dec, segment_length = PROGRAM_IMAGE_SEGMENT_STRUCT.unpack_from(image_bytes, offset)
+            offset += PROGRAM_IMAGE_SEGMENT_STRUCT.size
+            check_segment_memory_range(segment_address_dec, segment_length)
+            segment_list.append((segment_address_dec, image_bytes[offset:offset + segment_length]))
+            offset += segment_length
+    except struct.error:
+        raise SICProgramImageError("Program image file is damaged")
+
+    if offset != len(image_bytes):
+        raise SICProgramImageError("Program image file is damaged")
+
+    return SICProgramImage(program_name_bytes.decode("ascii", errors="replace").rstrip(), program_start_address_dec,
+                           program_length_dec, entry_address_dec, segment_list, source_modification_time_ns,
+                           source_size, source_hash)
+
+
+# This function returns the path of the cached program image of an object code file.
+def get_program_image_file_path(object_code_file_path):
+    root_file_path, file_extension = os.path.splitext(object_code_file_path)
+
+    if file_extension != "." + SIC_OBJECT_CODE_FILE_EXTENSION:
+        root_file_path = object_code_file_path
+
+    return root_file_path + "." + SIC_PROGRAM_IMAGE_FILE_EXTENSION
+
+
+# This function reads the whole object code file as bytes.
+def read_object_code_bytes(object_code_file_path):
+    with open(object_code_file_path, "rb") as object_code_file:
+        return object_code_file.read()
+
+
+# This function returns the cached program image of an object code file, if it was built from the file as it is.
+# The hash of the file is only computed when its modification time or size changed.
+def read_cached_program_image(program_image_file_path, object_code_file_path, object_code_file_stat):
+    try:
+        with open(program_image_file_path, "rb") as program_image_file:
+            program_image = program_image_from_bytes(program_image_file.read())
+    except (OSError, SICProgramImageError):
+        return None
+
+    if (program_image.source_modification_time_ns == object_code_file_stat.st_mtime_ns and
+            program_image.source_size == object_code_file_stat.st_size):
+        return program_image
+
+    if program_image.source_hash == hashlib.sha256(read_object_code_bytes(object_code_file_path)).digest():
+        return program_image
+
+    return None
+
+
+# This function loads the program image of an object code file, from the cache next to the file if it is
+# up to date. Otherwise it parses the object code, builds the image and writes it to the cache.
+# The image is written to a temporary file and moved into place, so a process never reads half an image.
+# A cache that can not be written (for example in a read-only directory) is skipped.
+def load_program_image(object_code_file_path):
+    program_image_file_path = get_program_image_file_path(object_code_file_path)
+    object_code_file_stat = os.stat(object_code_file_path)
+
+    program_image = read_cached_program_image(program_image_file_path, object_code_file_path, object_code_file_stat)
+    if program_image is not None:
+        return program_image
+
+    object_code_bytes = read_object_code_bytes(object_code_file_path)
+    program_image = program_image_from_object_code_records(
+        iterate_object_code_records(io.StringIO(object_code_bytes.decode("ascii", errors="replace"))))
+    program_image.source_modification_time_ns = object_code_file_stat.st_mtime_ns
+    program_image.source_size = object_code_file_stat.st_size
+    program_image.source_hash = hashlib.sha256(object_code_bytes).digest()
+
+    temporary_file_path = program_image_file_path + "." + str(os.getpid()) + ".tmp"
+    try:
+        program_image.save(temporary_file_path)
+        os.replace(temporary_file_path, program_image_file_path)
+    except OSError:
+        try:
+            os.remove(temporary_file_path)
+        except OSError:
+            pass
+
+    return program_image
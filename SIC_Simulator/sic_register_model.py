@@ -1,4 +1,4 @@
-from SIC_Utilities.sic_constants import HEX_TO_BIN_DICT, BIN_TO_HEX_DICT, INITIALIZATION_CHARACTER, BITS_IN_WORD
+from SIC_Utilities.sic_constants import HEX_TO_BIN_DICT, INITIALIZATION_CHARACTER, MAXIMUM_WORD_DEC
 
 
 class SICRegisterContentsError(Exception):
@@ -9,14 +9,17 @@ class SICRegisterModel:
     NUMBER_OF_HEX_DIGITS = 6
     NUMBER_OF_BIN_DIGITS = 24
 
+    # The register contents are held as a plain 24-bit unsigned integer (0 - FFFFFF).
+    # Hex and binary strings are only built when they are asked for (dump_registers, listing lookups).
+    # A register that has not been set since initialization is flagged, so it can still be displayed as "-".
     def __init__(self, register_name):
         self.register_name = register_name
-        self.hex_string = INITIALIZATION_CHARACTER * self.NUMBER_OF_HEX_DIGITS
-        self.bin_string = INITIALIZATION_CHARACTER * self.NUMBER_OF_BIN_DIGITS
+        self.value = MAXIMUM_WORD_DEC
+        self.is_initialized = False
 
     def initialize_register(self):
-        self.hex_string = INITIALIZATION_CHARACTER * self.NUMBER_OF_HEX_DIGITS
-        self.bin_string = INITIALIZATION_CHARACTER * self.NUMBER_OF_BIN_DIGITS
+        self.value = MAXIMUM_WORD_DEC
+        self.is_initialized = False
 
     def get_register_name(self):
         return self.register_name
@@ -24,13 +27,19 @@ class SICRegisterModel:
     def get_formatted_register_name(self):
         return self.register_name.rjust(2)
 
-    def hex_to_bin(self, hex_string):
-        bin_string = ""
-        # Register holds 24 bits
-        # range(start, stop, step)
-        for hex_digit in hex_string:
-            bin_string += HEX_TO_BIN_DICT[hex_digit]
-        return bin_string
+    # Get the register contents as an unsigned integer.
+    # Reading an uninitialized register yields FFFFFF, and the register is considered set from then on.
+    def get_value(self):
+        self.is_initialized = True
+        return self.value
+
+    # Set the register contents from an unsigned integer (0 - FFFFFF).
+    def set_value(self, value: int):
+        if not 0 <= value <= MAXIMUM_WORD_DEC:
+            raise SICRegisterContentsError
+
+        self.value = value
+        self.is_initialized = True
 
     def set_hex_string(self, hex_string):
         # Ensure all hex digits are uppercase and pad string with 0 if necessary
@@ -46,70 +55,59 @@ class SICRegisterModel:
             raise SICRegisterContentsError
 
         # hex_string is okay, set the value
-        self.hex_string = hex_string
-
-        # Set self.register_bin_string
-        self.bin_string = self.hex_to_bin(hex_string)
+        self.set_value(int(hex_string, 16))
 
-    def bin_to_hex(self, bin_string):
-        hex_string = ""
-        # Register holds 24 bits
-        # range(start, stop, step)
-        for index in range(0, BITS_IN_WORD, 4):
-            hex_string += BIN_TO_HEX_DICT[bin_string[index:index + 4]]
-        return hex_string
-
-    # Set self.register_bin_string
     def set_bin_string(self, bin_string):
         # Pad bin string with 0 if necessary
-        bin_string.rjust(self.NUMBER_OF_BIN_DIGITS, "0")
-        # Error Check for length and hex digits
+        bin_string = bin_string.rjust(self.NUMBER_OF_BIN_DIGITS, "0")
+        # Error Check for length and bin digits
         error_found = False
         if len(bin_string) != self.NUMBER_OF_BIN_DIGITS:
             error_found = True
         for digit in bin_string:
             if digit != "0" and digit != "1":
                 error_found = True
-                print("digit", digit)
         if error_found:
             raise SICRegisterContentsError
 
         # bin_string is okay, set the value
-        self.bin_string = bin_string
-
-        # Set self.register_hex_string
-        # Convert bin_string to hex
-        self.hex_string = self.bin_to_hex(bin_string)
+        self.set_value(int(bin_string, 2))
 
     def get_bin_string(self):
-        self.bin_string = self.bin_string.replace(INITIALIZATION_CHARACTER, "1")
-        self.hex_string = self.hex_string.replace(INITIALIZATION_CHARACTER, "F")
-        return self.bin_string
+        return format(self.get_value(), "024b")
 
     def get_hex_string(self):
-        self.hex_string = self.hex_string.replace(INITIALIZATION_CHARACTER, "F")
-        self.bin_string = self.bin_string.replace(INITIALIZATION_CHARACTER, "1")
-        return self.hex_string
+        return format(self.get_value(), "06X")
 
     def get_formatted_bin_string(self):
+        if self.is_initialized:
+            bin_string = format(self.value, "024b")
+        else:
+            bin_string = INITIALIZATION_CHARACTER * self.NUMBER_OF_BIN_DIGITS
+
         formatted_bin_string = ""
-        for index in range(len(self.bin_string)):
+        for index in range(len(bin_string)):
             if index % 8 == 0:
-                formatted_bin_string += "  " + self.bin_string[index]
+                formatted_bin_string += "  " + bin_string[index]
             elif index % 4 == 0:
-                formatted_bin_string += " " + self.bin_string[index]
+                formatted_bin_string += " " + bin_string[index]
             else:
-                formatted_bin_string += self.bin_string[index]
+                formatted_bin_string += bin_string[index]
 
         return formatted_bin_string.strip()
 
     def get_formatted_hex_string(self):
+        if self.is_initialized:
+            hex_string = format(self.value, "06X")
+        else:
+            hex_string = INITIALIZATION_CHARACTER * self.NUMBER_OF_HEX_DIGITS
+
         formatted_hex_string = ""
-        for index in range(len(self.hex_string)):
+        for index in range(len(hex_string)):
             if index % 2 == 0:
-                formatted_hex_string += " " + self.hex_string[index]
+                formatted_hex_string += " " + hex_string[index]
             else:
-                formatted_hex_string += self.hex_string[index]
+                formatted_hex_string += hex_string[index]
 
         return formatted_hex_string.strip()
 
@@ -120,28 +118,38 @@ REGISTER_L = "L"
 REGISTER_PC = "PC"
 REGISTER_SW = "SW"
 
-REGISTER_DICT = {REGISTER_A: SICRegisterModel(REGISTER_A),
-                 REGISTER_X: SICRegisterModel(REGISTER_X),
-                 REGISTER_L: SICRegisterModel(REGISTER_L),
-                 REGISTER_PC: SICRegisterModel(REGISTER_PC),
-                 REGISTER_SW: SICRegisterModel(REGISTER_SW)}
 
+# This function builds a new set of registers.
+def create_register_dict():
+    return {REGISTER_A: SICRegisterModel(REGISTER_A),
+            REGISTER_X: SICRegisterModel(REGISTER_X),
+            REGISTER_L: SICRegisterModel(REGISTER_L),
+            REGISTER_PC: SICRegisterModel(REGISTER_PC),
+            REGISTER_SW: SICRegisterModel(REGISTER_SW)}
+
+
+REGISTER_DICT = create_register_dict()
 
-def dump_registers():
+
+def get_register_dump_string(REGISTER_DICT=REGISTER_DICT):
     output_string = ""
     for register_name, register in REGISTER_DICT.items():
         output_string += ("REGISTER " + register.get_formatted_register_name() + " :" +
                           "   HEX [" + register.get_formatted_hex_string() + "]" +
                           "   BIN [" + register.get_formatted_bin_string() + "]\n")
 
-    print(output_string)
+    return output_string
+
+
+def dump_registers(REGISTER_DICT=REGISTER_DICT):
+    print(get_register_dump_string(REGISTER_DICT))
 
 
-def initialize_registers():
+def initialize_registers(REGISTER_DICT=REGISTER_DICT):
     for register_name, register in REGISTER_DICT.items():
         register.initialize_register()
 
 # TEST BED
 # register_a = SICRegisterModel()
-# register_a.set_register_hex_string("1AB4Ff")
+# register_a.set_hex_string("1AB4Ff")
 # register_a.set_bin_string("000000000000000000000001")
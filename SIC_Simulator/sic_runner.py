@@ -0,0 +1,467 @@
+import contextlib
+import os
+import sys
+import time
+
+from SIC_Peripherals.sic_device_readiness import create_readiness_model, draw_seed, SICDeviceReadinessError, \
+    READINESS_MODEL_RANDOM, DEFAULT_READY_PROBABILITY, DEFAULT_LATENCY
+from SIC_Peripherals.sic_input_device_F1 import INPUT_DEVICE_F1, SICTerminalSource, SICFileSource, \
+    get_standard_input_source, SICInputDeviceF1Error, DEFAULT_RECORD_SEPARATOR_BYTE_VALUE
+from SIC_Peripherals.sic_output_device_05 import OUTPUT_DEVICE_05, SICTerminalSink, SICFileSink, \
+    SICOutputDevice05Error, FLUSH_POLICY_EVERY_LINE
+from SIC_Simulator.sic_assembly_listing_parser import SICAssemblyListingIndex, get_assembly_listing_line, \
+    SICAssemblyListingParserError
+from SIC_Simulator.sic_breakpoints import SICBreakpointTable, SICBreakpointError, parse_breakpoint, parse_watchpoint
+from SIC_Simulator.sic_machine import MACHINE
+from SIC_Simulator.sic_memory_model import MEMORY_MODEL, SICMemoryModelError
+from SIC_Simulator.sic_object_code_parser import SICObjectCodeParserError
+from SIC_Simulator.sic_operation_executor import execute_operation
+from SIC_Simulator.sic_profiler import SICProfile, DEFAULT_NUMBER_OF_HOT_SPOTS
+from SIC_Simulator.sic_program_image import load_program_image, SICProgramImageError
+from SIC_Simulator.sic_register_model import dump_registers, get_register_dump_string, REGISTER_DICT, REGISTER_PC, \
+    SICRegisterContentsError
+from SIC_Simulator.sic_trace_recorder import SICTraceRingBuffer, SICTraceFileWriter, SICTraceRecorderError
+from SIC_Utilities.sic_constants import SIC_OBJECT_CODE_FILE_EXTENSION, SIC_ASSEMBLY_LISTING_FILE_EXTENSION
+from SIC_Utilities.sic_messaging import print_error, print_status, SICBufferedWriter
+
+# The headless runner loads a program and runs it without the interactive menu of sic_simulator.
+# It runs until XOS, a fault, a breakpoint or watchpoint, or the step budget is used up,
+# and reports the outcome as an exit status.
+EXIT_STATUS_NORMAL = 0
+EXIT_STATUS_FAULT = 1
+EXIT_STATUS_STEP_BUDGET_EXHAUSTED = 2
+EXIT_STATUS_LOAD_ERROR = 3
+EXIT_STATUS_BREAK = 4
+
+# Run modes select how much the runner prints while the program runs
+RUN_MODE_SILENT = "silent"
+RUN_MODE_EVERY_N_STEPS = "every-n"
+RUN_MODE_ON_CHANGE = "on-change"
+RUN_MODE_FULL = "full"
+RUN_MODE_LIST = [RUN_MODE_SILENT, RUN_MODE_EVERY_N_STEPS, RUN_MODE_ON_CHANGE, RUN_MODE_FULL]
+LISTING_RUN_MODE_SET = {RUN_MODE_ON_CHANGE, RUN_MODE_FULL}
+DEFAULT_REPORT_INTERVAL = 1000
+
+STANDARD_INPUT_FILE_PATH = "-"
+
+
+class SICRunnerError(Exception):
+    pass
+
+
+# This function builds the object code file path and the assembly listing file path of a program.
+# The program file path may be given with or without the object code file extension.
+def get_program_file_paths(program_file_path):
+    root_file_path, file_extension = os.path.splitext(program_file_path)
+
+    if file_extension == "":
+        root_file_path = program_file_path
+    elif file_extension != "." + SIC_OBJECT_CODE_FILE_EXTENSION:
+        raise SICRunnerError("Invalid file extension")
+
+    return (root_file_path + "." + SIC_OBJECT_CODE_FILE_EXTENSION,
+            root_file_path + "." + SIC_ASSEMBLY_LISTING_FILE_EXTENSION)
+
+
+# This function loads the program of an object code file, ready to run.
+# The object code is parsed once and then loaded from its cached program image (see sic_program_image).
+def load_program(object_code_file_path):
+    if not os.path.exists(object_code_file_path):
+        raise SICRunnerError("Object code file does not exist\n" + object_code_file_path)
+
+    MACHINE.load_program_image(load_program_image(object_code_file_path))
+
+
+# This function indexes the assembly listing file of a program for tracing (see SICAssemblyListingIndex).
+# The index is built here, so a damaged listing is reported as a load error.
+def load_assembly_listing(assembly_listing_file_path):
+    if not os.path.exists(assembly_listing_file_path):
+        raise SICRunnerError("Assembly listing file does not exist\n" + assembly_listing_file_path)
+
+    assembly_listing_index = SICAssemblyListingIndex(assembly_listing_file_path)
+    assembly_listing_index.build_index()
+    return assembly_listing_index
+
+
+# This function runs the loaded program silently for up to maximum_number_of_steps instructions.
+# A maximum_number_of_steps of None runs the program until it stops.
+# Device polling loops are fast-forwarded unless is_fast_forwarding_polling_loops is False.
+# It returns continue_execution and the number of instructions (steps) executed.
+def run_steps(maximum_number_of_steps=None, use_block_compiler=True, is_fast_forwarding_polling_loops=True):
+    return MACHINE.run_steps(maximum_number_of_steps, use_block_compiler, is_fast_forwarding_polling_loops)
+
+
+# This function executes one instruction, through the time travel log if there is one (see sic_time_travel).
+def execute_step(time_travel_log):
+    if time_travel_log is None:
+        return execute_operation(REGISTER_DICT, MEMORY_MODEL)
+    return time_travel_log.step()
+
+
+# This function runs the loaded program one instruction at a time for up to maximum_number_of_steps instructions,
+# through the time travel log if there is one, and stops before an instruction that hits a breakpoint or watchpoint
+# (see sic_breakpoints). The first instruction is only tested if is_testing_first_step, so a run that stopped
+# at a breakpoint goes on from it.
+# It returns continue_execution and the number of instructions (steps) executed.
+def run_breakpoint_steps(maximum_number_of_steps, breakpoint_table, time_travel_log=None, is_testing_first_step=False):
+    test_for_break = breakpoint_table.test_for_break
+    number_of_steps = 0
+    continue_execution = True
+
+    while continue_execution and (maximum_number_of_steps is None or number_of_steps < maximum_number_of_steps):
+        if (number_of_steps or is_testing_first_step) and test_for_break(REGISTER_DICT, MEMORY_MODEL):
+            break
+
+        continue_execution = execute_step(time_travel_log)
+        number_of_steps += 1
+
+    return continue_execution, number_of_steps
+
+
+# This function returns the contents of the registers that a step can change, PC excluded.
+def get_register_state():
+    return tuple((register.value, register.is_initialized) for register_name, register in REGISTER_DICT.items()
+                 if register_name != REGISTER_PC)
+
+
+# This function runs the loaded program and writes the step count and registers every report_interval steps.
+# With a time travel log the steps run through the log, one instruction at a time.
+# With a breakpoint table the steps run one instruction at a time and stop at a breakpoint or watchpoint.
+def run_reporting_steps(buffered_writer, maximum_number_of_steps, report_interval, use_block_compiler,
+                        is_fast_forwarding_polling_loops, time_travel_log=None, breakpoint_table=None):
+    number_of_steps = 0
+    continue_execution = True
+
+    while continue_execution and (maximum_number_of_steps is None or number_of_steps < maximum_number_of_steps):
+        interval_number_of_steps = report_interval
+        if maximum_number_of_steps is not None:
+            interval_number_of_steps = min(interval_number_of_steps, maximum_number_of_steps - number_of_steps)
+
+        if breakpoint_table is not None:
+            continue_execution, interval_number_of_steps = run_breakpoint_steps(interval_number_of_steps,
+                                                                                breakpoint_table, time_travel_log,
+                                                                                number_of_steps > 0)
+        elif time_travel_log is not None:
+            continue_execution, interval_number_of_steps = time_travel_log.run_steps(interval_number_of_steps)
+        else:
+            continue_execution, interval_number_of_steps = run_steps(interval_number_of_steps, use_block_compiler,
+                                                                     is_fast_forwarding_polling_loops)
+        number_of_steps += interval_number_of_steps
+
+        buffered_writer.write("STEP " + str(number_of_steps) + "\n" + get_register_dump_string() + "\n")
+
+        if breakpoint_table is not None and breakpoint_table.break_message is not None:
+            break
+
+    return continue_execution, number_of_steps
+
+
+# This function runs the loaded program one instruction at a time and writes the assembly listing line
+# and the registers after every step, or only after the steps that changed a register other than PC.
+# With a breakpoint table the run stops before an instruction (the first excepted) that hits a breakpoint or watchpoint.
+def run_listing_steps(buffered_writer, maximum_number_of_steps, assembly_listing_index, is_reporting_every_step,
+                      time_travel_log=None, breakpoint_table=None):
+    number_of_steps = 0
+    continue_execution = True
+
+    while continue_execution and (maximum_number_of_steps is None or number_of_steps < maximum_number_of_steps):
+        if (breakpoint_table is not None and number_of_steps and
+                breakpoint_table.test_for_break(REGISTER_DICT, MEMORY_MODEL)):
+            break
+
+        assembly_listing_line = get_assembly_listing_line(assembly_listing_index, REGISTER_DICT[REGISTER_PC])
+
+        if is_reporting_every_step:
+            buffered_writer.write(assembly_listing_line + "\n\n")
+            continue_execution = execute_step(time_travel_log)
+            buffered_writer.write(get_register_dump_string() + "\n")
+        else:
+            register_state = get_register_state()
+            continue_execution = execute_step(time_travel_log)
+            if get_register_state() != register_state:
+                buffered_writer.write(assembly_listing_line + "\n\n" + get_register_dump_string() + "\n")
+
+        number_of_steps += 1
+
+    return continue_execution, number_of_steps
+
+
+# This function runs the loaded program in a run mode:
+# RUN_MODE_SILENT         no output besides the program's own
+# RUN_MODE_EVERY_N_STEPS  the step count and registers every report_interval steps
+# RUN_MODE_ON_CHANGE      the assembly listing line and registers after each step that changed a register other than PC
+# RUN_MODE_FULL           the assembly listing line and registers for every step, like the (r)un command
+# The listing modes need the assembly listing index and execute one instruction at a time,
+# the other modes run on compiled blocks unless use_block_compiler is False,
+# and fast-forward device polling loops unless is_fast_forwarding_polling_loops is False.
+# A run with a profile (see sic_profiler) executes one instruction at a time and counts every instruction
+# in the profile. Only the silent run mode can be profiled.
+# A run with a trace recorder (see sic_trace_recorder) executes one instruction at a time and records every
+# instruction. Only the silent run mode can be traced, and a run is not profiled and traced at once.
+# A run with a time travel log (see sic_time_travel) executes one instruction at a time in any run mode and logs
+# every step, so the program can be stepped back afterwards.
+# A run with breakpoints or watchpoints (see sic_breakpoints) executes one instruction at a time in any run mode
+# and stops before an instruction that hits one, the first instruction of the run excepted. The breakpoint table
+# holds the reason in break_message. A run with an empty breakpoint table runs like a run without one.
+# All output of the run, the program's own included, goes through one buffered writer.
+# It returns the exit status and the number of instructions (steps) executed.
+def run_program(maximum_number_of_steps=None, run_mode=RUN_MODE_SILENT, assembly_listing_index=None,
+                report_interval=DEFAULT_REPORT_INTERVAL, use_block_compiler=True,
+                is_fast_forwarding_polling_loops=True, profile=None, trace_recorder=None, time_travel_log=None,
+                breakpoint_table=None):
+    if run_mode not in RUN_MODE_LIST:
+        raise SICRunnerError("Invalid run mode: " + str(run_mode))
+
+    if profile is not None and run_mode != RUN_MODE_SILENT:
+        raise SICRunnerError("A profiled run must use the silent run mode")
+
+    if trace_recorder is not None and run_mode != RUN_MODE_SILENT:
+        raise SICRunnerError("A traced run must use the silent run mode")
+
+    if profile is not None and trace_recorder is not None:
+        raise SICRunnerError("A run can not be profiled and traced at once")
+
+    if time_travel_log is not None and (profile is not None or trace_recorder is not None):
+        raise SICRunnerError("A run with a time travel log can not be profiled or traced")
+
+    if breakpoint_table is not None:
+        breakpoint_table.break_message = None
+        if breakpoint_table.is_empty():
+            breakpoint_table = None
+
+    if breakpoint_table is not None and (profile is not None or trace_recorder is not None):
+        raise SICRunnerError("A profiled or traced run can not stop at breakpoints")
+
+    if run_mode in LISTING_RUN_MODE_SET and assembly_listing_index is None:
+        raise SICRunnerError("Run mode " + run_mode + " needs the assembly listing")
+
+    if report_interval < 1:
+        raise SICRunnerError("The report interval must be at least 1")
+
+    buffered_writer = SICBufferedWriter(sys.stdout)
+
+    try:
+        with contextlib.redirect_stdout(buffered_writer):
+            if profile is not None:
+                continue_execution, number_of_steps = MACHINE.run_profiled_steps(profile, maximum_number_of_steps,
+                                                                                 is_fast_forwarding_polling_loops)
+            elif trace_recorder is not None:
+                continue_execution, number_of_steps = MACHINE.run_traced_steps(trace_recorder, maximum_number_of_steps)
+            elif breakpoint_table is not None and run_mode == RUN_MODE_SILENT:
+                continue_execution, number_of_steps = run_breakpoint_steps(maximum_number_of_steps, breakpoint_table,
+                                                                           time_travel_log)
+            elif time_travel_log is not None and run_mode == RUN_MODE_SILENT:
+                continue_execution, number_of_steps = time_travel_log.run_steps(maximum_number_of_steps)
+            elif run_mode == RUN_MODE_SILENT:
+                continue_execution, number_of_steps = run_steps(maximum_number_of_steps, use_block_compiler,
+                                                                is_fast_forwarding_polling_loops)
+            elif run_mode == RUN_MODE_EVERY_N_STEPS:
+                continue_execution, number_of_steps = run_reporting_steps(buffered_writer, maximum_number_of_steps,
+                                                                          report_interval, use_block_compiler,
+                                                                          is_fast_forwarding_polling_loops,
+                                                                          time_travel_log, breakpoint_table)
+            else:
+                continue_execution, number_of_steps = run_listing_steps(buffered_writer, maximum_number_of_steps,
+                                                                        assembly_listing_index,
+                                                                        run_mode == RUN_MODE_FULL, time_travel_log,
+                                                                        breakpoint_table)
+    finally:
+        OUTPUT_DEVICE_05.flush()
+        buffered_writer.flush()
+
+    if breakpoint_table is not None and breakpoint_table.break_message is not None:
+        return EXIT_STATUS_BREAK, number_of_steps
+    elif continue_execution:
+        return EXIT_STATUS_STEP_BUDGET_EXHAUSTED, number_of_steps
+    elif MACHINE.test_for_normal_termination():
+        return EXIT_STATUS_NORMAL, number_of_steps
+    else:
+        return EXIT_STATUS_FAULT, number_of_steps
+
+
+# This function connects input device F1 and output device 05 for a run.
+# Input device F1 prompts at the terminal, or reads input_file_path ("-" for the standard input pipe).
+# Output device 05 writes to the terminal, or to output_file_path.
+# Both devices get their own readiness model (see sic_device_readiness), built from the same settings.
+def attach_devices(input_file_path=None, record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE,
+                   output_file_path=None, output_flush_policy=FLUSH_POLICY_EVERY_LINE,
+                   readiness_model_name=READINESS_MODEL_RANDOM, seed=None,
+                   ready_probability=DEFAULT_READY_PROBABILITY, latency=DEFAULT_LATENCY):
+    # The seed is drawn once, so both devices report the same seed
+    if readiness_model_name == READINESS_MODEL_RANDOM and seed is None:
+        seed = draw_seed()
+
+    INPUT_DEVICE_F1.set_readiness_model(create_readiness_model(readiness_model_name, seed,
+                                                               ready_probability, latency))
+    OUTPUT_DEVICE_05.set_readiness_model(create_readiness_model(readiness_model_name, seed,
+                                                                ready_probability, latency))
+
+    if input_file_path is None:
+        INPUT_DEVICE_F1.set_source(SICTerminalSource())
+    elif input_file_path == STANDARD_INPUT_FILE_PATH:
+        INPUT_DEVICE_F1.set_source(get_standard_input_source(record_separator_byte_value))
+    else:
+        INPUT_DEVICE_F1.set_source(SICFileSource(input_file_path, record_separator_byte_value))
+
+    if output_file_path is None:
+        OUTPUT_DEVICE_05.set_sink(SICTerminalSink())
+    else:
+        OUTPUT_DEVICE_05.set_sink(SICFileSink(output_file_path, output_flush_policy))
+
+
+# This function closes any files opened by attach_devices and connects both devices to the terminal again.
+def detach_devices():
+    input_source = INPUT_DEVICE_F1.source
+    INPUT_DEVICE_F1.set_source(SICTerminalSource())
+    if isinstance(input_source, SICFileSource):
+        input_source.close()
+
+    output_sink = OUTPUT_DEVICE_05.sink
+    OUTPUT_DEVICE_05.set_sink(SICTerminalSink())
+    if isinstance(output_sink, SICFileSink):
+        output_sink.close()
+
+
+# This function prints the statistics of a run, the readiness model settings (and seed) of the devices included.
+def print_run_statistics(number_of_steps, elapsed_seconds):
+    steps_per_second = number_of_steps / elapsed_seconds if elapsed_seconds > 0 else 0
+
+    print_status("RUN STATISTICS",
+                 "STEPS: " + str(number_of_steps) + "\n" +
+                 "ELAPSED SECONDS: " + format(elapsed_seconds, ".6f") + "\n" +
+                 "STEPS PER SECOND: " + format(steps_per_second, ".0f") + "\n" +
+                 "INPUT DEVICE F1: " + str(INPUT_DEVICE_F1.bytes_read) + " bytes read, readiness " +
+                 INPUT_DEVICE_F1.readiness_model.get_description() + "\n" +
+                 "OUTPUT DEVICE 05: " + str(OUTPUT_DEVICE_05.bytes_written) + " bytes written, readiness " +
+                 OUTPUT_DEVICE_05.readiness_model.get_description())
+
+
+# This function loads and runs a program without any user interaction and returns the exit status.
+# The registers and memory are dumped at the end of the run only when asked for.
+# The assembly listing file is only read for the run modes that print listing lines.
+# The devices are connected as described in attach_devices.
+# A profiled run (is_profiling, or a profile_file_path for the JSON results) prints the profile report
+# of the number_of_profile_hot_spots most executed addresses at the end of the run (see sic_profiler).
+# The profile shows the assembly listing lines if the assembly listing file exists.
+# A traced run writes a binary record of every instruction to trace_file_path (see sic_trace_recorder),
+# or only the last trace_ring_size records if a trace_ring_size is given.
+# The run stops at the breakpoints (LOCATION [IF CONDITION]) and watchpoints (LOCATION[-LOCATION][:r|w|rw])
+# given as strings (see sic_breakpoints). Their labels are looked up in the assembly listing file.
+def run_program_file(program_file_path, maximum_number_of_steps=None, run_mode=RUN_MODE_SILENT,
+                     report_interval=DEFAULT_REPORT_INTERVAL, is_dumping_registers=False, is_dumping_memory=False,
+                     use_block_compiler=True, output_file_path=None, output_flush_policy=FLUSH_POLICY_EVERY_LINE,
+                     input_file_path=None, record_separator_byte_value=DEFAULT_RECORD_SEPARATOR_BYTE_VALUE,
+                     readiness_model_name=READINESS_MODEL_RANDOM, seed=None,
+                     ready_probability=DEFAULT_READY_PROBABILITY, latency=DEFAULT_LATENCY,
+                     is_reporting_statistics=False, is_fast_forwarding_polling_loops=True, is_profiling=False,
+                     profile_file_path=None, number_of_profile_hot_spots=DEFAULT_NUMBER_OF_HOT_SPOTS,
+                     trace_file_path=None, trace_ring_size=None, breakpoint_string_list=None,
+                     watchpoint_string_list=None):
+    try:
+        attach_devices(input_file_path, record_separator_byte_value, output_file_path, output_flush_policy,
+                       readiness_model_name, seed, ready_probability, latency)
+
+        object_code_file_path, assembly_listing_file_path = get_program_file_paths(program_file_path)
+
+        load_program(object_code_file_path)
+
+        assembly_listing_index = None
+        if run_mode in LISTING_RUN_MODE_SET:
+            assembly_listing_index = load_assembly_listing(assembly_listing_file_path)
+
+        profile = None
+        if is_profiling or profile_file_path is not None:
+            if run_mode != RUN_MODE_SILENT:
+                raise SICRunnerError("A profiled run must use the silent run mode")
+
+            profile = SICProfile()
+            if os.path.exists(assembly_listing_file_path):
+                assembly_listing_index = SICAssemblyListingIndex(assembly_listing_file_path)
+
+        trace_recorder = None
+        if trace_ring_size is not None and trace_file_path is None:
+            raise SICRunnerError("A trace ring needs a trace file")
+
+        if trace_file_path is not None:
+            if run_mode != RUN_MODE_SILENT:
+                raise SICRunnerError("A traced run must use the silent run mode")
+
+            if profile is not None:
+                raise SICRunnerError("A run can not be profiled and traced at once")
+
+            if trace_ring_size is not None:
+                trace_recorder = SICTraceRingBuffer(trace_ring_size)
+            else:
+                trace_recorder = SICTraceFileWriter(trace_file_path)
+
+        breakpoint_table = None
+        if breakpoint_string_list or watchpoint_string_list:
+            if profile is not None or trace_recorder is not None:
+                raise SICRunnerError("A profiled or traced run can not stop at breakpoints")
+
+            label_address_dict = None
+            if assembly_listing_index is not None:
+                label_address_dict = assembly_listing_index.get_label_address_dict()
+            elif os.path.exists(assembly_listing_file_path):
+                label_assembly_listing_index = load_assembly_listing(assembly_listing_file_path)
+                label_address_dict = label_assembly_listing_index.get_label_address_dict()
+                label_assembly_listing_index.close()
+
+            breakpoint_table = SICBreakpointTable()
+            for breakpoint_string in breakpoint_string_list or []:
+                breakpoint_table.set_breakpoint(*parse_breakpoint(breakpoint_string, label_address_dict))
+            for watchpoint_string in watchpoint_string_list or []:
+                breakpoint_table.set_watchpoint(*parse_watchpoint(watchpoint_string, label_address_dict))
+    except (SICRunnerError, SICObjectCodeParserError, SICProgramImageError, SICMemoryModelError,
+            SICAssemblyListingParserError, SICRegisterContentsError, SICDeviceReadinessError, SICInputDeviceF1Error,
+            SICOutputDevice05Error, SICTraceRecorderError, SICBreakpointError, OSError) as ex:
+        detach_devices()
+        print_error(str(ex))
+        return EXIT_STATUS_LOAD_ERROR
+
+    start_time = time.perf_counter()
+    try:
+        exit_status, number_of_steps = run_program(maximum_number_of_steps, run_mode, assembly_listing_index,
+                                                   report_interval, use_block_compiler,
+                                                   is_fast_forwarding_polling_loops, profile, trace_recorder,
+                                                   breakpoint_table=breakpoint_table)
+    finally:
+        elapsed_seconds = time.perf_counter() - start_time
+        detach_devices()
+
+        if trace_recorder is not None:
+            try:
+                trace_recorder.close()
+                if trace_ring_size is not None:
+                    trace_recorder.save(trace_file_path)
+            except OSError as ex:
+                print_error(str(ex))
+
+    if exit_status == EXIT_STATUS_STEP_BUDGET_EXHAUSTED:
+        print_error("STEP BUDGET EXHAUSTED", "STEPS: " + str(number_of_steps))
+
+    if exit_status == EXIT_STATUS_BREAK:
+        print_status(breakpoint_table.break_message, "STEPS: " + str(number_of_steps))
+
+    if is_reporting_statistics:
+        print_run_statistics(number_of_steps, elapsed_seconds)
+
+    if is_profiling:
+        print(profile.get_report_string(assembly_listing_index, number_of_profile_hot_spots))
+
+    if profile_file_path is not None:
+        try:
+            profile.save(profile_file_path, assembly_listing_index)
+        except OSError as ex:
+            print_error(str(ex))
+
+    if assembly_listing_index is not None:
+        assembly_listing_index.close()
+
+    if is_dumping_registers:
+        dump_registers()
+
+    if is_dumping_memory:
+        MEMORY_MODEL.dump_memory()
+
+    return exit_status
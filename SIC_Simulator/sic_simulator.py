@@ -1,16 +1,22 @@
 import os
 import sys
 
+from SIC_Peripherals.sic_input_device_F1 import initialize_input_device_F1
 from SIC_Peripherals.sic_output_device_05 import initialize_output_device_05
-from SIC_Simulator.sic_assembly_listing_parser import sic_assembly_listing_parser, print_assembly_listing_line, \
+from SIC_Simulator.sic_assembly_listing_parser import SICAssemblyListingIndex, print_assembly_listing_line, \
     SICAssemblyListingParserError
+from SIC_Simulator.sic_breakpoints import SICBreakpointTable, SICBreakpointError, parse_breakpoint, parse_watchpoint
 from SIC_Simulator.sic_configuration import SIC_DEFAULT_WORKING_DIRECTORY
 from SIC_Simulator.sic_loader import load_program_object_code
+from SIC_Simulator.sic_machine import MACHINE
 from SIC_Simulator.sic_memory_model import MEMORY_MODEL
 from SIC_Simulator.sic_object_code_parser import sic_object_code_parser, SICObjectCodeParserError
-from SIC_Simulator.sic_operation_executor import execute_operation
+from SIC_Simulator.sic_operation_executor import initialize_program_termination
 from SIC_Simulator.sic_register_model import dump_registers, REGISTER_DICT, REGISTER_PC, initialize_registers, \
     SICRegisterContentsError
+from SIC_Simulator.sic_runner import run_program, execute_step, RUN_MODE_FULL, RUN_MODE_ON_CHANGE, \
+    RUN_MODE_EVERY_N_STEPS, RUN_MODE_SILENT, DEFAULT_REPORT_INTERVAL, EXIT_STATUS_BREAK
+from SIC_Simulator.sic_time_travel import SICTimeTravelLog, SICTimeTravelError
 from SIC_Utilities.sic_constants import SIC_OBJECT_CODE_FILE_EXTENSION, SIC_ASSEMBLY_LISTING_FILE_EXTENSION
 from SIC_Utilities.sic_messaging import print_status, print_error
 
@@ -21,7 +27,7 @@ class SICSimulatorError(Exception):
 
 # This function is used to verify the existence of a program object code file(*.obj)
 # and its corresponding assembly listing file
-# If they exist, they are opened
+# If they exist, the object code file is opened
 def verify_and_open_program_files(program_file_name):
     program_file_dict = {}
     object_code_file_name = "." + SIC_OBJECT_CODE_FILE_EXTENSION
@@ -58,11 +64,9 @@ def verify_and_open_program_files(program_file_name):
     assembly_listing_file_path = SIC_DEFAULT_WORKING_DIRECTORY + assembly_listing_file_name
 
     # check to see if the file exists
+    # The assembly listing is only read when a step or a run prints listing lines (see SICAssemblyListingIndex)
     if os.path.exists(assembly_listing_file_path):
-        # open the file in read mode
-        assembly_listing_file = open(assembly_listing_file_path, "rt")
-
-        program_file_dict["assembly_listing_file"] = assembly_listing_file
+        program_file_dict["assembly_listing_file_path"] = assembly_listing_file_path
     else:
         raise SICSimulatorError("Assembly listing file does not exist\n" + assembly_listing_file_path)
 
@@ -75,16 +79,36 @@ def verify_and_open_program_files(program_file_name):
 ##############################
 
 LOAD_MENU = "(l)oad, (q)uit"
-RUN_MENU = "(s)tep, (d)ump, (r)un, (e)nd"
+RUN_MENU = ("(s)tep, (b)ack step, (d)ump, (r)un, (c)ontinue back, (g)o to step, brea(k)points, (l)og steps, (m)ode, "
+            "(e)nd")
+BREAKPOINT_MENU = "(b)reak at, (w)atch memory, (l)ist, (d)elete, (c)lear all"
+RUN_MODE_MENU = "(f)ull, (c)hange, (n) every N steps, (s)ilent"
+PROGRAM_STOPPED = "Program stopped: (b)ack step, (c)ontinue back or (g)o to step to look back, (e)nd to finish"
+PROGRAM_STOPPED_NOT_LOGGED = "Program stopped: (e)nd to finish"
+STEP_LOGGING_OFF = "Step logging is off: turn it on with (l)og steps to step back"
 END_CONFIRM = "Are you sure you want to end program? (y)es, (n)o"
 QUIT_CONFIRM = "Are you sure you want to quit? (y)es, (n)o"
 SIC_PROMPT = "SIC> "
 UNRECOGNIZED_COMMAND = "Unrecognized command"
 
 parsed_object_code_dict_list = []
-parsed_listing_dict = {}
+assembly_listing_index = None
+
+# While step logging is on, every step and run of the loaded program goes through the time travel log, so the
+# program can be stepped back (see sic_time_travel). A program that has stopped stays in the RUN menu until it is
+# ended or stepped back. A logged run executes one instruction at a time, so logging is off until (l)og steps turns
+# it on and runs keep the compiled blocks and the polling loop fast-forward.
+time_travel_log = SICTimeTravelLog(MACHINE)
+is_logging_steps = False
+is_program_stopped = False
+
+# (r)un stops at the breakpoints and watchpoints, and (c)ontinue back stops at them going back (see sic_breakpoints).
+# They are cleared when a program is loaded.
+breakpoint_table = SICBreakpointTable()
 
 mode = "LOAD"
+run_mode = RUN_MODE_FULL
+report_interval = DEFAULT_REPORT_INTERVAL
 
 print("SIC SIMULATOR")
 
@@ -104,7 +128,9 @@ while True:
 
                     parsed_object_code_dict_list = sic_object_code_parser(program_file_dict["object_code_file"])
 
-                    parsed_listing_dict = sic_assembly_listing_parser(program_file_dict["assembly_listing_file"])
+                    if assembly_listing_index is not None:
+                        assembly_listing_index.close()
+                    assembly_listing_index = SICAssemblyListingIndex(program_file_dict["assembly_listing_file_path"])
 
                     # Initialize memory and load program
                     load_program_object_code(parsed_object_code_dict_list)
@@ -116,9 +142,16 @@ while True:
                     header_record_dict = parsed_object_code_dict_list[0]
                     REGISTER_DICT[REGISTER_PC].set_hex_string(header_record_dict["program_start_address"])
 
-                    # Initialize output peripheral
+                    # Initialize peripherals
+                    initialize_input_device_F1()
                     initialize_output_device_05()
 
+                    initialize_program_termination(MEMORY_MODEL)
+
+                    time_travel_log.reset()
+                    is_program_stopped = False
+                    breakpoint_table.clear()
+
                     # STATUS
                     print_status(program_file_name + " loaded and ready to run")
                     mode = "RUN"
@@ -141,22 +174,159 @@ while True:
 
         match command.strip().upper():
             case "S":
-                print_assembly_listing_line(parsed_listing_dict, REGISTER_DICT[REGISTER_PC])
-                continue_execution = execute_operation(REGISTER_DICT, MEMORY_MODEL)
+                if is_program_stopped:
+                    print_error(PROGRAM_STOPPED)
+                    continue
+                try:
+                    print_assembly_listing_line(assembly_listing_index, REGISTER_DICT[REGISTER_PC])
+                except SICAssemblyListingParserError as ex:
+                    print_error(str(ex))
+                    mode = "LOAD"
+                    continue
+                continue_execution = execute_step(time_travel_log if is_logging_steps else None)
                 dump_registers()
                 if not continue_execution:
-                    mode = "LOAD"
+                    is_program_stopped = True
+                    print_status(PROGRAM_STOPPED if is_logging_steps else PROGRAM_STOPPED_NOT_LOGGED)
+            case "B":
+                if not is_logging_steps:
+                    print_error(STEP_LOGGING_OFF)
+                    continue
+                try:
+                    if time_travel_log.reverse_step():
+                        is_program_stopped = False
+                        print_status("STEP " + str(time_travel_log.step_number))
+                        dump_registers()
+                    else:
+                        print_error("There is no earlier step to go back to")
+                except SICTimeTravelError as ex:
+                    print_error(str(ex))
+            case "C":
+                if not is_logging_steps:
+                    print_error(STEP_LOGGING_OFF)
+                    continue
+                try:
+                    number_of_steps = time_travel_log.reverse_continue(breakpoint_table)
+                    if number_of_steps:
+                        is_program_stopped = False
+                    if breakpoint_table.break_message is not None:
+                        print_status(breakpoint_table.break_message)
+                    print_status("Went back " + str(number_of_steps) + " steps to STEP " +
+                                 str(time_travel_log.step_number))
+                    dump_registers()
+                except SICTimeTravelError as ex:
+                    print_error(str(ex))
+            case "G":
+                if not is_logging_steps:
+                    print_error(STEP_LOGGING_OFF)
+                    continue
+                print("Enter step number (" + str(time_travel_log.first_step_number) + " to " +
+                      str(time_travel_log.step_number) + ")")
+                command = input(SIC_PROMPT)
+                if not command.strip().isdigit():
+                    print(UNRECOGNIZED_COMMAND)
+                    continue
+                try:
+                    if int(command) != time_travel_log.step_number:
+                        time_travel_log.go_to_step(int(command))
+                        is_program_stopped = False
+                    print_status("STEP " + str(time_travel_log.step_number))
+                    dump_registers()
+                except SICTimeTravelError as ex:
+                    print_error(str(ex))
             case "D":
                 MEMORY_MODEL.dump_memory()
             case "R":
-                continue_execution = True
-                while continue_execution:
-                    print_assembly_listing_line(parsed_listing_dict, REGISTER_DICT[REGISTER_PC])
-                    continue_execution = execute_operation(REGISTER_DICT, MEMORY_MODEL)
+                if is_program_stopped:
+                    print_error(PROGRAM_STOPPED)
+                    continue
+                try:
+                    exit_status, number_of_steps = run_program(run_mode=run_mode,
+                                                               assembly_listing_index=assembly_listing_index,
+                                                               report_interval=report_interval,
+                                                               time_travel_log=(time_travel_log if is_logging_steps
+                                                                                else None),
+                                                               breakpoint_table=breakpoint_table)
+                except SICAssemblyListingParserError as ex:
+                    print_error(str(ex))
+                    mode = "LOAD"
+                    continue
+
+                if exit_status == EXIT_STATUS_BREAK:
+                    if is_logging_steps:
+                        print_status(breakpoint_table.break_message, "STEP " + str(time_travel_log.step_number))
+                    else:
+                        print_status(breakpoint_table.break_message)
                     dump_registers()
+                    continue
 
-                MEMORY_MODEL.dump_memory()
-                mode = "LOAD"
+                if run_mode != RUN_MODE_SILENT:
+                    MEMORY_MODEL.dump_memory()
+                is_program_stopped = True
+                print_status(PROGRAM_STOPPED if is_logging_steps else PROGRAM_STOPPED_NOT_LOGGED)
+            case "L":
+                # The log starts at step 0 from the current state, and turning logging off drops it
+                is_logging_steps = not is_logging_steps
+                time_travel_log.reset()
+                if is_logging_steps:
+                    print_status("Step logging on: steps and runs can be stepped back, runs are about 15 times slower")
+                else:
+                    print_status("Step logging off")
+            case "K":
+                print(BREAKPOINT_MENU)
+                command = input(SIC_PROMPT)
+
+                try:
+                    match command.strip().upper():
+                        case "B":
+                            print("Enter label or address, and a condition if wanted (RLOOP if X >= 1E)")
+                            breakpoint_table.set_breakpoint(
+                                *parse_breakpoint(input(SIC_PROMPT), assembly_listing_index.get_label_address_dict()))
+                        case "W":
+                            print("Enter label or address, or a range (BUFFER-103F), and :r, :w or :rw (default :w)")
+                            breakpoint_table.set_watchpoint(
+                                *parse_watchpoint(input(SIC_PROMPT), assembly_listing_index.get_label_address_dict()))
+                        case "L":
+                            description_list = breakpoint_table.get_description_list()
+                            if not description_list:
+                                print("No breakpoints or watchpoints")
+                            for number, description in enumerate(description_list, 1):
+                                print(str(number) + " " + description)
+                        case "D":
+                            print("Enter breakpoint or watchpoint number (see (l)ist)")
+                            command = input(SIC_PROMPT)
+                            if command.strip().isdigit():
+                                breakpoint_table.delete(int(command))
+                            else:
+                                print(UNRECOGNIZED_COMMAND)
+                        case "C":
+                            breakpoint_table.clear()
+                        case _:
+                            print(UNRECOGNIZED_COMMAND)
+                except (SICBreakpointError, SICAssemblyListingParserError, OSError) as ex:
+                    print_error(str(ex))
+            case "M":
+                print("Enter run mode")
+                print(RUN_MODE_MENU)
+                command = input(SIC_PROMPT)
+
+                match command.strip().upper():
+                    case "F":
+                        run_mode = RUN_MODE_FULL
+                    case "C":
+                        run_mode = RUN_MODE_ON_CHANGE
+                    case "N":
+                        print("Enter number of steps between register dumps")
+                        command = input(SIC_PROMPT)
+                        if command.strip().isdigit() and int(command) > 0:
+                            run_mode = RUN_MODE_EVERY_N_STEPS
+                            report_interval = int(command)
+                        else:
+                            print(UNRECOGNIZED_COMMAND)
+                    case "S":
+                        run_mode = RUN_MODE_SILENT
+                    case _:
+                        print(UNRECOGNIZED_COMMAND)
             case "E":
                 print(END_CONFIRM)
                 command = input(SIC_PROMPT)
@@ -0,0 +1,71 @@
+import json
+import zlib
+
+from SIC_Utilities.sic_constants import BYTES_IN_MEMORY
+
+# A machine snapshot holds the whole state of a machine: memory and its initialization bitmap, the five registers,
+# the termination flag, and the state of input device F1 and output device 05 (see get_state in SIC_Peripherals).
+# Memory is held as one bytes copy, so taking a snapshot is a few buffer copies.
+# A snapshot is restored into the machine it was taken from, or into a machine with the same kinds of devices,
+# so one warm state can be restored again and again to branch many runs from it (see SICMachine).
+#
+# SNAPSHOT FILE FORMAT
+# [SIGNATURE 8 bytes][zlib compressed: [HEADER (JSON) line][MEMORY 32768 bytes][INITIALIZATION BITMAP 4096 bytes]]
+# The header holds the registers, the termination flag and the device states.
+SNAPSHOT_FILE_SIGNATURE = b"SICSNAP1"
+BYTES_IN_INITIALIZED_BITMAP = BYTES_IN_MEMORY // 8
+
+
+class SICSnapshotError(Exception):
+    pass
+
+
+class SICMachineSnapshot:
+    # register_state_dict holds [value, is_initialized] by register name
+    def __init__(self, memory_image, initialized_bitmap_image, register_state_dict, is_program_terminated_normally,
+                 input_device_F1_state, output_device_05_state):
+        self.memory_image = memory_image
+        self.initialized_bitmap_image = initialized_bitmap_image
+        self.register_state_dict = register_state_dict
+        self.is_program_terminated_normally = is_program_terminated_normally
+        self.input_device_F1_state = input_device_F1_state
+        self.output_device_05_state = output_device_05_state
+
+    def to_bytes(self):
+        header_dict = {"registers": self.register_state_dict,
+                       "is_program_terminated_normally": self.is_program_terminated_normally,
+                       "input_device_F1": self.input_device_F1_state,
+                       "output_device_05": self.output_device_05_state}
+        header_bytes = json.dumps(header_dict, separators=(",", ":")).encode("ascii")
+
+        return SNAPSHOT_FILE_SIGNATURE + zlib.compress(header_bytes + b"\n" + self.memory_image +
+                                                       self.initialized_bitmap_image)
+
+    def save(self, snapshot_file_path):
+        with open(snapshot_file_path, "wb") as snapshot_file:
+            snapshot_file.write(self.to_bytes())
+
+
+# This function rebuilds a snapshot from the bytes of a snapshot file.
+def snapshot_from_bytes(snapshot_bytes):
+    if not snapshot_bytes.startswith(SNAPSHOT_FILE_SIGNATURE):
+        raise SICSnapshotError("Not a snapshot file")
+
+    try:
+        payload_bytes = zlib.decompress(snapshot_bytes[len(SNAPSHOT_FILE_SIGNATURE):])
+        header_bytes, image_bytes = payload_bytes.split(b"\n", 1)
+        header_dict = json.loads(header_bytes)
+    except (zlib.error, ValueError):
+        raise SICSnapshotError("Snapshot file is damaged")
+
+    if len(image_bytes) != BYTES_IN_MEMORY + BYTES_IN_INITIALIZED_BITMAP:
+        raise SICSnapshotError("Snapshot file is damaged")
+
+    return SICMachineSnapshot(image_bytes[:BYTES_IN_MEMORY], image_bytes[BYTES_IN_MEMORY:],
+                              header_dict["registers"], header_dict["is_program_terminated_normally"],
+                              header_dict["input_device_F1"], header_dict["output_device_05"])
+
+
+def load_snapshot(snapshot_file_path):
+    with open(snapshot_file_path, "rb") as snapshot_file:
+        return snapshot_from_bytes(snapshot_file.read())
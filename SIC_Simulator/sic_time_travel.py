@@ -0,0 +1,231 @@
+from SIC_Peripherals.sic_input_device_F1 import SICInputDeviceF1Error
+from SIC_Peripherals.sic_output_device_05 import SICOutputDevice05Error
+from SIC_Simulator.sic_memory_model import SICMemoryModelError
+from SIC_Simulator.sic_operation_executor import execute_operation
+from SIC_Simulator.sic_register_model import REGISTER_PC
+from SIC_Utilities.sic_constants import OPCODE_TO_HEX_DICT
+from SIC_Utilities.sic_converter import hex_string_to_dec
+
+# The time travel log runs a machine one instruction at a time and logs, for every step, only what the step changed:
+# the old contents of the registers it changed, the old bytes of the memory it wrote (see the write log of
+# SICMemoryModel), the old termination flag, and for RD and WD the old transfer state of the devices.
+# Undoing a step writes these back, so the machine can step back without running anything again.
+#
+# Every checkpoint_interval steps the log also takes a checkpoint of the whole machine. Going back to any step
+# restores the first checkpoint at or after it and undoes the steps in between, so it costs at most
+# checkpoint_interval undone steps. Only the last maximum_number_of_steps steps are kept.
+# Going back drops the steps after the step gone back to, running on logs new steps from there.
+#
+# The readiness models of the devices are never rewound, so a program that is stepped back and run again
+# can find its devices ready at other steps. A terminal can not take back its input or output: a read from the
+# terminal prompts again, and output already shown stays on the screen.
+#
+# STEP DELTA (tuple)
+# [0] register changes: (register, old value, old is_initialized, register, ...), or None
+# [1] memory writes: write log entries (address, old bytes, old initialization bits) in write order, or None
+# [2] device transfer states: (input device F1 state, output device 05 state), or None
+# [3] old termination flag, or None if the step did not change it
+DEFAULT_CHECKPOINT_INTERVAL = 1000
+DEFAULT_MAXIMUM_NUMBER_OF_LOGGED_STEPS = 100000
+DEVICE_TRANSFER_OPCODE_SET = {hex_string_to_dec(OPCODE_TO_HEX_DICT["RD"]),
+                              hex_string_to_dec(OPCODE_TO_HEX_DICT["WD"])}
+
+
+class SICTimeTravelError(Exception):
+    pass
+
+
+class SICTimeTravelLog:
+    def __init__(self, machine, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL,
+                 maximum_number_of_steps=DEFAULT_MAXIMUM_NUMBER_OF_LOGGED_STEPS):
+        if checkpoint_interval < 1:
+            raise SICTimeTravelError("The checkpoint interval must be at least 1")
+
+        if maximum_number_of_steps < checkpoint_interval:
+            raise SICTimeTravelError("The time travel log must keep at least one checkpoint interval of steps")
+
+        self.machine = machine
+        self.register_list = list(machine.register_dict.values())
+        self.checkpoint_interval = checkpoint_interval
+        self.maximum_number_of_steps = maximum_number_of_steps
+        self.reset()
+
+    # This function starts a new log at step 0 from the current state of the machine, for a program just loaded.
+    def reset(self):
+        self.step_number = 0
+        self.first_step_number = 0
+        # step_delta_list[n] undoes step first_step_number + n + 1
+        self.step_delta_list = []
+        self.checkpoint_dict = {0: self.get_checkpoint()}
+
+    # CHECKPOINTS
+    # A checkpoint is (memory image, initialization bitmap image, register states, termination flag,
+    # input device F1 transfer state, output device 05 transfer state).
+    def get_checkpoint(self):
+        memory_model = self.machine.memory_model
+        return (memory_model.get_memory_image(),
+                memory_model.get_initialized_bitmap_image(),
+                tuple((register.value, register.is_initialized) for register in self.register_list),
+                memory_model.is_program_terminated_normally,
+                self.machine.input_device_F1.get_transfer_state(),
+                self.machine.output_device_05.get_transfer_state())
+
+    # The devices are restored first, so a device that can not go back leaves the machine unchanged.
+    def restore_checkpoint(self, checkpoint):
+        (memory_image, initialized_bitmap_image, register_state_tuple, is_program_terminated_normally,
+         input_device_F1_state, output_device_05_state) = checkpoint
+
+        self.restore_device_states((input_device_F1_state, output_device_05_state))
+        self.machine.memory_model.restore_memory_image(memory_image, initialized_bitmap_image)
+        for register, (value, is_initialized) in zip(self.register_list, register_state_tuple):
+            register.value = value
+            register.is_initialized = is_initialized
+        self.machine.memory_model.is_program_terminated_normally = is_program_terminated_normally
+
+    def restore_device_states(self, device_state_tuple):
+        try:
+            self.machine.input_device_F1.set_transfer_state(device_state_tuple[0])
+            self.machine.output_device_05.set_transfer_state(device_state_tuple[1])
+        except (SICInputDeviceF1Error, SICOutputDevice05Error) as ex:
+            raise SICTimeTravelError("The devices can not go back: " + str(ex))
+
+    # RUNNING FORWARD
+    # This function executes one instruction and logs what it changed.
+    # It returns continue_execution, like execute_operation.
+    def step(self):
+        machine = self.machine
+        memory_model = machine.memory_model
+        register_list = self.register_list
+        register_state_list = [(register.value, register.is_initialized) for register in register_list]
+        is_program_terminated_normally = memory_model.is_program_terminated_normally
+
+        device_state_tuple = None
+        pc_register_dec_value = machine.register_dict[REGISTER_PC].value
+        try:
+            if memory_model.read_byte(pc_register_dec_value) in DEVICE_TRANSFER_OPCODE_SET:
+                device_state_tuple = (machine.input_device_F1.get_transfer_state(),
+                                      machine.output_device_05.get_transfer_state())
+        except SICMemoryModelError:
+            pass
+
+        memory_model.write_log = write_log = []
+        try:
+            continue_execution = execute_operation(machine.register_dict, memory_model)
+        finally:
+            memory_model.write_log = None
+
+        register_change_list = []
+        for register, (value, is_initialized) in zip(register_list, register_state_list):
+            if register.value != value or register.is_initialized != is_initialized:
+                register_change_list += (register, value, is_initialized)
+
+        self.step_delta_list.append((tuple(register_change_list) or None,
+                                     tuple(write_log) or None,
+                                     device_state_tuple,
+                                     is_program_terminated_normally
+                                     if memory_model.is_program_terminated_normally != is_program_terminated_normally
+                                     else None))
+        self.step_number += 1
+
+        if self.step_number % self.checkpoint_interval == 0:
+            self.checkpoint_dict[self.step_number] = self.get_checkpoint()
+
+            # The oldest checkpoint interval of steps is dropped once the log is full
+            if len(self.step_delta_list) > self.maximum_number_of_steps:
+                del self.step_delta_list[:self.checkpoint_interval]
+                del self.checkpoint_dict[self.first_step_number]
+                self.first_step_number += self.checkpoint_interval
+
+        return continue_execution
+
+    # This function runs the loaded program through the log for up to maximum_number_of_steps instructions.
+    # A maximum_number_of_steps of None runs the program until it stops.
+    # It returns continue_execution and the number of instructions (steps) executed.
+    def run_steps(self, maximum_number_of_steps=None):
+        number_of_steps = 0
+        continue_execution = True
+
+        while continue_execution and (maximum_number_of_steps is None or number_of_steps < maximum_number_of_steps):
+            continue_execution = self.step()
+            number_of_steps += 1
+
+        return continue_execution, number_of_steps
+
+    # GOING BACK
+    # This function undoes the last step in the log.
+    def undo_step(self):
+        register_change_tuple, write_log_tuple, device_state_tuple, is_program_terminated_normally = \
+            self.step_delta_list[-1]
+
+        if device_state_tuple is not None:
+            self.restore_device_states(device_state_tuple)
+
+        if write_log_tuple is not None:
+            memory_model = self.machine.memory_model
+            for memory_address_dec_value, byte_data, initialized_bits in reversed(write_log_tuple):
+                memory_model.undo_write(memory_address_dec_value, byte_data, initialized_bits)
+
+        if register_change_tuple is not None:
+            for change_index in range(0, len(register_change_tuple), 3):
+                register = register_change_tuple[change_index]
+                register.value = register_change_tuple[change_index + 1]
+                register.is_initialized = register_change_tuple[change_index + 2]
+
+        if is_program_terminated_normally is not None:
+            self.machine.memory_model.is_program_terminated_normally = is_program_terminated_normally
+
+        self.step_delta_list.pop()
+        self.step_number -= 1
+
+    # This function returns the machine to the state after step_number steps (0 is the program as loaded).
+    # It restores the first checkpoint at or after the step, then undoes the steps in between.
+    def go_to_step(self, step_number):
+        if not self.first_step_number <= step_number <= self.step_number:
+            raise SICTimeTravelError("Step " + str(step_number) + " is not in the time travel log (steps " +
+                                     str(self.first_step_number) + " to " + str(self.step_number) + ")")
+
+        checkpoint_step_number = -(-step_number // self.checkpoint_interval) * self.checkpoint_interval
+        if checkpoint_step_number < self.step_number:
+            self.restore_checkpoint(self.checkpoint_dict[checkpoint_step_number])
+            del self.step_delta_list[checkpoint_step_number - self.first_step_number:]
+            self.step_number = checkpoint_step_number
+
+        try:
+            while self.step_number > step_number:
+                self.undo_step()
+        finally:
+            # The checkpoints after the current step are taken again as the program runs on
+            for later_checkpoint_step_number in [checkpoint_dict_step_number
+                                                 for checkpoint_dict_step_number in self.checkpoint_dict
+                                                 if checkpoint_dict_step_number > self.step_number]:
+                del self.checkpoint_dict[later_checkpoint_step_number]
+
+    # This function undoes the last step. It returns False if there is no step to undo.
+    def reverse_step(self):
+        if self.step_number == self.first_step_number:
+            return False
+
+        self.go_to_step(self.step_number - 1)
+        return True
+
+    # This function goes back to the first step in the log. It returns the number of steps gone back.
+    # With a breakpoint table (see sic_breakpoints) it goes back one step at a time and stops at the first step
+    # whose next instruction hits a breakpoint or watchpoint, which sets break_message of the table.
+    def reverse_continue(self, breakpoint_table=None):
+        if breakpoint_table is not None:
+            breakpoint_table.break_message = None
+
+        if breakpoint_table is None or breakpoint_table.is_empty():
+            number_of_steps = self.step_number - self.first_step_number
+            self.go_to_step(self.first_step_number)
+            return number_of_steps
+
+        register_dict = self.machine.register_dict
+        memory_model = self.machine.memory_model
+        number_of_steps = 0
+        while self.reverse_step():
+            number_of_steps += 1
+            if breakpoint_table.test_for_break(register_dict, memory_model):
+                break
+
+        return number_of_steps
@@ -0,0 +1,238 @@
+import csv
+import struct
+from typing import NamedTuple
+
+from SIC_Simulator.sic_memory_model import SICMemoryModelError
+from SIC_Simulator.sic_operation_executor import execute_operation, ADDRESS_MASK, INDEXED_ADDRESSING_FLAG
+from SIC_Simulator.sic_register_model import REGISTER_A, REGISTER_X, REGISTER_PC, REGISTER_SW
+from SIC_Utilities.sic_constants import HEX_TO_OPCODE_DICT, INITIALIZATION_CHARACTER
+
+# The trace recorder writes one fixed-width binary record for every instruction executed:
+# the step number, the PC and opcode of the instruction, its effective address (indexed addressing applied),
+# and registers A, X and SW after the instruction. A traced run executes one instruction at a time through
+# run_traced_steps, so a run that is not traced does not pay for the recording.
+#
+# SICTraceRingBuffer keeps the last records of a run in a preallocated buffer, SICTraceFileWriter appends
+# every record to a trace file through a preallocated buffer. Both write the same trace file format,
+# which open_trace_file and iterate_trace_records read back and write_trace_text and write_trace_csv decode offline.
+#
+# TRACE FILE FORMAT (integers big-endian)
+# [SIGNATURE 8 bytes][RECORD 32 bytes]...
+# RECORD: step (8), PC (4), effective address (4), A (4), X (4), SW (4), opcode (1),
+#         initialized register flags (1: A 1, X 2, SW 4, instruction not readable 8), unused (2)
+TRACE_FILE_SIGNATURE = b"SICTRC01"
+TRACE_RECORD_STRUCT = struct.Struct(">QIIIIIBBxx")
+TRACE_FLAG_A_INITIALIZED = 1
+TRACE_FLAG_X_INITIALIZED = 2
+TRACE_FLAG_SW_INITIALIZED = 4
+TRACE_FLAG_INSTRUCTION_NOT_READABLE = 8
+DEFAULT_NUMBER_OF_BUFFERED_RECORDS = 65536
+
+TRACE_CSV_HEADER_LIST = ["step", "pc", "opcode", "mnemonic", "effective_address", "a", "x", "sw"]
+
+
+class SICTraceRecorderError(Exception):
+    pass
+
+
+class SICTraceRecord(NamedTuple):
+    step: int
+    pc: int
+    effective_address: int
+    a: int
+    x: int
+    sw: int
+    opcode: int
+    flags: int
+
+
+# This recorder keeps the last number_of_records records. Older records are overwritten.
+class SICTraceRingBuffer:
+    def __init__(self, number_of_records):
+        if number_of_records < 1:
+            raise SICTraceRecorderError("The trace ring buffer must hold at least one record")
+
+        self.number_of_records = number_of_records
+        self.record_bytearray = bytearray(number_of_records * TRACE_RECORD_STRUCT.size)
+        self.record_index = 0
+        self.number_of_records_written = 0
+
+    def record(self, step, pc, effective_address, a, x, sw, opcode, flags):
+        TRACE_RECORD_STRUCT.pack_into(self.record_bytearray, self.record_index * TRACE_RECORD_STRUCT.size,
+                                      step, pc, effective_address, a, x, sw, opcode, flags)
+        self.record_index += 1
+        if self.record_index == self.number_of_records:
+            self.record_index = 0
+        self.number_of_records_written += 1
+
+    # This function returns the records held, the oldest first, as the bytes of a trace file without signature.
+    def get_record_bytes(self):
+        if self.number_of_records_written < self.number_of_records:
+            return bytes(self.record_bytearray[:self.record_index * TRACE_RECORD_STRUCT.size])
+
+        split_offset = self.record_index * TRACE_RECORD_STRUCT.size
+        return bytes(self.record_bytearray[split_offset:] + self.record_bytearray[:split_offset])
+
+    def save(self, trace_file_path):
+        with open(trace_file_path, "wb") as trace_file:
+            trace_file.write(TRACE_FILE_SIGNATURE)
+            trace_file.write(self.get_record_bytes())
+
+    def close(self):
+        pass
+
+
+# This recorder appends every record to a trace file. Records are collected in a preallocated buffer
+# of number_of_buffered_records records, which is written out whenever it is full and when the recorder is closed.
+class SICTraceFileWriter:
+    def __init__(self, trace_file_path, number_of_buffered_records=DEFAULT_NUMBER_OF_BUFFERED_RECORDS):
+        if number_of_buffered_records < 1:
+            raise SICTraceRecorderError("The trace file buffer must hold at least one record")
+
+        self.trace_file = open(trace_file_path, "wb")
+        self.trace_file.write(TRACE_FILE_SIGNATURE)
+        self.number_of_records = number_of_buffered_records
+        self.record_bytearray = bytearray(number_of_buffered_records * TRACE_RECORD_STRUCT.size)
+        self.record_index = 0
+        self.number_of_records_written = 0
+
+    def record(self, step, pc, effective_address, a, x, sw, opcode, flags):
+        TRACE_RECORD_STRUCT.pack_into(self.record_bytearray, self.record_index * TRACE_RECORD_STRUCT.size,
+                                      step, pc, effective_address, a, x, sw, opcode, flags)
+        self.record_index += 1
+        if self.record_index == self.number_of_records:
+            self.flush()
+        self.number_of_records_written += 1
+
+    def flush(self):
+        self.trace_file.write(memoryview(self.record_bytearray)[:self.record_index * TRACE_RECORD_STRUCT.size])
+        self.record_index = 0
+        self.trace_file.flush()
+
+    def close(self):
+        if not self.trace_file.closed:
+            self.flush()
+            self.trace_file.close()
+
+
+# This function runs the loaded program one instruction at a time for up to maximum_number_of_steps instructions
+# and records every instruction executed with the trace recorder.
+# A maximum_number_of_steps of None runs the program until it stops.
+# Steps are numbered from 1, continuing the numbers of the records the recorder already holds.
+# It returns continue_execution and the number of instructions (steps) executed.
+def run_traced_steps(REGISTER_DICT, MEMORY_MODEL, trace_recorder, maximum_number_of_steps=None):
+    record = trace_recorder.record
+    read_word = MEMORY_MODEL.read_word
+    a_register = REGISTER_DICT[REGISTER_A]
+    x_register = REGISTER_DICT[REGISTER_X]
+    pc_register = REGISTER_DICT[REGISTER_PC]
+    sw_register = REGISTER_DICT[REGISTER_SW]
+    step = trace_recorder.number_of_records_written
+    number_of_steps = 0
+    continue_execution = True
+
+    while continue_execution and (maximum_number_of_steps is None or number_of_steps < maximum_number_of_steps):
+        pc_register_dec_value = pc_register.value
+
+        # The instruction is read before it executes, so the record holds it even if it writes over itself
+        try:
+            instruction_word_value = read_word(pc_register_dec_value)
+            opcode_dec_value = instruction_word_value >> 16
+            effective_address_dec_value = instruction_word_value & ADDRESS_MASK
+            if instruction_word_value & INDEXED_ADDRESSING_FLAG:
+                effective_address_dec_value += x_register.value
+            flags = 0
+        except SICMemoryModelError:
+            opcode_dec_value = 0
+            effective_address_dec_value = 0
+            flags = TRACE_FLAG_INSTRUCTION_NOT_READABLE
+
+        continue_execution = execute_operation(REGISTER_DICT, MEMORY_MODEL)
+        number_of_steps += 1
+        step += 1
+
+        if a_register.is_initialized:
+            flags |= TRACE_FLAG_A_INITIALIZED
+        if x_register.is_initialized:
+            flags |= TRACE_FLAG_X_INITIALIZED
+        if sw_register.is_initialized:
+            flags |= TRACE_FLAG_SW_INITIALIZED
+
+        record(step, pc_register_dec_value, effective_address_dec_value, a_register.value, x_register.value,
+               sw_register.value, opcode_dec_value, flags)
+
+    return continue_execution, number_of_steps
+
+
+# TRACE READER
+# This function opens a trace file for reading and checks its signature.
+# The file is left positioned at the first record.
+def open_trace_file(trace_file_path):
+    trace_file = open(trace_file_path, "rb")
+
+    if trace_file.read(len(TRACE_FILE_SIGNATURE)) != TRACE_FILE_SIGNATURE:
+        trace_file.close()
+        raise SICTraceRecorderError("Not a trace file")
+
+    return trace_file
+
+
+# This function yields the records of a trace file opened by open_trace_file, the first step first.
+# The trace file is not closed.
+def iterate_trace_records(trace_file):
+    while True:
+        record_bytes = trace_file.read(TRACE_RECORD_STRUCT.size * DEFAULT_NUMBER_OF_BUFFERED_RECORDS)
+        if len(record_bytes) % TRACE_RECORD_STRUCT.size != 0:
+            raise SICTraceRecorderError("Trace file is damaged")
+
+        for record_tuple in TRACE_RECORD_STRUCT.iter_unpack(record_bytes):
+            yield SICTraceRecord(*record_tuple)
+
+        if len(record_bytes) < TRACE_RECORD_STRUCT.size * DEFAULT_NUMBER_OF_BUFFERED_RECORDS:
+            return
+
+
+# This function returns the value of a register in a trace record as six hex digits, or "-" if uninitialized.
+def get_trace_register_string(value, is_initialized):
+    if not is_initialized:
+        return INITIALIZATION_CHARACTER * 6
+    return format(value, "06X")
+
+
+# This function returns the fields of a trace record as strings, in the order of TRACE_CSV_HEADER_LIST.
+def get_trace_record_string_list(trace_record):
+    if trace_record.flags & TRACE_FLAG_INSTRUCTION_NOT_READABLE:
+        opcode_string = mnemonic = effective_address_string = INITIALIZATION_CHARACTER * 2
+    else:
+        opcode_string = format(trace_record.opcode, "02X")
+        mnemonic = HEX_TO_OPCODE_DICT.get(opcode_string, "")
+        effective_address_string = format(trace_record.effective_address, "04X")
+
+    return [str(trace_record.step),
+            format(trace_record.pc, "04X"),
+            opcode_string,
+            mnemonic,
+            effective_address_string,
+            get_trace_register_string(trace_record.a, trace_record.flags & TRACE_FLAG_A_INITIALIZED),
+            get_trace_register_string(trace_record.x, trace_record.flags & TRACE_FLAG_X_INITIALIZED),
+            get_trace_register_string(trace_record.sw, trace_record.flags & TRACE_FLAG_SW_INITIALIZED)]
+
+
+# This function writes the records of a trace file as text, one line per step:
+# STEP        PC    OP  MNEMONIC  EA      A       X       SW
+def write_trace_text(trace_file_path, text_file):
+    with open_trace_file(trace_file_path) as trace_file:
+        text_file.write("STEP        PC    OP  MNEMONIC  EA      A       X       SW\n")
+        for trace_record in iterate_trace_records(trace_file):
+            step, pc, opcode, mnemonic, effective_address, a, x, sw = get_trace_record_string_list(trace_record)
+            text_file.write(step.ljust(12) + pc.ljust(6) + opcode.ljust(4) + mnemonic.ljust(10) +
+                            effective_address.ljust(8) + a.ljust(8) + x.ljust(8) + sw + "\n")
+
+
+# This function writes the records of a trace file as CSV with the columns of TRACE_CSV_HEADER_LIST.
+def write_trace_csv(trace_file_path, csv_file):
+    with open_trace_file(trace_file_path) as trace_file:
+        csv_writer = csv.writer(csv_file, lineterminator="\n")
+        csv_writer.writerow(TRACE_CSV_HEADER_LIST)
+        for trace_record in iterate_trace_records(trace_file):
+            csv_writer.writerow(get_trace_record_string_list(trace_record))
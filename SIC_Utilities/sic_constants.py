@@ -53,6 +53,8 @@ MAXIMUM_MEMORY_ADDRESS_DEC = 32767
 
 MAXIMUM_NUMBER_OF_LABELS = 500
 
+MAXIMUM_WORD_DEC = 16777215  # FFFFFF, the largest unsigned value a 24-bit word can hold
+
 MINIMUM_RESB = 1
 MAXIMUM_RESB = 32768
 
@@ -94,8 +96,13 @@ OBJECT_CODE_COLUMN_WIDTH = 36
 SIC_ASSEMBLY_LISTING_FILE_EXTENSION = "lst"
 SIC_OBJECT_CODE_FILE_EXTENSION = "obj"
 SIC_ASSEMBLY_CODE_FILE_EXTENSION = "asm"
+SIC_PROGRAM_IMAGE_FILE_EXTENSION = "sicimg"
 
 SW_LESS_THAN = "00003C"
 SW_EQUAL = "00003D"
 SW_GREATER_THAN = "00003E"
 
+SW_LESS_THAN_DEC = 60  # 00003C
+SW_EQUAL_DEC = 61  # 00003D
+SW_GREATER_THAN_DEC = 62  # 00003E
+
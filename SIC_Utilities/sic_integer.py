@@ -1,6 +1,6 @@
 # class SICConvert
 from SIC_Utilities.sic_constants import NUMBER_OF_BITS_IN_A_INTEGER, MINIMUM_INTEGER, MAXIMUM_INTEGER, HEX_TO_BIN_DICT, \
-    BIN_TO_HEX_DICT
+    BIN_TO_HEX_DICT, MAXIMUM_WORD_DEC
 
 
 class SICIntegerError(Exception):
@@ -157,6 +157,15 @@ def dec_to_hex_string(dec_value: int):
 
     return bin_to_hex(bin_string)
 
+
+# This function converts an unsigned 24-bit word value (0 - FFFFFF) to a signed decimal value.
+# Words with the sign-bit set are read as 2's complement negative values.
+def word_to_dec(word_value: int):
+    if word_value <= MAXIMUM_INTEGER:
+        return word_value
+    else:
+        return word_value - (MAXIMUM_WORD_DEC + 1)
+
 # Test Bed
 # try:
 #     binary_value1 = dec_to_bin_string(-5592406)
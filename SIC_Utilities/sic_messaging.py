@@ -1,3 +1,5 @@
+import sys
+
 TEXT_COLOR_RED = "\033[91m"
 TEXT_COLOR_GREEN = "\033[92m"
 TEXT_COLOR_DEFAULT = "\033[0m"
@@ -25,6 +27,37 @@ def print_error(text_line_1, text_line_2=None):
           + TEXT_COLOR_DEFAULT)
 
 
+
+# This class collects text written to it and passes it on to a stream in large chunks.
+# It can stand in for sys.stdout, so everything printed during a run goes through one buffered writer.
+# input() flushes sys.stdout before reading, so prompts are never held back.
+class SICBufferedWriter:
+    DEFAULT_BUFFER_SIZE = 65536
+
+    def __init__(self, stream=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.text_list = []
+        self.buffered_length = 0
+
+    def write(self, text):
+        self.text_list.append(text)
+        self.buffered_length += len(text)
+        if self.buffered_length >= self.buffer_size:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self.text_list:
+            self.stream.write("".join(self.text_list))
+            self.text_list.clear()
+            self.buffered_length = 0
+        self.stream.flush()
+
+    def isatty(self):
+        return self.stream.isatty()
+
+
 # TEST BED:
 # print_status("Hello")
 # print_status("Hello", "World")
@@ -0,0 +1,165 @@
+import argparse
+import sys
+import tempfile
+
+from SIC_Utilities.sic_messaging import print_error
+from benchmarks.sic_benchmark_cases import get_benchmark_list, DEFAULT_SCALE_LIST
+from benchmarks.sic_benchmark_runner import run_benchmarks, save_results, load_results, print_comparison, \
+    SICBenchmarkError, DEFAULT_NUMBER_OF_ROUNDS, DEFAULT_MINIMUM_ROUND_SECONDS, DEFAULT_CHANGE_THRESHOLD_PERCENT
+from benchmarks.sic_program_generator import SICProgramShape, write_assembly_code_file, SICProgramGeneratorError, \
+    DEFAULT_NUMBER_OF_INSTRUCTIONS, DEFAULT_LABEL_DENSITY, DEFAULT_LOOP_DEPTH, DEFAULT_LOOP_ITERATIONS, \
+    DEFAULT_NUMBER_OF_RESERVED_BYTES, DEFAULT_NUMBER_OF_RESERVED_BLOCKS, DEFAULT_RESERVED_WORD_RATIO, \
+    DEFAULT_INDEXED_ADDRESSING_RATIO, DEFAULT_IO_RATIO, DEFAULT_SEED, DEFAULT_PROGRAM_NAME
+
+# BENCHMARK COMMAND LINE
+# python -m benchmarks run [--filter TEXT]... [--rounds N] [--min-time SECONDS] [--scale N]...
+#                          [--results-file PATH]
+# python -m benchmarks compare <base results>.json <new results>.json [--threshold PERCENT]
+# python -m benchmarks generate <program>.asm [--instructions N] [--label-density D | --fill-labels]
+#                          [--loop-depth N] [--loop-iterations N] [--reserved-bytes N | --fill-memory]
+#                          [--reserved-blocks N] [--reserved-word-ratio R] [--indexed-ratio R] [--io-ratio R]
+#                          [--seed N] [--program-name NAME]
+#
+# EXIT STATUS
+# 0 benchmarks run, results compared, program generated
+# 1 no benchmark matches the filters, a results file could not be read or written,
+#   a program of that shape can not be generated
+
+
+def build_argument_parser():
+    argument_parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                              description="Time the hot paths of the SIC simulator and assembler.")
+    subparsers = argument_parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks and report operations per second")
+    run_parser.add_argument("--filter", action="append", default=None, dest="filter_list", metavar="TEXT",
+                            help="only run the benchmarks whose name contains this text (may be repeated)")
+    run_parser.add_argument("--rounds", type=int, default=DEFAULT_NUMBER_OF_ROUNDS,
+                            help="number of timed rounds of each benchmark (default: " +
+                                 str(DEFAULT_NUMBER_OF_ROUNDS) + ")")
+    run_parser.add_argument("--min-time", type=float, default=DEFAULT_MINIMUM_ROUND_SECONDS,
+                            help="minimum length of a round in seconds (default: " +
+                                 str(DEFAULT_MINIMUM_ROUND_SECONDS) + ")")
+    run_parser.add_argument("--scale", type=int, action="append", default=None, dest="scale_list", metavar="N",
+                            help="number of instructions of a synthetic program (may be repeated, default: " +
+                                 " ".join(str(scale) for scale in DEFAULT_SCALE_LIST) + ")")
+    run_parser.add_argument("--results-file", default=None,
+                            help="write the results as JSON to this file")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two results files")
+    compare_parser.add_argument("base_results_file_path", help="results file of the base commit")
+    compare_parser.add_argument("results_file_path", help="results file of the new commit")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_CHANGE_THRESHOLD_PERCENT,
+                                help="smallest change in percent marked faster or slower (default: " +
+                                     str(DEFAULT_CHANGE_THRESHOLD_PERCENT) + ")")
+
+    generate_parser = subparsers.add_parser("generate", help="write a synthetic SIC assembly program")
+    generate_parser.add_argument("assembly_code_file_path", help="assembly code file to write (*.asm)")
+    generate_parser.add_argument("--instructions", type=int, default=DEFAULT_NUMBER_OF_INSTRUCTIONS,
+                                 help="number of instructions in the body of the program (default: " +
+                                      str(DEFAULT_NUMBER_OF_INSTRUCTIONS) + ")")
+    label_group = generate_parser.add_mutually_exclusive_group()
+    label_group.add_argument("--label-density", type=float, default=DEFAULT_LABEL_DENSITY,
+                             help="part of the body instructions that are labelled (default: " +
+                                  str(DEFAULT_LABEL_DENSITY) + ")")
+    label_group.add_argument("--fill-labels", action="store_true",
+                             help="label the body until the program has as many labels as the assembler allows")
+    generate_parser.add_argument("--loop-depth", type=int, default=DEFAULT_LOOP_DEPTH,
+                                 help="number of nested loops around the body (default: " +
+                                      str(DEFAULT_LOOP_DEPTH) + ")")
+    generate_parser.add_argument("--loop-iterations", type=int, default=DEFAULT_LOOP_ITERATIONS,
+                                 help="number of times each loop runs (default: " +
+                                      str(DEFAULT_LOOP_ITERATIONS) + ")")
+    memory_group = generate_parser.add_mutually_exclusive_group()
+    memory_group.add_argument("--reserved-bytes", type=int, default=DEFAULT_NUMBER_OF_RESERVED_BYTES,
+                              help="bytes reserved by RESW and RESB between the sections of the body (default: " +
+                                   str(DEFAULT_NUMBER_OF_RESERVED_BYTES) + ")")
+    memory_group.add_argument("--fill-memory", action="store_true",
+                              help="reserve all the memory the program leaves free")
+    generate_parser.add_argument("--reserved-blocks", type=int, default=DEFAULT_NUMBER_OF_RESERVED_BLOCKS,
+                                 help="number of blocks the reserved bytes are split into (default: " +
+                                      str(DEFAULT_NUMBER_OF_RESERVED_BLOCKS) + ")")
+    generate_parser.add_argument("--reserved-word-ratio", type=float, default=DEFAULT_RESERVED_WORD_RATIO,
+                                 help="part of the reserved blocks that are RESW (default: " +
+                                      str(DEFAULT_RESERVED_WORD_RATIO) + ")")
+    generate_parser.add_argument("--indexed-ratio", type=float, default=DEFAULT_INDEXED_ADDRESSING_RATIO,
+                                 help="part of the data operands that use indexed addressing (default: " +
+                                      str(DEFAULT_INDEXED_ADDRESSING_RATIO) + ")")
+    generate_parser.add_argument("--io-ratio", type=float, default=DEFAULT_IO_RATIO,
+                                 help="part of the body instructions that test, read and write the devices "
+                                      "(default: " + str(DEFAULT_IO_RATIO) + ")")
+    generate_parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                                 help="seed of the random choices (default: " + str(DEFAULT_SEED) + ")")
+    generate_parser.add_argument("--program-name", default=DEFAULT_PROGRAM_NAME,
+                                 help="name of the program (default: " + DEFAULT_PROGRAM_NAME + ")")
+
+    return argument_parser
+
+
+# This function writes a program generated with the shape given on the command line.
+def generate_program(arguments):
+    shape = SICProgramShape(number_of_instructions=arguments.instructions,
+                            label_density=arguments.label_density,
+                            is_filling_labels=arguments.fill_labels,
+                            loop_depth=arguments.loop_depth,
+                            loop_iterations=arguments.loop_iterations,
+                            number_of_reserved_bytes=arguments.reserved_bytes,
+                            is_filling_memory=arguments.fill_memory,
+                            number_of_reserved_blocks=arguments.reserved_blocks,
+                            reserved_word_ratio=arguments.reserved_word_ratio,
+                            indexed_addressing_ratio=arguments.indexed_ratio,
+                            io_ratio=arguments.io_ratio,
+                            seed=arguments.seed,
+                            program_name=arguments.program_name)
+
+    try:
+        write_assembly_code_file(shape, arguments.assembly_code_file_path)
+    except (SICProgramGeneratorError, OSError) as ex:
+        print_error(str(ex))
+        return 1
+
+    return 0
+
+
+def MAIN(argument_list=None):
+    arguments = build_argument_parser().parse_args(argument_list)
+
+    if arguments.command == "generate":
+        return generate_program(arguments)
+
+    if arguments.command == "compare":
+        try:
+            base_results_dict = load_results(arguments.base_results_file_path)
+            results_dict = load_results(arguments.results_file_path)
+        except (SICBenchmarkError, OSError) as ex:
+            print_error(str(ex))
+            return 1
+
+        print_comparison(base_results_dict, results_dict, arguments.threshold)
+        return 0
+
+    try:
+        scale_list = arguments.scale_list if arguments.scale_list is not None else DEFAULT_SCALE_LIST
+        # The programs are assembled in a temporary directory, so the Assembly Code folder is left unchanged
+        with tempfile.TemporaryDirectory() as work_directory_path:
+            benchmark_list = get_benchmark_list(work_directory_path, scale_list)
+            if arguments.filter_list:
+                benchmark_list = [benchmark for benchmark in benchmark_list
+                                  if any(filter_text in benchmark.name for filter_text in arguments.filter_list)]
+            if not benchmark_list:
+                print_error("No benchmark matches the filters")
+                return 1
+
+            results_dict = run_benchmarks(benchmark_list, arguments.rounds, arguments.min_time)
+
+        if arguments.results_file is not None:
+            save_results(results_dict, arguments.results_file)
+    except (SICBenchmarkError, OSError) as ex:
+        print_error(str(ex))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(MAIN())
@@ -0,0 +1,354 @@
+import contextlib
+import glob
+import io
+import os
+import random
+import shutil
+
+from SIC_Assembler import sic_assembler
+from SIC_Assembler.sic_assembly_parser import parse_assembly_code_file, SICAssemblyParserError
+from SIC_Peripherals.sic_device_readiness import create_readiness_model, READINESS_MODEL_ALWAYS_READY
+from SIC_Peripherals.sic_input_device_F1 import SICInputDeviceF1, SICBufferSource, INPUT_DEVICE_F1_CODE
+from SIC_Peripherals.sic_output_device_05 import SICOutputDevice05, SICBytearraySink, OUTPUT_DEVICE_05_CODE
+from SIC_Simulator.sic_loader import load_program_object_code
+from SIC_Simulator.sic_machine import SICMachine
+from SIC_Simulator.sic_memory_model import SICMemoryModel
+from SIC_Simulator.sic_object_code_parser import sic_object_code_parser, iterate_object_code_records
+from SIC_Simulator.sic_operation_executor import execute_operation
+from SIC_Simulator.sic_register_model import REGISTER_A, REGISTER_X, REGISTER_L, REGISTER_PC, REGISTER_SW
+from SIC_Utilities import sic_converter, sic_integer
+from SIC_Utilities.sic_constants import OPCODE_TO_HEX_DICT, BYTES_IN_WORD, MAXIMUM_MEMORY_ADDRESS_DEC, \
+    MINIMUM_INTEGER, MAXIMUM_INTEGER, MAXIMUM_WORD_DEC, SIC_ASSEMBLY_CODE_FILE_EXTENSION, \
+    SIC_OBJECT_CODE_FILE_EXTENSION
+from benchmarks.sic_benchmark_runner import SICBenchmark
+from benchmarks.sic_program_generator import SICProgramShape, write_assembly_code_file
+
+# The benchmark cases time the hot paths of the simulator and the assembler:
+# execute_operation on straight-line code of one opcode class at a time, SICMemoryModel.get_bytes and set_byte
+# (with read_word and write_word for comparison), the converters of sic_converter and sic_integer,
+# the object code parsers, load_program_object_code, the assembly parser and the two assembler passes.
+# The parsers, the loader and the passes run over every program of the Assembly Code folder that assembles,
+# and over generated programs of growing size and at the limits of the assembler (see
+# get_generated_program_shape_dict), so the cost per line can be seen as programs grow.
+# The generated programs are also run by the simulator (see get_simulator_benchmark_list).
+ASSEMBLY_CODE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Assembly Code")
+DEFAULT_SCALE_LIST = [1000, 4000, 10000]
+NUMBER_OF_CONVERTER_VALUES = 256
+NUMBER_OF_MEMORY_ADDRESSES = 1024
+RANDOM_SEED = 24
+
+# EXECUTE OPERATION
+# Each opcode class is executed as a block of straight-line code at CODE_ADDRESS that reads and writes
+# the data at DATA_ADDRESS: the word 1, then the device codes F1 and 05.
+# Jumps go to the next group of the block, so every instruction of the block executes once per call.
+CODE_ADDRESS = 0x0000
+DATA_ADDRESS = 0x7F00
+NUMBER_OF_BLOCK_INSTRUCTIONS = 2400
+OPCODE_CLASS_DICT = {"load-store": ["LDA", "STA", "LDX", "STX", "LDCH", "STCH", "LDL", "STL"],
+                     "arithmetic": ["ADD", "SUB", "MUL", "DIV"],
+                     "logic-compare": ["AND", "OR", "COMP", "TIX"],
+                     "jump": ["JEQ", "JGT", "JLT", "JSUB", "J", "RSUB"],
+                     "device": ["TD", "RD", "WD"]}
+
+
+# This function returns the operand addresses of a group of instructions of an opcode class at group_address_dec.
+# JEQ, JGT and JLT go to the next instruction, JSUB calls the RSUB at the end of the group,
+# which returns to the J that leaves the group. The devices are addressed by their device codes in memory.
+def get_operand_address_list(opcode_mnemonic_list, group_address_dec):
+    if opcode_mnemonic_list == OPCODE_CLASS_DICT["jump"]:
+        return [group_address_dec + 3, group_address_dec + 6, group_address_dec + 9,
+                group_address_dec + 15, group_address_dec + 18, 0]
+
+    if opcode_mnemonic_list == OPCODE_CLASS_DICT["device"]:
+        return [DATA_ADDRESS + 3, DATA_ADDRESS + 3, DATA_ADDRESS + 4]
+
+    return [DATA_ADDRESS] * len(opcode_mnemonic_list)
+
+
+# This function returns a machine with a block of the instructions of an opcode class loaded.
+# The devices are always ready, input device F1 reads from a buffer and output device 05 writes to a buffer.
+def create_opcode_class_machine(opcode_mnemonic_list):
+    machine = SICMachine(SICInputDeviceF1(SICBufferSource(bytes(range(32, 127)) * 8),
+                                          create_readiness_model(READINESS_MODEL_ALWAYS_READY)),
+                         SICOutputDevice05(SICBytearraySink(), create_readiness_model(READINESS_MODEL_ALWAYS_READY)))
+
+    block_bytearray = bytearray()
+    for group_index in range(NUMBER_OF_BLOCK_INSTRUCTIONS // len(opcode_mnemonic_list)):
+        group_address_dec = CODE_ADDRESS + group_index * len(opcode_mnemonic_list) * BYTES_IN_WORD
+        for opcode_mnemonic, operand_address_dec in zip(opcode_mnemonic_list,
+                                                        get_operand_address_list(opcode_mnemonic_list,
+                                                                                 group_address_dec)):
+            instruction_word_value = (int(OPCODE_TO_HEX_DICT[opcode_mnemonic], 16) << 16) | operand_address_dec
+            block_bytearray += instruction_word_value.to_bytes(BYTES_IN_WORD, "big")
+
+    machine.memory_model.initialize_memory()
+    machine.memory_model.write_bytes(CODE_ADDRESS, bytes(block_bytearray))
+    machine.memory_model.write_bytes(DATA_ADDRESS, bytes([0, 0, 1, INPUT_DEVICE_F1_CODE, OUTPUT_DEVICE_05_CODE]))
+    return machine
+
+
+# This function returns a function that runs the block of a machine from create_opcode_class_machine once.
+# The registers are set again before every run, so the arithmetic never overflows.
+def get_execute_block_function(machine):
+    register_dict = machine.register_dict
+    memory_model = machine.memory_model
+    register_a = register_dict[REGISTER_A]
+    register_x = register_dict[REGISTER_X]
+    register_l = register_dict[REGISTER_L]
+    register_pc = register_dict[REGISTER_PC]
+    register_sw = register_dict[REGISTER_SW]
+    output_sink = machine.output_device_05.sink
+
+    def execute_block_instructions():
+        register_a.set_value(1)
+        register_x.set_value(0)
+        register_l.set_value(0)
+        register_sw.set_value(0)
+        register_pc.set_value(CODE_ADDRESS)
+        output_sink.reset()
+        for step_index in range(NUMBER_OF_BLOCK_INSTRUCTIONS):
+            execute_operation(register_dict, memory_model)
+
+    return execute_block_instructions
+
+
+def get_execute_operation_benchmark_list():
+    benchmark_list = []
+    for opcode_class_name, opcode_mnemonic_list in OPCODE_CLASS_DICT.items():
+        benchmark_list.append(SICBenchmark("execute_operation", "execute_operation/" + opcode_class_name,
+                                           get_execute_block_function(create_opcode_class_machine(
+                                               opcode_mnemonic_list)),
+                                           NUMBER_OF_BLOCK_INSTRUCTIONS, "instructions"))
+    return benchmark_list
+
+
+# MEMORY MODEL
+def get_memory_model_benchmark_list():
+    memory_model = SICMemoryModel()
+    memory_model.write_bytes(0, bytes(range(256)) * 128)
+    address_list = random.Random(RANDOM_SEED).sample(range(MAXIMUM_MEMORY_ADDRESS_DEC - 2),
+                                                     NUMBER_OF_MEMORY_ADDRESSES)
+
+    def get_bytes():
+        for memory_address_dec in address_list:
+            memory_model.get_bytes(memory_address_dec, BYTES_IN_WORD)
+
+    def set_byte():
+        for memory_address_dec in address_list:
+            memory_model.set_byte(memory_address_dec, "A5")
+
+    def read_word():
+        for memory_address_dec in address_list:
+            memory_model.read_word(memory_address_dec)
+
+    def write_word():
+        for memory_address_dec in address_list:
+            memory_model.write_word(memory_address_dec, 0xA5A5A5)
+
+    return [SICBenchmark("memory_model", "memory_model/" + function.__name__, function, len(address_list), "calls")
+            for function in [get_bytes, set_byte, read_word, write_word]]
+
+
+# CONVERTERS
+# Every converter is called on the same number of values, drawn from the range it accepts.
+def get_converter_benchmark_list():
+    random_generator = random.Random(RANDOM_SEED)
+    word_value_list = [random_generator.randrange(1, MAXIMUM_WORD_DEC + 1)
+                       for index in range(NUMBER_OF_CONVERTER_VALUES)]
+    address_value_list = [value & MAXIMUM_MEMORY_ADDRESS_DEC for value in word_value_list]
+    integer_value_list = [random_generator.randrange(MINIMUM_INTEGER, MAXIMUM_INTEGER + 1)
+                          for index in range(NUMBER_OF_CONVERTER_VALUES)]
+    hex_word_list = [format(value, "06X") for value in word_value_list]
+    bin_word_list = [format(value, "024b") for value in word_value_list]
+
+    converter_argument_list = [(sic_converter, sic_converter.dec_to_hex_string, word_value_list),
+                               (sic_converter, sic_converter.dec_to_memory_address_hex_string, address_value_list),
+                               (sic_converter, sic_converter.hex_string_to_dec, hex_word_list),
+                               (sic_converter, sic_converter.bin_word_to_hex_word, bin_word_list),
+                               (sic_converter, sic_converter.hex_word_to_bin_word, hex_word_list),
+                               (sic_integer, sic_integer.bin_string_to_dec, bin_word_list),
+                               (sic_integer, sic_integer.dec_to_bin_string, integer_value_list),
+                               (sic_integer, sic_integer.hex_to_bin, hex_word_list),
+                               (sic_integer, sic_integer.bin_to_hex, bin_word_list),
+                               (sic_integer, sic_integer.hex_string_to_dec, hex_word_list),
+                               (sic_integer, sic_integer.dec_to_hex_string, integer_value_list),
+                               (sic_integer, sic_integer.word_to_dec, word_value_list)]
+
+    benchmark_list = []
+    for converter_module, converter_function, value_list in converter_argument_list:
+        def convert_values(converter_function=converter_function, value_list=value_list):
+            for value in value_list:
+                converter_function(value)
+
+        module_name = converter_module.__name__.rpartition(".")[2]
+        benchmark_list.append(SICBenchmark(module_name, module_name + "/" + converter_function.__name__,
+                                           convert_values, len(value_list), "conversions"))
+    return benchmark_list
+
+
+# PROGRAMS
+# This function returns the shapes of the generated programs (see sic_program_generator) by name:
+# programs of growing size (scale_list), a program with all 500 labels the assembler allows, a program that fills
+# memory with text records from one end of it to the other, and a program that loops for over a million steps.
+def get_generated_program_shape_dict(scale_list=DEFAULT_SCALE_LIST):
+    generated_program_shape_dict = {"scaled-" + str(number_of_instructions):
+                                    SICProgramShape(number_of_instructions=number_of_instructions)
+                                    for number_of_instructions in scale_list}
+    generated_program_shape_dict["labels-500"] = SICProgramShape(number_of_instructions=5000, is_filling_labels=True)
+    generated_program_shape_dict["memory-32k"] = SICProgramShape(number_of_instructions=2000, is_filling_memory=True,
+                                                                 number_of_reserved_blocks=8)
+    generated_program_shape_dict["loop-1m"] = SICProgramShape(number_of_instructions=100, loop_depth=3,
+                                                              loop_iterations=22, io_ratio=0.05)
+    return generated_program_shape_dict
+
+
+# This function copies the programs of the Assembly Code folder and writes the generated programs
+# to work_directory_path, assembles them all (which writes their object code and listing files there),
+# and returns (name, assembly code file path, object code file path) for every program that assembles.
+def prepare_programs(work_directory_path, generated_program_shape_dict):
+    assembly_code_file_path_list = []
+    for source_file_path in sorted(glob.glob(os.path.join(ASSEMBLY_CODE_DIRECTORY,
+                                                          "*." + SIC_ASSEMBLY_CODE_FILE_EXTENSION))):
+        assembly_code_file_path = os.path.join(work_directory_path, os.path.basename(source_file_path))
+        shutil.copyfile(source_file_path, assembly_code_file_path)
+        assembly_code_file_path_list.append(assembly_code_file_path)
+
+    for program_name, shape in generated_program_shape_dict.items():
+        assembly_code_file_path = os.path.join(work_directory_path,
+                                               program_name + "." + SIC_ASSEMBLY_CODE_FILE_EXTENSION)
+        write_assembly_code_file(shape, assembly_code_file_path)
+        assembly_code_file_path_list.append(assembly_code_file_path)
+
+    program_list = []
+    for assembly_code_file_path in assembly_code_file_path_list:
+        try:
+            with open(os.devnull, "wt") as null_file, contextlib.redirect_stdout(null_file):
+                parsed_code_dict_list = parse_assembly_code_file(assembly_code_file_path)
+                sic_assembler.assembler_pass_one(parsed_code_dict_list)
+                sic_assembler.assembler_pass_two(parsed_code_dict_list, assembly_code_file_path)
+        except (SICAssemblyParserError, sic_assembler.SICAssemblerError):
+            # Some of the sample programs fail to assemble on purpose
+            continue
+
+        program_name = os.path.splitext(os.path.basename(assembly_code_file_path))[0]
+        object_code_file_path = (os.path.splitext(assembly_code_file_path)[0] + "." +
+                                 SIC_OBJECT_CODE_FILE_EXTENSION)
+        program_list.append((program_name, assembly_code_file_path, object_code_file_path))
+
+    return program_list
+
+
+# This function returns the number of lines of code in an assembly code file, comment lines excluded.
+def count_lines_of_code(assembly_code_file_path):
+    with open(os.devnull, "wt") as null_file, contextlib.redirect_stdout(null_file):
+        return len(parse_assembly_code_file(assembly_code_file_path))
+
+
+# The parsers and the loader are timed in object code lines per second,
+# the assembly parser and the passes in lines of code per second.
+def get_program_benchmark_list(program_list):
+    benchmark_list = []
+
+    for program_name, assembly_code_file_path, object_code_file_path in program_list:
+        with open(object_code_file_path, "rt") as object_code_file:
+            object_code_text = object_code_file.read()
+        number_of_object_code_lines = len(object_code_text.splitlines())
+        number_of_lines_of_code = count_lines_of_code(assembly_code_file_path)
+        parsed_object_code_dict_list = sic_object_code_parser(io.StringIO(object_code_text))
+        memory_model = SICMemoryModel()
+
+        with open(os.devnull, "wt") as null_file, contextlib.redirect_stdout(null_file):
+            parsed_code_dict_list = parse_assembly_code_file(assembly_code_file_path)
+
+        def parse_object_code(object_code_text=object_code_text):
+            sic_object_code_parser(io.StringIO(object_code_text))
+
+        def iterate_object_code(object_code_text=object_code_text):
+            for object_code_record in iterate_object_code_records(io.StringIO(object_code_text)):
+                pass
+
+        def load_object_code(parsed_object_code_dict_list=parsed_object_code_dict_list, memory_model=memory_model):
+            load_program_object_code(parsed_object_code_dict_list, memory_model)
+
+        def parse_assembly_code(assembly_code_file_path=assembly_code_file_path):
+            parse_assembly_code_file(assembly_code_file_path)
+
+        # Pass two needs the labels of pass one of the same program, so pass one runs before each call of pass two
+        # and the time of pass one alone is taken from its own benchmark
+        def assemble_pass_one(parsed_code_dict_list=parsed_code_dict_list):
+            sic_assembler.assembler_pass_one(parsed_code_dict_list)
+
+        def assemble_pass_two(parsed_code_dict_list=parsed_code_dict_list,
+                              assembly_code_file_path=assembly_code_file_path):
+            sic_assembler.assembler_pass_one(parsed_code_dict_list)
+            sic_assembler.assembler_pass_two(parsed_code_dict_list, assembly_code_file_path)
+
+        benchmark_list += [SICBenchmark("sic_object_code_parser", "sic_object_code_parser/" + program_name,
+                                        parse_object_code, number_of_object_code_lines, "lines"),
+                           SICBenchmark("iterate_object_code_records", "iterate_object_code_records/" + program_name,
+                                        iterate_object_code, number_of_object_code_lines, "lines"),
+                           SICBenchmark("load_program_object_code", "load_program_object_code/" + program_name,
+                                        load_object_code, number_of_object_code_lines, "lines"),
+                           SICBenchmark("parse_assembly_code_file", "parse_assembly_code_file/" + program_name,
+                                        parse_assembly_code, number_of_lines_of_code, "lines"),
+                           SICBenchmark("assembler_pass_one", "assembler_pass_one/" + program_name,
+                                        assemble_pass_one, number_of_lines_of_code, "lines"),
+                           SICBenchmark("assembler_passes", "assembler_passes/" + program_name,
+                                        assemble_pass_two, number_of_lines_of_code, "lines")]
+
+    return benchmark_list
+
+
+# SIMULATOR
+# The generated programs are run to the end from the state they are loaded in, with compiled blocks (as the headless
+# runner runs them) and one instruction at a time, and timed in instructions (steps) per second.
+# The devices are always ready, and input device F1 reads the same buffer every run.
+SIMULATOR_INPUT_DATA = b"THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG\n" * 16
+
+
+# This function returns a function that runs the program loaded in a machine to the end, restoring the machine
+# from a snapshot taken at the start first, and the number of steps a run takes.
+def get_run_program_function(machine, use_block_compiler):
+    loaded_snapshot = machine.snapshot()
+
+    def run_program():
+        machine.restore(loaded_snapshot)
+        return machine.run_steps(use_block_compiler=use_block_compiler)[1]
+
+    with open(os.devnull, "wt") as null_file, contextlib.redirect_stdout(null_file):
+        number_of_steps = run_program()
+    return run_program, number_of_steps
+
+
+def get_simulator_benchmark_list(program_list, generated_program_name_list):
+    benchmark_list = []
+
+    for program_name, assembly_code_file_path, object_code_file_path in program_list:
+        if program_name not in generated_program_name_list:
+            continue
+
+        for benchmark_group, use_block_compiler in [("run_steps", True), ("run_steps_no_compile", False)]:
+            machine = SICMachine(SICInputDeviceF1(SICBufferSource(SIMULATOR_INPUT_DATA),
+                                                  create_readiness_model(READINESS_MODEL_ALWAYS_READY)),
+                                 SICOutputDevice05(SICBytearraySink(),
+                                                   create_readiness_model(READINESS_MODEL_ALWAYS_READY)))
+            with open(object_code_file_path, "rt") as object_code_file:
+                machine.load_program_object_code(sic_object_code_parser(object_code_file))
+
+            run_program, number_of_steps = get_run_program_function(machine, use_block_compiler)
+            benchmark_list.append(SICBenchmark(benchmark_group, benchmark_group + "/" + program_name, run_program,
+                                               number_of_steps, "instructions"))
+
+    return benchmark_list
+
+
+# This function returns every benchmark. The programs are assembled into work_directory_path.
+def get_benchmark_list(work_directory_path, scale_list=DEFAULT_SCALE_LIST):
+    generated_program_shape_dict = get_generated_program_shape_dict(scale_list)
+    program_list = prepare_programs(work_directory_path, generated_program_shape_dict)
+
+    return (get_execute_operation_benchmark_list() +
+            get_memory_model_benchmark_list() +
+            get_converter_benchmark_list() +
+            get_program_benchmark_list(program_list) +
+            get_simulator_benchmark_list(program_list, list(generated_program_shape_dict)))
@@ -0,0 +1,181 @@
+import contextlib
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+# The benchmark runner times benchmarks in rounds and reports their speed in operations per second.
+# Before the rounds, a benchmark is called once to warm up (and fill any caches) and to find how many calls
+# make a round of at least minimum_round_seconds. Every round makes that many calls, and the report gives
+# the median, mean, standard deviation, minimum and maximum of the rounds. What an operation is
+# (an instruction, a conversion, a line of code) is part of each benchmark.
+# Everything the benchmarks print (status messages of the assembler, for example) is discarded.
+#
+# The results are written as JSON, so runs from different commits can be compared (see compare_results):
+# {"format": 1, "created": UTC time, "commit": git commit or null, "python": version, "platform": platform,
+#  "settings": {"rounds": ..., "minimum_round_seconds": ...},
+#  "results": [{"group": "execute_operation", "name": "execute_operation/arithmetic", "unit": "instructions",
+#               "operations_per_call": ..., "calls_per_round": ..., "rounds": [operations per second, ...],
+#               "median": ..., "mean": ..., "stdev": ..., "minimum": ..., "maximum": ...}, ...]}
+BENCHMARK_RESULTS_FORMAT = 1
+DEFAULT_NUMBER_OF_ROUNDS = 5
+DEFAULT_MINIMUM_ROUND_SECONDS = 0.2
+DEFAULT_CHANGE_THRESHOLD_PERCENT = 5.0
+
+
+class SICBenchmarkError(Exception):
+    pass
+
+
+# A benchmark calls function, which performs operations_per_call operations of unit each call.
+class SICBenchmark:
+    def __init__(self, group, name, function, operations_per_call, unit):
+        self.group = group
+        self.name = name
+        self.function = function
+        self.operations_per_call = operations_per_call
+        self.unit = unit
+
+
+# This function returns the number of calls that make a round of at least minimum_round_seconds.
+def get_calls_per_round(function, minimum_round_seconds):
+    start_time = time.perf_counter()
+    function()
+    elapsed_seconds = time.perf_counter() - start_time
+
+    if elapsed_seconds <= 0:
+        return 1000
+    return max(1, math.ceil(minimum_round_seconds / elapsed_seconds))
+
+
+# This function times a benchmark and returns its result dictionary (see the JSON results above).
+def run_benchmark(benchmark, number_of_rounds=DEFAULT_NUMBER_OF_ROUNDS,
+                  minimum_round_seconds=DEFAULT_MINIMUM_ROUND_SECONDS):
+    function = benchmark.function
+
+    with open(os.devnull, "wt") as null_file, contextlib.redirect_stdout(null_file):
+        calls_per_round = get_calls_per_round(function, minimum_round_seconds)
+        round_seconds_list = []
+        for round_index in range(number_of_rounds):
+            start_time = time.perf_counter()
+            for call_index in range(calls_per_round):
+                function()
+            round_seconds_list.append(time.perf_counter() - start_time)
+
+    operations_per_round = benchmark.operations_per_call * calls_per_round
+    rate_list = [operations_per_round / round_seconds if round_seconds > 0 else 0.0
+                 for round_seconds in round_seconds_list]
+
+    return {"group": benchmark.group,
+            "name": benchmark.name,
+            "unit": benchmark.unit,
+            "operations_per_call": benchmark.operations_per_call,
+            "calls_per_round": calls_per_round,
+            "rounds": [round(rate, 1) for rate in rate_list],
+            "median": round(statistics.median(rate_list), 1),
+            "mean": round(statistics.mean(rate_list), 1),
+            "stdev": round(statistics.stdev(rate_list), 1) if len(rate_list) > 1 else 0.0,
+            "minimum": round(min(rate_list), 1),
+            "maximum": round(max(rate_list), 1)}
+
+
+# This function returns the commit the benchmarks run from, or None outside a git working tree.
+def get_git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# This function returns a line of the report: the median rate, its spread between rounds and the range.
+def get_result_report_line(result_dict):
+    median = result_dict["median"]
+    spread_percent = 100 * result_dict["stdev"] / median if median else 0.0
+    return (result_dict["name"].ljust(48) + format(median, ",.0f").rjust(16) + " " +
+            (result_dict["unit"] + "/s").ljust(17) + ("+-" + format(spread_percent, ".1f") + "%").rjust(8) + "  " +
+            format(result_dict["minimum"], ",.0f") + " - " + format(result_dict["maximum"], ",.0f"))
+
+
+# This function runs the benchmarks and returns the results dictionary.
+# Each result is printed as it is measured, unless is_printing_report is False.
+def run_benchmarks(benchmark_list, number_of_rounds=DEFAULT_NUMBER_OF_ROUNDS,
+                   minimum_round_seconds=DEFAULT_MINIMUM_ROUND_SECONDS, is_printing_report=True):
+    if number_of_rounds < 1:
+        raise SICBenchmarkError("There must be at least one round")
+
+    if is_printing_report:
+        print("BENCHMARK".ljust(48) + "MEDIAN".rjust(16) + " " + "".ljust(17) + "STDEV".rjust(8) + "  MIN - MAX")
+
+    result_list = []
+    for benchmark in benchmark_list:
+        result_dict = run_benchmark(benchmark, number_of_rounds, minimum_round_seconds)
+        result_list.append(result_dict)
+        if is_printing_report:
+            print(get_result_report_line(result_dict), flush=True)
+
+    return {"format": BENCHMARK_RESULTS_FORMAT,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "commit": get_git_commit(),
+            "python": platform.python_implementation() + " " + platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {"rounds": number_of_rounds, "minimum_round_seconds": minimum_round_seconds},
+            "results": result_list}
+
+
+def save_results(results_dict, results_file_path):
+    with open(results_file_path, "wt") as results_file:
+        json.dump(results_dict, results_file, indent=1)
+        results_file.write("\n")
+
+
+def load_results(results_file_path):
+    with open(results_file_path, "rt") as results_file:
+        try:
+            results_dict = json.load(results_file)
+        except ValueError:
+            raise SICBenchmarkError("Not a benchmark results file: " + results_file_path)
+
+    if not isinstance(results_dict, dict) or results_dict.get("format") != BENCHMARK_RESULTS_FORMAT:
+        raise SICBenchmarkError("Not a benchmark results file: " + results_file_path)
+
+    return results_dict
+
+
+# This function compares the medians of the benchmarks two result files have in common and returns the report lines.
+# A change is marked FASTER or SLOWER when it is larger than threshold_percent and larger than the spread
+# (one standard deviation) of either run.
+def compare_results(base_results_dict, results_dict, threshold_percent=DEFAULT_CHANGE_THRESHOLD_PERCENT):
+    base_result_dict = {result["name"]: result for result in base_results_dict["results"]}
+
+    report_line_list = ["BASE: " + str(base_results_dict.get("commit")) + " " + str(base_results_dict.get("created")),
+                        "NEW:  " + str(results_dict.get("commit")) + " " + str(results_dict.get("created")),
+                        "",
+                        "BENCHMARK".ljust(48) + "BASE".rjust(16) + "NEW".rjust(16) + "CHANGE".rjust(10)]
+
+    for result in results_dict["results"]:
+        base_result = base_result_dict.get(result["name"])
+        if base_result is None or not base_result["median"]:
+            continue
+
+        change_percent = 100 * (result["median"] - base_result["median"]) / base_result["median"]
+        noise_percent = 100 * max(base_result["stdev"] / base_result["median"],
+                                  result["stdev"] / result["median"] if result["median"] else 0.0)
+
+        change_marker = ""
+        if abs(change_percent) > max(threshold_percent, noise_percent):
+            change_marker = "  FASTER" if change_percent > 0 else "  SLOWER"
+
+        report_line_list.append(result["name"].ljust(48) + format(base_result["median"], ",.0f").rjust(16) +
+                                format(result["median"], ",.0f").rjust(16) +
+                                format(change_percent, "+.1f").rjust(9) + "%" + change_marker)
+
+    return report_line_list
+
+
+# This function prints the report of compare_results.
+def print_comparison(base_results_dict, results_dict, threshold_percent=DEFAULT_CHANGE_THRESHOLD_PERCENT):
+    print("\n".join(compare_results(base_results_dict, results_dict, threshold_percent)))
@@ -0,0 +1,405 @@
+import random
+
+from SIC_Utilities.sic_constants import BYTES_IN_WORD, MAXIMUM_NUMBER_OF_LABELS, MAXIMUM_INTEGER, \
+    MAXIMUM_MEMORY_ADDRESS_DEC
+
+# The program generator writes valid SIC assembly code of any size and shape, so the assembler, the loader and the
+# simulator can be timed on programs far larger than the samples of the Assembly Code folder: up to the 500 labels
+# of the assembler, up to the whole 32K of memory, with text records from one end of memory to the other, and with
+# loops of millions of steps.
+#
+# PROGRAM LAYOUT
+# FIRST    LDA      ZERO                 the head of each loop (outermost first)
+#          STA      CNT1
+# LOOP1    LDX      ZERO                 the innermost loop counts in register X (TIX), outer loops in CNTn
+# LOOP2    ...                           body: number_of_instructions instructions in sections, each section after
+#          J        SEC1                 the first jumped to over a block of reserved memory (RESW or RESB)
+# RSV1     RESB     ...
+# SEC1     ...
+#          TIX      LIM2                 the tail of each loop (innermost first)
+#          JLT      LOOP2
+#          LDA      CNT1
+#          ...
+#          JLT      LOOP1
+#          XOS
+# ONE      WORD     1                    constants, variables, the device codes and TABLE,
+#          ...                           the initialized bytes read and written by indexed addressing
+#
+# The body is made of statements, chosen at random from a seed:
+#    LDA src / AND MASK / ADD|SUB|MUL|DIV|AND|OR constant / STA dst   (A stays in range, the program never faults)
+#    LDCH src / STCH dst
+#    LDA src / COMP variable
+#    an I/O statement, TD / JEQ / RD from input device F1, then TD / JEQ / WD to output device 05
+# A source or destination is TABLE,X (indexed addressing), a variable, or for a destination a reserved block.
+# The body runs loop_iterations ** loop_depth times, so a run takes about that many times the body's
+# number of instructions in steps.
+DEFAULT_NUMBER_OF_INSTRUCTIONS = 1000
+DEFAULT_LABEL_DENSITY = 0.02
+DEFAULT_LOOP_DEPTH = 1
+DEFAULT_LOOP_ITERATIONS = 10
+DEFAULT_NUMBER_OF_RESERVED_BYTES = 0
+DEFAULT_NUMBER_OF_RESERVED_BLOCKS = 4
+DEFAULT_RESERVED_WORD_RATIO = 0.5
+DEFAULT_INDEXED_ADDRESSING_RATIO = 0.25
+DEFAULT_IO_RATIO = 0.0
+DEFAULT_SEED = 25
+DEFAULT_PROGRAM_NAME = "SYNTH"
+
+MASK_VALUE = 4095
+NUMBER_OF_CONSTANTS = 7
+NUMBER_OF_VARIABLES = 8
+TABLE_BYTES_PER_LINE = 16
+ARITHMETIC_OPCODE_LIST = ["ADD", "SUB", "MUL", "DIV", "AND", "OR"]
+IO_STATEMENT_LENGTH = 6
+LABEL_COLUMN_WIDTH = 9
+OPCODE_COLUMN_WIDTH = 9
+
+
+class SICProgramGeneratorError(Exception):
+    pass
+
+
+# The shape of a generated program. See generate_assembly_code for its parameters.
+class SICProgramShape:
+    def __init__(self, number_of_instructions=DEFAULT_NUMBER_OF_INSTRUCTIONS, label_density=DEFAULT_LABEL_DENSITY,
+                 is_filling_labels=False, loop_depth=DEFAULT_LOOP_DEPTH, loop_iterations=DEFAULT_LOOP_ITERATIONS,
+                 number_of_reserved_bytes=DEFAULT_NUMBER_OF_RESERVED_BYTES, is_filling_memory=False,
+                 number_of_reserved_blocks=DEFAULT_NUMBER_OF_RESERVED_BLOCKS,
+                 reserved_word_ratio=DEFAULT_RESERVED_WORD_RATIO,
+                 indexed_addressing_ratio=DEFAULT_INDEXED_ADDRESSING_RATIO, io_ratio=DEFAULT_IO_RATIO,
+                 seed=DEFAULT_SEED, program_name=DEFAULT_PROGRAM_NAME):
+        self.number_of_instructions = number_of_instructions
+        self.label_density = label_density
+        self.is_filling_labels = is_filling_labels
+        self.loop_depth = loop_depth
+        self.loop_iterations = loop_iterations
+        self.number_of_reserved_bytes = number_of_reserved_bytes
+        self.is_filling_memory = is_filling_memory
+        self.number_of_reserved_blocks = number_of_reserved_blocks
+        self.reserved_word_ratio = reserved_word_ratio
+        self.indexed_addressing_ratio = indexed_addressing_ratio
+        self.io_ratio = io_ratio
+        self.seed = seed
+        self.program_name = program_name
+
+    def validate(self):
+        if self.number_of_instructions < 1:
+            raise SICProgramGeneratorError("A program must have at least one instruction")
+
+        for ratio_name, ratio in [("label density", self.label_density),
+                                  ("reserved word ratio", self.reserved_word_ratio),
+                                  ("indexed addressing ratio", self.indexed_addressing_ratio),
+                                  ("I/O ratio", self.io_ratio)]:
+            if not 0 <= ratio <= 1:
+                raise SICProgramGeneratorError("The " + ratio_name + " must be between 0 and 1")
+
+        if self.loop_depth < 0:
+            raise SICProgramGeneratorError("The loop depth must not be negative")
+
+        if not 1 <= self.loop_iterations <= MAXIMUM_INTEGER:
+            raise SICProgramGeneratorError("The number of loop iterations must be between 1 and " +
+                                           str(MAXIMUM_INTEGER))
+
+        if self.number_of_reserved_bytes < 0:
+            raise SICProgramGeneratorError("The number of reserved bytes must not be negative")
+
+        if self.number_of_reserved_blocks < 1:
+            raise SICProgramGeneratorError("There must be at least one reserved block")
+
+        if not (1 <= len(self.program_name) <= 6 and self.program_name.isalnum() and self.program_name.isupper()
+                and self.program_name[0].isalpha()):
+            raise SICProgramGeneratorError("The program name must be 1-6 uppercase letters and digits, "
+                                           "starting with a letter")
+
+    def get_description(self):
+        return ("instructions=" + str(self.number_of_instructions) +
+                " label-density=" + ("fill" if self.is_filling_labels else str(self.label_density)) +
+                " loop-depth=" + str(self.loop_depth) +
+                " loop-iterations=" + str(self.loop_iterations) +
+                " reserved-bytes=" + ("fill" if self.is_filling_memory else str(self.number_of_reserved_bytes)) +
+                " reserved-blocks=" + str(self.number_of_reserved_blocks) +
+                " reserved-word-ratio=" + str(self.reserved_word_ratio) +
+                " indexed-ratio=" + str(self.indexed_addressing_ratio) +
+                " io-ratio=" + str(self.io_ratio) +
+                " seed=" + str(self.seed))
+
+
+# A line of assembly code: [label, opcode, operand]. Labels waiting for the next instruction are kept in
+# pending_label, so a loop or a section can start with any statement.
+class SICProgramBuilder:
+    def __init__(self):
+        self.line_list = []
+        self.label_set = set()
+        self.pending_label = None
+        self.body_instruction_index_list = []
+
+    def add_label(self, label):
+        self.label_set.add(label)
+        return label
+
+    # This function returns the label of the next instruction: the pending label if there is one, else label.
+    def take_label(self, label):
+        if self.pending_label is not None:
+            label = self.pending_label
+            self.pending_label = None
+        return self.add_label(label)
+
+    def set_pending_label(self, label):
+        if self.pending_label is not None:
+            raise SICProgramGeneratorError("Two labels for one instruction: " + self.pending_label + ", " + label)
+        self.pending_label = self.add_label(label)
+
+    def add_instruction(self, opcode, operand="", label=None, is_body=False):
+        if label is None and self.pending_label is not None:
+            label = self.pending_label
+            self.pending_label = None
+
+        if is_body:
+            self.body_instruction_index_list.append(len(self.line_list))
+        self.line_list.append([label, opcode, operand])
+
+    def add_data(self, label, opcode, operand):
+        if label is not None:
+            self.add_label(label)
+        self.line_list.append([label, opcode, operand])
+
+
+# This function returns the number of bytes an assembly code line takes in memory.
+def get_line_byte_count(opcode, operand):
+    if opcode == "RESB":
+        return int(operand)
+    if opcode == "RESW":
+        return BYTES_IN_WORD * int(operand)
+    if opcode == "BYTE":
+        return (len(operand) - 3) // 2 if operand[0] == "X" else len(operand) - 3
+    return BYTES_IN_WORD
+
+
+# This function returns the data operand of a statement: TABLE,X, or a variable (or for a destination, a reserved
+# block as well).
+def get_data_operand(random_generator, shape, reserved_block_label_list, is_destination):
+    if random_generator.random() < shape.indexed_addressing_ratio:
+        return "TABLE,X"
+    if is_destination and reserved_block_label_list and random_generator.random() < 0.5:
+        return random_generator.choice(reserved_block_label_list)
+    return "V" + str(random_generator.randrange(NUMBER_OF_VARIABLES))
+
+
+# This function adds the statements of the body, number_of_instructions instructions in all.
+def add_body_statements(builder, random_generator, shape, number_of_instructions, reserved_block_label_list,
+                        io_label_counter):
+    remaining_number_of_instructions = number_of_instructions
+
+    while remaining_number_of_instructions > 0:
+        # An I/O statement is twice as long as the other statements on average,
+        # so it is chosen at a rate that puts io_ratio of the body's instructions in I/O statements
+        if (remaining_number_of_instructions >= IO_STATEMENT_LENGTH and
+                random_generator.random() < shape.io_ratio / (2 - shape.io_ratio)):
+            for device_label, transfer_opcode in [("INDEV", "RD"), ("OUTDEV", "WD")]:
+                io_label_counter[0] += 1
+                poll_label = builder.take_label("IO" + str(io_label_counter[0]))
+                builder.add_instruction("TD", device_label, poll_label, is_body=True)
+                builder.add_instruction("JEQ", poll_label, is_body=True)
+                builder.add_instruction(transfer_opcode, device_label, is_body=True)
+            remaining_number_of_instructions -= IO_STATEMENT_LENGTH
+            continue
+
+        source_operand = get_data_operand(random_generator, shape, reserved_block_label_list, False)
+        statement_kind = random_generator.randrange(4)
+        if statement_kind <= 1 and remaining_number_of_instructions >= 4:
+            builder.add_instruction("LDA", source_operand, is_body=True)
+            builder.add_instruction("AND", "MASK", is_body=True)
+            builder.add_instruction(random_generator.choice(ARITHMETIC_OPCODE_LIST),
+                                    "C" + str(random_generator.randrange(1, NUMBER_OF_CONSTANTS + 1)), is_body=True)
+            builder.add_instruction("STA", get_data_operand(random_generator, shape, reserved_block_label_list, True),
+                                    is_body=True)
+            remaining_number_of_instructions -= 4
+        elif statement_kind == 2 and remaining_number_of_instructions >= 2:
+            builder.add_instruction("LDCH", source_operand, is_body=True)
+            builder.add_instruction("STCH", get_data_operand(random_generator, shape, reserved_block_label_list, True),
+                                    is_body=True)
+            remaining_number_of_instructions -= 2
+        elif remaining_number_of_instructions >= 2:
+            builder.add_instruction("LDA", source_operand, is_body=True)
+            builder.add_instruction("COMP", "V" + str(random_generator.randrange(NUMBER_OF_VARIABLES)), is_body=True)
+            remaining_number_of_instructions -= 2
+        else:
+            builder.add_instruction("LDA", source_operand, is_body=True)
+            remaining_number_of_instructions -= 1
+
+
+# This function returns the sizes of the reserved blocks in bytes, and which of them are RESW.
+# Blocks too small to reserve anything (RESB and RESW reserve at least one byte or word) are left out.
+def get_reserved_block_list(random_generator, shape, number_of_reserved_bytes):
+    number_of_blocks = shape.number_of_reserved_blocks
+    number_of_word_blocks = round(number_of_blocks * shape.reserved_word_ratio)
+    word_block_index_set = set(random_generator.sample(range(number_of_blocks), number_of_word_blocks))
+
+    reserved_block_list = []
+    remaining_number_of_bytes = number_of_reserved_bytes
+    for block_index in range(number_of_blocks):
+        number_of_block_bytes = remaining_number_of_bytes // (number_of_blocks - block_index)
+        if block_index in word_block_index_set:
+            number_of_block_bytes -= number_of_block_bytes % BYTES_IN_WORD
+        # The last block takes what is left, unless it is RESW and a byte or two are left over
+        if block_index == number_of_blocks - 1 and block_index not in word_block_index_set:
+            number_of_block_bytes = remaining_number_of_bytes
+        if number_of_block_bytes > 0:
+            reserved_block_list.append((number_of_block_bytes, block_index in word_block_index_set))
+        remaining_number_of_bytes -= number_of_block_bytes
+
+    return reserved_block_list
+
+
+# This function builds the program with reserved blocks of the given sizes.
+def build_program(shape, reserved_block_list):
+    random_generator = random.Random(shape.seed)
+    builder = SICProgramBuilder()
+    reserved_block_label_list = ["RSV" + str(block_index + 1) for block_index in range(len(reserved_block_list))]
+    loop_depth = shape.loop_depth
+
+    # SETUP AND LOOP HEADS
+    builder.set_pending_label("FIRST")
+    for loop_level in range(1, loop_depth):
+        builder.add_instruction("LDA", "ZERO")
+        builder.add_instruction("STA", "CNT" + str(loop_level))
+        builder.set_pending_label("LOOP" + str(loop_level))
+    builder.add_instruction("LDX", "ZERO")
+    if loop_depth > 0:
+        builder.set_pending_label("LOOP" + str(loop_depth))
+
+    # BODY
+    number_of_sections = len(reserved_block_list) + 1
+    io_label_counter = [0]
+    for section_index in range(number_of_sections):
+        section_number_of_instructions = (shape.number_of_instructions * (section_index + 1) // number_of_sections -
+                                          shape.number_of_instructions * section_index // number_of_sections)
+        add_body_statements(builder, random_generator, shape, section_number_of_instructions,
+                            reserved_block_label_list, io_label_counter)
+
+        if section_index < len(reserved_block_list):
+            number_of_block_bytes, is_word_block = reserved_block_list[section_index]
+            builder.add_instruction("J", "SEC" + str(section_index + 1))
+            if is_word_block:
+                builder.add_data(reserved_block_label_list[section_index], "RESW",
+                                 str(number_of_block_bytes // BYTES_IN_WORD))
+            else:
+                builder.add_data(reserved_block_label_list[section_index], "RESB", str(number_of_block_bytes))
+            builder.set_pending_label("SEC" + str(section_index + 1))
+
+    # LOOP TAILS
+    if loop_depth > 0:
+        builder.add_instruction("TIX", "LIM" + str(loop_depth))
+        builder.add_instruction("JLT", "LOOP" + str(loop_depth))
+    for loop_level in range(loop_depth - 1, 0, -1):
+        builder.add_instruction("LDA", "CNT" + str(loop_level))
+        builder.add_instruction("ADD", "ONE")
+        builder.add_instruction("STA", "CNT" + str(loop_level))
+        builder.add_instruction("COMP", "LIM" + str(loop_level))
+        builder.add_instruction("JLT", "LOOP" + str(loop_level))
+    builder.add_instruction("XOS")
+
+    # DATA
+    builder.add_data("ZERO", "WORD", "0")
+    builder.add_data("ONE", "WORD", "1")
+    builder.add_data("MASK", "WORD", str(MASK_VALUE))
+    for constant_value in range(1, NUMBER_OF_CONSTANTS + 1):
+        builder.add_data("C" + str(constant_value), "WORD", str(constant_value))
+    for variable_index in range(NUMBER_OF_VARIABLES):
+        builder.add_data("V" + str(variable_index), "WORD", str(random_generator.randrange(MASK_VALUE + 1)))
+    for loop_level in range(1, loop_depth + 1):
+        builder.add_data("LIM" + str(loop_level), "WORD", str(shape.loop_iterations))
+    for loop_level in range(1, loop_depth):
+        builder.add_data("CNT" + str(loop_level), "RESW", "1")
+    builder.add_data("INDEV", "BYTE", "X'F1'")
+    builder.add_data("OUTDEV", "BYTE", "X'05'")
+
+    # TABLE holds a word for the largest index, X = loop_iterations - 1
+    number_of_table_bytes = (shape.loop_iterations if loop_depth > 0 else 1) + BYTES_IN_WORD - 1
+    for table_line_index in range(0, number_of_table_bytes, TABLE_BYTES_PER_LINE):
+        table_line_byte_count = min(TABLE_BYTES_PER_LINE, number_of_table_bytes - table_line_index)
+        builder.add_data("TABLE" if table_line_index == 0 else None, "BYTE",
+                         "X'" + "".join(format(random_generator.randrange(256), "02X")
+                                        for byte_index in range(table_line_byte_count)) + "'")
+
+    return builder
+
+
+def get_program_byte_count(builder):
+    return sum(get_line_byte_count(opcode, operand) for label, opcode, operand in builder.line_list)
+
+
+# This function labels body instructions at random until the program has number_of_labels labels.
+def add_body_labels(builder, random_generator, number_of_labels):
+    unlabelled_index_list = [line_index for line_index in builder.body_instruction_index_list
+                             if builder.line_list[line_index][0] is None]
+    number_of_body_labels = min(max(number_of_labels - len(builder.label_set), 0), len(unlabelled_index_list))
+
+    for label_number, line_index in enumerate(sorted(random_generator.sample(unlabelled_index_list,
+                                                                                 number_of_body_labels))):
+        builder.line_list[line_index][0] = builder.add_label("B" + str(label_number + 1))
+
+
+# This function returns the assembly code of a program of the given shape (see SICProgramShape):
+#    number_of_instructions    instructions in the body, besides the setup, the loops and the jumps between sections
+#    label_density             part of the body instructions labelled, or with is_filling_labels as many as the
+#                              assembler allows (MAXIMUM_NUMBER_OF_LABELS)
+#    loop_depth                number of nested loops around the body (0 runs the body once)
+#    loop_iterations           number of times each loop runs, and the number of indexes of TABLE
+#    number_of_reserved_bytes  bytes reserved in number_of_reserved_blocks blocks between the sections of the body,
+#                              or with is_filling_memory every byte of memory the program leaves free
+#    reserved_word_ratio       part of the reserved blocks that are RESW (the rest are RESB)
+#    indexed_addressing_ratio  part of the data operands that are TABLE,X
+#    io_ratio                  part of the body instructions in I/O statements
+#    seed                      seed of the random choices, the same seed gives the same program
+# It raises SICProgramGeneratorError if the program would have more labels than the assembler allows,
+# or not fit in memory.
+def generate_assembly_code(shape):
+    shape.validate()
+
+    if shape.is_filling_memory:
+        # The program is built with a word in every reserved block to measure it,
+        # then built again with the memory it leaves free spread over the reserved blocks
+        number_of_measuring_bytes = BYTES_IN_WORD * shape.number_of_reserved_blocks
+        builder = build_program(shape, get_reserved_block_list(random.Random(shape.seed), shape,
+                                                               number_of_measuring_bytes))
+        number_of_reserved_bytes = max(MAXIMUM_MEMORY_ADDRESS_DEC - get_program_byte_count(builder) +
+                                       number_of_measuring_bytes, 0)
+    else:
+        number_of_reserved_bytes = shape.number_of_reserved_bytes
+
+    builder = build_program(shape, get_reserved_block_list(random.Random(shape.seed), shape, number_of_reserved_bytes))
+    number_of_program_bytes = get_program_byte_count(builder)
+
+    # The location counter must stay at or below 7FFF after the last line, so the program can take 32767 bytes
+    if number_of_program_bytes > MAXIMUM_MEMORY_ADDRESS_DEC:
+        raise SICProgramGeneratorError("The program takes " + str(number_of_program_bytes) + " bytes, more than the " +
+                                       str(MAXIMUM_MEMORY_ADDRESS_DEC) + " bytes the assembler can place in memory")
+
+    random_generator = random.Random(shape.seed + 1)
+    if shape.is_filling_labels:
+        add_body_labels(builder, random_generator, MAXIMUM_NUMBER_OF_LABELS)
+    else:
+        add_body_labels(builder, random_generator,
+                        len(builder.label_set) + round(shape.label_density * len(builder.body_instruction_index_list)))
+
+    if len(builder.label_set) > MAXIMUM_NUMBER_OF_LABELS:
+        raise SICProgramGeneratorError("The program has " + str(len(builder.label_set)) + " labels, more than the " +
+                                       str(MAXIMUM_NUMBER_OF_LABELS) + " the assembler allows")
+
+    line_list = [". Synthetic program: " + shape.get_description(),
+                 ". " + str(number_of_program_bytes) + " bytes, " + str(len(builder.label_set)) + " labels",
+                 shape.program_name.ljust(LABEL_COLUMN_WIDTH) + "START".ljust(OPCODE_COLUMN_WIDTH) + "0"]
+    for label, opcode, operand in builder.line_list:
+        line_list.append(((label or "").ljust(LABEL_COLUMN_WIDTH) + opcode.ljust(OPCODE_COLUMN_WIDTH) +
+                          operand).rstrip())
+    line_list.append("".ljust(LABEL_COLUMN_WIDTH) + "END".ljust(OPCODE_COLUMN_WIDTH) + "FIRST")
+
+    return "\n".join(line_list) + "\n"
+
+
+# This function writes the assembly code of a program of the given shape to assembly_code_file_path.
+def write_assembly_code_file(shape, assembly_code_file_path):
+    assembly_code = generate_assembly_code(shape)
+    with open(assembly_code_file_path, "wt") as assembly_code_file:
+        assembly_code_file.write(assembly_code)
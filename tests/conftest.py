@@ -0,0 +1,19 @@
+import os
+import shutil
+
+import pytest
+
+from SIC_Simulator.sic_object_code_parser import sic_object_code_parser
+from tests.test_engine_parity import assemble_program
+
+ASSEMBLY_CODE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Assembly Code")
+
+
+# This fixture assembles ReadWrite.asm in a temporary directory and returns its parsed object code.
+@pytest.fixture(scope="session")
+def read_write_object_code_dict_list(tmp_path_factory):
+    assembly_code_file_path = str(tmp_path_factory.mktemp("assembly") / "ReadWrite.asm")
+    shutil.copyfile(os.path.join(ASSEMBLY_CODE_DIRECTORY, "ReadWrite.asm"), assembly_code_file_path)
+
+    with open(assemble_program(assembly_code_file_path), "rt") as object_code_file:
+        return sic_object_code_parser(object_code_file)
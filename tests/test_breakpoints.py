@@ -0,0 +1,130 @@
+import pytest
+
+from SIC_Peripherals.sic_device_readiness import READINESS_MODEL_ALWAYS_READY
+from SIC_Simulator import sic_runner
+from SIC_Simulator.sic_breakpoints import SICBreakpointTable
+from SIC_Simulator.sic_machine import MACHINE
+from SIC_Simulator.sic_register_model import REGISTER_PC, REGISTER_X
+from SIC_Simulator.sic_runner import run_program_file, run_program, load_program, EXIT_STATUS_NORMAL, \
+    EXIT_STATUS_BREAK
+from tests.test_engine_parity import assemble_program, remove_text_colors
+
+# Copy copies SOURCE to TARGET one byte at a time with indexed LDCH and STCH.
+#   1000          LDX   ZERO
+#   1003 CLOOP    LDCH  SOURCE,X
+#   1006          STCH  TARGET,X
+#   1009          TIX   LENGTH
+#   100C          JLT   CLOOP
+#   100F          XOS
+#   1012 SOURCE   BYTE  C'SIC'
+#   1015 TARGET   RESB  3
+# The loop runs 3 times, so the program ends after 1 + 3 * 4 + 1 = 14 steps.
+COPY_ASSEMBLY_CODE = """.LABEL\tOPCODE\tOPERAND\t\tREMARKS
+COPY\tSTART\t1000\t\t\tCOPY SOURCE TO TARGET, ONE BYTE AT A TIME
+\t\tLDX\t\tZERO\t\t\tCLEAR LOOP COUNTER
+CLOOP\tLDCH\tSOURCE,X\t\tGET CHARACTER FROM SOURCE
+\t\tSTCH\tTARGET,X\t\tSTORE CHARACTER IN TARGET
+\t\tTIX\t\tLENGTH\t\t\tLOOP UNTIL LENGTH
+\t\tJLT\t\tCLOOP\t\t\t  CHARACTERS ARE COPIED
+\t\tXOS\t\t\t\t\t\tEND PROGRAM AND EXIT TO THE OS
+SOURCE\tBYTE\tC'SIC'
+TARGET\tRESB\t3
+ZERO\tWORD\t0
+LENGTH\tWORD\t3
+\t\tEND\t\tCOPY
+"""
+COPY_NUMBER_OF_STEPS = 14
+
+
+# This fixture assembles Copy.asm in a temporary directory and returns the path of its object code file.
+@pytest.fixture(scope="module")
+def copy_object_code_file_path(tmp_path_factory):
+    assembly_code_file_path = tmp_path_factory.mktemp("assembly") / "Copy.asm"
+    assembly_code_file_path.write_text(COPY_ASSEMBLY_CODE)
+    return assemble_program(str(assembly_code_file_path))
+
+
+# This function runs Copy headless with breakpoints and watchpoints given as strings, like --break and --watch.
+# It returns the exit status and the messages of the run.
+def run_copy(copy_object_code_file_path, capsys, breakpoint_string_list=None, watchpoint_string_list=None):
+    exit_status = run_program_file(copy_object_code_file_path, readiness_model_name=READINESS_MODEL_ALWAYS_READY,
+                                   breakpoint_string_list=breakpoint_string_list,
+                                   watchpoint_string_list=watchpoint_string_list)
+    return exit_status, remove_text_colors(capsys.readouterr().out)
+
+
+def test_breakpoint_at_address(copy_object_code_file_path, capsys):
+    exit_status, messages = run_copy(copy_object_code_file_path, capsys, breakpoint_string_list=["1009"])
+    assert exit_status == EXIT_STATUS_BREAK
+    assert messages == "BREAKPOINT AT 1009\nSTEPS: 3\n"
+    assert MACHINE.register_dict[REGISTER_PC].value == 0x1009
+
+
+# The first instruction of the run is not tested, CLOOP is reached after LDX
+def test_breakpoint_at_label(copy_object_code_file_path, capsys):
+    exit_status, messages = run_copy(copy_object_code_file_path, capsys, breakpoint_string_list=["CLOOP"])
+    assert exit_status == EXIT_STATUS_BREAK
+    assert messages == "BREAKPOINT AT 1003\nSTEPS: 1\n"
+
+
+def test_conditional_breakpoint(copy_object_code_file_path, capsys):
+    exit_status, messages = run_copy(copy_object_code_file_path, capsys, breakpoint_string_list=["CLOOP if X = 2"])
+    assert exit_status == EXIT_STATUS_BREAK
+    assert messages == "BREAKPOINT AT 1003 IF X = 2\nSTEPS: 9\n"
+    assert MACHINE.register_dict[REGISTER_X].value == 2
+
+
+# A condition that never holds lets the program run to its end
+def test_conditional_breakpoint_that_never_holds(copy_object_code_file_path, capsys):
+    exit_status, messages = run_copy(copy_object_code_file_path, capsys, breakpoint_string_list=["CLOOP if X > 2"])
+    assert exit_status == EXIT_STATUS_NORMAL
+    assert "BREAKPOINT" not in messages
+
+
+# The watched byte is only reached through register X, on the last time round the loop
+def test_write_watchpoint_on_indexed_stch(copy_object_code_file_path, capsys):
+    exit_status, messages = run_copy(copy_object_code_file_path, capsys, watchpoint_string_list=["1017-1017"])
+    assert exit_status == EXIT_STATUS_BREAK
+    assert messages == "WATCHPOINT AT 1006: WRITE 1017\nSTEPS: 10\n"
+    assert MACHINE.register_dict[REGISTER_X].value == 2
+
+
+def test_read_watchpoint_on_indexed_ldch(copy_object_code_file_path, capsys):
+    exit_status, messages = run_copy(copy_object_code_file_path, capsys, watchpoint_string_list=["1013-1013:r"])
+    assert exit_status == EXIT_STATUS_BREAK
+    assert messages == "WATCHPOINT AT 1003: READ 1013\nSTEPS: 5\n"
+    assert MACHINE.register_dict[REGISTER_X].value == 1
+
+
+# A watchpoint on a label watches the word there. TARGET is written, never read.
+def test_watchpoint_at_label_watches_its_access_only(copy_object_code_file_path, capsys):
+    exit_status, messages = run_copy(copy_object_code_file_path, capsys, watchpoint_string_list=["TARGET"])
+    assert exit_status == EXIT_STATUS_BREAK
+    assert messages == "WATCHPOINT AT 1006: WRITE 1015\nSTEPS: 2\n"
+
+    exit_status, messages = run_copy(copy_object_code_file_path, capsys, watchpoint_string_list=["TARGET:r"])
+    assert exit_status == EXIT_STATUS_NORMAL
+    assert "WATCHPOINT" not in messages
+
+
+# A run with an empty breakpoint table takes the compiled path and tests nothing
+def test_empty_breakpoint_table_runs_compiled(copy_object_code_file_path, monkeypatch):
+    run_steps_argument_list = []
+
+    def record_run_steps(maximum_number_of_steps=None, use_block_compiler=True, is_fast_forwarding_polling_loops=True):
+        run_steps_argument_list.append(use_block_compiler)
+        return MACHINE.run_steps(maximum_number_of_steps, use_block_compiler, is_fast_forwarding_polling_loops)
+
+    def fail_empty_breakpoint_table(*argument_list):
+        raise AssertionError("An empty breakpoint table was tested")
+
+    monkeypatch.setattr(sic_runner, "run_steps", record_run_steps)
+    monkeypatch.setattr(sic_runner, "run_breakpoint_steps", fail_empty_breakpoint_table)
+    monkeypatch.setattr(SICBreakpointTable, "test_for_break", fail_empty_breakpoint_table)
+
+    load_program(copy_object_code_file_path)
+    breakpoint_table = SICBreakpointTable()
+    assert run_program(breakpoint_table=breakpoint_table) == (EXIT_STATUS_NORMAL, COPY_NUMBER_OF_STEPS)
+    assert run_steps_argument_list == [True]
+    assert breakpoint_table.break_message is None
+    assert bytes(MACHINE.memory_model.memory_bytearray[0x1015:0x1018]) == b"SIC"
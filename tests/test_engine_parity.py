@@ -0,0 +1,246 @@
+import contextlib
+import io
+import os
+import random
+
+import pytest
+
+from SIC_Assembler import sic_assembler
+from SIC_Assembler.sic_assembly_parser import parse_assembly_code_file
+from SIC_Peripherals.sic_device_readiness import create_readiness_model, READINESS_MODEL_ALWAYS_READY, \
+    READINESS_MODEL_RANDOM
+from SIC_Peripherals.sic_input_device_F1 import SICInputDeviceF1, SICBufferSource, INPUT_DEVICE_F1_CODE
+from SIC_Peripherals.sic_output_device_05 import SICOutputDevice05, SICBytearraySink, OUTPUT_DEVICE_05_CODE
+from SIC_Simulator import sic_block_compiler
+from SIC_Simulator.sic_batch_runner import get_register_result_dict, remove_text_colors, EXIT_REASON_NORMAL, \
+    EXIT_REASON_FAULT, EXIT_REASON_STEP_BUDGET_EXHAUSTED
+from SIC_Simulator.sic_machine import SICMachine
+from SIC_Simulator.sic_object_code_parser import sic_object_code_parser
+from SIC_Utilities.sic_constants import OPCODE_TO_HEX_DICT, BYTES_IN_WORD, MAXIMUM_MEMORY_ADDRESS_DEC, \
+    SIC_OBJECT_CODE_FILE_EXTENSION
+
+# DIFFERENTIAL TESTS
+# The interpreter (execute_operation, one instruction at a time) is the reference. The same program is run on the
+# block compiler and on the lockstep engine, and every run must end with the same exit reason, step count,
+# registers, memory, device bytes and messages.
+#
+# Random programs are a few dozen words of random instructions and data. Operands point into the program most of
+# the time and near the end of memory some of the time, and the data holds the device codes and values at the
+# edges of the integer range, so the runs reach the faults (memory, integer range, register contents, unknown
+# opcode and device) as well as XOS and the step budget. Most programs start by loading a small value into
+# register X, the others leave it uninitialized (FFFFFF).
+PROGRAM_START_ADDRESS_DEC = 0x1000
+NUMBER_OF_CODE_WORDS = 24
+NUMBER_OF_DATA_WORDS = 16
+MAXIMUM_NUMBER_OF_STEPS = 2000
+TEXT_RECORD_BYTES = 30
+
+NUMBER_OF_COMPILER_PROGRAMS = 300
+NUMBER_OF_LOCKSTEP_PROGRAMS = 200
+NUMBER_OF_LOCKSTEP_LANES = 4
+
+JUMP_MNEMONIC_SET = {"J", "JEQ", "JGT", "JLT", "JSUB"}
+DATA_WORD_VALUE_LIST = [0, 1, 2, 3, 0x7FFFFF, 0x800000, 0xFFFFFF, 0xFFFFFE]
+
+# ReadWrite copies the records of input device F1 to output device 05 and writes EOF after them.
+# It returns to an uninitialized register L at the end, so every run ends with a program counter fault.
+READ_WRITE_INPUT_DATA = b"HELLO SIC\nSECOND RECORD\nTHE LAST RECORD HAS NO LINE FEED"
+READ_WRITE_OUTPUT = "HELLO SICSECOND RECORDTHE LAST RECORD HAS NO LINE FEEDEOF"
+
+
+# This function returns the object code (H, T and E records) of a random program.
+def build_random_object_code(rng):
+    code_end_address_dec = PROGRAM_START_ADDRESS_DEC + NUMBER_OF_CODE_WORDS * BYTES_IN_WORD
+    program_length = (NUMBER_OF_CODE_WORDS + NUMBER_OF_DATA_WORDS) * BYTES_IN_WORD
+    mnemonic_list = sorted(OPCODE_TO_HEX_DICT)
+
+    program_bytes = bytearray()
+    for word_index in range(NUMBER_OF_CODE_WORDS):
+        mnemonic = rng.choice(mnemonic_list)
+        if mnemonic in JUMP_MNEMONIC_SET:
+            address_dec = PROGRAM_START_ADDRESS_DEC + rng.randrange(NUMBER_OF_CODE_WORDS) * BYTES_IN_WORD
+        elif rng.random() < 0.03:
+            address_dec = MAXIMUM_MEMORY_ADDRESS_DEC - rng.randrange(4)
+        else:
+            address_dec = PROGRAM_START_ADDRESS_DEC + rng.randrange(program_length)
+        if rng.random() < 0.25:
+            address_dec |= 0x8000
+        program_bytes += bytes([int(OPCODE_TO_HEX_DICT[mnemonic], 16), address_dec >> 8, address_dec & 0xFF])
+
+    for word_index in range(NUMBER_OF_DATA_WORDS):
+        if rng.random() < 0.5:
+            word_dec = rng.choice(DATA_WORD_VALUE_LIST)
+        else:
+            word_dec = rng.randrange(1 << 24)
+        program_bytes += word_dec.to_bytes(BYTES_IN_WORD, "big")
+
+    # The device codes, so that some device instructions find a device
+    program_bytes[-2] = INPUT_DEVICE_F1_CODE
+    program_bytes[-1] = OUTPUT_DEVICE_05_CODE
+
+    # LDX of the first data word, set to a small value
+    if rng.random() < 0.75:
+        first_data_address_dec = code_end_address_dec
+        program_bytes[0:BYTES_IN_WORD] = bytes([int(OPCODE_TO_HEX_DICT["LDX"], 16), first_data_address_dec >> 8,
+                                                first_data_address_dec & 0xFF])
+        first_data_offset = first_data_address_dec - PROGRAM_START_ADDRESS_DEC
+        program_bytes[first_data_offset:first_data_offset + BYTES_IN_WORD] = \
+            rng.randrange(16).to_bytes(BYTES_IN_WORD, "big")
+
+    object_code_line_list = ["HRANDOM" + format(PROGRAM_START_ADDRESS_DEC, "06X") + format(program_length, "06X")]
+    for record_offset in range(0, program_length, TEXT_RECORD_BYTES):
+        record_bytes = program_bytes[record_offset:record_offset + TEXT_RECORD_BYTES]
+        object_code_line_list.append("T" + format(PROGRAM_START_ADDRESS_DEC + record_offset, "06X") +
+                                     format(len(record_bytes), "02X") + record_bytes.hex().upper())
+    object_code_line_list.append("E" + format(PROGRAM_START_ADDRESS_DEC, "06X"))
+
+    return "\n".join(object_code_line_list) + "\n"
+
+
+# This function parses object code held in a string.
+def parse_object_code(object_code):
+    return sic_object_code_parser(io.StringIO(object_code))
+
+
+# This function returns random input data for input device F1: text, line feeds and end of file bytes.
+def build_random_input_data(rng):
+    return bytes(rng.choice(b"AB\n\x00") for byte_index in range(rng.randrange(40)))
+
+
+# This function returns input device F1 reading input_data and output device 05 collecting its output in a bytearray.
+def create_devices(input_data, readiness_model_name=READINESS_MODEL_ALWAYS_READY, seed=None):
+    return (SICInputDeviceF1(SICBufferSource(input_data), create_readiness_model(readiness_model_name, seed)),
+            SICOutputDevice05(SICBytearraySink(), create_readiness_model(readiness_model_name, seed)))
+
+
+# This function returns a new machine with the devices of create_devices.
+def create_machine(input_data, readiness_model_name=READINESS_MODEL_ALWAYS_READY, seed=None, memory_model=None):
+    return SICMachine(*create_devices(input_data, readiness_model_name, seed), memory_model)
+
+
+# This function returns the result of a machine's run, like run_batch_job does.
+def get_machine_result_dict(machine, continue_execution, number_of_steps, messages):
+    if continue_execution:
+        exit_reason = EXIT_REASON_STEP_BUDGET_EXHAUSTED
+    elif machine.test_for_normal_termination():
+        exit_reason = EXIT_REASON_NORMAL
+    else:
+        exit_reason = EXIT_REASON_FAULT
+
+    output_bytearray = machine.output_device_05.sink.output_bytearray
+    return {"exit_reason": exit_reason,
+            "steps": number_of_steps,
+            "input_bytes": machine.input_device_F1.bytes_read,
+            "output_bytes": len(output_bytearray),
+            "output": output_bytearray.decode("latin-1"),
+            "registers": get_register_result_dict(machine),
+            "messages": remove_text_colors(messages),
+            "memory": machine.memory_model.get_memory_image()}
+
+
+# This function runs a program on a new machine and returns its result.
+def run_machine(parsed_object_code_dict_list, input_data, use_block_compiler,
+                readiness_model_name=READINESS_MODEL_ALWAYS_READY, seed=None, is_fast_forwarding_polling_loops=True,
+                maximum_number_of_steps=MAXIMUM_NUMBER_OF_STEPS):
+    machine = create_machine(input_data, readiness_model_name, seed)
+    message_writer = io.StringIO()
+
+    with contextlib.redirect_stdout(message_writer):
+        machine.load_program_object_code(parsed_object_code_dict_list)
+        continue_execution, number_of_steps = machine.run_steps(maximum_number_of_steps, use_block_compiler,
+                                                                is_fast_forwarding_polling_loops)
+
+    return get_machine_result_dict(machine, continue_execution, number_of_steps, message_writer.getvalue())
+
+
+# This function runs a program on a lockstep engine, one lane per input, and returns the result of every lane.
+def run_lockstep_engine(parsed_object_code_dict_list, input_data_list, maximum_number_of_steps=None):
+    lockstep_engine_module = pytest.importorskip("SIC_Simulator.sic_lockstep_engine")
+
+    lockstep_engine = lockstep_engine_module.SICLockstepEngine(len(input_data_list))
+    lockstep_engine.load_program_object_code(parsed_object_code_dict_list)
+    lockstep_engine.set_input_data_list(input_data_list)
+    lockstep_engine.run(maximum_number_of_steps)
+
+    lane_result_list = []
+    for lane_index in range(len(input_data_list)):
+        lane_result_dict = lockstep_engine.get_lane_result_dict(lane_index)
+        del lane_result_dict["lane"]
+        lane_result_dict["memory"] = lockstep_engine.get_lane_memory_bytes(lane_index)
+        lane_result_list.append(lane_result_dict)
+    return lane_result_list
+
+
+# This function assembles an assembly code file, which writes the object code and assembly listing files next to it.
+# It returns the path of the object code file.
+def assemble_program(assembly_code_file_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        parsed_code_dict_list = parse_assembly_code_file(assembly_code_file_path)
+        sic_assembler.assembler_pass_one(parsed_code_dict_list)
+        sic_assembler.assembler_pass_two(parsed_code_dict_list, assembly_code_file_path)
+
+    return os.path.splitext(assembly_code_file_path)[0] + "." + SIC_OBJECT_CODE_FILE_EXTENSION
+
+
+# Every block is compiled on its first visit (0), or after being interpreted once (1),
+# so the programs run almost entirely in compiled code
+@pytest.mark.parametrize("seed", range(NUMBER_OF_COMPILER_PROGRAMS))
+def test_block_compiler_matches_interpreter(seed, monkeypatch):
+    rng = random.Random(seed)
+    parsed_object_code_dict_list = parse_object_code(build_random_object_code(rng))
+    input_data = build_random_input_data(rng)
+
+    interpreter_result_dict = run_machine(parsed_object_code_dict_list, input_data, use_block_compiler=False)
+    for number_of_interpreted_block_visits in (0, 1):
+        monkeypatch.setattr(sic_block_compiler, "NUMBER_OF_INTERPRETED_BLOCK_VISITS",
+                            number_of_interpreted_block_visits)
+        assert run_machine(parsed_object_code_dict_list, input_data, use_block_compiler=True) == \
+            interpreter_result_dict
+
+
+@pytest.mark.parametrize("seed", range(NUMBER_OF_LOCKSTEP_PROGRAMS))
+def test_lockstep_engine_matches_interpreter(seed):
+    rng = random.Random(seed)
+    parsed_object_code_dict_list = parse_object_code(build_random_object_code(rng))
+    input_data_list = [build_random_input_data(rng) for lane_index in range(NUMBER_OF_LOCKSTEP_LANES)]
+
+    lane_result_list = run_lockstep_engine(parsed_object_code_dict_list, input_data_list, MAXIMUM_NUMBER_OF_STEPS)
+    for input_data, lane_result_dict in zip(input_data_list, lane_result_list):
+        assert lane_result_dict == run_machine(parsed_object_code_dict_list, input_data, use_block_compiler=False)
+
+
+def test_register_contents_fault_halts_tix():
+    # TIX with register X uninitialized (FFFFFF) overflows register X
+    object_code = "HTIX   001000000006\nT001000062C1003FF0000\nE001000\n"
+    for use_block_compiler in (False, True):
+        result_dict = run_machine(parse_object_code(object_code), b"", use_block_compiler)
+        assert result_dict["exit_reason"] == EXIT_REASON_FAULT
+        assert result_dict["messages"] == "REGISTER CONTENTS FAULT: Halting program execution\n\n"
+
+
+def test_read_write_output_matches_across_engines(read_write_object_code_dict_list, monkeypatch):
+    interpreter_result_dict = run_machine(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA,
+                                          use_block_compiler=False, is_fast_forwarding_polling_loops=False,
+                                          maximum_number_of_steps=None)
+    assert interpreter_result_dict["output"] == READ_WRITE_OUTPUT
+
+    for number_of_interpreted_block_visits in (0, sic_block_compiler.NUMBER_OF_INTERPRETED_BLOCK_VISITS):
+        monkeypatch.setattr(sic_block_compiler, "NUMBER_OF_INTERPRETED_BLOCK_VISITS",
+                            number_of_interpreted_block_visits)
+        assert run_machine(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA, use_block_compiler=True,
+                           maximum_number_of_steps=None) == interpreter_result_dict
+
+    assert run_lockstep_engine(read_write_object_code_dict_list, [READ_WRITE_INPUT_DATA]) == [interpreter_result_dict]
+
+
+# The polling loops of a random readiness model are fast-forwarded in compiled runs
+@pytest.mark.parametrize("seed", range(5))
+def test_read_write_output_matches_with_random_readiness(read_write_object_code_dict_list, seed):
+    interpreter_result_dict = run_machine(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA,
+                                          use_block_compiler=False, readiness_model_name=READINESS_MODEL_RANDOM,
+                                          seed=seed, is_fast_forwarding_polling_loops=False,
+                                          maximum_number_of_steps=None)
+    assert interpreter_result_dict["output"] == READ_WRITE_OUTPUT
+    assert run_machine(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA, use_block_compiler=True,
+                       readiness_model_name=READINESS_MODEL_RANDOM, seed=seed,
+                       maximum_number_of_steps=None) == interpreter_result_dict
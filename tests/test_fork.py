@@ -0,0 +1,119 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from SIC_Peripherals.sic_device_readiness import READINESS_MODEL_ALWAYS_READY, READINESS_MODEL_RANDOM
+from SIC_Simulator.sic_paged_memory_model import SICPagedMemoryModel, BYTES_PER_PAGE
+from SIC_Utilities.sic_converter import hex_string_to_dec
+from tests.test_engine_parity import build_random_object_code, build_random_input_data, parse_object_code, \
+    create_devices, create_machine, get_machine_result_dict, run_machine, READ_WRITE_INPUT_DATA, \
+    MAXIMUM_NUMBER_OF_STEPS
+
+NUMBER_OF_FORK_PROGRAMS = 50
+
+# A page no program of these tests loads or writes
+BLANK_PAGE_ADDRESS_DEC = 0x7000
+
+
+# This function forks a machine. The new machine gets devices of its own, in the state of the machine's devices.
+def fork_machine(machine, input_data, readiness_model_name=READINESS_MODEL_ALWAYS_READY, seed=None):
+    forked_machine = machine.fork(*create_devices(input_data, readiness_model_name, seed))
+    forked_machine.input_device_F1.set_state(machine.input_device_F1.get_state())
+    forked_machine.output_device_05.set_state(machine.output_device_05.get_state())
+    return forked_machine
+
+
+# This function runs a machine for up to maximum_number_of_steps more steps and returns its result.
+def run_on(machine, number_of_steps_before, maximum_number_of_steps):
+    message_writer = io.StringIO()
+    with contextlib.redirect_stdout(message_writer):
+        continue_execution, number_of_steps = machine.run_steps(maximum_number_of_steps - number_of_steps_before)
+
+    return get_machine_result_dict(machine, continue_execution, number_of_steps_before + number_of_steps,
+                                   message_writer.getvalue())
+
+
+# This function loads a program on paged memory, runs it for number_of_steps_before_fork steps and forks it twice.
+# One fork runs to the end, then the machine forked from, then the other fork, so every run starts after
+# another machine has written the pages they share. It returns the results of the three runs.
+def run_forks(parsed_object_code_dict_list, input_data, number_of_steps_before_fork,
+              readiness_model_name=READINESS_MODEL_ALWAYS_READY, seed=None,
+              maximum_number_of_steps=MAXIMUM_NUMBER_OF_STEPS):
+    machine = create_machine(input_data, readiness_model_name, seed, SICPagedMemoryModel())
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        machine.load_program_object_code(parsed_object_code_dict_list)
+        continue_execution, number_of_steps = machine.run_steps(number_of_steps_before_fork)
+    assert continue_execution and number_of_steps == number_of_steps_before_fork
+
+    first_forked_machine = fork_machine(machine, input_data, readiness_model_name, seed)
+    second_forked_machine = fork_machine(machine, input_data, readiness_model_name, seed)
+
+    return [run_on(next_machine, number_of_steps_before_fork, maximum_number_of_steps)
+            for next_machine in (first_forked_machine, machine, second_forked_machine)]
+
+
+def test_fork_shares_no_writes(read_write_object_code_dict_list):
+    machine = create_machine(READ_WRITE_INPUT_DATA, memory_model=SICPagedMemoryModel())
+    with contextlib.redirect_stdout(io.StringIO()):
+        machine.load_program_object_code(read_write_object_code_dict_list)
+        machine.run_steps(100)
+
+    forked_machine = fork_machine(machine, READ_WRITE_INPUT_DATA)
+    program_start_address_dec = hex_string_to_dec(read_write_object_code_dict_list[0]["program_start_address"])
+    memory_model = machine.memory_model
+    forked_memory_model = forked_machine.memory_model
+    memory_image = memory_model.get_memory_image()
+    initialized_bitmap_image = memory_model.get_initialized_bitmap_image()
+    assert forked_memory_model.get_memory_image() == memory_image
+
+    # A write to a loaded page by the machine forked from
+    memory_model.write_word(program_start_address_dec, 0x123456)
+    assert forked_memory_model.read_word(program_start_address_dec) == \
+        int.from_bytes(memory_image[program_start_address_dec:program_start_address_dec + 3], "big")
+    assert forked_memory_model.get_memory_image() == memory_image
+    assert forked_memory_model.get_initialized_bitmap_image() == initialized_bitmap_image
+
+    # A write to the same page by the fork, which still shares the page with neither
+    forked_memory_model.write_byte(program_start_address_dec + 1, 0xAB)
+    assert memory_model.read_word(program_start_address_dec) == 0x123456
+
+    # Writes to a blank page, across its end, by each machine
+    memory_model.write_bytes(BLANK_PAGE_ADDRESS_DEC + BYTES_PER_PAGE - 1, b"\x01\x02")
+    forked_memory_model.write_word(BLANK_PAGE_ADDRESS_DEC, 0xFFFFFF)
+    assert memory_model.read_bytes(BLANK_PAGE_ADDRESS_DEC, 3) == \
+        memory_image[BLANK_PAGE_ADDRESS_DEC:BLANK_PAGE_ADDRESS_DEC + 3]
+    assert not memory_model.test_for_initialized_byte(BLANK_PAGE_ADDRESS_DEC)
+    assert forked_memory_model.read_bytes(BLANK_PAGE_ADDRESS_DEC + BYTES_PER_PAGE - 1, 2) == \
+        memory_image[BLANK_PAGE_ADDRESS_DEC + BYTES_PER_PAGE - 1:BLANK_PAGE_ADDRESS_DEC + BYTES_PER_PAGE + 1]
+    assert not forked_memory_model.test_for_initialized_byte(BLANK_PAGE_ADDRESS_DEC + BYTES_PER_PAGE)
+
+    # A fork of a fork shares the writes made before it, not after
+    second_forked_machine = fork_machine(forked_machine, READ_WRITE_INPUT_DATA)
+    forked_memory_model.write_word(BLANK_PAGE_ADDRESS_DEC, 0x000001)
+    assert second_forked_machine.memory_model.read_word(BLANK_PAGE_ADDRESS_DEC) == 0xFFFFFF
+
+
+# The forks run the program code the machine forked from already decoded, and write its data pages
+@pytest.mark.parametrize("seed", range(NUMBER_OF_FORK_PROGRAMS))
+def test_forked_machines_run_like_the_original(seed):
+    rng = random.Random(seed)
+    parsed_object_code_dict_list = parse_object_code(build_random_object_code(rng))
+    input_data = build_random_input_data(rng)
+
+    result_dict = run_machine(parsed_object_code_dict_list, input_data, use_block_compiler=False)
+    if result_dict["steps"] < 2:
+        pytest.skip("The program stops at its first step")
+
+    assert run_forks(parsed_object_code_dict_list, input_data, result_dict["steps"] // 2) == [result_dict] * 3
+
+
+@pytest.mark.parametrize("readiness_model_name", [READINESS_MODEL_ALWAYS_READY, READINESS_MODEL_RANDOM])
+def test_forked_read_write_runs_like_the_original(read_write_object_code_dict_list, readiness_model_name):
+    result_dict = run_machine(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA, use_block_compiler=False,
+                              readiness_model_name=readiness_model_name, seed=1, maximum_number_of_steps=None)
+
+    assert run_forks(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA, result_dict["steps"] // 3,
+                     readiness_model_name, seed=1, maximum_number_of_steps=result_dict["steps"]) == [result_dict] * 3
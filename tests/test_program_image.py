@@ -0,0 +1,24 @@
+import io
+
+import pytest
+
+from SIC_Simulator.sic_object_code_parser import iterate_object_code_records
+from SIC_Simulator.sic_program_image import program_image_from_object_code_records, program_image_from_bytes, \
+    SICProgramImageError
+
+
+# This function builds a program image from object code held in a string.
+def build_program_image(object_code):
+    return program_image_from_object_code_records(iterate_object_code_records(io.StringIO(object_code)))
+
+
+def test_text_record_in_memory_range_is_loaded():
+    program_image = build_program_image("HLAST  007FF0000010\nT007FF010" + "00" * 16 + "\nE007FF0\n")
+    assert program_image.segment_list == [(0x7FF0, bytes(16))]
+    assert program_image_from_bytes(program_image.to_bytes()).segment_list == program_image.segment_list
+
+
+# The last byte of the text record is one past the end of memory
+def test_text_record_out_of_memory_range_is_a_program_image_error():
+    with pytest.raises(SICProgramImageError, match="Text record out of memory range"):
+        build_program_image("HBAD   007FF0000011\nT007FF011" + "00" * 17 + "\nE007FF0\n")
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from SIC_Peripherals.sic_device_readiness import READINESS_MODEL_ALWAYS_READY, READINESS_MODEL_RANDOM
+from SIC_Simulator.sic_snapshot import snapshot_from_bytes, SICSnapshotError
+from tests.test_engine_parity import build_random_object_code, build_random_input_data, parse_object_code, \
+    create_machine, get_machine_result_dict, run_machine, READ_WRITE_INPUT_DATA, MAXIMUM_NUMBER_OF_STEPS
+
+NUMBER_OF_SNAPSHOT_PROGRAMS = 50
+
+
+# This function runs a program for number_of_steps_before_snapshot steps and takes a snapshot through its file format
+# (to_bytes, then snapshot_from_bytes). The machine runs on to the end and is then restored, and the restored machine
+# and a new machine restored from the same snapshot each run to the end again. It returns the results of both runs.
+def run_from_snapshot(parsed_object_code_dict_list, input_data, number_of_steps_before_snapshot,
+                      readiness_model_name=READINESS_MODEL_ALWAYS_READY, seed=None,
+                      maximum_number_of_steps=MAXIMUM_NUMBER_OF_STEPS):
+    machine = create_machine(input_data, readiness_model_name, seed)
+    new_machine = create_machine(input_data, readiness_model_name, seed)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        machine.load_program_object_code(parsed_object_code_dict_list)
+        new_machine.load_program_object_code(parsed_object_code_dict_list)
+        continue_execution, number_of_steps = machine.run_steps(number_of_steps_before_snapshot)
+        assert continue_execution and number_of_steps == number_of_steps_before_snapshot
+
+        snapshot_bytes = machine.snapshot().to_bytes()
+        machine.run_steps(maximum_number_of_steps)
+
+    result_list = []
+    for restored_machine in (machine, new_machine):
+        restored_machine.restore(snapshot_from_bytes(snapshot_bytes))
+
+        message_writer = io.StringIO()
+        with contextlib.redirect_stdout(message_writer):
+            remaining_maximum_number_of_steps = None
+            if maximum_number_of_steps is not None:
+                remaining_maximum_number_of_steps = maximum_number_of_steps - number_of_steps_before_snapshot
+            continue_execution, number_of_steps = restored_machine.run_steps(remaining_maximum_number_of_steps)
+
+        result_list.append(get_machine_result_dict(restored_machine, continue_execution,
+                                                   number_of_steps_before_snapshot + number_of_steps,
+                                                   message_writer.getvalue()))
+
+    return result_list
+
+
+# The snapshot is taken halfway through the run, so the rest of the run starts from the restored state
+@pytest.mark.parametrize("seed", range(NUMBER_OF_SNAPSHOT_PROGRAMS))
+def test_restored_snapshot_runs_like_the_original(seed):
+    rng = random.Random(seed)
+    parsed_object_code_dict_list = parse_object_code(build_random_object_code(rng))
+    input_data = build_random_input_data(rng)
+
+    result_dict = run_machine(parsed_object_code_dict_list, input_data, use_block_compiler=True)
+    if result_dict["steps"] < 2:
+        pytest.skip("The program stops at its first step")
+
+    assert run_from_snapshot(parsed_object_code_dict_list, input_data, result_dict["steps"] // 2) == \
+        [result_dict, result_dict]
+
+
+# The snapshot holds the device positions and the state of the random readiness models
+@pytest.mark.parametrize("readiness_model_name", [READINESS_MODEL_ALWAYS_READY, READINESS_MODEL_RANDOM])
+def test_read_write_restored_from_snapshot(read_write_object_code_dict_list, readiness_model_name):
+    result_dict = run_machine(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA, use_block_compiler=True,
+                              readiness_model_name=readiness_model_name, seed=1, maximum_number_of_steps=None)
+
+    for number_of_steps_before_snapshot in (1, result_dict["steps"] // 3, result_dict["steps"] - 1):
+        assert run_from_snapshot(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA,
+                                 number_of_steps_before_snapshot, readiness_model_name, seed=1,
+                                 maximum_number_of_steps=None) == [result_dict, result_dict]
+
+
+def test_damaged_snapshot_bytes():
+    machine = create_machine(b"")
+    snapshot_bytes = machine.snapshot().to_bytes()
+
+    for damaged_snapshot_bytes in (b"NOTSNAP1", snapshot_bytes[:-4], snapshot_bytes[:8] + b"\0" * 16):
+        with pytest.raises(SICSnapshotError):
+            snapshot_from_bytes(damaged_snapshot_bytes)
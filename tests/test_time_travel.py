@@ -0,0 +1,105 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from SIC_Simulator.sic_batch_runner import get_register_result_dict
+from SIC_Simulator.sic_time_travel import SICTimeTravelLog, SICTimeTravelError
+from tests.test_engine_parity import build_random_object_code, build_random_input_data, parse_object_code, \
+    create_machine, READ_WRITE_INPUT_DATA, READ_WRITE_OUTPUT, MAXIMUM_NUMBER_OF_STEPS
+
+NUMBER_OF_TIME_TRAVEL_PROGRAMS = 50
+CHECKPOINT_INTERVAL = 10
+
+
+# This function returns everything a step can change: registers, memory and its initialization bitmap,
+# the termination flag, and the transfer state and output of the devices.
+def get_machine_state(machine):
+    return (get_register_result_dict(machine),
+            machine.memory_model.get_memory_image(),
+            machine.memory_model.get_initialized_bitmap_image(),
+            machine.memory_model.is_program_terminated_normally,
+            machine.input_device_F1.get_transfer_state(),
+            machine.output_device_05.bytes_written,
+            bytes(machine.output_device_05.sink.output_bytearray))
+
+
+# This function loads a program and runs it through a time travel log, one step at a time, until it stops or
+# maximum_number_of_steps steps. It returns the machine, the log and the state after every step (0 is as loaded).
+def run_logged(parsed_object_code_dict_list, input_data, maximum_number_of_logged_steps,
+               maximum_number_of_steps=MAXIMUM_NUMBER_OF_STEPS):
+    machine = create_machine(input_data)
+    with contextlib.redirect_stdout(io.StringIO()):
+        machine.load_program_object_code(parsed_object_code_dict_list)
+        time_travel_log = SICTimeTravelLog(machine, CHECKPOINT_INTERVAL, maximum_number_of_logged_steps)
+
+        machine_state_list = [get_machine_state(machine)]
+        continue_execution = True
+        while continue_execution and (maximum_number_of_steps is None or
+                                      len(machine_state_list) <= maximum_number_of_steps):
+            continue_execution = time_travel_log.step()
+            machine_state_list.append(get_machine_state(machine))
+
+    return machine, time_travel_log, machine_state_list
+
+
+# This function goes back to every step of step_number_list, in order, and checks the state at each.
+# It then runs forward again from the last of them and checks the state after every step.
+def check_going_back(machine, time_travel_log, machine_state_list, step_number_list):
+    for step_number in step_number_list:
+        time_travel_log.go_to_step(step_number)
+        assert time_travel_log.step_number == step_number
+        assert get_machine_state(machine) == machine_state_list[step_number]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for step_number in range(step_number_list[-1] + 1, len(machine_state_list)):
+            time_travel_log.step()
+            assert get_machine_state(machine) == machine_state_list[step_number]
+
+
+# The steps gone back to are checkpoints, the steps either side of them, and steps between them
+@pytest.mark.parametrize("seed", range(NUMBER_OF_TIME_TRAVEL_PROGRAMS))
+def test_go_to_step_matches_the_recorded_state(seed):
+    rng = random.Random(seed)
+    machine, time_travel_log, machine_state_list = run_logged(parse_object_code(build_random_object_code(rng)),
+                                                              build_random_input_data(rng), MAXIMUM_NUMBER_OF_STEPS)
+    last_step_number = len(machine_state_list) - 1
+    assert time_travel_log.first_step_number == 0
+
+    step_number_list = sorted({step_number for step_number in (last_step_number, last_step_number - 1, 21, 20, 19,
+                                                               15, 11, 10, 9, 1, 0)
+                               if 0 <= step_number <= last_step_number}, reverse=True)
+    check_going_back(machine, time_travel_log, machine_state_list, step_number_list)
+
+
+# ReadWrite reads and writes its devices, so going back also takes back input read and output written
+def test_read_write_goes_back_across_checkpoints(read_write_object_code_dict_list):
+    machine, time_travel_log, machine_state_list = run_logged(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA,
+                                                              MAXIMUM_NUMBER_OF_STEPS, maximum_number_of_steps=None)
+    last_step_number = len(machine_state_list) - 1
+    assert machine.output_device_05.sink.output_bytearray.decode("latin-1") == READ_WRITE_OUTPUT
+
+    step_number_list = [last_step_number - 1, 777, 500, 401, 400, 399, 123, 30, 29, 3, 0]
+    check_going_back(machine, time_travel_log, machine_state_list, step_number_list)
+    assert machine.output_device_05.sink.output_bytearray.decode("latin-1") == READ_WRITE_OUTPUT
+
+
+# Only the last 30 steps, whole checkpoint intervals of them, are kept
+def test_go_to_step_after_the_oldest_interval_is_dropped(read_write_object_code_dict_list):
+    machine, time_travel_log, machine_state_list = run_logged(read_write_object_code_dict_list, READ_WRITE_INPUT_DATA,
+                                                              3 * CHECKPOINT_INTERVAL, maximum_number_of_steps=95)
+    assert time_travel_log.step_number == 95
+    assert time_travel_log.first_step_number == 60
+    assert min(time_travel_log.checkpoint_dict) == 60
+
+    with pytest.raises(SICTimeTravelError):
+        time_travel_log.go_to_step(59)
+    assert get_machine_state(machine) == machine_state_list[95]
+
+    check_going_back(machine, time_travel_log, machine_state_list, [94, 90, 71, 70, 69, 61, 60])
+    assert time_travel_log.first_step_number == 60
+
+    time_travel_log.go_to_step(60)
+    assert not time_travel_log.reverse_step()
+    assert get_machine_state(machine) == machine_state_list[60]